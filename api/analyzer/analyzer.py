@@ -1,8 +1,35 @@
+import bisect
 import hashlib
 import os
 import esprima
 import re
+from api.analyzer.records import DeclarationRecord, FunctionRecord, \
+    ClassMethodRecord, MethodCallRecord
+from api.analyzer.resolver import ImportPathResolver
 from api.instances.logging_standard import logging
+from api.util.paths_helper import file_path_to_file_id
+
+
+class LazyNodeInCode:
+    """Lazily formatted location of a node in the analyzed source code. The
+    code snippet and line number are only computed when the object is turned
+    into a string, which only happens if the log record is actually emitted.
+
+    :param formatter: The function formatting the node range.
+    :type formatter: callable
+    :param node_range: The range of the node in the source code.
+    :type node_range: list|None
+
+    :rtype: None
+    """
+    __slots__ = ("formatter", "node_range")
+
+    def __init__(self, formatter, node_range) -> None:
+        self.formatter = formatter
+        self.node_range = node_range
+
+    def __str__(self) -> str:
+        return self.formatter(self.node_range)
 
 
 class AnalyzeJS:
@@ -14,19 +41,30 @@ class AnalyzeJS:
     :param path_project_root: The absolute path to the root directory for
     the whole project.
     :type path_project_root: str
+    :param import_resolver: The resolver for import paths, should be shared
+    by all analyzers for the same project. A new resolver is created if none
+    is provided.
+    :type import_resolver: ImportPathResolver|None
 
     :rtype: None
     """
-    def __init__(self, path_target_file, path_project_root) -> None:
+    def __init__(
+            self,
+            path_target_file,
+            path_project_root,
+            import_resolver: ImportPathResolver = None) -> None:
         self.ast_analyzed = False
 
         self.path_target_file = path_target_file
         self.path_project_root = path_project_root
+        self.import_resolver = import_resolver
         self.code_target_file = None
         self.ast_target_file = None
         self.js_target_file_import_path = None
+        self.code_line_starts = None
 
         self.analyze_exported = []
+        self.analyze_warnings = {}
         self.analyze_imported = []
 
         # AST Information Caching
@@ -43,6 +81,7 @@ class AnalyzeJS:
         # Setup Process
         self.__validate_constructor_arguments()
         self.__clean_env_path_variables()
+        self.__set_import_resolver()
         self.__load_code_target_file()
         self.__load_ast_target_file()
         self.__set_js_target_file_import_path()
@@ -71,6 +110,17 @@ class AnalyzeJS:
         self.path_target_file = os.path.abspath(self.path_target_file)
         self.path_project_root = os.path.abspath(self.path_project_root)
 
+    def __set_import_resolver(self) -> None:
+        """Set up the import path resolver, unless one was provided.
+
+        :return: None
+        """
+        if self.import_resolver is None:
+            self.import_resolver = \
+                ImportPathResolver(self.path_project_root)
+        elif not isinstance(self.import_resolver, ImportPathResolver):
+            raise TypeError("'import_resolver' must be an ImportPathResolver")
+
     def __load_code_target_file(self) -> None:
         """Load the code for the selected target file.
 
@@ -105,19 +155,98 @@ class AnalyzeJS:
         :return: None
         """
         self.js_target_file_import_path = \
-            re.sub(r"^" + re.escape(self.path_project_root) + r"/|\.jsx?$",
-                   "",
-                   self.path_target_file)
+            file_path_to_file_id(self.path_project_root, self.path_target_file)
 
     # ~~~~~( Debugging ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    def __debug_node_in_code(self, node):
-        node_code = self.code_target_file[node.range[0]:node.range[1]]
-        new_lines = self.code_target_file[:node.range[0]].count("\n") + 1
+    def __get_line_number(self, offset: int) -> int:
+        """Get the line number for an offset in the loaded target file. The
+        line start index is built once per file and then searched with bisect.
+
+        :param offset: The character offset in the target file.
+        :type offset: int
+
+        :return: The line number (starting at 1) of the offset.
+        :rtype: int
+        """
+        if self.code_line_starts is None:
+            self.code_line_starts = \
+                [0] + [match.end() for match in
+                       re.finditer("\n", self.code_target_file)]
+
+        return bisect.bisect_right(self.code_line_starts, offset)
+
+    def __debug_range_in_code(self, node_range) -> str:
+        if node_range is None:
+            return f"\n" \
+                   f" >>> File: {self.path_target_file}"
+
+        node_code = self.code_target_file[node_range[0]:node_range[1]]
+        new_lines = self.__get_line_number(node_range[0])
 
         return f"\n" \
                f" >>> File: {self.path_target_file}\n" \
                f" >>> Line {new_lines}: {node_code}"
 
+    def __warn_node(self, message: str, warning_code: str, node) -> None:
+        """Log a warning about a node that cannot be handled. Only the first
+        occurrence of every warning code is logged directly, repeated
+        occurrences are collected and logged as a summary once the analysis
+        of the file is complete.
+
+        :param message: The warning message.
+        :type message: str
+        :param warning_code: The warning code, for example 'W-AWPCYHNOTNT'.
+        :type warning_code: str
+        :param node: The AST node the warning is about.
+        :type node: esprima.nodes.Node
+
+        :return: None
+        """
+        node_range = getattr(node, 'range', None)
+
+        if warning_code in self.analyze_warnings:
+            self.analyze_warnings[warning_code]["ranges"].append(node_range)
+            return
+
+        self.analyze_warnings[warning_code] = {
+            "message": message,
+            "ranges": [node_range]
+        }
+
+        logging.warning(
+            "%s[%s]%s",
+            message,
+            warning_code,
+            LazyNodeInCode(self.__debug_range_in_code, node_range))
+
+    def __log_warning_summary(self) -> None:
+        """Log a summary of all repeated warnings for the loaded target file.
+
+        :return: None
+        """
+        if not logging.getLogger().isEnabledFor(logging.WARNING):
+            return
+
+        summary_lines = []
+        for warning_code, warning in self.analyze_warnings.items():
+            repeated_ranges = warning["ranges"][1:]
+            if len(repeated_ranges) == 0:
+                continue
+
+            repeated_lines = sorted(set(
+                self.__get_line_number(node_range[0])
+                for node_range in repeated_ranges if node_range is not None))
+
+            summary_lines.append(
+                f" >>> [{warning_code}] repeated {len(repeated_ranges)} "
+                f"time(s), on line(s): "
+                f"{', '.join(str(line) for line in repeated_lines)}")
+
+        if len(summary_lines) > 0:
+            logging.warning(
+                "Repeated warnings during analysis of file "
+                f"{self.path_target_file}:\n" + "\n".join(summary_lines))
+
     def __debug_print_location(self, scope, path):
         path_in_program = '/'.join(path)
         scope_in_program = \
@@ -140,18 +269,16 @@ class AnalyzeJS:
                     enumerate(self.cache_declarations[dec_name]):
                 print(f" {(index + 1):0>4}.")
                 print(f"   - {'scope': >{name_size}}: "
-                      f"{' ' + str(dec_inst['scope']):.>{value_size}}")
+                      f"{' ' + str(dec_inst.scope):.>{value_size}}")
 
                 print(f"   - {'node_type': >{name_size}}: "
-                      f"{' ' + str(dec_inst['node_type']):.>{value_size}}")
-
-                # print(dec_inst['node'])
+                      f"{' ' + str(dec_inst.node_type):.>{value_size}}")
 
                 print(f"   - {'path': >{name_size}}: "
-                      f"{' ' + '/'.join(dec_inst['path']):.>{value_size}}")
+                      f"{' ' + '/'.join(dec_inst.path):.>{value_size}}")
 
                 print(f"   - {'kind': >{name_size}}: "
-                      f"{' ' + dec_inst['kind']:.>{value_size}}")
+                      f"{' ' + str(dec_inst.kind):.>{value_size}}")
 
             print()
         print()
@@ -163,15 +290,13 @@ class AnalyzeJS:
                         self.cache_declarations_exported_object[dec_name]):
                 print(f" {(index + 1):0>4}.")
                 print(f"   - {'scope': >{name_size}}: "
-                      f"{' ' + str(dec_inst['scope']):.>{value_size}}")
+                      f"{' ' + str(dec_inst.scope):.>{value_size}}")
 
                 print(f"   - {'node_type': >{name_size}}: "
-                      f"{' ' + str(dec_inst['node_type']):.>{value_size}}")
-
-                # print(dec_inst['node'])
+                      f"{' ' + str(dec_inst.node_type):.>{value_size}}")
 
                 print(f"   - {'path': >{name_size}}: "
-                      f"{' ' + '/'.join(dec_inst['path']):.>{value_size}}")
+                      f"{' ' + '/'.join(dec_inst.path):.>{value_size}}")
 
             print()
 
@@ -182,12 +307,10 @@ class AnalyzeJS:
                     enumerate(self.cache_functions[dec_name]):
                 print(f" {(index + 1):0>4}.")
                 print(f"   - {'scope': >{name_size}}: "
-                      f"{' ' + str(dec_inst['scope']):.>{value_size}}")
-
-                # print(dec_inst['node'])
+                      f"{' ' + str(dec_inst.scope):.>{value_size}}")
 
                 print(f"   - {'path': >{name_size}}: "
-                      f"{' ' + '/'.join(dec_inst['path']):.>{value_size}}")
+                      f"{' ' + '/'.join(dec_inst.path):.>{value_size}}")
 
             print()
 
@@ -198,21 +321,19 @@ class AnalyzeJS:
                     enumerate(self.cache_classes[dec_name]):
                 print(f" {(index + 1):0>4}.")
                 print(f"   - {'constructor': >{name_size}}: "
-                      f"{' ' + str(dec_inst['constructor'] is not None):.>{value_size}}")
+                      f"{' ' + str(dec_inst.constructor_params is not None):.>{value_size}}")
 
                 print(f"   - {'static': >{name_size}}: "
-                      f"{' ' + str(dec_inst['static']):.>{value_size}}")
+                      f"{' ' + str(dec_inst.static):.>{value_size}}")
 
                 print(f"   - {'name': >{name_size}}: "
-                      f"{' ' + str(dec_inst['name']):.>{value_size}}")
+                      f"{' ' + str(dec_inst.name):.>{value_size}}")
 
                 print(f"   - {'scope': >{name_size}}: "
-                      f"{' ' + str(dec_inst['scope']):.>{value_size}}")
-
-                # print(dec_inst['node'])
+                      f"{' ' + str(dec_inst.scope):.>{value_size}}")
 
                 print(f"   - {'path': >{name_size}}: "
-                      f"{' ' + '/'.join(dec_inst['path']):.>{value_size}}")
+                      f"{' ' + '/'.join(dec_inst.path):.>{value_size}}")
 
             print()
 
@@ -220,18 +341,16 @@ class AnalyzeJS:
         for index, dec_inst in enumerate(self.cache_method_calls):
             print(f" {(index + 1):0>4}.")
             print(f"   - {'name': >{name_size}}: "
-                  f"{' ' + str(dec_inst['name']):.>{value_size}}")
+                  f"{' ' + str(dec_inst.name):.>{value_size}}")
 
             print(f"   - {'scope': >{name_size}}: "
-                  f"{' ' + str(dec_inst['scope']):.>{value_size}}")
-
-            # print(dec_inst['node'])
+                  f"{' ' + str(dec_inst.scope):.>{value_size}}")
 
             print(f"   - {'path': >{name_size}}: "
-                  f"{' ' + '/'.join(dec_inst['path']):.>{value_size}}")
+                  f"{' ' + '/'.join(dec_inst.path):.>{value_size}}")
 
             print(f"   - {'property_chain': >{name_size}}: "
-                  f"{' ' + str(dec_inst['property_chain']):.>{value_size}}")
+                  f"{' ' + str(dec_inst.property_chain):.>{value_size}}")
 
         print()
 
@@ -250,8 +369,6 @@ class AnalyzeJS:
             print(f"   - {'object_type': >{name_size}}: "
                   f"{' ' + str(dec_inst['object_type']):.>{value_size}}")
 
-            # print(dec_inst['node'])
-
         print()
 
         print(f"{'=== [ analyze_imported ]':=<{win_size}}")
@@ -266,18 +383,11 @@ class AnalyzeJS:
             print(f"   - {'absolute_import_path': >{name_size}}: "
                   f"{' ' + str(dec_inst['absolute_import_path']):.>{value_size}}")
 
-            # print(dec_inst['node'])
-
         print()
 
     # ~~~~~( Cache Handling ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     def __cache_function(self, name, scope, node, node_type, path: list):
-        cache_content = {
-            "scope": scope,
-            "node": node,
-            "node_type": node_type,
-            "path": path
-        }
+        cache_content = FunctionRecord(scope, path, node, node_type)
 
         if name not in self.cache_functions:
             self.cache_functions[name] = [cache_content]
@@ -287,14 +397,8 @@ class AnalyzeJS:
     def __cache_class_method(
             self, classname, constructor, static, name, scope, node,
             path: list):
-        cache_content = {
-            "constructor": constructor,
-            "static": static,
-            "name": name,
-            "scope": scope,
-            "node": node,
-            "path": path
-        }
+        cache_content = ClassMethodRecord(
+            scope, path, node, name, static, constructor)
 
         if classname not in self.cache_classes:
             self.cache_classes[classname] = [cache_content]
@@ -309,18 +413,7 @@ class AnalyzeJS:
         elif name in self.cache_declarations and kind is None:
             kind = "redeclare"
 
-        if declaration is None:
-            declaration_type = None
-        else:
-            declaration_type = declaration.type
-
-        cache_content = {
-            "scope": scope,
-            "node": declaration,
-            "node_type": declaration_type,
-            "path": path,
-            "kind": kind
-        }
+        cache_content = DeclarationRecord(scope, path, declaration, kind)
 
         if name not in self.cache_declarations:
             self.cache_declarations[name] = [cache_content]
@@ -329,17 +422,7 @@ class AnalyzeJS:
 
     def __cache_declaration_exported_object(
             self, name, declaration, scope, path: list):
-        if declaration is None:
-            declaration_type = None
-        else:
-            declaration_type = declaration.type
-
-        cache_content = {
-            "scope": scope,
-            "node": declaration,
-            "node_type": declaration_type,
-            "path": path
-        }
+        cache_content = DeclarationRecord(scope, path, declaration)
 
         if name not in self.cache_declarations_exported_object:
             self.cache_declarations_exported_object[name] = [cache_content]
@@ -351,13 +434,8 @@ class AnalyzeJS:
         if property_chain is None:
             property_chain = []
 
-        cache_content = {
-            "name": name,
-            "scope": scope,
-            "node": node,
-            "path": path,
-            "property_chain": property_chain
-        }
+        cache_content = MethodCallRecord(
+            scope, path, node, name, property_chain)
 
         self.cache_method_calls.append(cache_content)
 
@@ -372,19 +450,8 @@ class AnalyzeJS:
         :return: An absolute path starting from the project root directory.
         :rtype: str
         """
-        abs_import_path = import_path
-        is_path_relative = re.match(r"[.]{1,2}/", import_path)
-        if is_path_relative:
-            combined_paths = \
-                os.path.abspath(
-                    os.path.dirname(self.path_target_file) + "/" + import_path)
-
-            abs_import_path = \
-                re.sub("^" + re.escape(self.path_project_root) + "/",
-                       "",
-                       combined_paths)
-
-        return abs_import_path
+        return self.import_resolver.resolve(
+            os.path.dirname(self.path_target_file), import_path)
 
     def __convert_esprima_ast_to_object(
             self,
@@ -420,11 +487,11 @@ class AnalyzeJS:
             object_data = node
 
         else:
-            logging.warning(
+            self.__warn_node(
                 "Object not complete because of unknown data could not be "
-                f"handled in parameter tree: {type(node)}. "
-                "[W-ONCBODCNBHIPTN]" +
-                self.__debug_node_in_code(node))
+                f"handled in parameter tree: {type(node)}. ",
+                "W-ONCBODCNBHIPTN",
+                node)
 
         return object_data
 
@@ -440,7 +507,8 @@ class AnalyzeJS:
         :type local_name: str
         :param object_type: The exported asset's type. (NOT IN USE)
         :type: object_type: str
-        :param node: The AST node for the exported asset. (NOT IN USE)
+        :param node: The AST node for the exported asset. (NOT IN USE, IS
+        NOT KEPT IN THE INFORMATION OBJECT)
         :type node: esprima.nodes.Node|list
 
         :return: The EXPORT DEFAULT information object.
@@ -450,8 +518,7 @@ class AnalyzeJS:
             "export": "export default",
             "local_name": local_name,
             "export_name": local_name,
-            "object_type": object_type,
-            "node": node
+            "object_type": object_type
         }
 
     def __make_info_export_named(
@@ -469,7 +536,8 @@ class AnalyzeJS:
         :type export_name: str
         :param object_type: The exported asset's type. (NOT IN USE)
         :type: object_type: str
-        :param node: The AST node for the exported asset. (NOT IN USE)
+        :param node: The AST node for the exported asset. (NOT IN USE, IS
+        NOT KEPT IN THE INFORMATION OBJECT)
         :type node: esprima.nodes.Node|list
 
         :return: The EXPORT NAMED information object.
@@ -479,8 +547,7 @@ class AnalyzeJS:
             "export": "export",
             "local_name": local_name,
             "export_name": export_name,
-            "object_type": object_type,
-            "node": node
+            "object_type": object_type
         }
 
     def __handle_node_export_default(
@@ -520,11 +587,11 @@ class AnalyzeJS:
                         node.declaration.id.name))
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "Export information for 'export default' not yet "
-                    f"supported: {node.declaration.type}. "
-                    "[W-EIFEDNYSNDT]" +
-                    self.__debug_node_in_code(node.declaration))
+                    f"supported: {node.declaration.type}. ",
+                    "W-EIFEDNYSNDT",
+                    node.declaration)
 
         return exported
 
@@ -547,20 +614,18 @@ class AnalyzeJS:
                 match export_specifier.type:
                     case "ExportSpecifier":
                         if export_specifier.exported.type != "Identifier":
-                            logging.warning(
+                            self.__warn_node(
                                 "Export specifier export type not supported: "
-                                f"{export_specifier.exported.type}. "
-                                "[W-ESETNSEETA]" +
-                                self.__debug_node_in_code(
-                                    export_specifier.exported))
+                                f"{export_specifier.exported.type}. ",
+                                "W-ESETNSEETA",
+                                export_specifier.exported)
 
                         if export_specifier.local.type != "Identifier":
-                            logging.warning(
+                            self.__warn_node(
                                 "Export specifier export type not supported: "
-                                f"{export_specifier.exported.type}. "
-                                "[W-ESETNSEETB]" +
-                                self.__debug_node_in_code(
-                                    export_specifier.exported))
+                                f"{export_specifier.exported.type}. ",
+                                "W-ESETNSEETB",
+                                export_specifier.exported)
 
                         if export_specifier.exported.type == "Identifier" and \
                                 export_specifier.local.type == "Identifier":
@@ -570,11 +635,11 @@ class AnalyzeJS:
                                     export_specifier.exported.name))
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "Export specifier type not supported: "
-                            f"{export_specifier.type}. "
-                            "[W-ESTNSET]" +
-                            self.__debug_node_in_code(export_specifier))
+                            f"{export_specifier.type}. ",
+                            "W-ESTNSET",
+                            export_specifier)
 
         if node.declaration is not None:
             match node.declaration.type:
@@ -591,14 +656,13 @@ class AnalyzeJS:
                                             declared))
 
                                 else:
-                                    logging.warning(
+                                    self.__warn_node(
                                         "Exported variable declaration with "
                                         "id of type: "
                                         f"{declared.id.type} not yet "
-                                        "supported. "
-                                        "[W-EVDWIOTNDITNYS]" +
-                                        self.__debug_node_in_code(
-                                            declared.id))
+                                        "supported. ",
+                                        "W-EVDWIOTNDITNYS",
+                                        declared.id)
 
                 case "FunctionDeclaration":
                     if node.declaration.id.type == "Identifier":
@@ -610,11 +674,11 @@ class AnalyzeJS:
                                 node.declaration))
 
                     else:
-                        logging.warning(
+                        self.__warn_node(
                             "Exported function declaration with id of type: "
-                            f"{node.declaration.id.type} not yet supported. "
-                            "[W-EFDWIOTNDITNYS]" +
-                            self.__debug_node_in_code(node.declaration))
+                            f"{node.declaration.id.type} not yet supported. ",
+                            "W-EFDWIOTNDITNYS",
+                            node.declaration)
 
                 case "ClassDeclaration":
                     if node.declaration.id.type == "Identifier":
@@ -626,19 +690,19 @@ class AnalyzeJS:
                                 node.declaration))
 
                     else:
-                        logging.warning(
+                        self.__warn_node(
                             "Exported class declaration with id of type: "
-                            f"{node.declaration.id.type} not yet supported. "
-                            "[W-ECDWIOTNDITNYS]" +
-                            self.__debug_node_in_code(node.declaration))
+                            f"{node.declaration.id.type} not yet supported. ",
+                            "W-ECDWIOTNDITNYS",
+                            node.declaration)
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "Export information support for type: "
                         f"{node.declaration.type}"
-                        " not yet added. "
-                        "[W-EISFTNDTNYS]" +
-                        self.__debug_node_in_code(node.declaration))
+                        " not yet added. ",
+                        "W-EISFTNDTNYS",
+                        node.declaration)
 
         return exported
 
@@ -721,9 +785,11 @@ class AnalyzeJS:
                                     absolute_import_path)]
 
                         case _:
-                            logging.warning(
-                                f"Import specifier of type {node.type} not "
-                                "yet supported.")
+                            self.__warn_node(
+                                "Import specifier of type "
+                                f"{import_specifier.type} not yet supported. ",
+                                "W-ISOTNYS",
+                                import_specifier)
 
         self.analyze_imported = imported
 
@@ -828,11 +894,11 @@ class AnalyzeJS:
                 return
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "Handling of caching of method call for final callee of "
-                    f"type: {node_walk.type} not yet supported. "
-                    "[W-HOCOMCFFCOTNTNYS]" +
-                    self.__debug_node_in_code(node_walk))
+                    f"type: {node_walk.type} not yet supported. ",
+                    "W-HOCOMCFFCOTNTNYS",
+                    node_walk)
                 return
 
         property_chain.reverse()
@@ -908,13 +974,13 @@ class AnalyzeJS:
                         continue
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "Cache handling for variable declaration "
                             "of type ArrayExpression cannot yet "
                             "handle item of type: "
-                            f"{current_element.type}. "
-                            "[W-CHFVDOTOCYHPVOTOVT]" +
-                            self.__debug_node_in_code(current_element))
+                            f"{current_element.type}. ",
+                            "W-CHFVDOTOCYHPVOTOVT",
+                            current_element)
 
     def __cache_handle_declaration_objectexpression(
             self,
@@ -947,13 +1013,13 @@ class AnalyzeJS:
             for index, obj_property in enumerate(node.properties):
 
                 if obj_property.type != "Property":
-                    logging.warning(
+                    self.__warn_node(
                         "Cache handling of variable declaration of "
                         "type ObjectExpression cannot yet handle "
                         "object properties of type "
-                        f"{obj_property.type} not yet supported. "
-                        "[W-CHOVDOTOCYHOPOTOKTNYS]" +
-                        self.__debug_node_in_code(obj_property))
+                        f"{obj_property.type} not yet supported. ",
+                        "W-CHOVDOTOCYHOPOTOKTNYS",
+                        obj_property)
                     continue
 
                 if obj_property.key.type == "Identifier":
@@ -961,13 +1027,13 @@ class AnalyzeJS:
                 elif obj_property.key.type == "Literal":
                     property_name = obj_property.key.value
                 else:
-                    logging.warning(
+                    self.__warn_node(
                         "Cache handling of variable declaration of "
                         "type ObjectExpression cannot yet handle "
                         "object property keys of type "
-                        f"{obj_property.key.type} not yet supported. "
-                        "[W-CHOVDOTOCYHOPKOTOKTNYS]" +
-                        self.__debug_node_in_code(obj_property.key))
+                        f"{obj_property.key.type} not yet supported. ",
+                        "W-CHOVDOTOCYHOPKOTOKTNYS",
+                        obj_property.key)
                     continue
 
                 self.__cache_declaration(
@@ -1006,13 +1072,13 @@ class AnalyzeJS:
                         continue
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "Cache handling for variable declaration "
                             "of type ObjectExpression cannot yet "
                             "handle property value of type: "
-                            f"{obj_property.value.type}. "
-                            "[W-CHFVDOTOCYHPVOTOVT]" +
-                            self.__debug_node_in_code(obj_property.value))
+                            f"{obj_property.value.type}. ",
+                            "W-CHFVDOTOCYHPVOTOVT",
+                            obj_property.value)
 
     def __cache_handle_anonymous_objectexpression(
             self,
@@ -1036,12 +1102,12 @@ class AnalyzeJS:
         if node.properties is not None:
             for index, obj_property in enumerate(node.properties):
                 if obj_property.type != "Property":
-                    logging.warning(
+                    self.__warn_node(
                         "Cache handling for anonymous ObjectExpression "
                         "cannot yet handle properties of type: "
-                        f"{obj_property.type}. "
-                        "[W-CHFAOCYHPOTOT]" +
-                        self.__debug_node_in_code(obj_property))
+                        f"{obj_property.type}. ",
+                        "W-CHFAOCYHPOTOT",
+                        obj_property)
                     continue
 
                 match obj_property.value.type:
@@ -1064,12 +1130,12 @@ class AnalyzeJS:
                         continue
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "Cache handling for anonymous ObjectExpression "
                             "cannot yet handle property value of type: "
-                            f"{obj_property.value.type}. "
-                            "[W-CHFOCYPVOTOVT]" +
-                            self.__debug_node_in_code(obj_property.value))
+                            f"{obj_property.value.type}. ",
+                            "W-CHFOCYPVOTOVT",
+                            obj_property.value)
 
     def __cache_handle_declaration_variabledeclarator(
             self,
@@ -1137,11 +1203,11 @@ class AnalyzeJS:
                     return
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "Cache handling for variable declaration call of "
-                        f"type: {node.init.type} not yet supported. "
-                        "[W-CHFVDCOTDITNYS]" +
-                        self.__debug_node_in_code(node.init))
+                        f"type: {node.init.type} not yet supported. ",
+                        "W-CHFVDCOTDITNYS",
+                        node.init)
 
         elif node.id.type == "ArrayPattern":
             if node.init.type == "ArrayExpression" and \
@@ -1198,15 +1264,14 @@ class AnalyzeJS:
                             return
 
                         case _:
-                            logging.warning(
+                            self.__warn_node(
                                 "Cache handling for variable declaration "
                                 "call with array pattern and array expression "
                                 "of type: "
                                 f"{node.init.elements[index].type} "
-                                "not yet supported. "
-                                "[W-CHFVDCWAPAAEOTNIEITNYS]" +
-                                self.__debug_node_in_code(
-                                    node.init.elements[index]))
+                                "not yet supported. ",
+                                "W-CHFVDCWAPAAEOTNIEITNYS",
+                                node.init.elements[index])
 
             else:
                 match node.init.type:
@@ -1225,19 +1290,19 @@ class AnalyzeJS:
                         return
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "Cache handling for variable declarator with "
                             "id of an array pattern and initiator of type: "
-                            f"{node.init.type} not yet supported. "
-                            "[W-CHFVDWIOAAPAIOTNITNYS]" +
-                            self.__debug_node_in_code(node.init))
+                            f"{node.init.type} not yet supported. ",
+                            "W-CHFVDWIOAAPAIOTNITNYS",
+                            node.init)
 
         else:
-            logging.warning(
+            self.__warn_node(
                 "Cache handling for variable declaration call with id of "
-                f"type {node.id.type} not yet supported. "
-                "[W-CHFVDCWIOTNITNYS]" +
-                self.__debug_node_in_code(node.id))
+                f"type {node.id.type} not yet supported. ",
+                "W-CHFVDCWIOTNITNYS",
+                node.id)
 
     def __cache_handle_exported_object_declaration(
             self,
@@ -1270,12 +1335,12 @@ class AnalyzeJS:
             for index, obj_property in enumerate(node.properties):
 
                 if obj_property.type != "Property":
-                    logging.warning(
+                    self.__warn_node(
                         "Cache handling of special declaration in exported "
                         f"object with property of type {obj_property.type} "
-                        "not yet supported. "
-                        "[W-CHOSDIEOWPOTOTNYS]" +
-                        self.__debug_node_in_code(obj_property))
+                        "not yet supported. ",
+                        "W-CHOSDIEOWPOTOTNYS",
+                        obj_property)
                     continue
 
                 if obj_property.key.type == "Identifier":
@@ -1283,12 +1348,12 @@ class AnalyzeJS:
                 elif obj_property.key.type == "Literal":
                     property_name = obj_property.key.value
                 else:
-                    logging.warning(
+                    self.__warn_node(
                         "Cache handling of special declaration in exported "
                         f"object with property keys of type "
-                        f"{obj_property.key.type} not yet supported. "
-                        "[W-CHOSDIEOWPKOTOKTNYS]" +
-                        self.__debug_node_in_code(obj_property.key))
+                        f"{obj_property.key.type} not yet supported. ",
+                        "W-CHOSDIEOWPKOTOKTNYS",
+                        obj_property.key)
                     continue
 
                 self.__cache_declaration_exported_object(
@@ -1319,12 +1384,12 @@ class AnalyzeJS:
                         continue
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "Cache handling of special declaration in "
                             "exported object cannot yet handle property "
-                            f"value of type: {obj_property.value.type}. "
-                            "[W-CHOSDIEOCYHPVOTOVT]" +
-                            self.__debug_node_in_code(obj_property.value))
+                            f"value of type: {obj_property.value.type}. ",
+                            "W-CHOSDIEOCYHPVOTOVT",
+                            obj_property.value)
 
     # ~~~~~( AST Walk - Tree Exploration ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     def __ast_walk_handle_method_call(
@@ -1403,11 +1468,11 @@ class AnalyzeJS:
                     call_path += ["callee"]
 
                 else:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of method call node walk callee "
-                        f"type: {node_walk.callee.type} not yet supported. "
-                        "[W-AWHOMCNWCTNCTNYS]" +
-                        self.__debug_node_in_code(node_walk.callee))
+                        f"type: {node_walk.callee.type} not yet supported. ",
+                        "W-AWHOMCNWCTNCTNYS",
+                        node_walk.callee)
                     return
 
             else:
@@ -1444,11 +1509,11 @@ class AnalyzeJS:
         elif node_walk.type != "Identifier" and \
                 node_walk.type != "ThisExpression" and \
                 node_walk.type != "Super":
-            logging.warning(
+            self.__warn_node(
                 "AST walk handling of method call for final callee of type: "
-                f"{node_walk.type} not yet supported. "
-                "[W-AWHOMCFFCOTNTNYS]" +
-                self.__debug_node_in_code(node_walk))
+                f"{node_walk.type} not yet supported. ",
+                "W-AWHOMCFFCOTNTNYS",
+                node_walk)
 
         call_identity = []
         for call in call_chain:
@@ -1494,11 +1559,11 @@ class AnalyzeJS:
 
         for index, obj_property in enumerate(node.properties):
             if obj_property.type != "Property":
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of object expression property of type "
-                    f"{obj_property.type} not yet supported. "
-                    "[W-AWHOOEPOTOTNYS]" +
-                    self.__debug_node_in_code(obj_property))
+                    f"{obj_property.type} not yet supported. ",
+                    "W-AWHOOEPOTOTNYS",
+                    obj_property)
                 continue
 
             if obj_property.key.type == "Identifier":
@@ -1506,11 +1571,11 @@ class AnalyzeJS:
             elif obj_property.key.type == "Literal":
                 property_name = obj_property.key.value
             else:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of object expression property with "
-                    f"key of type {obj_property.key.type} not yet supported. "
-                    "[W-AWHOOEPWKOTOKTNYS]" +
-                    self.__debug_node_in_code(obj_property.key))
+                    f"key of type {obj_property.key.type} not yet supported. ",
+                    "W-AWHOOEPWKOTOKTNYS",
+                    obj_property.key)
                 continue
 
             match obj_property.value.type:
@@ -1549,12 +1614,12 @@ class AnalyzeJS:
                     continue
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of object expression property "
                         f"value of type: {obj_property.value.type} not yet "
-                        "supported. "
-                        "[W-AWHOOEPVOTOVTNYS]" +
-                        self.__debug_node_in_code(obj_property.value))
+                        "supported. ",
+                        "W-AWHOOEPVOTOVTNYS",
+                        obj_property.value)
 
     def __ast_walk_handle_functiondeclaration(
             self,
@@ -1590,12 +1655,12 @@ class AnalyzeJS:
                 path + ["body", "body"])
 
         else:
-            logging.warning(
+            self.__warn_node(
                 "AST walk handling of function declaration of type "
                 f"{node.type} cannot yet handle function body of "
-                f"type {node.body.type}"
-                "[W-AWHOFDOTNTCYHFBOTNBT]" +
-                self.__debug_node_in_code(node.body))
+                f"type {node.body.type}",
+                "W-AWHOFDOTNTCYHFBOTNBT",
+                node.body)
 
     def __ast_walk_handle_classdeclaration(
             self,
@@ -1630,9 +1695,11 @@ class AnalyzeJS:
         found_methods = []
         constructor_method = None
         if node.body.type != "ClassBody":
-            logging.warning(
+            self.__warn_node(
                 "AST walk handling of class declaration cannot yet handle "
-                f"class body of type {node.body.type}")
+                f"class body of type {node.body.type}",
+                "W-AWHOCDCYHCBOT",
+                node.body)
             return
 
         if node.body.body is not None:
@@ -1658,12 +1725,12 @@ class AnalyzeJS:
                                  class_node.static))
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of class declaration cannot "
                             "yet handle internal node of type "
-                            f"{class_node.type}. "
-                            "[W-AWHOCDCYHINOTCT]" +
-                            self.__debug_node_in_code(class_node))
+                            f"{class_node.type}. ",
+                            "W-AWHOCDCYHINOTCT",
+                            class_node)
 
         for found_method in found_methods:
             method_name, method_value, method_path, method_static = \
@@ -1746,13 +1813,13 @@ class AnalyzeJS:
                     return
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of binary expression "
                         f"{current_path} hand type: "
                         f"{node.__dict__[current_path].type} "
-                        f"not yet supported. "
-                        "[W-AWHOBERHTNRTNYS]" +
-                        self.__debug_node_in_code(node.__dict__[current_path]))
+                        f"not yet supported. ",
+                        "W-AWHOBERHTNRTNYS",
+                        node.__dict__[current_path])
 
     def __ast_walk_handle_logicalexpression(
             self,
@@ -1807,11 +1874,11 @@ class AnalyzeJS:
                 pass
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of logical expression left hand type: "
-                    f"{node.left.type} not yet supported. "
-                    "[W-AWHOLELHTNLTNYS]" +
-                    self.__debug_node_in_code(node.left))
+                    f"{node.left.type} not yet supported. ",
+                    "W-AWHOLELHTNLTNYS",
+                    node.left)
 
         match node.right.type:
             case "BinaryExpression":
@@ -1841,11 +1908,11 @@ class AnalyzeJS:
                 pass
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of logical expression right hand type: "
-                    f"{node.right.type} not yet supported. "
-                    "[W-AWHOLERHTDRTNYS]" +
-                    self.__debug_node_in_code(node.right))
+                    f"{node.right.type} not yet supported. ",
+                    "W-AWHOLERHTDRTNYS",
+                    node.right)
 
     def __ast_walk_handle_ifstatement(
             self,
@@ -1917,11 +1984,11 @@ class AnalyzeJS:
                 pass
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of if statement with test of type: "
-                    f"{node.test.type} not yet supported. "
-                    "[W-AWHOISWTOTNTTNYS]" +
-                    self.__debug_node_in_code(node.test))
+                    f"{node.test.type} not yet supported. ",
+                    "W-AWHOISWTOTNTTNYS",
+                    node.test)
 
         condition_range = node.test.range
         condition_text = \
@@ -1958,11 +2025,11 @@ class AnalyzeJS:
                         pre_condition + [f"NOT({condition_text})"])
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of if statement alternate type "
-                        f"{node.alternate.type} not yet supported. "
-                        "[W-AWHOISATNATNYS]" +
-                        self.__debug_node_in_code(node.alternate))
+                        f"{node.alternate.type} not yet supported. ",
+                        "W-AWHOISATNATNYS",
+                        node.alternate)
 
     def __ast_walk_handle_switchstatement(
             self,
@@ -2010,11 +2077,11 @@ class AnalyzeJS:
 
         for index, switch_case in enumerate(node.cases):
             if switch_case.type != "SwitchCase":
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of switch statement switch case of "
-                    f"type: {switch_case.type} not yet supported. "
-                    "[W-AWHOSSSCOTSTNYS]" +
-                    self.__debug_node_in_code(switch_case))
+                    f"type: {switch_case.type} not yet supported. ",
+                    "W-AWHOSSSCOTSTNYS",
+                    switch_case)
                 continue
 
             if switch_case.test is not None:
@@ -2049,15 +2116,15 @@ class AnalyzeJS:
                             path + ["cases", str(index), "test"])
 
                     case "ArrowFunctionExpression":
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of switch statement found "
                             "anonymous function expression in a case. There "
                             "should be no way for the contents of it to be "
                             "executed, but it's best to inspect the actual "
                             f"code between {switch_case.test.range[0]} and "
-                            f"{switch_case.test.range[1]}. "
-                            "[W-AWHOSSFAFEIACTSBNWFTCOITBEBIBTITACBSTRASTR]" +
-                            self.__debug_node_in_code(switch_case))
+                            f"{switch_case.test.range[1]}. ",
+                            "W-AWHOSSFAFEIACTSBNWFTCOITBEBIBTITACBSTRASTR",
+                            switch_case)
                         # Uncomment to read code
                         # print(
                         #    self.code_target_file[
@@ -2069,12 +2136,12 @@ class AnalyzeJS:
                         pass
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of switch statement and switch "
                             f"case with test of type: {switch_case.test.type} "
-                            "not yet supported. "
-                            "[W-AWHOSSASCWTOTSTTNYS]" +
-                            self.__debug_node_in_code(switch_case.test))
+                            "not yet supported. ",
+                            "W-AWHOSSASCWTOTSTTNYS",
+                            switch_case.test)
 
             if switch_case.test is not None:
                 switch_case_range = switch_case.test.range
@@ -2152,11 +2219,11 @@ class AnalyzeJS:
                     return
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of variable declarator type: "
-                        f"{node.init.type} not yet supported. "
-                        "[W-AWHOVDTNITNYS]" +
-                        self.__debug_node_in_code(node.init))
+                        f"{node.init.type} not yet supported. ",
+                        "W-AWHOVDTNITNYS",
+                        node.init)
 
         elif node.id.type == "ArrayPattern":
             if node.init.type == "ArrayExpression" and \
@@ -2201,14 +2268,13 @@ class AnalyzeJS:
                             return
 
                         case _:
-                            logging.warning(
+                            self.__warn_node(
                                 "AST walk handling of variable declarator "
                                 "array pattern with array expression type: "
                                 f"{node.init.elements[index].type} "
-                                f"not yet supported. "
-                                "[W-AWHOVDAPWAETNIEITNYS]" +
-                                self.__debug_node_in_code(
-                                    node.init.elements[index]))
+                                f"not yet supported. ",
+                                "W-AWHOVDAPWAETNIEITNYS",
+                                node.init.elements[index])
 
             else:
                 match node.init.type:
@@ -2221,17 +2287,19 @@ class AnalyzeJS:
                         return
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of variable declarator with "
                             "id of an array pattern and initiator of type: "
-                            f"{node.init.type} not yet supported. "
-                            "[W-AWHOVDWIOAAPAIOTNITNYS]" +
-                            self.__debug_node_in_code(node.init))
+                            f"{node.init.type} not yet supported. ",
+                            "W-AWHOVDWIOAAPAIOTNITNYS",
+                            node.init)
 
         else:
-            logging.warning(
+            self.__warn_node(
                 "AST walk handling of variable declaration with id of type "
-                f"{node.id.type} not yet supported")
+                f"{node.id.type} not yet supported",
+                "W-AWHOVDWIOTNYS",
+                node.id)
 
     def __ast_walk_handle_variabledeclaration(
             self,
@@ -2263,12 +2331,12 @@ class AnalyzeJS:
         for index, declaration in enumerate(node.declarations):
             if declaration.id.type != "Identifier" and \
                     declaration.id.type != "ArrayPattern":
-                logging.warning(
+                self.__warn_node(
                     "Variable declarator with identifier of type: "
                     f"{declaration.id.type} cannot yet be "
-                    f"handled. "
-                    "[W-VDWIOTDITCYBH]" +
-                    self.__debug_node_in_code(declaration))
+                    f"handled. ",
+                    "W-VDWIOTDITCYBH",
+                    declaration)
                 return
 
             self.__cache_handle_declaration_variabledeclarator(
@@ -2337,21 +2405,21 @@ class AnalyzeJS:
                                            "this"))
 
                     else:
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of assignment expression left "
                             "hand member expression object of type: "
-                            f"{node_walk.object.type} not yet supported. "
-                            "[W-AWHOAELHMEOOTNOTNYS]" +
-                            self.__debug_node_in_code(node_walk.object))
+                            f"{node_walk.object.type} not yet supported. ",
+                            "W-AWHOAELHMEOOTNOTNYS",
+                            node_walk.object)
 
                     node_walk = node_walk.object
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of assignment expression left hand "
-                    f"type: {node.left.type} not yet supported. "
-                    "[W-AWHOAELHTNLTNYS]" +
-                    self.__debug_node_in_code(node.left))
+                    f"type: {node.left.type} not yet supported. ",
+                    "W-AWHOAELHTNLTNYS",
+                    node.left)
                 return
 
         call_chain.reverse()
@@ -2421,12 +2489,12 @@ class AnalyzeJS:
                 return
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of assignment expression "
                     f"right hand type: {node.right.type} not yet "
-                    "supported. "
-                    "[W-AWHOAERHTNRTNYS]" +
-                    self.__debug_node_in_code(node.right))
+                    "supported. ",
+                    "W-AWHOAERHTNRTNYS",
+                    node.right)
 
     def __ast_walk_handle_sequenceexpression(
             self,
@@ -2461,11 +2529,11 @@ class AnalyzeJS:
                     continue
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of sequence expression assignment "
-                        f"of type: {assignment.type} is not yet supported. "
-                        "[W-AWHOSEAOTATINYS]" +
-                        self.__debug_node_in_code(assignment))
+                        f"of type: {assignment.type} is not yet supported. ",
+                        "W-AWHOSEAOTATINYS",
+                        assignment)
 
     def __ast_walk_handle_expressionstatement(
             self,
@@ -2542,11 +2610,11 @@ class AnalyzeJS:
                 pass
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of expression statement type: "
-                    f"{node.expression.type} not yet supported. "
-                    "[W-AWHOESTNETNYS]" +
-                    self.__debug_node_in_code(node.expression))
+                    f"{node.expression.type} not yet supported. ",
+                    "W-AWHOESTNETNYS",
+                    node.expression)
 
     def __ast_walk_handle_functionexpression(
             self,
@@ -2593,14 +2661,14 @@ class AnalyzeJS:
                 #  (() => {/* Walk here? */})();
                 #  It becomes a CallExpression.
                 if len(path) > 2 and path[-2] == "body":
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk handling of expression statement found "
                         "anonymous function expression in a body node. There "
                         "should be no way for the contents of it to be "
                         "executed, but it's best to inspect the actual code "
-                        f"between {node.range[0]} and {node.range[1]}. "
-                        "[W-AWHOESFAFEIABNTSBNWFTCOITBEBIBTITACBNRANR]" +
-                        self.__debug_node_in_code(node))
+                        f"between {node.range[0]} and {node.range[1]}. ",
+                        "W-AWHOESFAFEIABNTSBNWFTCOITBEBIBTITACBNRANR",
+                        node)
                     # Uncomment to read code
                     # print(
                     #    self.code_target_file[
@@ -2635,19 +2703,19 @@ class AnalyzeJS:
                             path + ["body"])
 
                     else:
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of function expression of type "
                             f"{node.type} cannot yet handle function body of "
-                            f"type {node.body.type}. "
-                            "[W-AWHOFEOTNTCYHFBOTNBT]" +
-                            self.__debug_node_in_code(node.body))
+                            f"type {node.body.type}. ",
+                            "W-AWHOFEOTNTCYHFBOTNBT",
+                            node.body)
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling of function expression type: "
-                    f"{node.type} not yet supported. "
-                    "[W-AWHOFETNTNYS]" +
-                    self.__debug_node_in_code(node))
+                    f"{node.type} not yet supported. ",
+                    "W-AWHOFETNTNYS",
+                    node)
 
     def __ast_walk_handle_returnstatement(
             self,
@@ -2710,11 +2778,11 @@ class AnalyzeJS:
                 return
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     "AST walk handling for return statement argument of "
-                    f"type: {node.argument.type} not yet supported. "
-                    "[W-AWHFRSAOTNATNYS]" +
-                    self.__debug_node_in_code(node.argument))
+                    f"type: {node.argument.type} not yet supported. ",
+                    "W-AWHFRSAOTNATNYS",
+                    node.argument)
 
     def __ast_walk_handle_throwstatement(
             self,
@@ -2745,11 +2813,11 @@ class AnalyzeJS:
                 path + ["argument"])
 
         else:
-            logging.warning(
+            self.__warn_node(
                 "AST walk handling for throw statement argument of "
-                f"type: {node.argument.type} not yet supported. "
-                "[W-AWHFTSAOTNATNYS]" +
-                self.__debug_node_in_code(node.argument))
+                f"type: {node.argument.type} not yet supported. ",
+                "W-AWHFTSAOTNATNYS",
+                node.argument)
 
 
     def __ast_walk_handle_jsxelement(
@@ -2801,12 +2869,12 @@ class AnalyzeJS:
                                 path + ["openingElement", "attributes",
                                         str(index), "value"])
                         else:
-                            logging.warning(
+                            self.__warn_node(
                                 "AST walk handling of JSXElement with "
                                 "attribute of type: "
-                                f"{jsx_attribute.type} not yet supported. "
-                                "[W-AWHOJWAOTJTNYS]" +
-                                self.__debug_node_in_code(jsx_attribute))
+                                f"{jsx_attribute.type} not yet supported. ",
+                                "W-AWHOJWAOTJTNYS",
+                                jsx_attribute)
 
             case "JSXExpressionContainer":
                 match node.expression.type:
@@ -2849,21 +2917,21 @@ class AnalyzeJS:
                         pass
 
                     case _:
-                        logging.warning(
+                        self.__warn_node(
                             "AST walk handling of expression statement type: "
-                            f"{node.expression.type} not yet supported. "
-                            "[W-AWHOESTNETNYSA]" +
-                            self.__debug_node_in_code(node.expression))
+                            f"{node.expression.type} not yet supported. ",
+                            "W-AWHOESTNETNYSA",
+                            node.expression)
 
             case "JSXText":
                 pass
 
             case _:
-                logging.warning(
+                self.__warn_node(
                     f"Cache handling for JSX elements of type: {node.type} "
-                    "not yet supported. "
-                    "[W-CHFJEOTNTNYS]" +
-                    self.__debug_node_in_code(node))
+                    "not yet supported. ",
+                    "W-CHFJEOTNTNYS",
+                    node)
 
     def __process_ast_walk(
             self,
@@ -2996,11 +3064,11 @@ class AnalyzeJS:
                     return
 
                 case _:
-                    logging.warning(
+                    self.__warn_node(
                         "AST walk process cannot yet handle node of type: "
-                        f"{node.type}. "
-                        "[W-AWPCYHNOTNT]" +
-                        self.__debug_node_in_code(node))
+                        f"{node.type}. ",
+                        "W-AWPCYHNOTNT",
+                        node)
 
     # ~~~~~( Analysis - Post Process ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     def __validate_declaration_candidate(
@@ -3027,28 +3095,28 @@ class AnalyzeJS:
         :rtype: bool
         """
         # Declaration is a function
-        if declaration["info"]["node_type"] != "ArrowFunctionExpression" and \
-                declaration["info"]["node_type"] != "FunctionExpression":
+        if declaration["info"].node_type != "ArrowFunctionExpression" and \
+                declaration["info"].node_type != "FunctionExpression":
             return False
 
         # Explicit declaration in window can always be exported no matter
         # the scope
-        if declaration["info"]["kind"] == "window-explicit":
+        if declaration["info"].kind == "window-explicit":
             return True
 
         # First declaration
         if declaration_name not in first_declarations:
 
             # Only candidate if scope is global when first declared
-            if len(declaration["info"]["scope"]) > 1 or \
-                    declaration["info"]["scope"] != [("global", "window")]:
+            if len(declaration["info"].scope) > 1 or \
+                    declaration["info"].scope != (("global", "window"),):
                 return False
 
             # Not allowed to implicitly declare variable in 'window'
-            if declaration["info"]["kind"] == "window":
+            if declaration["info"].kind == "window":
                 new_lines = \
-                    self.code_target_file[
-                        :declaration["info"]['node'].range[0]].count("\n") + 1
+                    self.__get_line_number(
+                        declaration["info"].node_range[0])
                 logging.warning(
                     f"Variable name first used but never previously declared "
                     f"in file {self.js_target_file_import_path}, on line "
@@ -3062,30 +3130,33 @@ class AnalyzeJS:
         # Redeclaration
         else:
             # Same scope
-            if len(declaration["info"]["scope"]) == 1 and \
-                    declaration["info"]["scope"] == [("global", "window")]:
+            if len(declaration["info"].scope) == 1 and \
+                    declaration["info"].scope == (("global", "window"),):
 
                 # Not allowed to redeclare let or const
-                if declaration["info"]["kind"] == "const" or \
-                        declaration["info"]["kind"] == "let":
+                if declaration["info"].kind == "const" or \
+                        declaration["info"].kind == "let":
                     return False
 
+                first_declaration_kind = \
+                    first_declarations[declaration_name]["info"].kind
+
                 # Only allowed to redeclare if first declaration was not const
-                if first_declarations[declaration_name]["kind"] == "const":
+                if first_declaration_kind == "const":
                     return False
 
                 # Only allowed to redeclare if first declaration was let
                 # and redeclaration is in implicit window.
-                if first_declarations[declaration_name]["kind"] == "let" and \
-                        declaration["info"]["kind"] != "window":
+                if first_declaration_kind == "let" and \
+                        declaration["info"].kind != "window":
                     return True
 
             # Different scope
             else:
                 # Declaration with same name in different scope is not
                 # a redeclaration, it's a different variable.
-                if declaration["info"]["kind"] == "const" or \
-                        declaration["info"]["kind"] == "let":
+                if declaration["info"].kind == "const" or \
+                        declaration["info"].kind == "let":
                     return False
 
             return True
@@ -3100,14 +3171,14 @@ class AnalyzeJS:
             - It's declared as a function.
 
         :param object_prop: The object property to validate.
-        :type object_prop: dict
+        :type object_prop: DeclarationRecord
 
         :return: True it declaration is a possible candidate, False otherwise.
         :rtype: bool
         """
         # Declaration is a function
-        if object_prop["node_type"] != "ArrowFunctionExpression" and \
-                object_prop["node_type"] != "FunctionExpression":
+        if object_prop.node_type != "ArrowFunctionExpression" and \
+                object_prop.node_type != "FunctionExpression":
             return False
 
         # Only candidate if object is in exported variable
@@ -3117,7 +3188,7 @@ class AnalyzeJS:
 
     def __validate_function_candidate(
             self,
-            function: dict) -> bool:
+            function: FunctionRecord) -> bool:
         """Validate a function declaration candidate for it to be eligible
         as a definition for an exported asset.
 
@@ -3125,14 +3196,14 @@ class AnalyzeJS:
             - It's declared in the utmost scope (global)
 
         :param function: The function to validate.
-        :type function: dict
+        :type function: FunctionRecord
 
         :return: True it declaration is a possible candidate, False otherwise.
         :rtype: bool
         """
         # Only candidate if scope is global
-        if len(function["scope"]) > 1 or \
-                function["scope"] != [("global", "window")]:
+        if len(function.scope) > 1 or \
+                function.scope != (("global", "window"),):
             return False
 
         return True
@@ -3160,7 +3231,7 @@ class AnalyzeJS:
 
                 if re.match(r"window\." + re.escape(local_name) + "$",
                             decl_name):
-                    decl_alt["kind"] = "window-explicit"
+                    decl_alt.kind = "window-explicit"
                     decl_name = local_name
 
                 if decl_name == local_name:
@@ -3268,12 +3339,12 @@ class AnalyzeJS:
                     for index, decl in enumerate(non_valid_declarations):
                         string_decl += \
                             " >>> Line " + \
-                            str(self.code_target_file[
-                                :decl['node'].range[0]].count('\n') + 1) + \
+                            str(self.__get_line_number(
+                                decl.node_range[0])) + \
                             f" >>> Declaration #{str(index+1):0>3}: " + \
                             self.code_target_file[
-                                decl['node'].range[0]:
-                                decl['node'].range[1]] + \
+                                decl.node_range[0]:
+                                decl.node_range[1]] + \
                             "\n"
 
                     logging.warning(
@@ -3294,8 +3365,8 @@ class AnalyzeJS:
             local_name = imported_asset["local_name"]
 
             for method_call in self.cache_method_calls:
-                if local_name == method_call["property_chain"][0][1] or \
-                        local_name == method_call["name"]:
+                if local_name == method_call.property_chain[0][1] or \
+                        local_name == method_call.name:
                     test_surface_object = {
                         **imported_asset,
                         "method_call": method_call
@@ -3318,26 +3389,25 @@ class AnalyzeJS:
 
             if test_surface["asset_type"] == "class":
                 # functionId
-                if test_surface["declaration"]["static"]:
+                if test_surface["declaration"].static:
                     function_id = f"{test_surface['full_name']}"
                 else:
                     function_id = f"(new {test_surface['full_name']}())"
                 function_id = f"{function_id}." \
-                              f"{test_surface['declaration']['name']}"
+                              f"{test_surface['declaration'].name}"
 
                 # arguments
-                if test_surface["declaration"]["constructor"] is not None:
+                if test_surface["declaration"].constructor_params is not None:
                     arguments.append(
                         {test_surface['full_name']:
                             self.__convert_esprima_ast_to_object(
-                                test_surface["declaration"][
-                                    "constructor"].params)})
+                                test_surface[
+                                    "declaration"].constructor_params)})
 
                 arguments.append(
-                    {test_surface['declaration']['name']:
+                    {test_surface['declaration'].name:
                         self.__convert_esprima_ast_to_object(
-                            test_surface["declaration"][
-                                "node"].params)})
+                            test_surface["declaration"].params)})
 
             elif test_surface["asset_type"] == "function":
                 # functionId
@@ -3347,8 +3417,7 @@ class AnalyzeJS:
                 arguments.append(
                     {test_surface['full_name']:
                         self.__convert_esprima_ast_to_object(
-                            test_surface["declaration"][
-                                "node"].params)})
+                            test_surface["declaration"].params)})
 
             else:
                 logging.warning(
@@ -3357,7 +3426,7 @@ class AnalyzeJS:
                     "[W-UTCTSFAONYSTTA]")
 
             # functionHash
-            function_range = test_surface["declaration"]["node"].range
+            function_range = test_surface["declaration"].node_range
             function_source = \
                 self.code_target_file[function_range[0]:function_range[1]]
             function_hash = \
@@ -3368,8 +3437,8 @@ class AnalyzeJS:
                 "fileId": self.js_target_file_import_path,
                 "arguments": arguments,
                 "functionRange":
-                    (test_surface["declaration"]["node"].range[0],
-                     test_surface["declaration"]["node"].range[1]),
+                    (test_surface["declaration"].node_range[0],
+                     test_surface["declaration"].node_range[1]),
                 "functionHash": function_hash,
                 "exportInfo": test_surface["export"],
                 "exportName": test_surface["export_name"],
@@ -3389,12 +3458,12 @@ class AnalyzeJS:
         info_imported_dependencies = []
 
         for dependency in self.imported_dependencies:
-            call_range = dependency["method_call"]["node"].range
+            call_range = dependency["method_call"].node_range
 
             dependent = "!OUTSIDE_TEST_SURFACE"
 
             for test_surface in self.exported_test_surfaces:
-                surface_range = test_surface["declaration"]["node"].range
+                surface_range = test_surface["declaration"].node_range
                 if call_range[0] >= surface_range[0] and \
                         call_range[1] <= surface_range[1]:
                     dependent = test_surface["full_name"]
@@ -3407,7 +3476,7 @@ class AnalyzeJS:
                 "calledFileId": dependency["absolute_import_path"],
                 "calledFunctionId":
                     '.'.join([prop for (prop_type, prop) in
-                              dependency["method_call"]["property_chain"]])
+                              dependency["method_call"].property_chain])
             })
 
         return info_imported_dependencies
@@ -3427,6 +3496,9 @@ class AnalyzeJS:
         # Walk the AST and cache information
         self.__process_ast_walk()
 
+        # Everything needed from the AST is now cached, release it
+        self.ast_target_file = None
+
         # Find Testable Surfaces
         self.__process_find_exported_test_surfaces()
 
@@ -3436,6 +3508,9 @@ class AnalyzeJS:
         # Debug help
         # self.__debug_print_info()
 
+        # Summarize repeated warnings
+        self.__log_warning_summary()
+
         # Done
         self.ast_analyzed = True
 
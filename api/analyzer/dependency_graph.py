@@ -0,0 +1,267 @@
+import threading
+from array import array
+from collections import deque
+
+
+class DependencyGraph:
+    """Compact in memory dependency graph for all functions in a project.
+
+    Every function is interned to an integer node ID. Forward edges (from a
+    function to the functions it calls) and reverse edges (from a function to
+    the functions calling it) are stored in compressed sparse row form, as
+    one offsets array and one targets array per direction. A node is marked
+    as a test surface if it has a function info entry.
+
+    :param function_info: All function info entries (test surfaces) for the
+    project.
+    :type function_info: list
+    :param function_dependencies: All function dependency entries for the
+    project.
+    :type function_dependencies: list
+
+    :rtype: None
+    """
+    def __init__(
+            self,
+            function_info: list,
+            function_dependencies: list) -> None:
+        self.node_ids = {}
+        self.node_keys = []
+        self.file_nodes = {}
+        self.surface = bytearray()
+
+        for info in function_info:
+            node_id = self.__intern(info["fileId"], info["functionId"])
+            self.surface[node_id] = 1
+
+        edges = []
+        for dependency in function_dependencies:
+            edges.append((
+                self.__intern(
+                    dependency["fileId"], dependency["functionId"]),
+                self.__intern(
+                    dependency["calledFileId"],
+                    dependency["calledFunctionId"])))
+
+        self.forward_offsets, self.forward_targets = \
+            self.__make_adjacency(edges, False)
+        self.reverse_offsets, self.reverse_targets = \
+            self.__make_adjacency(edges, True)
+
+    def __intern(self, file_id: str, function_id: str) -> int:
+        """Get the node ID for a function, the function is added to the graph
+        if it's not already in it.
+
+        :param file_id: The function's file ID.
+        :type file_id: str
+        :param function_id: The function ID.
+        :type function_id: str
+
+        :return: The node ID.
+        :rtype: int
+        """
+        node_key = (file_id, function_id)
+        node_id = self.node_ids.get(node_key)
+
+        if node_id is None:
+            node_id = len(self.node_keys)
+            self.node_ids[node_key] = node_id
+            self.node_keys.append(node_key)
+            self.surface.append(0)
+            self.file_nodes.setdefault(file_id, []).append(node_id)
+
+        return node_id
+
+    def __make_adjacency(self, edges: list, reverse: bool) -> tuple:
+        """Make compressed sparse row adjacency arrays for the edges.
+
+        :param edges: The edges as (from node ID, to node ID) tuples.
+        :type edges: list
+        :param reverse: If True, the adjacency is made for reversed edges.
+        :type reverse: bool
+
+        :return: The offsets array and the targets array.
+        :rtype: tuple
+        """
+        source_index, target_index = (1, 0) if reverse else (0, 1)
+        node_count = len(self.node_keys)
+
+        offsets = array('L', [0]) * (node_count + 1)
+        for edge in edges:
+            offsets[edge[source_index] + 1] += 1
+        for node_id in range(node_count):
+            offsets[node_id + 1] += offsets[node_id]
+
+        targets = array('L', [0]) * len(edges)
+        positions = offsets[:-1]
+        for edge in edges:
+            position = positions[edge[source_index]]
+            targets[position] = edge[target_index]
+            positions[edge[source_index]] = position + 1
+
+        return offsets, targets
+
+    def __get_node_id(self, file_id: str, function_id: str) -> int | None:
+        return self.node_ids.get((file_id, function_id))
+
+    def get_dependencies_count(self, file_id: str, function_id: str) -> int:
+        """Get the number of dependencies the function has, that is the
+        number of calls from the function to other test surfaces.
+
+        :param file_id: The function's file ID.
+        :type file_id: str
+        :param function_id: The function ID.
+        :type function_id: str
+
+        :return: The number of dependencies.
+        :rtype: int
+        """
+        node_id = self.__get_node_id(file_id, function_id)
+        if node_id is None:
+            return 0
+
+        return \
+            self.forward_offsets[node_id + 1] - self.forward_offsets[node_id]
+
+    def get_dependents_count(self, file_id: str, function_id: str) -> int:
+        """Get the number of dependents the function has, that is the number
+        of calls to the function.
+
+        :param file_id: The function's file ID.
+        :type file_id: str
+        :param function_id: The function ID.
+        :type function_id: str
+
+        :return: The number of dependents.
+        :rtype: int
+        """
+        node_id = self.__get_node_id(file_id, function_id)
+        if node_id is None:
+            return 0
+
+        return \
+            self.reverse_offsets[node_id + 1] - self.reverse_offsets[node_id]
+
+    def get_transitive_dependents(self, sources: list) -> dict:
+        """Get all functions transitively depending on any of the source
+        functions, found with a breadth first traversal of the reverse edges.
+
+        :param sources: The source functions as (file ID, function ID)
+        tuples. Functions not in the graph are ignored.
+        :type sources: list
+
+        :return: The dependent functions as (file ID, function ID) tuples
+        mapped to a tuple of their (shortest) distance from a source function
+        and the source function causing the dependency. Source functions are
+        included with distance 0 and themselves as cause.
+        :rtype: dict
+        """
+        distances = {}
+        causes = {}
+        queue = deque()
+
+        for source in sources:
+            node_id = self.__get_node_id(*source)
+            if node_id is not None and node_id not in distances:
+                distances[node_id] = 0
+                causes[node_id] = node_id
+                queue.append(node_id)
+
+        reverse_offsets = self.reverse_offsets
+        reverse_targets = self.reverse_targets
+        while queue:
+            node_id = queue.popleft()
+            distance = distances[node_id] + 1
+            for position in range(
+                    reverse_offsets[node_id], reverse_offsets[node_id + 1]):
+                dependent_id = reverse_targets[position]
+                if dependent_id not in distances:
+                    distances[dependent_id] = distance
+                    causes[dependent_id] = causes[node_id]
+                    queue.append(dependent_id)
+
+        return {
+            self.node_keys[node_id]:
+                (distance, self.node_keys[causes[node_id]])
+            for node_id, distance in distances.items()}
+
+    def get_affected_test_surfaces(self, file_id: str) -> list:
+        """Get all test surfaces that are transitively affected by changes to
+        the file, including the test surfaces in the file itself.
+
+        :param file_id: The file ID.
+        :type file_id: str
+
+        :return: The affected test surfaces as dictionaries with file ID,
+        function ID and distance from the file, sorted by distance.
+        :rtype: list
+        """
+        sources = [
+            self.node_keys[node_id]
+            for node_id in self.file_nodes.get(file_id, [])
+            if self.surface[node_id]]
+
+        affected = [
+            {
+                "fileId": node_key[0],
+                "functionId": node_key[1],
+                "distance": distance
+            }
+            for node_key, (distance, cause) in
+            self.get_transitive_dependents(sources).items()
+            if self.surface[self.node_ids[node_key]]]
+
+        affected.sort(key=lambda surface: surface["distance"])
+
+        return affected
+
+
+class DependencyGraphRegistry:
+    """Thread safe registry keeping the most recently built dependency graph
+    for every project.
+
+    :rtype: None
+    """
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__graphs = {}
+
+    def get(self, path_to_project: str) -> DependencyGraph | None:
+        """Get the dependency graph for a project.
+
+        :param path_to_project: The absolute path to the project.
+        :type path_to_project: str
+
+        :return: The dependency graph, None if there is no graph for the
+        project.
+        :rtype: DependencyGraph|None
+        """
+        with self.__lock:
+            return self.__graphs.get(path_to_project)
+
+    def set(self, path_to_project: str, graph: DependencyGraph) -> None:
+        """Set the dependency graph for a project.
+
+        :param path_to_project: The absolute path to the project.
+        :type path_to_project: str
+        :param graph: The dependency graph.
+        :type graph: DependencyGraph
+
+        :return: None
+        """
+        if not isinstance(graph, DependencyGraph):
+            raise TypeError("'graph' must be a DependencyGraph")
+
+        with self.__lock:
+            self.__graphs[path_to_project] = graph
+
+    def remove(self, path_to_project: str) -> None:
+        """Remove the dependency graph for a project.
+
+        :param path_to_project: The absolute path to the project.
+        :type path_to_project: str
+
+        :return: None
+        """
+        with self.__lock:
+            self.__graphs.pop(path_to_project, None)
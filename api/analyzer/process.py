@@ -2,11 +2,17 @@ import hashlib
 import os
 from api.analyzer.client_actions import CACode
 from api.analyzer.config import AnalyzerConfig
+from api.analyzer.dependency_graph import DependencyGraph
 from api.instances.analyzer_client_action import client_action
+from api.instances.config_urang import config_urang
 from api.instances.logging_standard import logging
 from api.analyzer.analyzer import AnalyzeJS
-from api.cache import clear_cache, read_file, save_file, debug_get_cache_info
+from api.analyzer.resolver import ImportPathResolver
+from api.cache import clear_cache, read_file, save_file, \
+    debug_get_cache_info, invalidate_global_session, lock_project_cache
 from api.instances.database_main import database_handler
+from api.instances.dependency_graphs import dependency_graph_registry
+from api.instances.project_data_cache_main import project_data_cache
 from api.instances.shared_websockets_main import shared_websockets_handler
 from api.util.paths_helper import full_path_to_correct_sub_directory
 from api.websocket import WsIdentity, WsCode, WsClientCode
@@ -39,11 +45,13 @@ class ProjectDataHandler:
         self.added_function_info = []
         self.existing_function_info = []
         self.dead_function_info = []
+        self.changed_functions = []
 
         # Setup Process
         self.__validate_constructor_arguments()
         self.__clean_env_path_variables()
         self.__project_backup()
+        self.__database_write_buffer_begin()
 
     # ~~~~~( Initiation ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     def __validate_constructor_arguments(self) -> None:
@@ -90,6 +98,81 @@ class ProjectDataHandler:
 
         return change_list
 
+    def __merge_change_lists(
+            self,
+            previous_change_list: list,
+            change_list: list) -> list:
+        """Merge a list of new changes into a list of previous changes.
+        Changed property names are only kept once and propagated dependency
+        changes are only kept once per cause, where the newest change replaces
+        the previous one.
+
+        :param previous_change_list: The list of previous changes.
+        :type previous_change_list: list
+        :param change_list: The list of new changes.
+        :type change_list: list
+
+        :return: The merged list of changes.
+        :rtype: list
+        """
+        merged_changes = {}
+        for change in previous_change_list + change_list:
+            if isinstance(change, dict):
+                change_key = \
+                    (change["attribute"],
+                     change["cause"]["fileId"],
+                     change["cause"]["functionId"])
+            else:
+                change_key = change
+
+            merged_changes.pop(change_key, None)
+            merged_changes[change_key] = change
+
+        return list(merged_changes.values())
+
+    def __make_dependency_change(
+            self,
+            cause: tuple,
+            distance: int) -> dict:
+        """Make a change list entry for a function that has (possibly)
+        changed behaviour because a function it transitively depends upon
+        has changed.
+
+        :param cause: The changed function as a (file ID, function ID) tuple.
+        :type cause: tuple
+        :param distance: The number of calls between the function and the
+        changed function.
+        :type distance: int
+
+        :return: The change list entry.
+        :rtype: dict
+        """
+        return {
+            "attribute": "dependency",
+            "cause": {
+                "fileId": cause[0],
+                "functionId": cause[1]
+            },
+            "distance": distance
+        }
+
+    def __database_write_buffer_begin(self) -> None:
+        """Buffer the database writes made during the analysis, if enabled
+        in the configuration. The buffered writes are flushed when the
+        analysis is committed, and discarded if it is cancelled.
+
+        :return: None
+        """
+        write_buffer_config = \
+            (config_urang.get('database') or {}).get('write_buffer') or {}
+
+        if not write_buffer_config.get('enabled', False):
+            return
+
+        database_handler.begin_write_buffer(
+            max_operations=write_buffer_config.get('max_operations', 1000),
+            max_delay=write_buffer_config.get('max_delay', 1.0))
+
     # ~~~~~( Backup Management ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     def __project_backup_remove(self) -> None:
         """Remove backup of the current project from the database.
@@ -133,10 +216,9 @@ class ProjectDataHandler:
                     self.existing_function_info. \
                         append(existing_function_info_id)
 
-                database_handler.add_function_info({
-                    **function_info,
-                    **backup_info
-                })
+            database_handler.add_function_info_many([
+                {**function_info, **backup_info}
+                for function_info in orig_function_info])
 
         if orig_function_dependency is not None:
             for function_dependency in orig_function_dependency:
@@ -145,20 +227,18 @@ class ProjectDataHandler:
                     self.existing_function_dependencies. \
                         append(existing_dependency_id)
 
-                database_handler.add_function_dependency({
-                    **function_dependency,
-                    **backup_info
-                })
+            database_handler.add_function_dependency_many([
+                {**function_dependency, **backup_info}
+                for function_dependency in orig_function_dependency])
 
         if orig_test_info is not None:
             for test_info in orig_test_info:
                 if '_id' in test_info:
                     test_info.pop("_id")
 
-                database_handler.add_test_info({
-                    **test_info,
-                    **backup_info
-                })
+            database_handler.add_test_info_many([
+                {**test_info, **backup_info}
+                for test_info in orig_test_info])
 
     def __project_restore(self) -> None:
         """Restore project from the created backup.
@@ -193,60 +273,65 @@ class ProjectDataHandler:
                 for function_info in backup_function_info:
                     if '_id' in function_info:
                         function_info.pop("_id")
-                    database_handler.add_function_info(
-                        {**function_info, **original_info})
+                database_handler.add_function_info_many([
+                    {**function_info, **original_info}
+                    for function_info in backup_function_info])
 
             if backup_function_dependency is not None:
                 database_handler.remove_function_dependency(original_info)
                 for function_dependency in backup_function_dependency:
                     if '_id' in function_dependency:
                         function_dependency.pop("_id")
-                    database_handler.add_function_dependency(
-                        {**function_dependency, **original_info})
+                database_handler.add_function_dependency_many([
+                    {**function_dependency, **original_info}
+                    for function_dependency in backup_function_dependency])
 
             if backup_test_info is not None:
                 database_handler.remove_test_info(original_info)
                 for test_info in backup_test_info:
                     if '_id' in test_info:
                         test_info.pop("_id")
-                    database_handler.add_test_info(
-                        {**test_info, **original_info})
+                database_handler.add_test_info_many([
+                    {**test_info, **original_info}
+                    for test_info in backup_test_info])
 
+        dependency_graph_registry.remove(self.path_project_root)
         self.__project_backup_remove()
 
-    def __backup_get_project_function_info(
-            self,
-            file_id: str,
-            function_id: str) -> dict:
-        """Get specified project test surface function info from the database
+    def __backup_get_project_function_info_all(self) -> dict:
+        """Get all project test surfaces function info from the database
         backup.
 
-        :param file_id: The function's file ID.
-        :type file_id: str
-        :param function_id: The project function ID.
-        :type function_id: str
-
-        :return: The specified test surface's function info.
+        :return: All test surfaces function info in the backup, mapped by
+        their file ID and function ID.
         :rtype: dict
         """
         path_project_root_backup = "/BACKUP" + self.path_project_root
-        function_info = None
         db_function_info = \
             database_handler.get_function_info({
-                "pathToProject": path_project_root_backup,
-                "fileId": file_id,
-                "functionId": function_id
-            })
+                "pathToProject": path_project_root_backup
+            }, projection=['fileId', 'functionId', 'dependencies',
+                           'dependents'])
 
+        function_info = {}
         if db_function_info is not None:
-            function_info = db_function_info[0]
+            for backup_function_info in db_function_info:
+                function_info.setdefault(
+                    (backup_function_info["fileId"],
+                     backup_function_info["functionId"]),
+                    backup_function_info)
 
         return function_info
 
     # ~~~~~( Database Management ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    def __db_get_project_function_dependencies(self) -> list:
+    def __db_get_project_function_dependencies(
+            self,
+            projection: list = None) -> list:
         """Get all project function dependencies from the database.
 
+        :param projection: The attributes to get, all if None.
+        :type projection: list|None
+
         :return: All function dependencies.
         :rtype: list
         """
@@ -254,17 +339,22 @@ class ProjectDataHandler:
         db_function_dependencies = \
             database_handler.get_function_dependency({
                 "pathToProject": self.path_project_root
-            })
+            }, projection=projection)
 
         if db_function_dependencies is not None:
             function_dependencies = db_function_dependencies
 
         return function_dependencies
 
-    def __db_get_project_function_info(self) -> list:
+    def __db_get_project_function_info(
+            self,
+            projection: list = None) -> list:
         """Get all project test surfaces and their function info from the
         database.
 
+        :param projection: The attributes to get, all if None.
+        :type projection: list|None
+
         :return: All test surfaces function info.
         :rtype: list
         """
@@ -272,7 +362,7 @@ class ProjectDataHandler:
         db_function_info = \
             database_handler.get_function_info({
                 "pathToProject": self.path_project_root
-            })
+            }, projection=projection)
 
         if db_function_info is not None:
             function_info = db_function_info
@@ -290,7 +380,7 @@ class ProjectDataHandler:
         """
         saved_dependencies = \
             [dependency["_id"] for dependency in
-             self.__db_get_project_function_dependencies()]
+             self.__db_get_project_function_dependencies(['_id'])]
         found_dependencies = \
             self.added_function_dependencies + \
             self.existing_function_dependencies
@@ -310,7 +400,7 @@ class ProjectDataHandler:
         """
         saved_functions = \
             [dependency["_id"] for dependency in
-             self.__db_get_project_function_info()]
+             self.__db_get_project_function_info(['_id'])]
         found_functions = \
             self.added_function_info + \
             self.existing_function_info
@@ -329,10 +419,10 @@ class ProjectDataHandler:
             self.__db_get_dead_project_function_dependencies_id()
 
         if len(dead_dependencies) > 0:
-            for dead_dependency in dead_dependencies:
-                database_handler.remove_function_dependency({
-                    '_id': dead_dependency
-                })
+            database_handler.remove_function_dependency({
+                '_id': {'$in': dead_dependencies},
+                'pathToProject': self.path_project_root
+            })
 
             logging.info(
                 f"Removed {len(dead_dependencies)} dead dependencies from "
@@ -348,10 +438,10 @@ class ProjectDataHandler:
             self.__db_get_dead_project_function_info_id()
 
         if len(dead_functions) > 0:
-            for dead_function in dead_functions:
-                database_handler.remove_function_info({
-                    '_id': dead_function
-                })
+            database_handler.remove_function_info({
+                '_id': {'$in': dead_functions},
+                'pathToProject': self.path_project_root
+            })
 
             logging.info(
                 f"Removed {len(dead_functions)} dead test surfaces from "
@@ -482,14 +572,42 @@ class ProjectDataHandler:
                     logging.info(
                         f"Detected changes were: {', '.join(change_list)}")
 
+                    if "functionHash" in change_list:
+                        self.changed_functions.append(
+                            (self.analyzer_instance.get_file_identity(),
+                             test_surface['functionId']))
+
                     database_handler.set_function_info(
                         {
                             **new_function_info,
+                            "previousFunctionRange":
+                                existing_function_info["functionRange"],
                             "haveFunctionChanged": True,
                             "changeList":
-                                list(set(previous_change_list + change_list))
+                                self.__merge_change_lists(
+                                    previous_change_list, change_list)
+                        },
+                        {
+                            '_id': existing_function_info["_id"],
+                            'pathToProject': self.path_project_root
+                        }
+                    )
+
+                elif existing_function_info.get(
+                        "previousFunctionRange",
+                        existing_function_info["functionRange"]) != \
+                        existing_function_info["functionRange"]:
+                    # The function is where it was in the previous version
+                    # of the file, which is now the old cached version.
+                    database_handler.set_function_info(
+                        {
+                            "previousFunctionRange":
+                                existing_function_info["functionRange"]
                         },
-                        {'_id': existing_function_info["_id"]}
+                        {
+                            '_id': existing_function_info["_id"],
+                            'pathToProject': self.path_project_root
+                        }
                     )
 
             else:
@@ -535,6 +653,12 @@ class ProjectDataHandler:
         :return: None
         """
         project_dependencies = self.__db_get_project_function_dependencies()
+        project_functions = {
+            (function_info['fileId'], function_info['functionId'])
+            for function_info in self.__db_get_project_function_info(
+                ['fileId', 'functionId'])}
+
+        external_dependencies = []
         for index, project_dependency in enumerate(project_dependencies):
             shared_websockets_handler.send_progress(
                 WsIdentity.NEW_PROJECT,
@@ -549,27 +673,46 @@ class ProjectDataHandler:
             )
 
             dependency_defined_in_project = \
-                database_handler.get_function_info({
-                    'pathToProject': self.path_project_root,
-                    'fileId': project_dependency['calledFileId'],
-                    'functionId': project_dependency['calledFunctionId']
-                })
+                (project_dependency['calledFileId'],
+                 project_dependency['calledFunctionId']) in project_functions
 
-            if dependency_defined_in_project is None:
-                database_handler.remove_function_dependency({
-                    '_id': project_dependency["_id"]
-                })
+            if not dependency_defined_in_project:
+                external_dependencies.append(project_dependency["_id"])
+
+        if len(external_dependencies) > 0:
+            database_handler.remove_function_dependency({
+                '_id': {'$in': external_dependencies},
+                'pathToProject': self.path_project_root
+            })
 
     def __db_save_project_function_dependencies_count(self) -> None:
         """For all saved test surfaces, count the number of dependents that
         rely on the current function, and count the number of test functions
-        the current function depends upon. Once done, save this information
-        to the test surface's function info entry in the database.
+        the current function depends upon. Test surfaces transitively
+        depending on a function whose source has changed are also marked as
+        changed, with the changed function and the distance to it in the
+        change list. Once done, save this information to the test surfaces'
+        function info entries in the database in one bulk update.
 
         :return:
         """
-        project_functions = self.__db_get_project_function_info()
-
+        project_functions = self.__db_get_project_function_info(
+            ['_id', 'fileId', 'functionId', 'changeList'])
+        project_dependencies = self.__db_get_project_function_dependencies(
+            ['fileId', 'functionId', 'calledFileId', 'calledFunctionId'])
+        project_functions_backup = \
+            self.__backup_get_project_function_info_all()
+
+        dependency_graph = \
+            DependencyGraph(project_functions, project_dependencies)
+        dependency_graph_registry.set(
+            self.path_project_root, dependency_graph)
+
+        changed_dependents = \
+            dependency_graph.get_transitive_dependents(
+                self.changed_functions)
+
+        function_info_updates = []
         for index, project_function in enumerate(project_functions):
 
             shared_websockets_handler.send_progress(
@@ -582,64 +725,65 @@ class ProjectDataHandler:
                 f"{project_function['functionId']}"
             )
 
-            function_depends_on = \
-                database_handler.get_function_dependency({
-                    'pathToProject': self.path_project_root,
-                    'fileId': project_function['fileId'],
-                    'functionId': project_function['functionId']
-                })
-
-            depends_on_function = \
-                database_handler.get_function_dependency({
-                    'pathToProject': self.path_project_root,
-                    'calledFileId': project_function['fileId'],
-                    'calledFunctionId': project_function['functionId']
-                })
-
-            function_depends_on_count = 0
-            depends_on_function_count = 0
-
-            if function_depends_on is not None:
-                function_depends_on_count = len(function_depends_on)
-
-            if depends_on_function is not None:
-                depends_on_function_count = len(depends_on_function)
+            project_function_key = \
+                (project_function['fileId'], project_function['functionId'])
 
             new_function_info = {
-                'dependencies': function_depends_on_count,
-                'dependents': depends_on_function_count
+                'dependencies':
+                    dependency_graph.get_dependencies_count(
+                        *project_function_key),
+                'dependents':
+                    dependency_graph.get_dependents_count(
+                        *project_function_key)
             }
 
             project_function_backup = \
-                self.__backup_get_project_function_info(
-                    project_function['fileId'], project_function['functionId'])
+                project_functions_backup.get(project_function_key)
 
+            change_list = []
             if project_function_backup is not None:
                 change_list = \
                     self.__compare_dict_prop_values(
                         project_function_backup, new_function_info)
 
-                previous_change_list = project_function['changeList']
-
                 if len(change_list) > 0:
                     logging.info(
                         f"Detected changes were: {', '.join(change_list)}")
 
-                    database_handler.set_function_info(
-                        {
-                            **new_function_info,
-                            "haveFunctionChanged": True,
-                            "changeList":
-                                list(set(previous_change_list + change_list))
-                        },
-                        {'_id': project_function["_id"]}
-                    )
-
-            else:
-                database_handler.set_function_info(
+            if project_function_key in changed_dependents:
+                distance, cause = changed_dependents[project_function_key]
+                if distance > 0:
+                    logging.info(
+                        f"Detected change in dependency {cause[0]}:"
+                        f"{cause[1]} at distance {distance}")
+                    change_list.append(
+                        self.__make_dependency_change(cause, distance))
+
+            if len(change_list) > 0:
+                function_info_updates.append((
+                    {
+                        **new_function_info,
+                        "haveFunctionChanged": True,
+                        "changeList":
+                            self.__merge_change_lists(
+                                project_function['changeList'], change_list)
+                    },
+                    {
+                        '_id': project_function["_id"],
+                        'pathToProject': self.path_project_root
+                    }
+                ))
+
+            elif project_function_backup is None:
+                function_info_updates.append((
                     new_function_info,
-                    {'_id': project_function["_id"]}
-                )
+                    {
+                        '_id': project_function["_id"],
+                        'pathToProject': self.path_project_root
+                    }
+                ))
+
+        database_handler.set_function_info_many(function_info_updates)
 
     # ~~~~~( Public Interface ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # ~~~~~( Public Interface - Analyzer Management ) ~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -736,17 +880,21 @@ class ProjectDataHandler:
         :return: None
         """
         self.__db_cleanup_project_function_dependencies()
-        self.__db_save_project_function_dependencies_count()
         self.__db_delete_dead_project_function_dependencies()
         self.__db_delete_dead_project_function_info()
+        self.__db_save_project_function_dependencies_count()
 
     # ~~~~~( Public Interface - Cleanup ) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     def process_cleanup(self) -> None:
-        """Cleanup process after a successful project analysis.
+        """Cleanup process after a successful project analysis, when the
+        analysis is committed.
 
         :return: None
         """
+        database_handler.end_write_buffer()
         self.__project_backup_remove()
+        project_data_cache.invalidate(self.path_project_root)
+        invalidate_global_session()
 
     def restore_backup(self) -> None:
         """Restore analysis backup if current project analysis process have to
@@ -754,7 +902,10 @@ class ProjectDataHandler:
 
         :return: None
         """
+        database_handler.discard_write_buffer()
         self.__project_restore()
+        project_data_cache.invalidate(self.path_project_root)
+        invalidate_global_session()
 
 
 def action_cancel_analysis_process(project_data: ProjectDataHandler):
@@ -775,27 +926,18 @@ def point_client_action_cancel(project_data: ProjectDataHandler):
         return False
 
 
-def analyze_files(project_root):
-    """Analyze all eligible files in the provided project root.
+def __analyze_files(project_root):
+    """Analyze all eligible files in the provided project root, see
+    analyze_files.
 
     :param project_root: The project root directory
     :type project_root: str
 
-    :raises:
-        TypeError: If the passed 'project_root' is of the wrong type.
-        ValueError: If the passed 'project_root' is empty.
-
     :return: Nothing
     """
-    if not isinstance(project_root, str):
-        raise ValueError(
-            "'project_root' must be a STRING")
-    elif len(project_root) < 1:
-        raise ValueError(
-            "'project_root' must be a path")
-
     analyzer_config = AnalyzerConfig()
     project_data = ProjectDataHandler(project_root)
+    import_resolver = ImportPathResolver(project_root)
 
     def callback_client_messages(message: dict):
         if 'userAction' in message and message['userAction'] == \
@@ -832,7 +974,7 @@ def analyze_files(project_root):
             continue
 
         try:
-            analyzer = AnalyzeJS(current_file, project_root)
+            analyzer = AnalyzeJS(current_file, project_root, import_resolver)
 
         except SyntaxError as e:
             logging.warning(
@@ -908,6 +1050,39 @@ def analyze_files(project_root):
     )
 
 
+def analyze_files(project_root):
+    """Analyze all eligible files in the provided project root. The cache of
+    the project is locked during the analysis, so that the cache maintenance
+    leaves it alone. Once done, a summary of the database queries made by
+    the analysis is logged.
+
+    :param project_root: The project root directory
+    :type project_root: str
+
+    :raises:
+        TypeError: If the passed 'project_root' is of the wrong type.
+        ValueError: If the passed 'project_root' is empty.
+
+    :return: Nothing
+    """
+    if not isinstance(project_root, str):
+        raise ValueError(
+            "'project_root' must be a STRING")
+    elif len(project_root) < 1:
+        raise ValueError(
+            "'project_root' must be a path")
+
+    database_handler.begin_query_summary()
+    try:
+        with lock_project_cache(project_root):
+            __analyze_files(project_root)
+    finally:
+        query_summary = database_handler.end_query_summary()
+        logging.info(
+            f"Database queries made by the analysis of {project_root}: "
+            f"{query_summary.format_summary()}")
+
+
 # Debugging Help
 def __debug_info_print_project_info(
         project_root: str = "",
@@ -0,0 +1,139 @@
+import esprima
+
+
+class CacheRecord:
+    """Compact record of a node found during the AST walk. Only the parts of
+    the node needed by the post processing steps are kept, so that the AST
+    itself can be released as soon as the walk is complete.
+
+    :param scope: The scope the node was found in.
+    :type scope: list
+    :param path: The path taken in the AST to reach the node.
+    :type path: list
+    :param node: The AST node to record.
+    :type node: esprima.nodes.Node|None
+    :param node_type: The node type, defaults to the type of the node.
+    :type node_type: str|None
+
+    :rtype: None
+    """
+    __slots__ = ("scope", "path", "node_type", "node_range", "params")
+
+    def __init__(
+            self,
+            scope: list,
+            path: list,
+            node: esprima.nodes.Node = None,
+            node_type: str = None) -> None:
+        self.scope = tuple(scope)
+        self.path = tuple(path)
+
+        if node is None:
+            self.node_type = node_type
+            self.node_range = None
+            self.params = None
+        else:
+            self.node_type = node.type if node_type is None else node_type
+            self.node_range = \
+                (node.range[0], node.range[1]) \
+                if getattr(node, 'range', None) is not None else None
+            self.params = getattr(node, 'params', None)
+
+
+class DeclarationRecord(CacheRecord):
+    """Record of a variable (or object property) declaration.
+
+    :param scope: The scope the declaration was found in.
+    :type scope: list
+    :param path: The path taken in the AST to reach the declaration.
+    :type path: list
+    :param node: The AST node of the declared value.
+    :type node: esprima.nodes.Node|None
+    :param kind: The kind of declaration, for example 'const' or 'window'.
+    :type kind: str|None
+
+    :rtype: None
+    """
+    __slots__ = ("kind",)
+
+    def __init__(
+            self,
+            scope: list,
+            path: list,
+            node: esprima.nodes.Node = None,
+            kind: str = None) -> None:
+        super().__init__(scope, path, node)
+        self.kind = kind
+
+
+class FunctionRecord(CacheRecord):
+    """Record of a function declaration.
+
+    :rtype: None
+    """
+    __slots__ = ()
+
+
+class ClassMethodRecord(CacheRecord):
+    """Record of a method declared in a class.
+
+    :param scope: The scope the method was found in.
+    :type scope: list
+    :param path: The path taken in the AST to reach the method.
+    :type path: list
+    :param node: The AST node of the method's function.
+    :type node: esprima.nodes.Node
+    :param name: The name of the method.
+    :type name: str
+    :param static: True if the method is static, False otherwise.
+    :type static: bool
+    :param constructor: The AST node of the class constructor's function.
+    :type constructor: esprima.nodes.Node|None
+
+    :rtype: None
+    """
+    __slots__ = ("name", "static", "constructor_params")
+
+    def __init__(
+            self,
+            scope: list,
+            path: list,
+            node: esprima.nodes.Node,
+            name: str,
+            static: bool,
+            constructor: esprima.nodes.Node = None) -> None:
+        super().__init__(scope, path, node)
+        self.name = name
+        self.static = static
+        self.constructor_params = \
+            None if constructor is None else constructor.params
+
+
+class MethodCallRecord(CacheRecord):
+    """Record of a method call.
+
+    :param scope: The scope the method call was found in.
+    :type scope: list
+    :param path: The path taken in the AST to reach the method call.
+    :type path: list
+    :param node: The AST node of the method call.
+    :type node: esprima.nodes.Node
+    :param name: The name of the called method.
+    :type name: str
+    :param property_chain: The chain of properties leading to the call.
+    :type property_chain: list
+
+    :rtype: None
+    """
+    __slots__ = ("name", "property_chain")
+
+    def __init__(
+            self,
+            scope: list,
+            path: list,
+            node: esprima.nodes.Node,
+            name: str,
+            property_chain: list) -> None:
+        super().__init__(scope, path, node)
+        self.name = name
+        self.property_chain = tuple(property_chain)
@@ -0,0 +1,155 @@
+import os
+import re
+
+
+class ImportPathResolver:
+    """Project scoped resolver for import paths found in JavaScript import
+    statements. Resolved import paths are memoized by importing directory and
+    import path, and directory listings are cached, so that every distinct
+    import is only resolved once for the whole project analysis.
+
+    Relative import paths are resolved like a module bundler would, by
+    probing for the exact file, the file with a known extension and an index
+    file in the directory. If nothing can be found on disk the path is
+    resolved lexically. Any other (bare) import path is returned unchanged.
+
+    :param path_project_root: The absolute path to the root directory for
+    the whole project.
+    :type path_project_root: str
+    :param extensions: The file extensions to probe for, in order.
+    :type extensions: tuple
+
+    :rtype: None
+    """
+    STANDARD_EXTENSIONS = (".js", ".jsx")
+
+    def __init__(
+            self,
+            path_project_root: str,
+            extensions: tuple = STANDARD_EXTENSIONS) -> None:
+        if not isinstance(path_project_root, str):
+            raise TypeError("'path_project_root' must be a STRING")
+        elif len(path_project_root) < 1:
+            raise ValueError("'path_project_root' cannot be empty")
+
+        self.path_project_root = os.path.abspath(path_project_root)
+        self.extensions = tuple(extensions)
+
+        self.__resolved_paths = {}
+        self.__directory_listings = {}
+        self.__re_file_extension = re.compile(
+            "(" + "|".join(re.escape(ext) for ext in self.extensions) + ")$")
+
+    def __list_directory(self, directory: str) -> dict:
+        """Get the (cached) listing of a directory.
+
+        :param directory: The absolute path to the directory.
+        :type directory: str
+
+        :return: Entry names in the directory mapped to True if the entry is
+        a directory, False otherwise. Empty if the directory does not exist.
+        :rtype: dict
+        """
+        listing = self.__directory_listings.get(directory)
+        if listing is None:
+            listing = {}
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        listing[entry.name] = entry.is_dir()
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                pass
+
+            self.__directory_listings[directory] = listing
+
+        return listing
+
+    def __is_file(self, path: str) -> bool:
+        listing = self.__list_directory(os.path.dirname(path))
+        return listing.get(os.path.basename(path)) is False
+
+    def __is_directory(self, path: str) -> bool:
+        listing = self.__list_directory(os.path.dirname(path))
+        return listing.get(os.path.basename(path)) is True
+
+    def __make_file_identity(self, path: str) -> str:
+        """Make a file identity (without file extension and starting from the
+        project root directory) for an absolute path.
+
+        :param path: The absolute path to make a file identity for.
+        :type path: str
+
+        :return: The file identity.
+        :rtype: str
+        """
+        path = self.__re_file_extension.sub("", path)
+
+        if path.startswith(self.path_project_root + "/"):
+            path = path[len(self.path_project_root) + 1:]
+
+        return path
+
+    def __resolve_relative(self, combined_path: str) -> str:
+        """Resolve an absolute (but not yet probed) import path.
+
+        :param combined_path: The absolute import path.
+        :type combined_path: str
+
+        :return: The file identity for the import path.
+        :rtype: str
+        """
+        # Exact file with a known extension
+        if self.__re_file_extension.search(combined_path) and \
+                self.__is_file(combined_path):
+            return self.__make_file_identity(combined_path)
+
+        # File with a known extension
+        for extension in self.extensions:
+            if self.__is_file(combined_path + extension):
+                return self.__make_file_identity(combined_path)
+
+        # Directory with an index file
+        if self.__is_directory(combined_path):
+            for extension in self.extensions:
+                index_file = os.path.join(combined_path, "index" + extension)
+                if self.__is_file(index_file):
+                    return self.__make_file_identity(index_file)
+
+        # Nothing found on disk
+        return self.__make_file_identity(combined_path)
+
+    def resolve(self, importing_directory: str, import_path: str) -> str:
+        """Resolve an import path found in a file in the importing directory
+        to a file identity starting from the project root directory.
+
+        :param importing_directory: The absolute path to the directory of
+        the importing file.
+        :type importing_directory: str
+        :param import_path: The import path to resolve.
+        :type import_path: str
+
+        :return: The file identity for the import path.
+        :rtype: str
+        """
+        resolved_key = (importing_directory, import_path)
+        resolved_path = self.__resolved_paths.get(resolved_key)
+        if resolved_path is not None:
+            return resolved_path
+
+        if re.match(r"[.]{1,2}/", import_path):
+            resolved_path = self.__resolve_relative(
+                os.path.abspath(importing_directory + "/" + import_path))
+        else:
+            resolved_path = import_path
+
+        self.__resolved_paths[resolved_key] = resolved_path
+
+        return resolved_path
+
+    def clear(self) -> None:
+        """Clear all memoized import paths and directory listings.
+
+        :return: None
+        """
+        self.__resolved_paths.clear()
+        self.__directory_listings.clear()
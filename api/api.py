@@ -1,15 +1,28 @@
+import bisect
 import logging
 import os
 import re
 from enum import Enum
 
+from bson.errors import InvalidId
+
 from api.analyzer.process import analyze_files
 from threading import Thread
 from api.cache import read_file as cache_read_file, \
     read_file_old as cache_read_file_old, save_global_session, \
-    read_global_session
+    count_file_versions as cache_count_file_versions, \
+    get_file_hash as cache_get_file_hash, \
+    read_file_range as cache_read_file_range, FileRangeUnit, \
+    read_or_load_global_session, get_global_session_statistics
+from api.analyzer.dependency_graph import DependencyGraph
+from api.database import FUNCTION_INFO_COLLECTION, TEST_INFO_COLLECTION
+from api.instances.cache_maintenance_main import cache_maintenance
 from api.instances.database_main import database_handler
+from api.instances.dependency_graphs import dependency_graph_registry
+from api.instances.project_data_cache_main import project_data_cache
 from api.instances.shared_websockets_main import shared_websockets_handler
+from api.util.diff import diff_lines, format_diff
+from api.util.memory_cache import MemoryCache
 from api.util.paths_helper import get_base_directory, \
     sub_directory_to_full_path, full_path_to_correct_sub_directory
 from api.websocket import WsIdentity, WsCode
@@ -37,9 +50,28 @@ class APICode(Enum):
 
     ERROR_PROJECT_HAS_NO_TESTS = "PROJECT_HAS_NO_TESTS"
 
+
+# Function diffs keyed by the hashes of the old and new file contents and
+# the ranges of the function in them, bounded by the total length of the
+# diffs in characters.
+FUNCTION_DIFF_CACHE_MAX_CHARACTERS = 16 * 1024 * 1024
+function_diff_cache = MemoryCache(
+    FUNCTION_DIFF_CACHE_MAX_CHARACTERS, weigher=lambda diff: len(diff) + 1)
+
+# Directory listings keyed by the complete path to the directory, bounded by
+# the total number of entries. A listing is rescanned when the directory is
+# modified, and expires after a few seconds in case a modification is missed
+# by a file system with coarse modification times.
+DIRECTORY_LISTING_CACHE_MAX_ENTRIES = 100000
+DIRECTORY_LISTING_CACHE_TTL = 5
+directory_listing_cache = MemoryCache(
+    DIRECTORY_LISTING_CACHE_MAX_ENTRIES,
+    weigher=lambda listing: len(listing[1]) + 1,
+    ttl=DIRECTORY_LISTING_CACHE_TTL)
+
 def __get_existing_projects():
     all_functions = \
-        database_handler.get_function_info({})
+        database_handler.get_function_info({}, projection=['pathToProject'])
 
     if all_functions is not None:
         return list(dict.fromkeys(
@@ -52,50 +84,125 @@ def __get_existing_projects():
     return []
 
 
-def list_files(sub_directory: str) -> dict:
-    """List files in the given sub directory.
+def __scan_directory(directory_full_path: str) -> list:
+    """List the entries of a directory, ordered by name. Listings are cached
+    for a short time, and rescanned as soon as the modification time of the
+    directory changes, as it does when an entry is added, removed or renamed.
+
+    :param directory_full_path: The complete path to the directory.
+    :type directory_full_path: str
+
+    :return: The (name, is directory, is file) tuples of the entries.
+    :rtype: list
+    """
+    # The modification time is read before the scan, so a change during the
+    # scan is seen as a newer modification time by the next listing.
+    directory_modified = os.stat(directory_full_path).st_mtime_ns
+    cached_listing = directory_listing_cache.get(directory_full_path)
+    if cached_listing is not None and \
+            cached_listing[0] == directory_modified:
+        return cached_listing[1]
+
+    with os.scandir(directory_full_path) as directory_entries:
+        listing = sorted(
+            (entry.name, entry.is_dir(), entry.is_file())
+            for entry in directory_entries)
+
+    directory_listing_cache.set(
+        directory_full_path, (directory_modified, listing))
+    return listing
+
+
+def __paginate_directory_listing(
+        listing: list,
+        limit: int,
+        after_file_name: str | None) -> list:
+    """Get a page of the entries of a directory listing, ordered by name.
+
+    :param listing: The directory listing, see __scan_directory.
+    :type listing: list
+    :param limit: The maximum number of entries in the page, no limit if 0.
+    :type limit: int
+    :param after_file_name: Only include entries with a name after this.
+    :type after_file_name: str|None
+
+    :raises:
+        TypeError: If 'limit' or 'after_file_name' is of the wrong type.
+        ValueError: If 'limit' is negative.
+
+    :return: The entries in the page.
+    :rtype: list
+    """
+    if not isinstance(limit, int) or isinstance(limit, bool):
+        raise TypeError("'limit' must be an INTEGER")
+    elif limit < 0:
+        raise ValueError("'limit' cannot be negative")
+
+    start = 0
+    if after_file_name is not None:
+        if not isinstance(after_file_name, str):
+            raise TypeError("'after_file_name' must be a STRING")
+
+        start = bisect.bisect_right(
+            listing, after_file_name, key=lambda entry: entry[0])
+
+    if limit > 0:
+        return listing[start:start + limit]
+
+    return listing[start:]
+
+
+def list_files(
+        sub_directory: str,
+        limit: int = 0,
+        after_file_name: str = None) -> dict:
+    """List files in the given sub directory, ordered by name. The files can
+    be paginated by limiting the number of files and continuing after the
+    last file name of the previous page.
 
     :param sub_directory: The sub directory to list files from.
     :type sub_directory: str
+    :param limit: The maximum number of files to list, no limit if 0.
+    :type limit: int
+    :param after_file_name: Only list files with a name after this name.
+    :type after_file_name: str|None
     :return: Operation status data and the list of files.
     :rtype: dict
     """
     try:
-        existing_projects = read_global_session('existing_projects')
-        if existing_projects is None:
-            existing_projects = __get_existing_projects()
-            save_global_session('existing_projects', existing_projects)
+        existing_projects = set(read_or_load_global_session(
+            'existing_projects', __get_existing_projects))
 
         sub_directory_full_path = \
             sub_directory_to_full_path(sub_directory)
         correct_sub_directory = \
             full_path_to_correct_sub_directory(sub_directory_full_path)
 
-        files = os.listdir(sub_directory_full_path)
+        try:
+            listing = __paginate_directory_listing(
+                __scan_directory(sub_directory_full_path),
+                limit,
+                after_file_name)
+        except (TypeError, ValueError) as e:
+            return __bad_pagination_return_data(e)
+
+        # Entry names never hold '/', '.' or '..', so joining them to the
+        # normalized directory path gives the same path as normalizing each.
+        directory_path = \
+            os.path.abspath(correct_sub_directory + "/.").rstrip("/")
         file_list = [
             {
                 "fileName":
-                    f,
+                    file_name,
                 "subDir":
                     correct_sub_directory,
                 "isDirectory":
-                    os.path.isdir(sub_directory_full_path + "/" + f),
+                    is_directory,
                 "isFile":
-                    os.path.isfile(sub_directory_full_path + "/" + f),
+                    is_file,
                 "isProject":
-                    os.path.abspath(correct_sub_directory + "/" + f) in
-                    existing_projects
-            } for f in files]
-
-        # TODO: Remove this loop only used for testing purposes.
-        for file_index, file in enumerate(file_list):
-            shared_websockets_handler.send_progress(
-                WsIdentity.LIST_FILES,
-                WsCode.FILE_LIST_LOOP_FILES,
-                file_index,
-                len(file_list),
-                "Progress is being made"
-            )
+                    directory_path + "/" + file_name in existing_projects
+            } for file_name, is_directory, is_file in listing]
 
         # TODO: Remove this only used for testing purposes.
         shared_websockets_handler.send_success(
@@ -109,7 +216,10 @@ def list_files(sub_directory: str) -> dict:
             "curDir": correct_sub_directory,
             "isCurDirProject":
                 correct_sub_directory in existing_projects,
-            "fileList": file_list
+            "fileList": file_list,
+            "nextAfterFileName":
+                file_list[-1]["fileName"]
+                if 0 < limit == len(file_list) else None
         }
 
     except Exception as e:
@@ -161,28 +271,64 @@ def choose_project(path_to_project: str) -> dict:
     }
 
 
-def __get_function_info_project(path_to_project: str):
-    return database_handler.get_function_info({
-        'pathToProject': path_to_project
-    })
+def __get_project_functions(path_to_project: str) -> list:
+    """Get all function info documents for a project, ordered by their IDs.
+    The documents are read through the project data cache and must not be
+    modified.
 
+    :param path_to_project: The absolute path to the project.
+    :type path_to_project: str
 
-def __get_function_info_project_file(path_to_project: str, file_id: str):
-    return database_handler.get_function_info({
-        'pathToProject': path_to_project,
-        'fileId': file_id
-    })
+    :return: The function info documents, empty if the project doesn't exist.
+    :rtype: list
+    """
+    return project_data_cache.get_function_info(
+        path_to_project,
+        lambda: list(database_handler.iter_function_info({
+            'pathToProject': path_to_project
+        })))
 
 
-def __get_function_info_project_file_function(
-        path_to_project: str,
-        file_id: str,
-        function_id: str):
-    return database_handler.get_function_info({
-        'pathToProject': path_to_project,
-        'fileId': file_id,
-        'functionId': function_id
-    })
+def __get_project_tests(path_to_project: str) -> list:
+    """Get all test info documents for a project, ordered by their IDs. The
+    documents are read through the project data cache and must not be
+    modified.
+
+    :param path_to_project: The absolute path to the project.
+    :type path_to_project: str
+
+    :return: The test info documents.
+    :rtype: list
+    """
+    return project_data_cache.get_test_info(
+        path_to_project,
+        lambda: list(database_handler.iter_test_info({
+            'pathToProject': path_to_project
+        })))
+
+
+def __get_dependency_graph_project(path_to_project: str):
+    dependency_graph = dependency_graph_registry.get(path_to_project)
+
+    if dependency_graph is None:
+        project_functions = __get_project_functions(path_to_project)
+        if len(project_functions) == 0:
+            return None
+
+        project_dependencies = \
+            database_handler.get_function_dependency({
+                'pathToProject': path_to_project
+            }, projection=['fileId', 'functionId', 'calledFileId',
+                           'calledFunctionId'])
+
+        if project_dependencies is None:
+            project_dependencies = []
+
+        dependency_graph = \
+            DependencyGraph(project_functions, project_dependencies)
+        dependency_graph_registry.set(path_to_project, dependency_graph)
+
+    return dependency_graph
 
 
 def get_existing_projects() -> dict:
@@ -200,37 +346,200 @@ def get_existing_projects() -> dict:
     }
 
 
-def get_functions_for_project(sub_directory: str) -> dict:
-    """Get all functions created for the project at the given path.
+def get_database_statistics() -> dict:
+    """Get the database connection pool and query statistics, and the
+    statistics of the in-memory caches, of the current process.
+
+    :return: Operation status data and the database statistics.
+    :rtype: dict
+    """
+    return {
+        "status": APIStatus.OK.value,
+        "databaseStatistics": database_handler.get_pool_statistics(),
+        "queryStatistics": database_handler.get_query_statistics(),
+        "cacheStatistics": {
+            "session": get_global_session_statistics(),
+            "projectData":
+                project_data_cache.memory_cache.get_statistics(),
+            "functionDiff": function_diff_cache.get_statistics(),
+            "directoryListing": directory_listing_cache.get_statistics(),
+            "maintenance": cache_maintenance.get_statistics()
+        }
+    }
+
+
+def __get_next_after_id(documents: list, limit: int) -> str | None:
+    """Get the ID to continue after when fetching the next page of documents.
+
+    :param documents: The documents in the current page.
+    :type documents: list
+    :param limit: The maximum number of documents in a page, 0 if the
+    documents were not paginated.
+    :type limit: int
+
+    :return: The ID of the last document if the page is full, None if there
+    are no more pages.
+    :rtype: str|None
+    """
+    if 0 < limit == len(documents):
+        return documents[-1]['_id']
+
+    return None
+
+
+def __bad_pagination_return_data(e: Exception) -> dict:
+    return {
+        "status": APIStatus.ERROR.value,
+        "statusCode": APICode.ERROR_BAD_REQUEST.value,
+        "message": "Bad pagination arguments: " + " ".join(str(e).split())
+    }
+
+
+def get_functions_for_project(
+        sub_directory: str,
+        limit: int = 0,
+        after_id: str = None,
+        stream: bool = False) -> dict:
+    """Get all functions created for the project at the given path, ordered
+    by their IDs. The functions can be paginated by limiting the number of
+    functions and continuing after the last function ID of the previous page.
 
     :param sub_directory: Path to existing project.
     :type sub_directory: str
+    :param limit: The maximum number of functions to get, no limit if 0.
+    :type limit: int
+    :param after_id: Only get functions with an ID after this ID.
+    :type after_id: str|None
+    :param stream: If True, the functions are returned as a lazy iterator
+    instead of a list, and no next ID is given.
+    :type stream: bool
 
     :return: Operation status data and the project functions if successful.
     :rtype: dict
     """
     full_path_to_project = sub_directory_to_full_path(sub_directory)
-    project_functions = __get_function_info_project(full_path_to_project)
 
-    if project_functions is None:
-        return_message = {
+    # Only whole projects are read through the project data cache, pages and
+    # streams are read from a database cursor.
+    if limit == 0 and after_id is None and not stream:
+        project_functions = __get_project_functions(full_path_to_project)
+
+        if len(project_functions) == 0:
+            return {
+                "status": APIStatus.ERROR.value,
+                "statusCode": APICode.ERROR_PROJECT_NOT_EXISTING.value
+            }
+
+        return {
+            "status": APIStatus.OK.value,
+            "projectFunctions": project_functions,
+            "nextAfterId": None
+        }
+
+    if not __is_existing_project(full_path_to_project):
+        return {
             "status": APIStatus.ERROR.value,
             "statusCode": APICode.ERROR_PROJECT_NOT_EXISTING.value
         }
 
-    else:
-        return_message = {
+    try:
+        project_functions = \
+            database_handler.iter_function_info(
+                {'pathToProject': full_path_to_project},
+                limit=limit,
+                after_id=after_id)
+    except (TypeError, ValueError, InvalidId) as e:
+        return __bad_pagination_return_data(e)
+
+    if stream:
+        return {
             "status": APIStatus.OK.value,
             "projectFunctions": project_functions
         }
 
-    return return_message
+    project_functions = list(project_functions)
+
+    return {
+        "status": APIStatus.OK.value,
+        "projectFunctions": project_functions,
+        "nextAfterId": __get_next_after_id(project_functions, limit)
+    }
+
+
+def get_project_functions_version(sub_directory: str) -> str:
+    """Get the version of the functions of the project at the given path. The
+    version changes whenever the functions are written to by any process, and
+    is cheap to get as no functions are read.
+
+    :param sub_directory: Path to existing project.
+    :type sub_directory: str
+
+    :return: The version.
+    :rtype: str
+    """
+    return project_data_cache.get_version(
+        sub_directory_to_full_path(sub_directory), FUNCTION_INFO_COLLECTION)
+
+
+def get_project_tests_version(sub_directory: str) -> str:
+    """Get the version of the tests of the project at the given path. The
+    version changes whenever the tests are written to by any process, and is
+    cheap to get as no tests are read.
+
+    :param sub_directory: Path to existing project.
+    :type sub_directory: str
+
+    :return: The version.
+    :rtype: str
+    """
+    return project_data_cache.get_version(
+        sub_directory_to_full_path(sub_directory), TEST_INFO_COLLECTION)
+
+
+def get_file_version(
+        sub_directory: str,
+        file_id: str,
+        read_old_file: bool = False,
+        version: int = 0) -> str:
+    """Get the version of what read_file returns for a project file: the
+    version of the functions of the project, which tell if the file exists,
+    and the content hash and number of versions of the file in the cache.
+    Only the ref of the file in the cache is read, not its contents.
+
+    :param sub_directory: Path to existing project.
+    :type sub_directory: str
+    :param file_id: The id of the file.
+    :type file_id: str
+    :param read_old_file: If True, get the version of the older cache file.
+    :type read_old_file: bool
+    :param version: The version of the file in the cache history, see
+    read_file.
+    :type version: int
+
+    :return: The version.
+    :rtype: str
+    """
+    full_path_to_project = sub_directory_to_full_path(sub_directory)
+    functions_version = project_data_cache.get_version(
+        full_path_to_project, FUNCTION_INFO_COLLECTION)
+
+    try:
+        file_hash = cache_get_file_hash(
+            full_path_to_project, file_id, 1 if read_old_file else version)
+        file_versions = \
+            cache_count_file_versions(full_path_to_project, file_id)
+    except (TypeError, ValueError, FileNotFoundError):
+        file_hash = None
+        file_versions = 0
+
+    return f"{functions_version}.{file_hash}.{file_versions}"
 
 
 def read_file(
         sub_directory: str,
         file_id: str,
-        read_old_file: bool = False) -> dict:
+        read_old_file: bool = False,
+        version: int = 0) -> dict:
     """Read a project file.
 
     :param sub_directory: Path to existing project.
@@ -239,16 +548,18 @@ def read_file(
     :type file_id: str
     :param read_old_file: If True, will read the older cache file.
     :type read_old_file: bool
+    :param version: The version of the file to read from the cache history,
+    0 for the current version, 1 for the version before it and so on.
+    Ignored if 'read_old_file' is True.
+    :type version: int
 
     :return: Operation status data and the file data if successful.
     :rtype: dict
     """
     full_path_to_project = sub_directory_to_full_path(sub_directory)
-    project_file_functions = \
-        __get_function_info_project_file(full_path_to_project, file_id)
 
-    if project_file_functions is None:
-        if __get_function_info_project(full_path_to_project) is None:
+    if not __is_existing_project_file(full_path_to_project, file_id):
+        if not __is_existing_project(full_path_to_project):
             return_message = {
                 "status": APIStatus.ERROR.value,
                 "statusCode": APICode.ERROR_PROJECT_NOT_EXISTING.value
@@ -265,10 +576,20 @@ def read_file(
                 file_contents = \
                     cache_read_file_old(full_path_to_project, file_id)
             else:
-                file_contents = cache_read_file(full_path_to_project, file_id)
+                file_contents = \
+                    cache_read_file(full_path_to_project, file_id, version)
             return_message = {
                 "status": APIStatus.OK.value,
-                "fileContents": file_contents
+                "fileContents": file_contents,
+                "fileVersions":
+                    cache_count_file_versions(full_path_to_project, file_id)
+            }
+
+        except (TypeError, ValueError) as e:
+            return_message = {
+                "status": APIStatus.ERROR.value,
+                "statusCode": APICode.ERROR_BAD_REQUEST.value,
+                "message": "Bad version argument: " + str(e)
             }
 
         except FileNotFoundError:
@@ -292,66 +613,329 @@ def read_file(
     return return_message
 
 
-def get_tests_for_project(sub_directory: str) -> dict:
-    """Get all tests for the given project.
+def read_file_range(
+        sub_directory: str,
+        file_id: str,
+        start: int = 0,
+        end: int | None = None,
+        unit: str = FileRangeUnit.CHARACTERS.value,
+        function_id: str | None = None) -> dict:
+    """Read a range of a project file, without reading the whole file.
 
     :param sub_directory: Path to existing project.
     :type sub_directory: str
+    :param file_id: The id of the file to read.
+    :type file_id: str
+    :param start: The offset of the start of the range.
+    :type start: int
+    :param end: The offset after the end of the range, None for the end of
+    the file.
+    :type end: int|None
+    :param unit: The unit of the offsets, "characters", "lines" or "bytes".
+    :type unit: str
+    :param function_id: If given, read the range of this function in the
+    file instead of the given range.
+    :type function_id: str|None
+
+    :return: Operation status data, and the contents and the range read if
+    successful.
+    :rtype: dict
+    """
+    full_path_to_project = sub_directory_to_full_path(sub_directory)
+
+    if function_id is not None:
+        function_info = __get_project_file_function(
+            full_path_to_project, file_id, function_id)
+
+        if function_info is None:
+            return __missing_project_function_return_data(
+                full_path_to_project, file_id)
+
+        start, end = function_info['functionRange']
+        unit = FileRangeUnit.CHARACTERS.value
+
+    elif not __is_existing_project_file(full_path_to_project, file_id):
+        return __missing_project_function_return_data(
+            full_path_to_project, file_id)
+
+    try:
+        file_contents = cache_read_file_range(
+            full_path_to_project, file_id, start, end, FileRangeUnit(unit))
+        return_message = {
+            "status": APIStatus.OK.value,
+            "fileContents": file_contents,
+            "range": [start, end],
+            "unit": unit
+        }
+
+    except FileNotFoundError:
+        return_message = {
+            "status":
+                APIStatus.ERROR.value,
+            "statusCode":
+                APICode.ERROR_PROJECT_CACHE_FILE_NOT_EXISTING.value
+        }
+
+    except (TypeError, ValueError) as e:
+        return_message = {
+            "status": APIStatus.ERROR.value,
+            "statusCode": APICode.ERROR_BAD_REQUEST.value,
+            "message": "Bad range arguments: " + str(e)
+        }
+
+    return return_message
+
+
+def __diff_function(
+        full_path_to_project: str,
+        file_id: str,
+        function_range: tuple,
+        previous_function_range: tuple | None) -> str:
+    """Diff the source of a function in the old and the current cached
+    version of its file.
+
+    :param full_path_to_project: Path to existing project.
+    :type full_path_to_project: str
+    :param file_id: The id of the file containing the function.
+    :type file_id: str
+    :param function_range: The range of the function in the current file.
+    :type function_range: tuple
+    :param previous_function_range: The range of the function in the old
+    file, or None if the function has not changed since it was added.
+    :type previous_function_range: tuple|None
+
+    :return: The formatted diff.
+    :rtype: str
+
+    :raises FileNotFoundError: If a version of the file is not cached.
+    """
+    function_source = cache_read_file_range(
+        full_path_to_project, file_id, function_range[0], function_range[1])
+
+    if previous_function_range is None:
+        previous_function_source = function_source
+    else:
+        previous_function_source = \
+            cache_read_file_old(full_path_to_project, file_id)[
+                previous_function_range[0]:previous_function_range[1]]
+
+    return format_diff(diff_lines(
+        previous_function_source.splitlines(),
+        function_source.splitlines()))
+
+
+def get_function_diff(
+        sub_directory: str,
+        file_id: str,
+        function_id: str) -> dict:
+    """Diff the source of a function in the old and the current version of
+    its file. Diffs are cached, so only the hashes of the file versions are
+    read when the same diff is requested again.
+
+    :param sub_directory: Path to existing project.
+    :type sub_directory: str
+    :param file_id: The id of the file containing the function.
+    :type file_id: str
+    :param function_id: The id of the function to diff.
+    :type function_id: str
+
+    :return: Operation status data and the function diff if successful,
+    formatted like api.cache.compare_file_cache.
+    :rtype: dict
+    """
+    full_path_to_project = sub_directory_to_full_path(sub_directory)
+
+    function_info = __get_project_file_function(
+        full_path_to_project, file_id, function_id)
+
+    if function_info is None:
+        return __missing_project_function_return_data(
+            full_path_to_project, file_id)
+
+    function_range = tuple(function_info['functionRange'])
+    previous_function_range = function_info.get('previousFunctionRange')
+    if previous_function_range is not None:
+        previous_function_range = tuple(previous_function_range)
+
+    try:
+        diff_key = (
+            cache_get_file_hash(full_path_to_project, file_id),
+            function_range,
+            cache_get_file_hash(full_path_to_project, file_id, 1)
+            if previous_function_range is not None else None,
+            previous_function_range)
+
+        function_diff = function_diff_cache.get_or_load(
+            diff_key,
+            lambda: __diff_function(
+                full_path_to_project,
+                file_id,
+                function_range,
+                previous_function_range))
+
+        return_message = {
+            "status": APIStatus.OK.value,
+            "functionDiff": function_diff
+        }
+
+    except FileNotFoundError:
+        return_message = {
+            "status":
+                APIStatus.ERROR.value,
+            "statusCode":
+                APICode.ERROR_PROJECT_CACHE_FILE_NOT_EXISTING.value
+        }
+
+    return return_message
+
+
+def get_affected_test_surfaces(sub_directory: str, file_id: str) -> dict:
+    """Get all test surfaces transitively affected by changes to a project
+    file, including the test surfaces in the file itself.
+
+    :param sub_directory: Path to existing project.
+    :type sub_directory: str
+    :param file_id: The id of the changed file.
+    :type file_id: str
+
+    :return: Operation status data and the affected test surfaces if
+    successful.
+    :rtype: dict
+    """
+    full_path_to_project = sub_directory_to_full_path(sub_directory)
+    dependency_graph = __get_dependency_graph_project(full_path_to_project)
+
+    if dependency_graph is None:
+        return_message = {
+            "status": APIStatus.ERROR.value,
+            "statusCode": APICode.ERROR_PROJECT_NOT_EXISTING.value
+        }
+
+    else:
+        return_message = {
+            "status": APIStatus.OK.value,
+            "affectedTestSurfaces":
+                dependency_graph.get_affected_test_surfaces(file_id)
+        }
+
+    return return_message
+
+
+def get_tests_for_project(
+        sub_directory: str,
+        limit: int = 0,
+        after_id: str = None,
+        stream: bool = False) -> dict:
+    """Get all tests for the given project, ordered by their IDs. The tests
+    can be paginated by limiting the number of tests and continuing after the
+    last test ID of the previous page.
+
+    :param sub_directory: Path to existing project.
+    :type sub_directory: str
+    :param limit: The maximum number of tests to get, no limit if 0.
+    :type limit: int
+    :param after_id: Only get tests with an ID after this ID.
+    :type after_id: str|None
+    :param stream: If True, the tests are returned as a lazy iterator instead
+    of a list, and no next ID is given.
+    :type stream: bool
     :return: Operation status data and the project tests.
     :rtype: dict
     """
     full_path_to_project = sub_directory_to_full_path(sub_directory)
-    project_tests = \
-        database_handler.get_test_info({
-            'pathToProject': full_path_to_project
-        })
 
-    tests = []
+    # Only whole projects are read through the project data cache, pages and
+    # streams are read from a database cursor.
+    if limit == 0 and after_id is None and not stream:
+        return {
+            "status": APIStatus.OK.value,
+            "projectTests": __get_project_tests(full_path_to_project),
+            "nextAfterId": None
+        }
+
+    try:
+        project_tests = \
+            database_handler.iter_test_info(
+                {'pathToProject': full_path_to_project},
+                limit=limit,
+                after_id=after_id)
+    except (TypeError, ValueError, InvalidId) as e:
+        return __bad_pagination_return_data(e)
+
+    if stream:
+        return {
+            "status": APIStatus.OK.value,
+            "projectTests": project_tests
+        }
 
-    if project_tests is not None:
-        tests = project_tests
+    project_tests = list(project_tests)
 
     return {
         "status": APIStatus.OK.value,
-        "projectTests": tests
+        "projectTests": project_tests,
+        "nextAfterId": __get_next_after_id(project_tests, limit)
     }
 
 
-def __update_tests_count(
+def __increment_tests_count(
         path_to_project: str,
         file_id: str,
-        function_id: str):
-    if __get_function_info_project_file_function(
-            path_to_project, file_id, function_id) is not None:
-        function_tests = \
-            database_handler.get_test_info({
-                'pathToProject': path_to_project,
-                'fileId': file_id,
-                'functionId': function_id
-            })
+        function_id: str,
+        increment: int):
+    database_handler.increment_function_info(
+        {
+            "numberOfTests": increment
+        }, {
+            'pathToProject': path_to_project,
+            'fileId': file_id,
+            'functionId': function_id
+        })
 
-        tests_count = 0
-        if function_tests is not None:
-            tests_count = len(function_tests)
 
-        database_handler.set_function_info(
-            {
-                "numberOfTests": tests_count
-            }, {
-                'pathToProject': path_to_project,
-                'fileId': file_id,
-                'functionId': function_id
-            })
+def __is_existing_project(path_to_project: str) -> bool:
+    return database_handler.count_function_info({
+        'pathToProject': path_to_project
+    }, limit=1) > 0
+
+
+def __is_existing_project_file(path_to_project: str, file_id: str) -> bool:
+    return database_handler.count_function_info({
+        'pathToProject': path_to_project,
+        'fileId': file_id
+    }, limit=1) > 0
+
+
+def __is_existing_project_file_function(
+        path_to_project: str,
+        file_id: str,
+        function_id: str) -> bool:
+    return database_handler.count_function_info({
+        'pathToProject': path_to_project,
+        'fileId': file_id,
+        'functionId': function_id
+    }, limit=1) > 0
+
+
+def __get_project_file_function(
+        path_to_project: str,
+        file_id: str,
+        function_id: str) -> dict | None:
+    function_info = database_handler.get_function_info({
+        'pathToProject': path_to_project,
+        'fileId': file_id,
+        'functionId': function_id
+    })
+
+    return function_info[0] if function_info is not None else None
 
 
 def __missing_project_function_return_data(path_to_project, file_id):
-    if __get_function_info_project(path_to_project) is None:
+    if not __is_existing_project(path_to_project):
         return_message = {
             "status": APIStatus.ERROR.value,
             "statusCode": APICode.ERROR_PROJECT_NOT_EXISTING.value
         }
-    elif __get_function_info_project_file(
-            path_to_project, file_id) is None:
+    elif not __is_existing_project_file(path_to_project, file_id):
         return_message = {
             "status": APIStatus.ERROR.value,
             "statusCode": APICode.ERROR_PROJECT_FILE_NOT_EXISTING.value
@@ -387,10 +971,9 @@ def save_test(
     :rtype: dict
     """
     full_path_to_project = sub_directory_to_full_path(sub_directory)
-    project_function = __get_function_info_project_file_function(
-        full_path_to_project, file_id, function_id)
 
-    if project_function is None:
+    if not __is_existing_project_file_function(
+            full_path_to_project, file_id, function_id):
         return_message = \
             __missing_project_function_return_data(
                 full_path_to_project, file_id)
@@ -404,7 +987,8 @@ def save_test(
             'moduleData': test_module
         })
 
-        __update_tests_count(full_path_to_project, file_id, function_id)
+        __increment_tests_count(
+            full_path_to_project, file_id, function_id, 1)
 
         return_message = {
             "status": APIStatus.OK.value,
@@ -446,7 +1030,10 @@ def edit_test(
                 'customName': custom_name,
                 'moduleData': test_module
             },
-            {'_id': test_id}
+            {
+                '_id': test_id,
+                'pathToProject': project_test[0]['pathToProject']
+            }
         )
 
         return_message = {
@@ -476,13 +1063,15 @@ def delete_test(test_id: str) -> dict:
 
     else:
         database_handler.remove_test_info({
-            '_id': test_id
+            '_id': test_id,
+            'pathToProject': project_test[0]['pathToProject']
         })
 
-        __update_tests_count(
+        __increment_tests_count(
             project_test[0]["pathToProject"],
             project_test[0]["fileId"],
-            project_test[0]["functionId"])
+            project_test[0]["functionId"],
+            -1)
 
         return_message = {
             "status": APIStatus.OK.value
@@ -543,10 +1132,16 @@ def edit_function_info(
         }
     else:
         function_info_data['functionRange'] = tuple(function_info_data['functionRange'])
+        if 'previousFunctionRange' in function_info_data:
+            function_info_data['previousFunctionRange'] = \
+                tuple(function_info_data['previousFunctionRange'])
 
         database_handler.set_function_info(
             function_info_data,
-            {'_id': function_id}
+            {
+                '_id': function_id,
+                'pathToProject': function_info[0]['pathToProject']
+            }
         )
 
         return_message = {
@@ -567,9 +1162,7 @@ def remove_changes_from_untested_functions(sub_directory):
     """
     full_path_to_project = sub_directory_to_full_path(sub_directory)
 
-    project_functions = __get_function_info_project(full_path_to_project)
-
-    if project_functions is None:
+    if not __is_existing_project(full_path_to_project):
         return_message = {
             "status": APIStatus.ERROR.value,
             "statusCode": APICode.ERROR_PROJECT_NOT_EXISTING.value
@@ -578,24 +1171,25 @@ def remove_changes_from_untested_functions(sub_directory):
         project_tests = \
             database_handler.get_test_info({
                 'pathToProject': full_path_to_project
-            })
+            }, projection=['functionId'])
 
         if project_tests is None:
             project_tests = []
 
-        tested_functions_list = []
-        for test_info in project_tests:
-            if test_info['functionId'] not in tested_functions_list:
-                tested_functions_list.append(test_info['functionId'])
-
-        for function_info in project_functions:
-            if function_info['functionId'] not in tested_functions_list:
-                function_info['haveFunctionChanged'] = False
-                function_info['changeList'] = []
-                database_handler.set_function_info(
-                    function_info,
-                    {'_id': function_info['_id']}
-                )
+        tested_functions = \
+            {test_info['functionId'] for test_info in project_tests}
+
+        database_handler.set_function_info(
+            {
+                'haveFunctionChanged': False,
+                'changeList': []
+            },
+            {
+                'pathToProject': full_path_to_project,
+                'functionId': {'$nin': list(tested_functions)}
+            },
+            act_on_first_match=False
+        )
 
         return_message = {
             "status": APIStatus.OK.value
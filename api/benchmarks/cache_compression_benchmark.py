@@ -0,0 +1,105 @@
+"""Benchmark of the compression of the analysis cache in api.cache.
+
+Saves the same generated JavaScript files to the cache with every
+compression and level, and compares the size of the cache on disk with the
+time it takes to save and read the files back.
+
+Run from the repository root with:
+
+    python -m api.benchmarks.cache_compression_benchmark
+"""
+import os
+import random
+import tempfile
+import timeit
+
+import api.cache as cache
+
+FILE_COUNT = 200
+FUNCTIONS_PER_FILE = 40
+REPEAT = 5
+PROJECT_ROOT = "/benchmark/project"
+COMPRESSIONS = [
+    ("none", 0),
+    ("zlib", 1),
+    ("zlib", 6),
+    ("zlib", 9),
+    ("lzma", 0),
+    ("lzma", 6)
+]
+
+
+def make_files() -> dict:
+    random_generator = random.Random(42)
+    words = ["user", "item", "list", "value", "index", "result", "state",
+             "props", "data", "error", "count", "name", "id", "key"]
+
+    def identifier() -> str:
+        return random_generator.choice(words) + \
+            random_generator.choice(words).capitalize()
+
+    files = {}
+    for file_index in range(FILE_COUNT):
+        functions = []
+        for _ in range(FUNCTIONS_PER_FILE):
+            arguments = ", ".join(
+                identifier() for _ in range(random_generator.randint(0, 3)))
+            functions.append(
+                f"export const {identifier()} = ({arguments}) => {{\n"
+                f"  const {identifier()} = {random_generator.randint(0, 999)};"
+                f"\n  if ({identifier()}.{identifier()} === undefined) {{\n"
+                f"    return {identifier()}({arguments});\n"
+                f"  }}\n"
+                f"  return '{identifier()}';\n"
+                f"}};\n")
+        files[f"src/components/file{file_index}"] = "\n".join(functions)
+
+    return files
+
+
+def get_directory_size(directory: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory_path, file_name))
+        for directory_path, _, file_names in os.walk(directory)
+        for file_name in file_names)
+
+
+def benchmark(compression: str, level: int, files: dict) -> None:
+    with tempfile.TemporaryDirectory() as cache_directory:
+        cache.CONFIG_LOCATION_CACHE = cache_directory
+        cache.CONFIG_CACHE_COMPRESSION = compression
+        cache.CONFIG_CACHE_COMPRESSION_LEVEL = level
+
+        def save_files():
+            cache.clear_cache(PROJECT_ROOT)
+            for file_id, file_data in files.items():
+                cache.save_file(PROJECT_ROOT, file_id, file_data)
+
+        def read_files():
+            for file_id in files:
+                cache.read_file(PROJECT_ROOT, file_id)
+
+        save_time = min(timeit.repeat(save_files, number=1, repeat=REPEAT))
+        read_time = min(timeit.repeat(read_files, number=1, repeat=REPEAT))
+        size = get_directory_size(cache_directory)
+
+    print(f"{compression + ' ' + str(level):<12}"
+          f"{size / 1024:>12.1f} KiB"
+          f"{save_time * 1000:>12.2f} ms"
+          f"{read_time * 1000:>12.2f} ms")
+
+
+def main() -> None:
+    files = make_files()
+    source_size = sum(
+        len(str.encode(file_data)) for file_data in files.values())
+
+    print(f"{FILE_COUNT} files, {source_size / 1024:.1f} KiB of source, "
+          f"best of {REPEAT}")
+    print(f"{'compression':<12}{'disk':>16}{'save':>15}{'read':>15}")
+    for compression, level in COMPRESSIONS:
+        benchmark(compression, level, files)
+
+
+if __name__ == '__main__':
+    main()
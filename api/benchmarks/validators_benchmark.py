@@ -0,0 +1,129 @@
+"""Micro-benchmark of the compiled attribute checkers in api.database.
+
+Compares validating and converting function info documents with the
+compiled attribute checker against walking the attribute checker
+dictionaries for every attribute, which is how documents were handled
+before the attribute checkers were compiled.
+
+Run from the repository root with:
+
+    python -m api.benchmarks.validators_benchmark
+"""
+import timeit
+
+from bson.objectid import ObjectId
+
+from api.database import FUNCTION_INFO_ATTRIBUTE_CHECKER, \
+    compile_attribute_checker
+
+DOCUMENT_COUNT = 1000
+REPEAT = 5
+
+
+def uncompiled_check_and_convert(document, attribute_property_checker):
+    for attribute_key, attribute_value in document.items():
+        if not isinstance(attribute_key, str) or len(attribute_key) == 0 or \
+                attribute_key not in attribute_property_checker:
+            raise ValueError(attribute_key)
+
+        if not isinstance(
+                attribute_value,
+                attribute_property_checker[attribute_key]['type']):
+            raise TypeError(attribute_key)
+
+        if attribute_property_checker[attribute_key]['cond']:
+            if not attribute_property_checker[attribute_key]['cond'](
+                    attribute_value):
+                raise ValueError(attribute_key)
+
+    db_document = document.copy()
+    for attribute, value in db_document.items():
+        if attribute_property_checker[attribute]['app_to_db_conv']:
+            db_document[attribute] = \
+                attribute_property_checker[attribute]['app_to_db_conv'](value)
+
+    for attribute_key in attribute_property_checker:
+        if attribute_key not in db_document:
+            if 'standard_value' in attribute_property_checker[attribute_key]:
+                db_document[attribute_key] = \
+                    attribute_property_checker[attribute_key]['standard_value']
+
+    return db_document
+
+
+def uncompiled_db_to_app(db_document, attribute_property_checker):
+    app_document = db_document.copy()
+    for attribute, value in app_document.items():
+        if attribute_property_checker[attribute]['db_to_app_conv']:
+            app_document[attribute] = \
+                attribute_property_checker[attribute]['db_to_app_conv'](value)
+
+    return app_document
+
+
+def compiled_check_and_convert(document, compiled_checker):
+    compiled_checker.check_document(document)
+    db_document = compiled_checker.app_to_db_doc_conv(document)
+    compiled_checker.add_default_values(db_document)
+
+    return db_document
+
+
+def make_documents() -> list:
+    return [
+        {
+            "pathToProject": "/home/user/project",
+            "fileId": f"components/file{index % 50}",
+            "functionId": f"function{index}",
+            "arguments": [{"args": ""}],
+            "functionRange": (index, index + 10),
+            "functionHash": "sdg7sdfg98fsd7g98dfs7df",
+            "dependents": index % 7,
+            "dependencies": index % 5,
+            "exportInfo": "export",
+            "exportName": f"function{index}"
+        }
+        for index in range(DOCUMENT_COUNT)]
+
+
+def benchmark(name: str, function) -> float:
+    best_time = min(timeit.repeat(function, number=1, repeat=REPEAT))
+    print(f"{name:<40}{best_time * 1000:>10.2f} ms")
+
+    return best_time
+
+
+def main() -> None:
+    checker = FUNCTION_INFO_ATTRIBUTE_CHECKER
+    compiled_checker = compile_attribute_checker(checker)
+    documents = make_documents()
+    db_documents = [
+        {**compiled_check_and_convert(document, compiled_checker),
+         "_id": ObjectId()}
+        for document in documents]
+
+    print(f"{DOCUMENT_COUNT} function info documents, best of {REPEAT}")
+
+    uncompiled_time = benchmark(
+        "check and convert (uncompiled)",
+        lambda: [uncompiled_check_and_convert(document, checker)
+                 for document in documents])
+    compiled_time = benchmark(
+        "check and convert (compiled)",
+        lambda: [compiled_check_and_convert(document, compiled_checker)
+                 for document in documents])
+    print(f"{'speedup':<40}{uncompiled_time / compiled_time:>10.2f} x")
+
+    uncompiled_time = benchmark(
+        "database to app (uncompiled)",
+        lambda: [uncompiled_db_to_app(db_document, checker)
+                 for db_document in db_documents])
+    compiled_time = benchmark(
+        "database to app (compiled)",
+        lambda: [compiled_checker.db_to_app_doc_conv(db_document)
+                 for db_document in db_documents])
+    print(f"{'speedup':<40}{uncompiled_time / compiled_time:>10.2f} x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,141 @@
-import datetime
+import bisect
+import codecs
+import contextlib
+import functools
 import hashlib
+import json
+import lzma
+import mmap
 import os
 import difflib
+import fcntl
 import shutil
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from enum import Enum
+from api.instances.config_urang import config_urang
+from api.util.delta import apply_delta, make_delta
+from api.util.memory_cache import MemoryCache
 from api.util.paths_helper import full_path_to_correct_sub_directory
 
+
+class CacheCompression(Enum):
+    """Compression of the blobs in the cache. The value is the name of the
+    compression in urang.config.yml."""
+    NONE = "none"
+    ZLIB = "zlib"
+    LZMA = "lzma"
+
+
+class FileRangeUnit(Enum):
+    """Unit of the offsets of a range read from a cached file. Characters
+    are the unit of the function ranges found by the analyzer, and lines
+    are separated by '\\n'."""
+    BYTES = "bytes"
+    CHARACTERS = "characters"
+    LINES = "lines"
+
+
+# The file name suffix of the blobs of each compression.
+CACHE_COMPRESSION_SUFFIXES = {
+    CacheCompression.NONE: "",
+    CacheCompression.ZLIB: ".zlib",
+    CacheCompression.LZMA: ".xz"
+}
+
+__CACHE_CONFIG = config_urang.get('cache') or {}
+
 # TODO: Move configuration to config.urangu.yaml
 CONFIG_LOCATION_CACHE = \
     os.path.abspath(
         os.path.dirname(os.path.abspath(__file__)) + "/../.analyze_cache")
 
-__MEMORY_MAX_TIME = 600  # 10 minutes
-__MEMORY = {}
+# The number of versions of every file kept in the cache, the current
+# version included.
+CONFIG_CACHE_HISTORY_VERSIONS = __CACHE_CONFIG.get('history_versions', 10)
+
+# The compression of new blobs, and its level from 0 (fastest) to 9
+# (smallest). Blobs saved with another compression are still read.
+CONFIG_CACHE_COMPRESSION = \
+    (__CACHE_CONFIG.get('compression') or {}).get('algorithm', "zlib")
+CONFIG_CACHE_COMPRESSION_LEVEL = \
+    (__CACHE_CONFIG.get('compression') or {}).get('level', 6)
+
+# Compressed blobs are read and decompressed in chunks of this many bytes.
+CACHE_READ_CHUNK_SIZE = 64 * 1024
+
+# The cache of a project is a content addressed store. The current version
+# of a file is saved as a blob named by the hash of its contents, and every
+# file ID has a small ref file pointing to its current blob:
+#
+#   <project hash>/blobs/<first 2 characters of hash>/<content hash>[.zlib]
+#   <project hash>/refs/<file ID hash>.json
+#
+# The ref file also holds the history of the file, newest first, as reverse
+# deltas: the delta of version k turns version k - 1 into version k, so the
+# current version is the base snapshot and older versions are rebuilt from
+# it. Saving a new version writes one blob (if not already stored) and then
+# atomically replaces the ref file. Identical contents are stored once.
+CACHE_BLOBS_DIRECTORY = "blobs"
+CACHE_REFS_DIRECTORY = "refs"
+
+# The line offset index of a blob is saved next to it, with this suffix
+# after the hash, the first time a range of the blob is read. As blobs never
+# change, neither do their indexes.
+CACHE_LINE_INDEX_SUFFIX = ".lines"
+
+# Temporary files are written by the atomic writes of the cache with this
+# suffix. The cache maintenance removes those older than the max age, as
+# left behind by writes that never finished.
+CACHE_TEMPORARY_SUFFIX = ".tmp"
+CACHE_TEMPORARY_MAX_AGE = 60 * 60
+
+# Only one run of the cache maintenance at a time holds this lock file in
+# CONFIG_LOCATION_CACHE.
+CACHE_MAINTENANCE_LOCK_FILE = "maintenance.lock"
+
+# A file is used when it is saved or read, and its ref file is touched so
+# that the cache maintenance evicts the least recently used files first. The
+# ref file of a file is touched at most once in the interval, in seconds.
+CACHE_TOUCH_INTERVAL = 60
+__TOUCHED_REF_FILES = MemoryCache(4096, ttl=CACHE_TOUCH_INTERVAL)
+
+# The global session cache of values expensive to compute, like the list of
+# existing projects. Values expire after max_age seconds, and the least
+# recently used values are evicted when there are more than max_entries.
+__SESSION_CONFIG = __CACHE_CONFIG.get('session') or {}
+__MEMORY = MemoryCache(
+    __SESSION_CONFIG.get('max_entries', 256),
+    ttl=__SESSION_CONFIG.get('max_age', 600))
+
+
+@functools.lru_cache(maxsize=4096)
+def __hash_name(name: str) -> str:
+    """Hash a project root or file ID to get its name in the cache. The hash
+    is memoized since the same names are hashed for every cache operation.
+
+    :param name: The name to hash.
+    :type name: str
+
+    :return: The hash of the name.
+    :rtype: str
+    """
+    return hashlib.sha256(str.encode(name)).hexdigest()
+
+
+def __hash_contents(file_data: str) -> str:
+    """Hash file contents to get the name of their blob.
+
+    :param file_data: The file contents.
+    :type file_data: str
+
+    :return: The hash of the contents.
+    :rtype: str
+    """
+    return hashlib.sha256(str.encode(file_data)).hexdigest()
 
 
 def __get_cache_path(project_root: str) -> str:
@@ -24,12 +148,75 @@ def __get_cache_path(project_root: str) -> str:
     :rtype: str
     """
     sub_directory = full_path_to_correct_sub_directory(project_root)
-    project_root_hash = hashlib.sha256(str.encode(sub_directory)).hexdigest()
-    return CONFIG_LOCATION_CACHE + f"/{project_root_hash}"
+    return CONFIG_LOCATION_CACHE + f"/{__hash_name(sub_directory)}"
+
+
+def __get_blob_file(
+        project_root: str,
+        blob_hash: str,
+        compression: CacheCompression) -> str:
+    """Get cache path to the blob with the given hash and compression for the
+    current project.
+
+    :param project_root: The complete project root directory.
+    :type project_root: str
+    :param blob_hash: The hash of the uncompressed blob contents.
+    :type blob_hash: str
+    :param compression: The compression of the blob.
+    :type compression: CacheCompression
+
+    :return: The cache path for the blob in the project.
+    :rtype: str
+    """
+    return f"{__get_cache_path(project_root)}/{CACHE_BLOBS_DIRECTORY}/" \
+           f"{blob_hash[:2]}/{blob_hash}" \
+           f"{CACHE_COMPRESSION_SUFFIXES[compression]}"
+
+
+def __find_blob_file(
+        project_root: str,
+        blob_hash: str) -> tuple[str, CacheCompression] | None:
+    """Find the blob with the given hash in the current project, whatever
+    compression it was saved with.
+
+    :param project_root: The complete project root directory.
+    :type project_root: str
+    :param blob_hash: The hash of the uncompressed blob contents.
+    :type blob_hash: str
+
+    :return: The cache path for the blob and its compression, or None if
+    the blob does not exist.
+    :rtype: tuple[str, CacheCompression]|None
+    """
+    configured_compression = CacheCompression(CONFIG_CACHE_COMPRESSION)
+    for compression in [configured_compression] + [
+            compression for compression in CacheCompression
+            if compression != configured_compression]:
+        blob_file = __get_blob_file(project_root, blob_hash, compression)
+        if os.path.isfile(blob_file):
+            return blob_file, compression
+
+    return None
+
+
+def __get_ref_file(project_root: str, file_id: str) -> str:
+    """Get cache path to the ref file of the file for the current project.
+
+    :param project_root: The complete project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to get the path for.
+    :type file_id: str
+
+    :return: The cache path for the ref file in the project.
+    :rtype: str
+    """
+    return f"{__get_cache_path(project_root)}/{CACHE_REFS_DIRECTORY}/" \
+           f"{__hash_name(file_id)}.json"
 
 
 def __get_cache_file(project_root: str, file_id: str) -> str:
-    """Get cache path to the file for the current project.
+    """Get the path the file for the current project was cached at before
+    the cache was content addressed.
 
     :param project_root: The complete project root directory.
     :type project_root: str
@@ -39,12 +226,12 @@ def __get_cache_file(project_root: str, file_id: str) -> str:
     :return: The cache path for the file in the project.
     :rtype: str
     """
-    file_id_hash = hashlib.sha256(str.encode(file_id)).hexdigest()
-    return f"{__get_cache_path(project_root)}/{file_id_hash}.js"
+    return f"{__get_cache_path(project_root)}/{__hash_name(file_id)}.js"
 
 
 def __get_old_cache_file(project_root: str, file_id: str) -> str:
-    """Get old cache path to the file for the current project.
+    """Get the path the old version of the file for the current project was
+    cached at before the cache was content addressed.
 
     :param project_root: The complete project root directory.
     :type project_root: str
@@ -54,8 +241,421 @@ def __get_old_cache_file(project_root: str, file_id: str) -> str:
     :return: The cache path for the file in the project.
     :rtype: str
     """
-    file_id_hash = hashlib.sha256(str.encode(file_id)).hexdigest()
-    return f"{__get_cache_path(project_root)}/{file_id_hash}[OLD].js"
+    return f"{__get_cache_path(project_root)}/{__hash_name(file_id)}[OLD].js"
+
+
+def __write_file_atomic(file_path: str, file_data: bytes) -> None:
+    """Write a file by writing a temporary file in the same directory and
+    renaming it over the file, so that readers see either the whole old or
+    the whole new file.
+
+    :param file_path: The path of the file to write.
+    :type file_path: str
+    :param file_data: The data to write.
+    :type file_data: bytes
+
+    :return: None
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    file_descriptor, temporary_path = \
+        tempfile.mkstemp(
+            dir=os.path.dirname(file_path), suffix=CACHE_TEMPORARY_SUFFIX)
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temporary_file:
+            temporary_file.write(file_data)
+        os.replace(temporary_path, file_path)
+
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def __touch_ref_file(ref_file_path: str) -> None:
+    """Mark the file of a ref file as used now, unless it was already marked
+    within CACHE_TOUCH_INTERVAL seconds.
+
+    :param ref_file_path: The path of the ref file.
+    :type ref_file_path: str
+
+    :return: None
+    """
+    if ref_file_path in __TOUCHED_REF_FILES:
+        return
+
+    try:
+        os.utime(ref_file_path)
+    except OSError:
+        return
+
+    __TOUCHED_REF_FILES.set(ref_file_path, True)
+
+
+def __read_ref(project_root: str, file_id: str) -> dict | None:
+    """Read the ref file of the file in the project.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to read the ref file of.
+    :type file_id: str
+
+    :return: The ref with the hash of the 'current' blob and the 'history'
+    of the file, or None if the file has no ref.
+    :rtype: dict|None
+    """
+    ref_file_path = __get_ref_file(project_root, file_id)
+    if not os.path.isfile(ref_file_path):
+        return None
+
+    try:
+        with open(ref_file_path, 'r') as ref_file:
+            ref = json.load(ref_file)
+
+    except FileNotFoundError:
+        # Removed by the cache maintenance since it was found.
+        return None
+
+    __touch_ref_file(ref_file_path)
+
+    return ref
+
+
+def __write_ref(
+        project_root: str,
+        file_id: str,
+        current_hash: str,
+        history: list) -> None:
+    """Atomically point the ref of the file in the project to a new current
+    blob and history.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to write the ref file of.
+    :type file_id: str
+    :param current_hash: The hash of the blob of the current version.
+    :type current_hash: str
+    :param history: The older versions, newest first, each with the 'hash'
+    of its contents and the 'delta' from the version after it.
+    :type history: list
+
+    :return: None
+    """
+    __write_file_atomic(
+        __get_ref_file(project_root, file_id),
+        str.encode(json.dumps({
+            "fileId": file_id,
+            "current": current_hash,
+            "history": history[:CONFIG_CACHE_HISTORY_VERSIONS - 1]
+        })))
+
+
+def __compress(file_data: bytes, compression: CacheCompression) -> bytes:
+    """Compress blob contents with the configured compression level.
+
+    :param file_data: The uncompressed contents.
+    :type file_data: bytes
+    :param compression: The compression to use.
+    :type compression: CacheCompression
+
+    :return: The compressed contents.
+    :rtype: bytes
+    """
+    match compression:
+        case CacheCompression.ZLIB:
+            return zlib.compress(file_data, CONFIG_CACHE_COMPRESSION_LEVEL)
+        case CacheCompression.LZMA:
+            return lzma.compress(
+                file_data, preset=CONFIG_CACHE_COMPRESSION_LEVEL)
+        case _:
+            return file_data
+
+
+def __iter_blob_chunks(blob_file: str, compression: CacheCompression):
+    """Read a blob file in chunks, decompressing them as they are read, so
+    that the compressed file is never held in memory as a whole.
+
+    :param blob_file: The path of the blob file.
+    :type blob_file: str
+    :param compression: The compression of the blob.
+    :type compression: CacheCompression
+
+    :return: Generator of the uncompressed chunks.
+    :rtype: Generator[bytes]
+
+    :raises FileNotFoundError: If the blob file does not exist.
+    """
+    match compression:
+        case CacheCompression.ZLIB:
+            decompressor = zlib.decompressobj()
+        case CacheCompression.LZMA:
+            decompressor = lzma.LZMADecompressor()
+        case _:
+            decompressor = None
+
+    with open(blob_file, 'rb') as blob_file_object:
+        while chunk := blob_file_object.read(CACHE_READ_CHUNK_SIZE):
+            yield decompressor.decompress(chunk) \
+                if decompressor is not None else chunk
+
+    if compression == CacheCompression.ZLIB:
+        yield decompressor.flush()
+
+
+def __decode_blob(blob_file: str, compression: CacheCompression) -> str:
+    """Read and decode the contents of a blob file.
+
+    :param blob_file: The path of the blob file.
+    :type blob_file: str
+    :param compression: The compression of the blob.
+    :type compression: CacheCompression
+
+    :return: The contents of the blob.
+    :rtype: str
+
+    :raises FileNotFoundError: If the blob file does not exist.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    file_contents = [
+        decoder.decode(chunk)
+        for chunk in __iter_blob_chunks(blob_file, compression)]
+    file_contents.append(decoder.decode(b"", final=True))
+
+    return "".join(file_contents)
+
+
+def __save_blob(project_root: str, file_data: str) -> str:
+    """Save file contents as a blob in the project, compressed with the
+    configured compression, unless a blob with the same contents is already
+    stored with any compression.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_data: The file contents.
+    :type file_data: str
+
+    :return: The hash of the blob.
+    :rtype: str
+    """
+    blob_hash = __hash_contents(file_data)
+    if __find_blob_file(project_root, blob_hash) is None:
+        compression = CacheCompression(CONFIG_CACHE_COMPRESSION)
+        __write_file_atomic(
+            __get_blob_file(project_root, blob_hash, compression),
+            __compress(str.encode(file_data), compression))
+
+    return blob_hash
+
+
+def __read_blob(project_root: str, blob_hash: str) -> str:
+    """Read the contents of a blob in the project.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param blob_hash: The hash of the blob.
+    :type blob_hash: str
+
+    :return: The contents of the blob.
+    :rtype: str
+
+    :raises FileNotFoundError: If the blob does not exist.
+    """
+    blob_file = __find_blob_file(project_root, blob_hash)
+    if blob_file is None:
+        raise FileNotFoundError(
+            f"For project in '{project_root}', there is no blob with hash "
+            f"'{blob_hash}'")
+
+    return __decode_blob(*blob_file)
+
+
+def __build_line_index(
+        blob_file: str, compression: CacheCompression) -> array:
+    """Build the line offset index of a blob.
+
+    :param blob_file: The path of the blob file.
+    :type blob_file: str
+    :param compression: The compression of the blob.
+    :type compression: CacheCompression
+
+    :return: The byte and character offsets of the start of every line,
+    followed by the byte and character offsets of the end of the blob, as
+    [byte offset 0, character offset 0, byte offset 1, ...].
+    :rtype: array
+    """
+    line_index = array('Q', [0, 0])
+    byte_offset = 0
+    character_offset = 0
+    pending_data = b""
+
+    for chunk in __iter_blob_chunks(blob_file, compression):
+        data = pending_data + chunk
+        line_start = 0
+        while (line_end := data.find(b"\n", line_start)) != -1:
+            line = data[line_start:line_end + 1]
+            byte_offset += len(line)
+            character_offset += \
+                len(line) if line.isascii() else len(line.decode())
+            line_index.extend((byte_offset, character_offset))
+            line_start = line_end + 1
+
+        pending_data = data[line_start:]
+
+    if len(pending_data) > 0:
+        byte_offset += len(pending_data)
+        character_offset += len(pending_data.decode())
+        line_index.extend((byte_offset, character_offset))
+
+    return line_index
+
+
+@functools.lru_cache(maxsize=1024)
+def __get_line_index(blob_file: str, compression: CacheCompression) -> array:
+    """Get the line offset index of a blob, see __build_line_index. The
+    index is loaded from next to the blob, or built and saved there if the
+    blob has no index yet.
+
+    :param blob_file: The path of the blob file.
+    :type blob_file: str
+    :param compression: The compression of the blob.
+    :type compression: CacheCompression
+
+    :return: The line offset index. It must not be modified.
+    :rtype: array
+    """
+    line_index_file = \
+        blob_file[:len(blob_file) - len(
+            CACHE_COMPRESSION_SUFFIXES[compression])] + \
+        CACHE_LINE_INDEX_SUFFIX
+
+    line_index = array('Q')
+    try:
+        with open(line_index_file, 'rb') as line_index_file_object:
+            line_index.frombytes(line_index_file_object.read())
+
+    except FileNotFoundError:
+        line_index = __build_line_index(blob_file, compression)
+        __write_file_atomic(line_index_file, line_index.tobytes())
+
+    return line_index
+
+
+def __read_blob_bytes(
+        blob_file: str,
+        compression: CacheCompression,
+        byte_start: int,
+        byte_end: int) -> bytes:
+    """Read a byte range of a blob. Uncompressed blobs are memory mapped, so
+    only the pages of the range are read. Compressed blobs are decompressed
+    as a stream up to the end of the range.
+
+    :param blob_file: The path of the blob file.
+    :type blob_file: str
+    :param compression: The compression of the blob.
+    :type compression: CacheCompression
+    :param byte_start: The offset of the first byte to read.
+    :type byte_start: int
+    :param byte_end: The offset after the last byte to read.
+    :type byte_end: int
+
+    :return: The bytes of the range.
+    :rtype: bytes
+    """
+    if byte_end <= byte_start:
+        return b""
+
+    if compression == CacheCompression.NONE:
+        with open(blob_file, 'rb') as blob_file_object:
+            if os.fstat(blob_file_object.fileno()).st_size == 0:
+                return b""
+
+            with mmap.mmap(blob_file_object.fileno(), 0,
+                           access=mmap.ACCESS_READ) as blob_map:
+                return blob_map[byte_start:byte_end]
+
+    range_chunks = []
+    chunk_start = 0
+    for chunk in __iter_blob_chunks(blob_file, compression):
+        chunk_end = chunk_start + len(chunk)
+        if chunk_end > byte_start:
+            range_chunks.append(
+                chunk[max(0, byte_start - chunk_start):byte_end - chunk_start])
+        if chunk_end >= byte_end:
+            break
+        chunk_start = chunk_end
+
+    return b"".join(range_chunks)
+
+
+def __slice_contents(
+        file_contents: str,
+        start: int,
+        end: int | None,
+        unit: FileRangeUnit) -> str:
+    """Slice a range out of file contents read as a whole.
+
+    :param file_contents: The file contents.
+    :type file_contents: str
+    :param start: The start offset of the range.
+    :type start: int
+    :param end: The end offset of the range, None for the end of the file.
+    :type end: int|None
+    :param unit: The unit of the offsets.
+    :type unit: FileRangeUnit
+
+    :return: The contents of the range.
+    :rtype: str
+    """
+    match unit:
+        case FileRangeUnit.BYTES:
+            return str.encode(file_contents)[start:end].decode(
+                errors='replace')
+        case FileRangeUnit.LINES:
+            lines = file_contents.split("\n")
+            lines_with_ends = [line + "\n" for line in lines[:-1]]
+            if len(lines[-1]) > 0:
+                lines_with_ends.append(lines[-1])
+            return "".join(lines_with_ends[start:end])
+        case _:
+            return file_contents[start:end]
+
+
+def __migrate_legacy_file(project_root: str, file_id: str) -> dict | None:
+    """Move the file in the project from the cache layout used before the
+    cache was content addressed into a blob and a ref file. Caches are
+    migrated lazily, one file at a time when it is saved again.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to migrate.
+    :type file_id: str
+
+    :return: The ref of the migrated file, or None if the file was not
+    cached in the old layout.
+    :rtype: dict|None
+    """
+    if not os.path.isfile(__get_cache_file(project_root, file_id)):
+        return None
+
+    with open(__get_cache_file(project_root, file_id), 'r') as cache_file:
+        current_contents = cache_file.read()
+    current_hash = __save_blob(project_root, current_contents)
+
+    history = []
+    if os.path.isfile(__get_old_cache_file(project_root, file_id)):
+        with open(__get_old_cache_file(project_root, file_id), 'r') as \
+                old_cache_file:
+            old_contents = old_cache_file.read()
+        history.append({
+            "hash": __hash_contents(old_contents),
+            "delta": make_delta(current_contents, old_contents)
+        })
+
+    __write_ref(project_root, file_id, current_hash, history)
+
+    os.remove(__get_cache_file(project_root, file_id))
+    if len(history) > 0:
+        os.remove(__get_old_cache_file(project_root, file_id))
+
+    return {"fileId": file_id, "current": current_hash, "history": history}
 
 
 def clear_cache(project_root: str) -> None:
@@ -72,7 +672,10 @@ def clear_cache(project_root: str) -> None:
 
 def save_file(project_root: str, file_id: str, file_data: str):
     """Save cache to the given file in the given project with the specified
-    data.
+    data. The cached version before it is kept in the history of the file,
+    unless the data is the same as the cached version. The history is
+    bounded to CONFIG_CACHE_HISTORY_VERSIONS versions, and the oldest
+    versions are dropped first.
 
     :param project_root: The project root directory.
     :type project_root: str
@@ -102,31 +705,96 @@ def save_file(project_root: str, file_id: str, file_data: str):
     elif len(file_data) < 1:
         raise ValueError("'file_data' cannot be empty")
 
-    if not os.path.isdir(__get_cache_path(project_root)):
-        os.makedirs(__get_cache_path(project_root), exist_ok=True)
+    ref = __read_ref(project_root, file_id)
+    if ref is None:
+        ref = __migrate_legacy_file(project_root, file_id)
+
+    if ref is None:
+        __write_ref(
+            project_root, file_id, __save_blob(project_root, file_data), [])
+        return
 
-    # Save old cache contents before overwriting new ones.
+    current_hash = __hash_contents(file_data)
+    if ref["current"] == current_hash:
+        return
+
+    history = ref["history"]
     try:
-        old_cache_contents = read_file(project_root, file_id)
-        with open(__get_old_cache_file(project_root, file_id), 'w') as \
-                old_cache_file:
-            old_cache_file.write(old_cache_contents)
+        old_contents = __read_blob(project_root, ref["current"])
+        history = [{
+            "hash": ref["current"],
+            "delta": make_delta(file_data, old_contents)
+        }] + history
 
     except FileNotFoundError:
-        # No old cache contents, first time saving cache
-        pass
+        # The current blob is gone, so is every version rebuilt from it.
+        history = []
+
+    __save_blob(project_root, file_data)
+    __write_ref(project_root, file_id, current_hash, history)
 
-    with open(__get_cache_file(project_root, file_id), 'w') as cache_file:
-        cache_file.write(file_data)
 
+def __read_cached_file(
+        project_root: str, file_id: str, version: int) -> str | None:
+    """Read a cached version of the file in the project. Files cached before
+    the cache was content addressed are read from where they were cached.
 
-def read_file(project_root: str, file_id: str) -> str:
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to read from cache.
+    :type file_id: str
+    :param version: The version to read, 0 for the current version, 1 for
+    the version before it and so on.
+    :type version: int
+
+    :return: The cached contents, or None if there is no such version.
+    :rtype: str|None
+    """
+    ref = __read_ref(project_root, file_id)
+    if ref is not None:
+        if version > len(ref["history"]):
+            return None
+
+        try:
+            file_contents = __read_blob(project_root, ref["current"])
+            for history_entry in ref["history"][:version]:
+                if "delta" in history_entry:
+                    file_contents = \
+                        apply_delta(file_contents, history_entry["delta"])
+                else:
+                    file_contents = \
+                        __read_blob(project_root, history_entry["hash"])
+
+        except FileNotFoundError:
+            return None
+
+        return file_contents
+
+    match version:
+        case 0:
+            legacy_cache_file = __get_cache_file(project_root, file_id)
+        case 1:
+            legacy_cache_file = __get_old_cache_file(project_root, file_id)
+        case _:
+            return None
+
+    if not os.path.isfile(legacy_cache_file):
+        return None
+
+    with open(legacy_cache_file, 'r') as cache_file:
+        return cache_file.read()
+
+
+def read_file(project_root: str, file_id: str, version: int = 0) -> str:
     """Read cache file for the given file in the given project.
 
     :param project_root: The project root directory.
     :type project_root: str
     :param file_id: The file ID for the file to read from cache.
     :type file_id: str
+    :param version: The version of the file to read, 0 for the current
+    version, 1 for the version before it and so on.
+    :type version: int
 
     :return: The contents of the cache file.
     :rtype: str
@@ -147,13 +815,21 @@ def read_file(project_root: str, file_id: str) -> str:
     elif len(file_id) < 1:
         raise ValueError("'file_id' cannot be empty")
 
-    if not os.path.isfile(__get_cache_file(project_root, file_id)):
+    if not isinstance(version, int) or isinstance(version, bool):
+        raise TypeError("'version' must be an INTEGER")
+    elif version < 0:
+        raise ValueError("'version' cannot be negative")
+
+    file_contents = __read_cached_file(project_root, file_id, version)
+    if file_contents is None and version > 0:
+        raise FileNotFoundError(
+            f"For project in '{project_root}', there is no version {version} "
+            f"in the cache for file with ID '{file_id}'")
+    elif file_contents is None:
         raise FileNotFoundError(
             f"For project in '{project_root}', there is no cache for file "
             f"with ID '{file_id}'")
 
-    with open(__get_cache_file(project_root, file_id), 'r') as cache_file:
-        file_contents = cache_file.read()
     return file_contents
 
 
@@ -184,16 +860,671 @@ def read_file_old(project_root: str, file_id: str) -> str:
     elif len(file_id) < 1:
         raise ValueError("'file_id' cannot be empty")
 
-    if not os.path.isfile(__get_old_cache_file(project_root, file_id)):
+    file_contents = __read_cached_file(project_root, file_id, 1)
+    if file_contents is None:
         raise FileNotFoundError(
             f"For project in '{project_root}', there is no old cache for file "
             f"with ID '{file_id}'")
 
-    with open(__get_old_cache_file(project_root, file_id), 'r') as cache_file:
-        file_contents = cache_file.read()
     return file_contents
 
 
+def read_file_range(
+        project_root: str,
+        file_id: str,
+        start: int,
+        end: int | None = None,
+        unit: FileRangeUnit = FileRangeUnit.CHARACTERS) -> str:
+    """Read a range of the cache file for the given file in the given
+    project, without reading the whole file. The line offset index of the
+    file is used to find where the range starts and ends, so that only the
+    range is read and decoded.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to read from cache.
+    :type file_id: str
+    :param start: The offset of the start of the range, from 0.
+    :type start: int
+    :param end: The offset after the end of the range, None to read to the
+    end of the file. Offsets past the end of the file are clamped to it.
+    :type end: int|None
+    :param unit: The unit of the offsets. The lines of a line range are
+    returned with their line breaks. A byte range splitting a character is
+    decoded with the replacement character.
+    :type unit: FileRangeUnit
+
+    :return: The contents of the range.
+    :rtype: str
+
+    :raises TypeError: If any of the given arguments are of the wrong type.
+    :raises ValueError: If any of the given arguments are missing necessary
+    data.
+    :raises FileNotFoundError: If there is no cache saved for the given
+    project and file ID.
+    """
+    if not isinstance(project_root, str):
+        raise TypeError("'project_root' must be a STRING")
+    elif len(project_root) < 1:
+        raise ValueError("'project_root' cannot be empty")
+
+    if not isinstance(file_id, str):
+        raise TypeError("'file_id' must be a STRING")
+    elif len(file_id) < 1:
+        raise ValueError("'file_id' cannot be empty")
+
+    if not isinstance(start, int) or isinstance(start, bool):
+        raise TypeError("'start' must be an INTEGER")
+    elif start < 0:
+        raise ValueError("'start' cannot be negative")
+
+    if end is not None and (
+            not isinstance(end, int) or isinstance(end, bool)):
+        raise TypeError("'end' must be an INTEGER")
+    elif end is not None and end < start:
+        raise ValueError("'end' cannot be before 'start'")
+
+    if not isinstance(unit, FileRangeUnit):
+        raise TypeError("'unit' must be a FileRangeUnit")
+
+    ref = __read_ref(project_root, file_id)
+    blob = __find_blob_file(project_root, ref["current"]) \
+        if ref is not None else None
+
+    if blob is None:
+        file_contents = __read_cached_file(project_root, file_id, 0)
+        if file_contents is None:
+            raise FileNotFoundError(
+                f"For project in '{project_root}', there is no cache for "
+                f"file with ID '{file_id}'")
+
+        return __slice_contents(file_contents, start, end, unit)
+
+    blob_file, compression = blob
+    if unit == FileRangeUnit.BYTES:
+        return __read_blob_bytes(
+            blob_file,
+            compression,
+            start,
+            end if end is not None else sys.maxsize
+        ).decode(errors='replace')
+
+    line_index = __get_line_index(blob_file, compression)
+    line_count = len(line_index) // 2 - 1
+
+    if unit == FileRangeUnit.LINES:
+        first_line = min(start, line_count)
+        end_line = line_count if end is None else min(end, line_count)
+        return __read_blob_bytes(
+            blob_file,
+            compression,
+            line_index[2 * first_line],
+            line_index[2 * end_line]).decode()
+
+    file_length = line_index[-1]
+    start = min(start, file_length)
+    end = file_length if end is None else min(end, file_length)
+
+    # The lines from the one the range starts in up to the first line
+    # starting at or after the end of the range are read and decoded.
+    def line_character_offset(line: int) -> int:
+        return line_index[2 * line + 1]
+
+    first_line = bisect.bisect_right(
+        range(line_count + 1), start, key=line_character_offset) - 1
+    end_line = bisect.bisect_left(
+        range(line_count + 1), end, key=line_character_offset)
+
+    lines_contents = __read_blob_bytes(
+        blob_file,
+        compression,
+        line_index[2 * first_line],
+        line_index[2 * end_line]).decode()
+
+    lines_start = line_character_offset(first_line)
+    return lines_contents[start - lines_start:end - lines_start]
+
+
+def migrate_cache_compression(project_root: str | None = None) -> dict:
+    """Recompress the blobs saved with another compression than the
+    configured one, like the uncompressed blobs of caches saved before
+    compression was enabled. Each blob is written with the configured
+    compression before the old blob is removed, so the cache can be read
+    while it is migrated.
+
+    :param project_root: The project root directory of the cache to
+    migrate, or None to migrate the caches of all projects.
+    :type project_root: str|None
+
+    :return: The number of 'blobs' found and 'migrated', and the size of the
+    migrated blobs in bytes 'before' and 'after' the migration.
+    :rtype: dict
+    """
+    cache_path = __get_cache_path(project_root) \
+        if project_root is not None else CONFIG_LOCATION_CACHE
+    configured_compression = CacheCompression(CONFIG_CACHE_COMPRESSION)
+    suffix_compressions = {
+        suffix: compression
+        for compression, suffix in CACHE_COMPRESSION_SUFFIXES.items()}
+
+    migration = {"blobs": 0, "migrated": 0, "before": 0, "after": 0}
+    for directory_path, _, file_names in os.walk(cache_path):
+        if os.path.basename(os.path.dirname(directory_path)) != \
+                CACHE_BLOBS_DIRECTORY:
+            continue
+
+        for file_name in file_names:
+            blob_hash, suffix = os.path.splitext(file_name)
+            if suffix not in suffix_compressions:
+                continue
+
+            migration["blobs"] += 1
+            compression = suffix_compressions[suffix]
+            if compression == configured_compression:
+                continue
+
+            blob_file = os.path.join(directory_path, file_name)
+            migrated_blob_file = os.path.join(
+                directory_path,
+                blob_hash + CACHE_COMPRESSION_SUFFIXES[configured_compression])
+            __write_file_atomic(
+                migrated_blob_file,
+                __compress(
+                    str.encode(__decode_blob(blob_file, compression)),
+                    configured_compression))
+
+            migration["migrated"] += 1
+            migration["before"] += os.path.getsize(blob_file)
+            migration["after"] += os.path.getsize(migrated_blob_file)
+            os.remove(blob_file)
+
+    return migration
+
+
+@contextlib.contextmanager
+def lock_project_cache(project_root: str):
+    """Lock the cache of the project while the project is analyzed. Any
+    number of analyses can hold the lock at once, but the cache maintenance
+    leaves the cache of a locked project alone. The lock is held on the
+    cache directory of the project, and released when the process exits.
+
+    :param project_root: The complete project root directory.
+    :type project_root: str
+    """
+    cache_path = __get_cache_path(project_root)
+    while True:
+        os.makedirs(cache_path, exist_ok=True)
+        directory_descriptor = os.open(cache_path, os.O_RDONLY)
+        fcntl.flock(directory_descriptor, fcntl.LOCK_SH)
+
+        # The maintenance can remove the cache while the lock is waited for,
+        # and then the lock is held on a directory that no longer exists.
+        try:
+            if os.stat(cache_path).st_ino == \
+                    os.fstat(directory_descriptor).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+
+        os.close(directory_descriptor)
+
+    try:
+        yield
+    finally:
+        os.close(directory_descriptor)
+
+
+@contextlib.contextmanager
+def __try_lock_cache_directory(cache_directory: str):
+    """Lock the cache directory of a project for the cache maintenance,
+    unless an analysis of the project holds the lock.
+
+    :param cache_directory: The cache directory of the project.
+    :type cache_directory: str
+
+    :return: Whether the lock was acquired.
+    :rtype: bool
+    """
+    try:
+        directory_descriptor = os.open(cache_directory, os.O_RDONLY)
+    except FileNotFoundError:
+        yield False
+        return
+
+    try:
+        try:
+            fcntl.flock(directory_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            locked = True
+        except BlockingIOError:
+            locked = False
+
+        yield locked
+    finally:
+        os.close(directory_descriptor)
+
+
+@contextlib.contextmanager
+def lock_cache_maintenance():
+    """Lock the caches of all projects for one run of the cache maintenance,
+    unless another run, of this or another process, holds the lock.
+
+    :return: Whether the lock was acquired.
+    :rtype: bool
+    """
+    os.makedirs(CONFIG_LOCATION_CACHE, exist_ok=True)
+    with open(CONFIG_LOCATION_CACHE + "/" + CACHE_MAINTENANCE_LOCK_FILE,
+              'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            locked = True
+        except BlockingIOError:
+            locked = False
+
+        yield locked
+
+
+def __list_cache_directories() -> list:
+    """List the cache directories of all projects.
+
+    :return: The paths of the cache directories.
+    :rtype: list
+    """
+    if not os.path.isdir(CONFIG_LOCATION_CACHE):
+        return []
+
+    with os.scandir(CONFIG_LOCATION_CACHE) as entries:
+        return [entry.path for entry in entries if entry.is_dir()]
+
+
+def __get_directory_size(directory: str) -> int:
+    """Get the size of all files in a directory and its sub directories.
+
+    :param directory: The directory.
+    :type directory: str
+
+    :return: The size in bytes.
+    :rtype: int
+    """
+    size = 0
+    for directory_path, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            file_path = os.path.join(directory_path, file_name)
+            try:
+                size += os.path.getsize(file_path)
+            except FileNotFoundError:
+                pass
+
+    return size
+
+
+def __remove_cache_files(file_paths: list) -> int:
+    """Remove files from the cache, ignoring those already removed.
+
+    :param file_paths: The paths of the files.
+    :type file_paths: list
+
+    :return: The number of bytes freed.
+    :rtype: int
+    """
+    freed = 0
+    for file_path in file_paths:
+        try:
+            size = os.path.getsize(file_path)
+            os.remove(file_path)
+            freed += size
+        except FileNotFoundError:
+            pass
+
+    return freed
+
+
+def __scan_cache_directory(cache_directory: str) -> dict:
+    """Scan the cache directory of a project for what the cache maintenance
+    needs to know about it.
+
+    The 'files' of the scan map the file ID hash of every cached file to its
+    ref and legacy cache 'paths', their 'size', the time it was last 'used'
+    and the hashes of the 'blobs' it needs. The 'blobs' map every blob hash
+    to the 'paths' and 'size' of the blob and its line index, and the
+    'references' to the number of files needing the blob. The 'temporary'
+    files are listed with the time they were last modified.
+
+    :param cache_directory: The cache directory of the project.
+    :type cache_directory: str
+
+    :return: The scan.
+    :rtype: dict
+    """
+    scan = {"files": {}, "blobs": {}, "references": {}, "temporary": []}
+    for directory_path, _, file_names in os.walk(cache_directory):
+        for file_name in file_names:
+            file_path = os.path.join(directory_path, file_name)
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+
+            if file_name.endswith(CACHE_TEMPORARY_SUFFIX):
+                scan["temporary"].append((file_path, file_stat.st_mtime))
+                continue
+
+            blob_hashes = set()
+            if directory_path == cache_directory and \
+                    file_name.endswith("[OLD].js"):
+                file_hash = file_name[:-len("[OLD].js")]
+            elif directory_path == cache_directory and \
+                    file_name.endswith(".js"):
+                file_hash = file_name[:-len(".js")]
+            elif os.path.dirname(directory_path) == cache_directory and \
+                    os.path.basename(directory_path) == \
+                    CACHE_REFS_DIRECTORY and file_name.endswith(".json"):
+                file_hash = file_name[:-len(".json")]
+                try:
+                    with open(file_path, 'r') as ref_file:
+                        ref = json.load(ref_file)
+                except (OSError, ValueError):
+                    ref = {}
+
+                blob_hashes = {ref.get("current")} | {
+                    version.get("hash")
+                    for version in ref.get("history", [])
+                    if "delta" not in version}
+                blob_hashes.discard(None)
+            elif os.path.basename(os.path.dirname(directory_path)) == \
+                    CACHE_BLOBS_DIRECTORY:
+                blob = scan["blobs"].setdefault(
+                    file_name.split(".", 1)[0], {"paths": [], "size": 0})
+                blob["paths"].append(file_path)
+                blob["size"] += file_stat.st_size
+                continue
+            else:
+                continue
+
+            cached_file = scan["files"].setdefault(
+                file_hash,
+                {"paths": [], "size": 0, "used": 0, "blobs": set()})
+            cached_file["paths"].append(file_path)
+            cached_file["size"] += file_stat.st_size
+            cached_file["used"] = max(cached_file["used"], file_stat.st_mtime)
+            cached_file["blobs"] |= blob_hashes
+
+    for cached_file in scan["files"].values():
+        for blob_hash in cached_file["blobs"]:
+            scan["references"][blob_hash] = \
+                scan["references"].get(blob_hash, 0) + 1
+
+    return scan
+
+
+def __get_scan_size(scan: dict) -> int:
+    """Get the size of the cached files and blobs of a scan.
+
+    :param scan: The scan of the cache directory of a project.
+    :type scan: dict
+
+    :return: The size in bytes.
+    :rtype: int
+    """
+    return \
+        sum(cached_file["size"] for cached_file in scan["files"].values()) + \
+        sum(blob["size"] for blob in scan["blobs"].values())
+
+
+def __evict_cached_file(scan: dict, file_hash: str, remove: bool) -> int:
+    """Evict a file from the scan of the cache directory of a project,
+    together with the blobs no other file needs.
+
+    :param scan: The scan of the cache directory of a project.
+    :type scan: dict
+    :param file_hash: The file ID hash of the file.
+    :type file_hash: str
+    :param remove: Whether to remove the files from disk, or only from the
+    scan to find out how much evicting it would free.
+    :type remove: bool
+
+    :return: The number of bytes freed.
+    :rtype: int
+    """
+    cached_file = scan["files"].pop(file_hash)
+    paths = list(cached_file["paths"])
+    freed = cached_file["size"]
+    for blob_hash in cached_file["blobs"]:
+        scan["references"][blob_hash] -= 1
+        if scan["references"][blob_hash] == 0 and blob_hash in scan["blobs"]:
+            blob = scan["blobs"].pop(blob_hash)
+            paths += blob["paths"]
+            freed += blob["size"]
+
+    return __remove_cache_files(paths) if remove else freed
+
+
+def collect_cache_garbage(
+        live_projects: dict, live_since: float | None = None) -> dict:
+    """Remove what is no longer needed from the caches of all projects: the
+    caches of projects that are not live, the cached files of file IDs that
+    are not live in their project, the blobs and line indexes no cached file
+    needs, and temporary files left behind by writes that never finished.
+
+    The caches of projects locked by an analysis are skipped. Caches and
+    files used since live_since are kept, as they were saved after the live
+    projects were listed.
+
+    :param live_projects: The complete root directory of every live project,
+    mapped to the set of its live file IDs, or to None to keep all of its
+    cached files.
+    :type live_projects: dict
+    :param live_since: The time the live projects were listed, or None.
+    :type live_since: float|None
+
+    :return: The number of 'projects', 'files' and 'blobs' removed, the
+    number of projects 'skipped' since they were locked, and the number of
+    bytes 'freed'.
+    :rtype: dict
+    """
+    live_cache_directories = {
+        __get_cache_path(project_root): live_file_ids
+        for project_root, live_file_ids in live_projects.items()}
+
+    collection = {
+        "projects": 0, "files": 0, "blobs": 0, "skipped": 0, "freed": 0}
+    for cache_directory in __list_cache_directories():
+        with __try_lock_cache_directory(cache_directory) as locked:
+            if not locked:
+                collection["skipped"] += 1
+                continue
+
+            scan = __scan_cache_directory(cache_directory)
+
+            if cache_directory not in live_cache_directories:
+                if live_since is not None and any(
+                        cached_file["used"] >= live_since
+                        for cached_file in scan["files"].values()):
+                    continue
+
+                collection["freed"] += __get_directory_size(cache_directory)
+                collection["projects"] += 1
+                shutil.rmtree(cache_directory, ignore_errors=True)
+                continue
+
+            live_file_ids = live_cache_directories[cache_directory]
+            if live_file_ids is not None:
+                live_file_hashes = {
+                    __hash_name(file_id) for file_id in live_file_ids}
+                for file_hash, cached_file in list(scan["files"].items()):
+                    if file_hash in live_file_hashes or (
+                            live_since is not None and
+                            cached_file["used"] >= live_since):
+                        continue
+
+                    collection["freed"] += __remove_cache_files(
+                        scan["files"].pop(file_hash)["paths"])
+                    collection["files"] += 1
+
+            needed_blob_hashes = set().union(
+                *(cached_file["blobs"]
+                  for cached_file in scan["files"].values()))
+            for blob_hash, blob in scan["blobs"].items():
+                if blob_hash not in needed_blob_hashes:
+                    collection["freed"] += __remove_cache_files(blob["paths"])
+                    collection["blobs"] += 1
+
+            for temporary_path, modified in scan["temporary"]:
+                if time.time() - modified > CACHE_TEMPORARY_MAX_AGE:
+                    collection["freed"] += \
+                        __remove_cache_files([temporary_path])
+
+    return collection
+
+
+def enforce_cache_quota(
+        max_project_size: int | None = None,
+        max_total_size: int | None = None) -> dict:
+    """Evict the least recently used files from the caches until the cache
+    of every project is at most max_project_size bytes, and the caches of
+    all projects together at most max_total_size bytes. Evicted files are
+    analyzed in full again the next time their project is analyzed.
+
+    The caches of projects locked by an analysis count towards the total
+    size, but nothing is evicted from them. The other caches are evicted
+    from until they fit in what the locked caches leave of the total quota,
+    and not at all if the locked caches alone exceed it.
+
+    :param max_project_size: The max size of the cache of a project in
+    bytes, or None for no limit.
+    :type max_project_size: int|None
+    :param max_total_size: The max size of all caches in bytes, or None for
+    no limit.
+    :type max_total_size: int|None
+
+    :return: The number of 'files' evicted, the number of projects 'skipped'
+    since they were locked, the number of bytes 'freed' and the 'size' of
+    all caches after the eviction.
+    :rtype: dict
+    """
+    quota = {"files": 0, "skipped": 0, "freed": 0, "size": 0}
+    scans = {}
+    locked_size = 0
+    for cache_directory in __list_cache_directories():
+        with __try_lock_cache_directory(cache_directory) as locked:
+            if not locked:
+                quota["skipped"] += 1
+                locked_size += __get_directory_size(cache_directory)
+                continue
+
+            scan = __scan_cache_directory(cache_directory)
+            size = __get_scan_size(scan)
+            least_recently_used = sorted(
+                scan["files"],
+                key=lambda cached_hash: scan["files"][cached_hash]["used"])
+            for file_hash in least_recently_used:
+                if max_project_size is None or size <= max_project_size:
+                    break
+
+                freed = __evict_cached_file(scan, file_hash, True)
+                size -= freed
+                quota["freed"] += freed
+                quota["files"] += 1
+
+            scans[cache_directory] = scan
+            quota["size"] += size
+
+    quota["size"] += locked_size
+    if max_total_size is None or quota["size"] <= max_total_size or \
+            locked_size >= max_total_size:
+        return quota
+
+    # Find the last use of the files to evict from all projects together to
+    # get below the total quota, then evict them one project at a time.
+    size = quota["size"]
+    evict_used_until = None
+    for used, cache_directory, file_hash in sorted(
+            (cached_file["used"], cache_directory, file_hash)
+            for cache_directory, scan in scans.items()
+            for file_hash, cached_file in scan["files"].items()):
+        if size <= max_total_size:
+            break
+
+        size -= __evict_cached_file(scans[cache_directory], file_hash, False)
+        evict_used_until = used
+
+    if evict_used_until is None:
+        return quota
+
+    for cache_directory in scans:
+        with __try_lock_cache_directory(cache_directory) as locked:
+            if not locked:
+                continue
+
+            scan = __scan_cache_directory(cache_directory)
+            for file_hash, cached_file in list(scan["files"].items()):
+                if cached_file["used"] > evict_used_until:
+                    continue
+
+                freed = __evict_cached_file(scan, file_hash, True)
+                quota["size"] -= freed
+                quota["freed"] += freed
+                quota["files"] += 1
+
+    return quota
+
+
+def get_file_hash(project_root: str, file_id: str, version: int = 0) -> str:
+    """Get the hash of the contents of a cached version of the given file in
+    the given project, without reading the contents when possible. Equal
+    hashes mean equal contents.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to get the hash of.
+    :type file_id: str
+    :param version: The version of the file, 0 for the current version, 1
+    for the version before it and so on.
+    :type version: int
+
+    :return: The sha256 hash of the contents of the version.
+    :rtype: str
+
+    :raises FileNotFoundError: If there is no such version in the cache.
+    """
+    ref = __read_ref(project_root, file_id)
+    if ref is not None and version == 0:
+        return ref["current"]
+    elif ref is not None and 0 < version <= len(ref["history"]):
+        return ref["history"][version - 1]["hash"]
+
+    file_contents = __read_cached_file(project_root, file_id, version)
+    if file_contents is None:
+        raise FileNotFoundError(
+            f"For project in '{project_root}', there is no version {version} "
+            f"in the cache for file with ID '{file_id}'")
+
+    return __hash_contents(file_contents)
+
+
+def count_file_versions(project_root: str, file_id: str) -> int:
+    """Count the versions of the given file in the given project that are
+    kept in the cache.
+
+    :param project_root: The project root directory.
+    :type project_root: str
+    :param file_id: The file ID for the file to count the versions of.
+    :type file_id: str
+
+    :return: The number of versions, the current version included, that can
+    be read with read_file. 0 if the file is not cached.
+    :rtype: int
+    """
+    ref = __read_ref(project_root, file_id)
+    if ref is not None:
+        return 1 + len(ref["history"])
+
+    return sum(
+        1 for cache_file in (
+            __get_cache_file(project_root, file_id),
+            __get_old_cache_file(project_root, file_id))
+        if os.path.isfile(cache_file))
+
+
 def compare_file_cache(
         project_root: str, file_id: str, new_file_data: str
 ) -> str:
@@ -231,12 +1562,13 @@ def compare_file_cache(
     elif len(new_file_data) < 1:
         raise ValueError("'new_file_data' cannot be empty")
 
-    if not os.path.isfile(__get_cache_file(project_root, file_id)):
+    cache_contents = __read_cached_file(project_root, file_id, 0)
+    if cache_contents is None:
         raise FileNotFoundError(
             f"For project in '{project_root}', there is no cache for file "
             f"with ID '{file_id}' to use for comparison.")
 
-    cache_contents_lines = read_file(project_root, file_id).splitlines()
+    cache_contents_lines = cache_contents.splitlines()
     new_file_data_lines = new_file_data.splitlines()
     differ_handler = difflib.Differ()
     differences = \
@@ -254,10 +1586,7 @@ def save_global_session(cache_prop, cache_value):
     :type cache_value: Any
     :return: Nothing
     """
-    __MEMORY[cache_prop] = {
-        "value": cache_value,
-        "time": datetime.datetime.now()
-    }
+    __MEMORY.set(cache_prop, cache_value)
 
 
 def read_global_session(cache_prop):
@@ -270,19 +1599,48 @@ def read_global_session(cache_prop):
     :return: The contents of the cache if it exists, otherwise None. Also
     if the contents have expired None is returned.
     """
-    if cache_prop in __MEMORY:
-        cache_age_seconds = \
-            (
-                    datetime.datetime.now() - __MEMORY[cache_prop]["time"]
-            ).total_seconds()
+    return __MEMORY.get(cache_prop)
 
-        if cache_age_seconds <= __MEMORY_MAX_TIME:
-            return __MEMORY[cache_prop]["value"]
 
-        else:
-            __MEMORY.pop(cache_prop, None)
+def read_or_load_global_session(cache_prop, loader):
+    """Read from the working memory cache, or load and save the item if it
+    is not cached or has expired. If the item is invalidated while it is
+    loading, the loaded value is returned but not saved.
 
-    return None
+    :param cache_prop: The name of the item in memory to read.
+    :type cache_prop: str
+    :param loader: Function without arguments loading the item.
+    :type loader: callable
+
+    :return: The cached or loaded contents.
+    """
+    return __MEMORY.get_or_load(cache_prop, loader)
+
+
+def invalidate_global_session(cache_prop=None):
+    """Remove an item from the working memory cache, or all items. Called
+    when what the items were computed from changes, like when an analysis
+    is done.
+
+    :param cache_prop: The name of the item in memory to remove, None to
+    remove all items.
+    :type cache_prop: str|None
+    :return: Nothing
+    """
+    if cache_prop is None:
+        __MEMORY.clear()
+    else:
+        __MEMORY.remove(cache_prop)
+
+
+def get_global_session_statistics() -> dict:
+    """Get the size and the hit, miss, eviction and expiration counters of
+    the working memory cache.
+
+    :return: The statistics, see MemoryCache.get_statistics.
+    :rtype: dict
+    """
+    return __MEMORY.get_statistics()
 
 
 def debug_get_cache_info(project_root: str, file_id: str):
@@ -291,4 +1649,4 @@ def debug_get_cache_info(project_root: str, file_id: str):
     print(f"{'project_root cache': <{ns}}: "
           f"{' .' + __get_cache_path(project_root)[62:]:.>{ws}}")
     print(f"{'file_id cache': <{ns}}: "
-          f"{' .' + __get_cache_file(project_root, file_id)[127:]:.>{ws}}")
+          f"{' .' + __get_ref_file(project_root, file_id)[127:]:.>{ws}}")
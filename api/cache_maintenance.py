@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from api.cache import collect_cache_garbage, enforce_cache_quota, \
+    lock_cache_maintenance
+from api.instances.logging_standard import logging
+
+
+class CacheMaintenance:
+    """Background maintenance of the analysis caches of all projects.
+
+    Every run reconciles the caches with the database: the caches of
+    projects with no functions in the database are removed, and so are the
+    cached files of files with no functions in their project, and the blobs
+    no cached file needs. Then the least recently used files are evicted
+    until the caches are within the quotas. The caches of projects being
+    analyzed are left alone, so runs never block analyses.
+
+    :param database_handler: The database to reconcile the caches with.
+    :type database_handler: DatabaseHandler
+    :param interval: The number of seconds between the runs.
+    :type interval: float
+    :param max_project_size: The max size of the cache of a project in
+    bytes, or None for no limit.
+    :type max_project_size: int|None
+    :param max_total_size: The max size of all caches in bytes, or None for
+    no limit.
+    :type max_total_size: int|None
+
+    :rtype: None
+    """
+
+    def __init__(
+            self,
+            database_handler,
+            interval: float = 3600,
+            max_project_size: int | None = None,
+            max_total_size: int | None = None) -> None:
+        if not isinstance(interval, (int, float)) or \
+                isinstance(interval, bool):
+            raise TypeError("'interval' must be a NUMBER")
+        elif interval <= 0:
+            raise ValueError("'interval' must be positive")
+
+        self.database_handler = database_handler
+        self.interval = interval
+        self.max_project_size = max_project_size
+        self.max_total_size = max_total_size
+
+        self.runs = 0
+        self.last_run = None
+
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def get_live_projects(self) -> dict:
+        """Get the projects with functions in the database, and the file IDs
+        of the files with functions in each of them.
+
+        :return: The complete root directory of every project, mapped to the
+        set of its file IDs.
+        :rtype: dict
+        """
+        all_functions = self.database_handler.get_function_info(
+            {}, projection=['pathToProject', 'fileId'])
+        if all_functions is None:
+            return {}
+
+        live_projects = {}
+        for function_info in all_functions:
+            live_projects.setdefault(
+                os.path.abspath(function_info["pathToProject"]), set()).add(
+                function_info["fileId"])
+
+        return live_projects
+
+    def run(self) -> dict | None:
+        """Run the maintenance once, unless another run is in progress.
+
+        :return: The time the run was 'started', its 'duration' in seconds,
+        and the results of the garbage 'collection' and the 'quota', see
+        collect_cache_garbage and enforce_cache_quota. None if another run
+        was in progress.
+        :rtype: dict|None
+        """
+        with lock_cache_maintenance() as locked:
+            if not locked:
+                return None
+
+            started = time.time()
+            collection = collect_cache_garbage(
+                self.get_live_projects(), live_since=started)
+            quota = enforce_cache_quota(
+                self.max_project_size, self.max_total_size)
+
+        self.runs += 1
+        self.last_run = {
+            "started": started,
+            "duration": time.time() - started,
+            "collection": collection,
+            "quota": quota
+        }
+        logging.info(
+            f"Cache maintenance removed {collection['projects']} projects, "
+            f"{collection['files']} files and {collection['blobs']} blobs, "
+            f"evicted {quota['files']} files, freed "
+            f"{collection['freed'] + quota['freed']} bytes, "
+            f"{quota['size']} bytes cached")
+
+        return self.last_run
+
+    def __run_periodically(self) -> None:
+        while not self.__stopped.is_set():
+            try:
+                self.run()
+            except Exception:
+                logging.exception("Cache maintenance failed")
+
+            self.__stopped.wait(self.interval)
+
+    def start(self) -> None:
+        """Start running the maintenance every interval seconds in a daemon
+        thread, the first run right away.
+
+        :return: None
+        """
+        if self.__thread is not None:
+            return
+
+        self.__stopped.clear()
+        self.__thread = threading.Thread(
+            target=self.__run_periodically,
+            name="cache-maintenance",
+            daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop running the maintenance, waiting for a run in progress to
+        finish.
+
+        :return: None
+        """
+        if self.__thread is None:
+            return
+
+        self.__stopped.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def get_statistics(self) -> dict:
+        """Get the number of runs and the result of the last run.
+
+        :return: The number of 'runs', whether the maintenance is 'running'
+        periodically, and the 'lastRun', see run.
+        :rtype: dict
+        """
+        return {
+            "runs": self.runs,
+            "running": self.__thread is not None,
+            "lastRun": self.last_run
+        }
@@ -1,14 +1,59 @@
-from pymongo import MongoClient
+import hashlib
+import os
+import secrets
+import threading
+import weakref
+from enum import Enum
+from pymongo import MongoClient, InsertOne, UpdateOne, UpdateMany, \
+    DeleteOne, DeleteMany
 from bson.objectid import ObjectId
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import ConnectionFailure, DuplicateKeyError
 from pprint import pprint
 from pathlib import Path
 
 import yaml
 
+from api.instances.logging_standard import logging
+from api.storage.documents import project_document
+from api.storage.instrumented import InstrumentedStorageBackend
+from api.storage.mongodb import ConnectionPoolStatistics
+from api.storage.query_metrics import QueryMetrics, get_filter_shape
+from api.storage.sqlite import SQLiteStorageBackend
+from api.storage.write_buffer import BufferedWrite, WriteBuffer
+
 FUNCTION_INFO_COLLECTION = 'functionInfo'
 TEST_INFO_COLLECTION = 'testInfo'
 FUNCTION_DEPENDENCY_COLLECTION = 'functionDependency'
+PROJECT_VERSION_COLLECTION = 'projectVersion'
+
+# Collections with a version per project, see get_project_version
+VERSIONED_COLLECTIONS = [FUNCTION_INFO_COLLECTION, TEST_INFO_COLLECTION]
+
+SQLITE_URL_PREFIX = 'sqlite://'
+
+# Fields to index in storage backends that don't create indexes on their own
+COLLECTION_INDEXES = {
+    FUNCTION_INFO_COLLECTION: [
+        ('pathToProject', 'fileId', 'functionId'),
+        ('pathToProject', 'haveFunctionChanged')
+    ],
+    TEST_INFO_COLLECTION: [
+        ('pathToProject', 'fileId', 'functionId')
+    ],
+    FUNCTION_DEPENDENCY_COLLECTION: [
+        ('pathToProject', 'fileId', 'functionId'),
+        ('pathToProject', 'calledFileId', 'calledFunctionId')
+    ]
+}
+
+FILTER_LIST_OPERATORS = ['$in', '$nin']
+FILTER_COMPARISON_OPERATORS = ['$gt']
+
+
+class DBOperation(Enum):
+    ADD = "ADD"
+    SET = "SET"
+    REMOVE = "REMOVE"
 
 
 def __check_for_valid_string(in_arg: str) -> bool:
@@ -87,35 +132,57 @@ def __db_to_app_string_conv(db_string: str) -> str:
 
 
 def app_to_db_doc_conv(app_document, document_attribute_checker):
-    db_document = app_document.copy()
+    return compile_attribute_checker(
+        document_attribute_checker).app_to_db_doc_conv(app_document)
 
-    for attribute, value in db_document.items():
-        if document_attribute_checker[attribute]['app_to_db_conv']:
-            db_document[attribute] = document_attribute_checker[
-                attribute]['app_to_db_conv'](value)
 
-    return db_document
+def db_to_app_doc_conv(db_document, document_attribute_checker):
+    return compile_attribute_checker(
+        document_attribute_checker).db_to_app_doc_conv(db_document)
 
 
-def db_to_app_doc_conv(db_document, document_attribute_checker):
-    app_document = db_document.copy()
+def is_filter_operator_value(filter_value) -> bool:
+    """Checks if a filter value is a query operator object, like
+    {'$in': [...]} or {'$gt': value}, rather than a value to compare with.
 
-    for attribute, value in app_document.items():
-        if document_attribute_checker[attribute]['db_to_app_conv']:
-            app_document[attribute] = document_attribute_checker[
-                attribute]['db_to_app_conv'](value)
+    :param filter_value: The filter value to check.
 
-    return app_document
+    :return: Boolean value indicating if the value is a query operator object.
+    """
+    return isinstance(filter_value, dict) and len(filter_value) > 0 and \
+        all(isinstance(operator, str) and operator.startswith('$')
+            for operator in filter_value)
+
+
+def app_to_db_filter_conv(app_filter, document_attribute_checker):
+    app_to_db_convs = \
+        compile_attribute_checker(document_attribute_checker).app_to_db_convs
+    db_filter = {}
+
+    for attribute, value in app_filter.items():
+        conv = app_to_db_convs[attribute]
+
+        if is_filter_operator_value(value):
+            db_filter[attribute] = {}
+            for operator, operator_value in value.items():
+                if operator in FILTER_COMPARISON_OPERATORS:
+                    db_filter[attribute][operator] = \
+                        conv(operator_value) if conv else operator_value
+                else:
+                    db_filter[attribute][operator] = \
+                        [conv(item) for item in operator_value] \
+                        if conv else list(operator_value)
+        elif conv:
+            db_filter[attribute] = conv(value)
+        else:
+            db_filter[attribute] = value
+
+    return db_filter
 
 
 def add_default_values(document, document_attribute_checker):
-    for attribute_key in document_attribute_checker:
-        if attribute_key not in document:
-            if 'standard_value' in document_attribute_checker[attribute_key]:
-                if attribute_key not in document:
-                    document[attribute_key] = document_attribute_checker[
-                        attribute_key][
-                        'standard_value']
+    compile_attribute_checker(
+        document_attribute_checker).add_default_values(document)
 
 
 FUNCTION_INFO_ATTRIBUTE_CHECKER = {
@@ -155,6 +222,12 @@ FUNCTION_INFO_ATTRIBUTE_CHECKER = {
         'app_to_db_conv': lambda app_data: [app_data[0], app_data[1]],
         'db_to_app_conv': lambda db_data: tuple(db_data)
     },
+    'previousFunctionRange': {
+        'type': tuple,
+        'cond': __check_for_valid_function_range,
+        'app_to_db_conv': lambda app_data: [app_data[0], app_data[1]],
+        'db_to_app_conv': lambda db_data: tuple(db_data)
+    },
     'functionHash': {
         'type': str,
         'cond': __check_for_valid_string,
@@ -289,57 +362,329 @@ FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER = {
 }
 
 
-def check_valid_document_attributes(
-        attribute_filter_value_dict: dict,
-        attribute_property_checker: dict,
-        *, strict_compare: bool = False
-) -> None:
-    for attribute_key, attribute_value in attribute_filter_value_dict.items():
+class CompiledAttributeChecker:
+    """An attribute checker compiled into lookup tables and converter lists,
+    so that documents can be validated and converted without walking the
+    nested attribute checker dictionaries for every attribute. The checks
+    raise the same errors, with the same messages, as the attribute checker
+    describes.
+
+    :param attribute_property_checker: The attribute checker to compile.
+    """
+    __slots__ = (
+        'attribute_property_checker', 'attribute_types', 'attribute_conds',
+        'app_to_db_convs', 'db_to_app_convs', 'required_attributes',
+        'standard_values')
+
+    def __init__(self, attribute_property_checker: dict) -> None:
+        self.attribute_property_checker = attribute_property_checker
+
+        self.attribute_types = {
+            attribute_key: attribute_properties['type']
+            for attribute_key, attribute_properties
+            in attribute_property_checker.items()}
+
+        self.attribute_conds = {
+            attribute_key: attribute_properties['cond']
+            for attribute_key, attribute_properties
+            in attribute_property_checker.items()}
+
+        self.app_to_db_convs = {
+            attribute_key: attribute_properties['app_to_db_conv']
+            for attribute_key, attribute_properties
+            in attribute_property_checker.items()}
+
+        self.db_to_app_convs = {
+            attribute_key: attribute_properties['db_to_app_conv']
+            for attribute_key, attribute_properties
+            in attribute_property_checker.items()}
+
+        self.required_attributes = tuple(
+            attribute_key for attribute_key in attribute_property_checker
+            if attribute_key != '_id')
+
+        self.standard_values = tuple(
+            (attribute_key, attribute_properties['standard_value'])
+            for attribute_key, attribute_properties
+            in attribute_property_checker.items()
+            if 'standard_value' in attribute_properties)
+
+    def check_document(
+            self,
+            attribute_filter_value_dict: dict,
+            *, strict_compare: bool = False
+    ) -> None:
+        """Checks that all attributes in a document are valid attributes with
+        valid values.
+
+        :param attribute_filter_value_dict: The document to check.
+        :param strict_compare: If True, all attributes except '_id' must be
+            in the document.
+
+        :return: No return value.
+
+        :raises TypeError: If an attribute or a value is of the wrong type.
+        :raises ValueError: If an attribute or a value is not valid.
+        """
+        attribute_types = self.attribute_types
+        attribute_conds = self.attribute_conds
+
+        for attribute_key, attribute_value in \
+                attribute_filter_value_dict.items():
+            attribute_type = attribute_types.get(attribute_key) \
+                if isinstance(attribute_key, str) else None
+
+            if attribute_type is None:
+                self.__raise_invalid_attribute_key(
+                    attribute_filter_value_dict,
+                    attribute_key,
+                    attribute_value)
+
+            if not isinstance(attribute_value, attribute_type):
+                raise TypeError(f"""The value of the attribute {attribute_key},
+                should be a {attribute_type}
+                type, but was given a value of type {
+            type(attribute_value)}.""")
+
+            attribute_cond = attribute_conds[attribute_key]
+            if attribute_cond and not attribute_cond(attribute_value):
+                raise ValueError(f"""
+                Attribute {attribute_key} has the value {attribute_value} which 
+                doesn't conform to the conditions for that attribute.""")
+
+        if strict_compare:
+            for item in self.required_attributes:
+                if item not in attribute_filter_value_dict:
+                    raise ValueError(f"""
+                The attribute {item} is missing form the given attribute
+                attribute dictionary.""")
 
+    @staticmethod
+    def __raise_invalid_attribute_key(
+            attribute_filter_value_dict: dict,
+            attribute_key: any,
+            attribute_value: any
+    ) -> None:
         if not isinstance(attribute_key, str):
             raise TypeError(f"""
             All keys in the {attribute_filter_value_dict} should be strings but
             got a key of type {type(attribute_key)} with the corresponding
             value: {attribute_value}.""")
 
-        if not __check_for_valid_string(attribute_key):
+        if len(attribute_key) == 0:
             raise ValueError(f"""
             A key in the {attribute_filter_value_dict}, with the corresponding
             value {attribute_value}, is an empty string.""")
 
-        if attribute_key not in attribute_property_checker:
-            raise ValueError(f"""
+        raise ValueError(f"""
             The attribute key {attribute_key} isn't a valid attribute according
             to the attribute property checker.""")
 
-        if not isinstance(
-                attribute_value,
-                attribute_property_checker[
-                    attribute_key][
-                    'type']):
-            raise TypeError(f"""The value of the attribute {attribute_key},
-                should be a {attribute_property_checker[attribute_key]['type']}
-                type, but was given a value of type {
-            type(attribute_value)}.""")
+    def app_to_db_doc_conv(self, app_document: dict) -> dict:
+        app_to_db_convs = self.app_to_db_convs
+        db_document = app_document.copy()
 
-        if attribute_property_checker[
-            attribute_key]['cond']:
-            if not attribute_property_checker[
-                attribute_key][
-                'cond'](
-                attribute_value):
-                raise ValueError(f"""
-                Attribute {attribute_key} has the value {attribute_value} which 
-                doesn't conform to the conditions for that attribute.""")
+        for attribute, value in app_document.items():
+            conv = app_to_db_convs[attribute]
+            if conv:
+                db_document[attribute] = conv(value)
+
+        return db_document
+
+    def db_to_app_doc_conv(self, db_document: dict) -> dict:
+        db_to_app_convs = self.db_to_app_convs
+        app_document = db_document.copy()
+
+        for attribute, value in db_document.items():
+            conv = db_to_app_convs[attribute]
+            if conv:
+                app_document[attribute] = conv(value)
+
+        return app_document
+
+    def add_default_values(self, document: dict) -> None:
+        for attribute_key, standard_value in self.standard_values:
+            if attribute_key not in document:
+                document[attribute_key] = standard_value
+
+
+_compiled_attribute_checkers = {}
+
+
+def compile_attribute_checker(
+        attribute_property_checker: dict
+) -> CompiledAttributeChecker:
+    """Get the compiled version of an attribute checker. Every attribute
+    checker is only compiled once.
+
+    :param attribute_property_checker: The attribute checker to compile.
+
+    :return: The compiled attribute checker.
+    """
+    compiled_checker = \
+        _compiled_attribute_checkers.get(id(attribute_property_checker))
+
+    if compiled_checker is None or \
+            compiled_checker.attribute_property_checker is not \
+            attribute_property_checker:
+        compiled_checker = \
+            CompiledAttributeChecker(attribute_property_checker)
+        _compiled_attribute_checkers[id(attribute_property_checker)] = \
+            compiled_checker
+
+    return compiled_checker
 
-    if strict_compare:
-        for item in attribute_property_checker:
-            if item == '_id':
+
+for _attribute_property_checker in [
+        FUNCTION_INFO_ATTRIBUTE_CHECKER,
+        TEST_INFO_ATTRIBUTES_CHECKER,
+        FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER]:
+    compile_attribute_checker(_attribute_property_checker)
+
+
+def check_valid_document_attributes(
+        attribute_filter_value_dict: dict,
+        attribute_property_checker: dict,
+        *, strict_compare: bool = False
+) -> None:
+    compile_attribute_checker(attribute_property_checker).check_document(
+        attribute_filter_value_dict,
+        strict_compare=strict_compare)
+
+
+def check_valid_filter_attributes(
+        attribute_filter_dict: dict,
+        attribute_property_checker: dict
+) -> None:
+    """Checks a filter the same way as a document, with the addition that an
+    attribute can be filtered with a list operator ($in or $nin), in which
+    case every value in the list is checked, or with a comparison operator
+    ($gt), in which case the compared value is checked.
+
+    :param attribute_filter_dict: The filter to check.
+    :param attribute_property_checker: The attribute checker to check with.
+
+    :return: No return value.
+
+    :raises TypeError: If an attribute or a value is of the wrong type.
+    :raises ValueError: If an attribute or a value is not valid.
+    """
+    plain_filter_dict = {}
+
+    for attribute_key, attribute_value in attribute_filter_dict.items():
+        if not is_filter_operator_value(attribute_value):
+            plain_filter_dict[attribute_key] = attribute_value
+            continue
+
+        for operator, operator_value in attribute_value.items():
+            if operator in FILTER_COMPARISON_OPERATORS:
+                check_valid_document_attributes(
+                    {attribute_key: operator_value},
+                    attribute_property_checker)
                 continue
-            if item not in attribute_filter_value_dict:
+
+            if operator not in FILTER_LIST_OPERATORS:
                 raise ValueError(f"""
-                The attribute {item} is missing form the given attribute
-                attribute dictionary.""")
+                The operator {operator} used for the attribute {attribute_key}
+                isn't a supported filter operator.""")
+
+            if not isinstance(operator_value, (list, tuple, set)):
+                raise TypeError(f"""The value of the operator {operator} for
+                the attribute {attribute_key} should be a list, but was given a
+                value of type {type(operator_value)}.""")
+
+            for item in operator_value:
+                check_valid_document_attributes(
+                    {attribute_key: item},
+                    attribute_property_checker)
+
+    check_valid_document_attributes(
+        plain_filter_dict,
+        attribute_property_checker)
+
+
+def check_valid_increment_attributes(
+        attribute_increment_dict: dict,
+        attribute_property_checker: dict
+) -> None:
+    """Checks that all attributes to increment are numeric attributes
+    according to the attribute checker and that all increments are integers.
+    The conditions for the attributes are not checked, as the resulting
+    values are not known before the increment is made.
+
+    :param attribute_increment_dict: The attributes to increment mapped to
+        their increments.
+    :param attribute_property_checker: The attribute checker to check with.
+
+    :return: No return value.
+
+    :raises TypeError: If an attribute or an increment is of the wrong type.
+    :raises ValueError: If an attribute is not valid.
+    """
+    for attribute_key, increment in attribute_increment_dict.items():
+        if attribute_key not in attribute_property_checker:
+            raise ValueError(f"""
+            The attribute key {attribute_key} isn't a valid attribute according
+            to the attribute property checker.""")
+
+        if attribute_property_checker[attribute_key]['type'] is not int:
+            raise TypeError(f"""The attribute {attribute_key} is not a
+                numeric attribute and cannot be incremented.""")
+
+        if not isinstance(increment, int) or isinstance(increment, bool):
+            raise TypeError(f"""The increment of the attribute
+                {attribute_key} should be a {int} type, but was given a value
+                of type {type(increment)}.""")
+
+
+def check_valid_projection(
+        projection: list,
+        attribute_property_checker: dict
+) -> None:
+    """Checks that a projection only contains attributes known by the
+    attribute checker.
+
+    :param projection: The names of the attributes to project.
+    :param attribute_property_checker: The attribute checker to check with.
+
+    :return: No return value.
+
+    :raises TypeError: If the projection or an attribute is of the wrong type.
+    :raises ValueError: If the projection or an attribute is not valid.
+    """
+    if not isinstance(projection, (list, tuple)):
+        raise TypeError(f"""The projection should be a list, but was given a
+            value of type {type(projection)}.""")
+
+    if len(projection) == 0:
+        raise ValueError("The projection cannot be empty.")
+
+    for attribute_key in projection:
+        if not isinstance(attribute_key, str):
+            raise TypeError(f"""
+            All attributes in the projection {projection} should be strings but
+            got an attribute of type {type(attribute_key)}.""")
+
+        if attribute_key not in attribute_property_checker:
+            raise ValueError(f"""
+            The attribute key {attribute_key} isn't a valid attribute according
+            to the attribute property checker.""")
+
+
+def make_db_projection(projection: list) -> dict:
+    """Make a database projection from a list of attribute names. The '_id'
+    attribute is only included if it's in the list.
+
+    :param projection: The names of the attributes to project.
+
+    :return: The database projection.
+    """
+    db_projection = {attribute_key: 1 for attribute_key in projection}
+
+    if '_id' not in db_projection:
+        db_projection['_id'] = 0
+
+    return db_projection
 
 
 def _import_auth_info():
@@ -348,57 +693,147 @@ def _import_auth_info():
     return config
 
 
+# Database handlers to reset in forked child processes, as database clients
+# and their connections can't be shared between processes.
+_database_handlers = weakref.WeakSet()
+
+
+def _reset_database_handlers_after_fork() -> None:
+    for database_handler in list(_database_handlers):
+        database_handler._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_database_handlers_after_fork)
+
+
 # Todo: Add error handler that can revert changes and such if error occurs.
 class DatabaseHandler:
     """
     The DatabaseHandler class is used to communicate with the database
     """
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+            self,
+            url: str,
+            *, client_options: dict = None,
+            slow_query_ms: float = None,
+            explain_slow_queries: bool = False
+    ) -> None:
         """Initiates an instance of the DatabaseHandler class.
 
         :param url: The url at which the database resides
-
-        :raises TypeError: If the given url isn't a string
-        :raises ValueError: If the given url string is empty
+        :param client_options: Extra options for the MongoClient, like the
+            options of its connection pool.
+        :param slow_query_ms: Queries taking at least this many milliseconds
+            are logged as slow, None to not log slow queries.
+        :param explain_slow_queries: If True, slow queries are logged with
+            the query plan of their filter.
+
+        :raises TypeError: If the given url isn't a string, the client
+            options aren't a dict or the slow query threshold isn't a number
+        :raises ValueError: If the given url string is empty or the slow
+            query threshold is negative
         """
 
         self.client = None
         self.database = None
         self.db_url = None
+        self.client_options = None
+        self.pool_statistics = None
+        self.query_metrics = QueryMetrics()
+        self.slow_query_ms = None
+        self.explain_slow_queries = False
+        self.write_listeners = []
+        self.__thread_local = threading.local()
+        self.__connect_lock = threading.Lock()
+        self.__connect_on_use = False
 
         if not isinstance(url, str):
             raise TypeError("url should be a string.")
         if len(url) <= 0:
             raise ValueError("Can't send empty string.")
+        if client_options is not None and not isinstance(client_options, dict):
+            raise TypeError("client_options should be a dict.")
+        if slow_query_ms is not None and (
+                not isinstance(slow_query_ms, (int, float)) or
+                isinstance(slow_query_ms, bool)):
+            raise TypeError("slow_query_ms should be a number.")
+        if slow_query_ms is not None and slow_query_ms < 0:
+            raise ValueError("slow_query_ms can't be negative.")
         self.db_url = url
+        self.client_options = client_options or {}
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow_queries = explain_slow_queries
+
+        _database_handlers.add(self)
 
         return
 
-    def connect_to_db(self) -> None:
+    def connect_to_db(self, *, lazy: bool = False) -> None:
         """Connects to the database located att the url provided during the
-        instantiation of the object.
+        instantiation of the object. An url starting with 'sqlite://'
+        followed by a file path (or ':memory:') opens an embedded SQLite
+        database instead of connecting to a MongoDB server.
+
+        A lazy connection is made by the first query instead, in the process
+        making the query. Connections are never shared with forked child
+        processes, which connect again on their first query.
+
+        :param lazy: If True, the connection is made by the first query.
 
         :return: No return value
 
         :raises RuntimeError: If the user tries to connect while already being
             connected. It can also be raised if the connection fails.
         """
-        if self.client is not None or self.database is not None:
+        if self.client is not None or self.database is not None or \
+                self.__connect_on_use:
             raise RuntimeError('Try to connect while already connected')
+
+        if lazy:
+            self.__connect_on_use = True
+            return
+
+        self.__open_connection()
+
+    def __open_connection(self) -> None:
+        if self.db_url.startswith(SQLITE_URL_PREFIX):
+            try:
+                storage_backend = SQLiteStorageBackend(
+                    self.db_url[len(SQLITE_URL_PREFIX):],
+                    indexes=COLLECTION_INDEXES)
+            except Exception as exc:
+                raise RuntimeError('Failed to open database') from exc
+
+            # The embedded storage backend is both the client to close and
+            # the database to get collections from.
+            self.client = storage_backend
+            self.database = InstrumentedStorageBackend(
+                storage_backend, self.__record_query)
+            return
+
+        pool_statistics = ConnectionPoolStatistics()
+        client = None
         try:
 
             auth_info = _import_auth_info()
 
-            self.client = MongoClient(
+            client = MongoClient(
                 self.db_url,
                 username=auth_info['auth']['username'],
-                password=auth_info['auth']['password'])
+                password=auth_info['auth']['password'],
+                event_listeners=[pool_statistics],
+                **self.client_options)
 
-            self.client.admin.command('hello')
+            client.admin.command('hello')
         except ConnectionFailure as exc:
+            if client is not None:
+                client.close()
             raise RuntimeError('Failed to open database') from exc
-        self.database = self.client.urangutest
+        self.client = client
+        self.pool_statistics = pool_statistics
+        self.database = InstrumentedStorageBackend(
+            self.client.urangutest, self.__record_query)
         return
 
     def disconnect_from_db(self) -> None:
@@ -410,21 +845,449 @@ class DatabaseHandler:
             being connected to a database.
         """
         if self.client is None or self.database is None:
+            if self.__connect_on_use:
+                self.__connect_on_use = False
+                return
+
             raise RuntimeError('Try to close non existing connection')
 
         self.client.close()
         self.client = None
         self.database = None
+        self.pool_statistics = None
+        self.__connect_on_use = False
         return
 
+    def _reset_after_fork(self) -> None:
+        """Reset the instance in a forked child process. The connection of
+        the parent process is dropped without being closed, as it is still
+        used by the parent, and the child connects again on its first query.
+
+        :return: No return value.
+        """
+        self.__connect_lock = threading.Lock()
+
+        if self.client is not None or self.database is not None:
+            self.client = None
+            self.database = None
+            self.pool_statistics = None
+            self.__connect_on_use = True
+
+    def get_pool_statistics(self) -> dict:
+        """Get the connection pool statistics of the current process.
+
+        :return: The process ID, if the process is connected, the options of
+            the client and the statistics of its connection pools, which are
+            None unless connected to a MongoDB server.
+        """
+        return {
+            'pid': os.getpid(),
+            'connected': self.client is not None,
+            'clientOptions': self.client_options,
+            'pool':
+                self.pool_statistics.get_statistics()
+                if self.pool_statistics is not None else None
+        }
+
+    def add_write_listener(self, listener) -> None:
+        """Add a listener to call after every write to the database. The
+        listener is called with the name of the collection written to and a
+        set of the paths of all projects written to, or None if the projects
+        are not known from the written documents and filters.
+
+        :param listener: The listener to add.
+
+        :return: No return value.
+        """
+        self.write_listeners.append(listener)
+
+    def remove_write_listener(self, listener) -> None:
+        """Remove a listener added with add_write_listener.
+
+        :param listener: The listener to remove.
+
+        :return: No return value.
+        """
+        self.write_listeners.remove(listener)
+
+    def get_query_statistics(self) -> list:
+        """Get the statistics of all queries made by this process.
+
+        :return: The statistics of the queries, see
+            QueryMetrics.get_statistics.
+        """
+        return self.query_metrics.get_statistics()
+
+    def begin_query_summary(self) -> None:
+        """Start summarizing the queries made by the current thread, in
+        addition to the statistics of all queries.
+
+        :return: No return value.
+
+        :raises RuntimeError: If the queries of the current thread are
+            already summarized.
+        """
+        if getattr(self.__thread_local, 'query_summary', None) is not None:
+            raise RuntimeError(
+                "The queries of the current thread are already summarized.")
+
+        self.__thread_local.query_summary = QueryMetrics()
+
+    def end_query_summary(self) -> QueryMetrics | None:
+        """Stop summarizing the queries made by the current thread.
+
+        :return: The metrics of the queries made since begin_query_summary
+            was called, or None if the queries weren't summarized.
+        """
+        query_summary = getattr(self.__thread_local, 'query_summary', None)
+        self.__thread_local.query_summary = None
+        return query_summary
+
+    def __record_query(
+            self,
+            collection: str,
+            operation: str,
+            db_filter: dict | None,
+            duration: float,
+            documents: int,
+            explain: any
+    ) -> None:
+        filter_shape = get_filter_shape(db_filter)
+        self.query_metrics.record(
+            collection, operation, filter_shape, duration, documents)
+
+        query_summary = getattr(self.__thread_local, 'query_summary', None)
+        if query_summary is not None:
+            query_summary.record(
+                collection, operation, filter_shape, duration, documents)
+
+        if self.slow_query_ms is None or duration * 1000 < self.slow_query_ms:
+            return
+
+        query_plan = None
+        if self.explain_slow_queries and explain is not None:
+            try:
+                query_plan = explain()
+            except Exception as e:
+                query_plan = f"unavailable ({e})"
+
+        logging.warning(
+            f"Slow query on {collection}: {operation} {filter_shape} took "
+            f"{duration * 1000:.1f} ms for {documents} documents" +
+            (f", query plan: {query_plan}" if query_plan is not None else ""))
+
+    def begin_write_buffer(
+            self,
+            *, max_operations: int = 1000,
+            max_delay: float = 1.0
+    ) -> None:
+        """Start buffering the writes made by the current thread. Added,
+        updated and removed documents are buffered and written in one bulk
+        write per collection once max_operations writes are buffered, once
+        max_delay seconds have passed since the first buffered write or when
+        flush_write_buffer or end_write_buffer is called. Counting writes,
+        increments and bulk writes are not buffered, but flush the buffered
+        writes to their collection first.
+
+        Reads made by the current thread see its buffered writes, while
+        other threads see them once they are flushed. The write listeners
+        are also called once the writes are flushed.
+
+        :param max_operations: The number of buffered writes to flush at.
+        :param max_delay: The number of seconds after the first buffered
+            write to flush at.
+
+        :return: No return value.
+
+        :raises RuntimeError: If the writes of the current thread are
+            already buffered.
+        """
+        if self.is_write_buffered():
+            raise RuntimeError(
+                "The writes of the current thread are already buffered.")
+
+        self.__thread_local.write_buffer = WriteBuffer(
+            max_operations=max_operations,
+            max_delay=max_delay)
+
+    def is_write_buffered(self) -> bool:
+        """Check if the writes of the current thread are buffered.
+
+        :return: True if begin_write_buffer has been called by the current
+            thread, without the buffer having been ended or discarded.
+        """
+        return self.__get_write_buffer() is not None
+
+    def flush_write_buffer(self) -> None:
+        """Write all writes buffered by the current thread to the database.
+        Has no effect if the writes of the current thread aren't buffered.
+
+        :return: No return value.
+        """
+        write_buffer = self.__get_write_buffer()
+        if write_buffer is None:
+            return
+
+        self.__check_connection()
+
+        for collection in list(write_buffer.writes.keys()):
+            self.__flush_write_buffer_collection(write_buffer, collection)
+
+    def end_write_buffer(self) -> None:
+        """Flush the writes buffered by the current thread and stop
+        buffering its writes. Has no effect if the writes of the current
+        thread aren't buffered.
+
+        :return: No return value.
+        """
+        try:
+            self.flush_write_buffer()
+        finally:
+            self.__thread_local.write_buffer = None
+
+    def discard_write_buffer(self) -> None:
+        """Stop buffering the writes of the current thread, without making
+        the writes still in the buffer. Has no effect if the writes of the
+        current thread aren't buffered.
+
+        :return: No return value.
+        """
+        self.__thread_local.write_buffer = None
+
+    def __get_write_buffer(self) -> WriteBuffer | None:
+        return getattr(self.__thread_local, 'write_buffer', None)
+
+    def __buffer_write(
+            self,
+            collection: str,
+            write: BufferedWrite,
+            write_data: any,
+            written_documents: list
+    ) -> None:
+        write_buffer = self.__get_write_buffer()
+        write_buffer.add(collection, write, write_data, written_documents)
+
+        if write_buffer.is_full():
+            self.flush_write_buffer()
+
+    def __flush_write_buffer_collection(
+            self,
+            write_buffer: WriteBuffer,
+            collection: str
+    ) -> None:
+        writes, written_documents = write_buffer.pop(collection)
+        if len(writes) == 0:
+            return
+
+        db_requests = []
+        for write, write_data in writes:
+            match write:
+                case BufferedWrite.INSERT:
+                    db_requests.append(InsertOne(write_data))
+                case BufferedWrite.UPDATE:
+                    db_attribute_filter_dict, db_update, many = write_data
+                    db_requests.append(
+                        UpdateMany(db_attribute_filter_dict, db_update)
+                        if many else
+                        UpdateOne(db_attribute_filter_dict, db_update))
+                case BufferedWrite.DELETE:
+                    db_attribute_filter_dict, many = write_data
+                    db_requests.append(
+                        DeleteMany(db_attribute_filter_dict)
+                        if many else
+                        DeleteOne(db_attribute_filter_dict))
+
+        try:
+            self.database[collection].bulk_write(db_requests, ordered=True)
+        finally:
+            self.__notify_write_listeners(collection, written_documents)
+
+    def __flush_write_buffer_before(self, collection: str) -> None:
+        """Flush the writes to a collection buffered by the current thread,
+        before the collection is accessed directly.
+
+        :param collection: The collection to flush the writes to.
+
+        :return: No return value.
+        """
+        write_buffer = self.__get_write_buffer()
+        if write_buffer is not None and write_buffer.has_writes(collection):
+            self.__flush_write_buffer_collection(write_buffer, collection)
+
+    def __find_buffered(
+            self,
+            collection: str,
+            db_attribute_filter_dict: dict
+    ) -> list | None:
+        """Find the full documents matching a filter, with the writes
+        buffered by the current thread overlaid on the documents in the
+        database. If the writes can't be overlaid they are flushed instead.
+
+        :param collection: The collection to find the documents in.
+        :param db_attribute_filter_dict: The filter to match documents with.
+
+        :return: The documents, or None if no writes to the collection are
+            buffered and the documents should be found in the database.
+        """
+        write_buffer = self.__get_write_buffer()
+        if write_buffer is None or not write_buffer.has_writes(collection):
+            return None
+
+        if not write_buffer.can_overlay(collection, db_attribute_filter_dict):
+            self.__flush_write_buffer_collection(write_buffer, collection)
+            return None
+
+        return write_buffer.overlay(
+            collection,
+            db_attribute_filter_dict,
+            self.database[collection].find(db_attribute_filter_dict))
+
+    @staticmethod
+    def __get_written_projects(written_documents: list) -> set | None:
+        paths_to_project = set()
+
+        for written_document in written_documents:
+            path_to_project = written_document.get('pathToProject')
+
+            if isinstance(path_to_project, str):
+                paths_to_project.add(path_to_project)
+            elif is_filter_operator_value(path_to_project) and \
+                    list(path_to_project.keys()) == ['$in']:
+                paths_to_project.update(path_to_project['$in'])
+            else:
+                return None
+
+        return paths_to_project
+
+    def __notify_write_listeners(
+            self,
+            collection: str,
+            written_documents: list
+    ) -> None:
+        if len(written_documents) == 0:
+            return
+
+        paths_to_project = self.__get_written_projects(written_documents)
+
+        if collection in VERSIONED_COLLECTIONS:
+            self.__increment_project_versions(collection, paths_to_project)
+
+        for listener in self.write_listeners:
+            listener(collection, paths_to_project)
+
+    @staticmethod
+    def __get_project_version_id(
+            path_to_project: str,
+            collection: str
+    ) -> ObjectId:
+        # The ID is derived from the project and collection, so that every
+        # process finds and creates the same version document.
+        return ObjectId(hashlib.blake2b(
+            str.encode(f"{collection}:{path_to_project}"),
+            digest_size=12).digest())
+
+    def __insert_project_version(
+            self,
+            path_to_project: str,
+            collection: str,
+            generation: int
+    ) -> bool:
+        try:
+            self.database[PROJECT_VERSION_COLLECTION].insert_one({
+                '_id': self.__get_project_version_id(
+                    path_to_project, collection),
+                'pathToProject': path_to_project,
+                'collection': collection,
+                'epoch': secrets.token_hex(4),
+                'generation': generation
+            })
+        except DuplicateKeyError:
+            # Inserted by another process in the meantime
+            return False
+
+        return True
+
+    def __increment_project_versions(
+            self,
+            collection: str,
+            paths_to_project: set | None
+    ) -> None:
+        project_versions = self.database[PROJECT_VERSION_COLLECTION]
+
+        if paths_to_project is None:
+            project_versions.update_many(
+                {'collection': collection},
+                {'$inc': {'generation': 1}})
+            return
+
+        for path_to_project in paths_to_project:
+            version_id = \
+                self.__get_project_version_id(path_to_project, collection)
+
+            while project_versions.update_one(
+                    {'_id': version_id},
+                    {'$inc': {'generation': 1}}).matched_count == 0:
+                if self.__insert_project_version(
+                        path_to_project, collection, 1):
+                    break
+
+    def get_project_version(
+            self,
+            path_to_project: str,
+            collection: str
+    ) -> str:
+        """Get the version of the documents of a project in a collection.
+        The version is kept in the database, and changes whenever any
+        process writes to the documents, so it can tell if documents read
+        earlier, by any process, are still current. It is to be read before
+        the documents, so that a version is never newer than the documents
+        read after it.
+
+        :param path_to_project: The absolute path to the project.
+        :param collection: The collection, one of VERSIONED_COLLECTIONS.
+
+        :return: The version.
+
+        :raises ValueError: If the collection has no versions.
+        """
+        if collection not in VERSIONED_COLLECTIONS:
+            raise ValueError(f"The collection {collection} has no versions.")
+
+        self.__check_connection()
+
+        version_id = \
+            self.__get_project_version_id(path_to_project, collection)
+
+        while True:
+            project_version = \
+                self.database[PROJECT_VERSION_COLLECTION].find_one(
+                    {'_id': version_id}, {'epoch': 1, 'generation': 1})
+
+            if project_version is not None:
+                return \
+                    f"{project_version['epoch']}." \
+                    f"{project_version['generation']}"
+
+            # Every project read has a version document, so that writes not
+            # naming their projects can move the versions of all projects.
+            self.__insert_project_version(path_to_project, collection, 0)
+
     def __check_connection(self) -> None:
-        """Checks if the instance is connected to a database.
+        """Checks if the instance is connected to a database, connecting
+        first if the connection is lazy and not yet made by this process.
 
         :return: No return value.
 
-        :raises RuntimeError: If instance is not connected to a database.
+        :raises RuntimeError: If instance is not connected to a database, or
+            if a lazy connection fails.
         """
         if self.client is None and self.database is None:
+            if self.__connect_on_use:
+                with self.__connect_lock:
+                    if self.client is None and self.database is None:
+                        self.__open_connection()
+                return
+
             raise RuntimeError("""
                 Tried to send query without connecting to database.
             """)
@@ -435,29 +1298,50 @@ class DatabaseHandler:
             attribute_filter_dict: dict,
             attribute_property_checker: dict,
             *, query_function: any = None,
-            act_on_first_match: bool = False
+            act_on_first_match: bool = False,
+            projection: list = None
     ) -> any:
 
         self.__check_connection()
 
-        check_valid_document_attributes(
+        check_valid_filter_attributes(
             attribute_filter_dict,
             attribute_property_checker)
 
-        db_attribute_filter_dict = app_to_db_doc_conv(
+        db_attribute_filter_dict = app_to_db_filter_conv(
             attribute_filter_dict,
             attribute_property_checker)
 
+        db_projection = None
+        if projection is not None:
+            check_valid_projection(projection, attribute_property_checker)
+            db_projection = make_db_projection(projection)
+
         if not query_function:
+            buffered_db_documents = self.__find_buffered(
+                collection, db_attribute_filter_dict)
 
             # TODO: Fix it so that is _id is only attribute then used find one.
             #   or maybe just change act_on_first_match accrdingly.
 
-            if act_on_first_match or '_id' in attribute_filter_dict:
+            act_on_first_match = act_on_first_match or (
+                    '_id' in attribute_filter_dict and
+                    not is_filter_operator_value(
+                        attribute_filter_dict['_id']))
+
+            if buffered_db_documents is not None:
+                if act_on_first_match:
+                    buffered_db_documents = buffered_db_documents[:1]
+
+                db_documents = [
+                    project_document(db_document, db_projection)
+                    for db_document in buffered_db_documents]
+
+            elif act_on_first_match:
                 db_documents = self.database[
                     collection] \
                     .find_one(
-                    db_attribute_filter_dict)
+                    db_attribute_filter_dict, db_projection)
 
                 if not db_documents:
                     return None
@@ -467,22 +1351,102 @@ class DatabaseHandler:
                 db_documents = self.database[
                     collection] \
                     .find(
-                    db_attribute_filter_dict)
+                    db_attribute_filter_dict, db_projection)
 
             if not db_documents:
                 return None
 
+            db_to_app_doc_conv_compiled = compile_attribute_checker(
+                attribute_property_checker).db_to_app_doc_conv
+
             ret_list = [
-                db_to_app_doc_conv(docs, attribute_property_checker)
-                for docs in db_documents]
+                db_to_app_doc_conv_compiled(docs) for docs in db_documents]
 
             if len(ret_list) == 0:
                 return None
 
             return ret_list
         else:
+            self.__flush_write_buffer_before(collection)
             return query_function(db_attribute_filter_dict)
 
+    def __iter_query(
+            self,
+            /, collection: str,
+            attribute_filter_dict: dict,
+            attribute_property_checker: dict,
+            *, projection: list = None,
+            limit: int = 0,
+            after_id: str = None
+    ) -> any:
+
+        self.__check_connection()
+
+        if after_id is not None:
+            if '_id' in attribute_filter_dict:
+                raise ValueError("""
+                The attribute _id cannot be filtered on when iterating after
+                a given id.""")
+
+            attribute_filter_dict = {
+                **attribute_filter_dict,
+                '_id': {'$gt': after_id}}
+
+        check_valid_filter_attributes(
+            attribute_filter_dict,
+            attribute_property_checker)
+
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise TypeError(f"""The limit should be a {int} type, but was
+                given a value of type {type(limit)}.""")
+
+        if limit < 0:
+            raise ValueError(f"The limit {limit} cannot be negative.")
+
+        db_attribute_filter_dict = app_to_db_filter_conv(
+            attribute_filter_dict,
+            attribute_property_checker)
+
+        db_projection = None
+        if projection is not None:
+            check_valid_projection(projection, attribute_property_checker)
+            db_projection = make_db_projection(projection)
+
+        buffered_db_documents = self.__find_buffered(
+            collection, db_attribute_filter_dict)
+
+        if buffered_db_documents is not None:
+            buffered_db_documents.sort(
+                key=lambda db_document: db_document['_id'])
+            if limit > 0:
+                buffered_db_documents = buffered_db_documents[:limit]
+
+            db_to_app_doc_conv_compiled = compile_attribute_checker(
+                attribute_property_checker).db_to_app_doc_conv
+
+            return (
+                db_to_app_doc_conv_compiled(
+                    project_document(db_document, db_projection))
+                for db_document in buffered_db_documents)
+
+        db_cursor = self.database[collection] \
+            .find(db_attribute_filter_dict, db_projection) \
+            .sort('_id', 1) \
+            .limit(limit)
+
+        return self.__iter_cursor(db_cursor, attribute_property_checker)
+
+    @staticmethod
+    def __iter_cursor(db_cursor, attribute_property_checker: dict) -> any:
+        db_to_app_doc_conv_compiled = compile_attribute_checker(
+            attribute_property_checker).db_to_app_doc_conv
+
+        try:
+            for db_document in db_cursor:
+                yield db_to_app_doc_conv_compiled(db_document)
+        finally:
+            db_cursor.close()
+
     def __add_query(
             self,
             /, collection: str,
@@ -504,22 +1468,36 @@ class DatabaseHandler:
 
         add_default_values(db_document, attribute_property_checker)
 
-        if not query_function:
-            db_result = self.database[collection].insert_one(db_document)
-            return str(db_result.inserted_id)
-        else:
-            return query_function(db_document)
+        if not query_function and self.is_write_buffered():
+            if '_id' not in db_document:
+                db_document['_id'] = ObjectId()
+
+            self.__buffer_write(
+                collection, BufferedWrite.INSERT, db_document, [document])
+            return str(db_document['_id'])
+
+        self.__flush_write_buffer_before(collection)
+
+        try:
+            if not query_function:
+                db_result = self.database[collection].insert_one(db_document)
+                return str(db_result.inserted_id)
+            else:
+                return query_function(db_document)
+        finally:
+            self.__notify_write_listeners(collection, [document])
 
     def __set_query(
             self,
             /, collection: str, updated_document_data: any,
             attribute_filter_dict: dict, attribute_property_checker: dict,
-            *, query_function: any = None
+            *, query_function: any = None,
+            act_on_first_match: bool = True
     ) -> None:
 
         self.__check_connection()
 
-        check_valid_document_attributes(
+        check_valid_filter_attributes(
             attribute_filter_dict,
             attribute_property_checker)
 
@@ -531,16 +1509,257 @@ class DatabaseHandler:
             updated_document_data,
             attribute_property_checker)
 
-        db_attribute_filter_dict = app_to_db_doc_conv(
+        db_attribute_filter_dict = app_to_db_filter_conv(
+            attribute_filter_dict,
+            attribute_property_checker)
+
+        written_documents = \
+            [attribute_filter_dict, updated_document_data] \
+            if 'pathToProject' in updated_document_data \
+            else [attribute_filter_dict]
+
+        if not query_function and self.is_write_buffered():
+            self.__buffer_write(
+                collection,
+                BufferedWrite.UPDATE,
+                (db_attribute_filter_dict,
+                 {'$set': db_updated_document},
+                 not act_on_first_match),
+                written_documents)
+            return
+
+        self.__flush_write_buffer_before(collection)
+
+        try:
+            if not query_function:
+                if act_on_first_match:
+                    self.database[collection].update_one(
+                        db_attribute_filter_dict,
+                        {'$set': db_updated_document})
+                else:
+                    self.database[collection].update_many(
+                        db_attribute_filter_dict,
+                        {'$set': db_updated_document})
+            else:
+                query_function(db_updated_document, db_attribute_filter_dict)
+        finally:
+            self.__notify_write_listeners(collection, written_documents)
+
+    def __count_query(
+            self,
+            /, collection: str,
+            attribute_filter_dict: dict,
+            attribute_property_checker: dict,
+            *, query_function: any = None,
+            limit: int = 0
+    ) -> int:
+
+        self.__check_connection()
+
+        check_valid_filter_attributes(
+            attribute_filter_dict,
+            attribute_property_checker)
+
+        db_attribute_filter_dict = app_to_db_filter_conv(
             attribute_filter_dict,
             attribute_property_checker)
 
         if not query_function:
-            self.database[collection].update_one(
-                db_attribute_filter_dict,
-                {'$set': db_updated_document})
+            buffered_db_documents = self.__find_buffered(
+                collection, db_attribute_filter_dict)
+
+            if buffered_db_documents is not None:
+                if limit > 0:
+                    return min(len(buffered_db_documents), limit)
+
+                return len(buffered_db_documents)
+
+            if limit > 0:
+                return self.database[collection].count_documents(
+                    db_attribute_filter_dict, limit=limit)
+
+            return self.database[collection].count_documents(
+                db_attribute_filter_dict)
         else:
-            query_function(db_updated_document, db_attribute_filter_dict)
+            self.__flush_write_buffer_before(collection)
+            return query_function(db_attribute_filter_dict)
+
+    def __increment_query(
+            self,
+            /, collection: str,
+            attribute_increment_dict: dict,
+            attribute_filter_dict: dict,
+            attribute_property_checker: dict,
+            *, query_function: any = None,
+            act_on_first_match: bool = True
+    ) -> int:
+
+        self.__check_connection()
+
+        check_valid_filter_attributes(
+            attribute_filter_dict,
+            attribute_property_checker)
+
+        check_valid_increment_attributes(
+            attribute_increment_dict,
+            attribute_property_checker)
+
+        db_attribute_filter_dict = app_to_db_filter_conv(
+            attribute_filter_dict,
+            attribute_property_checker)
+
+        # The number of matched documents is returned, so the increment is
+        # made directly.
+        self.__flush_write_buffer_before(collection)
+
+        try:
+            if not query_function:
+                if act_on_first_match:
+                    db_result = self.database[collection].update_one(
+                        db_attribute_filter_dict,
+                        {'$inc': attribute_increment_dict})
+                else:
+                    db_result = self.database[collection].update_many(
+                        db_attribute_filter_dict,
+                        {'$inc': attribute_increment_dict})
+
+                return db_result.matched_count
+            else:
+                return query_function(
+                    attribute_increment_dict, db_attribute_filter_dict)
+        finally:
+            self.__notify_write_listeners(collection, [attribute_filter_dict])
+
+    def __bulk_write_query(
+            self,
+            /, collection: str,
+            operations: list,
+            attribute_property_checker: dict,
+            *, query_function: any = None,
+            ordered: bool = True
+    ) -> dict:
+
+        self.__check_connection()
+
+        compiled_checker = \
+            compile_attribute_checker(attribute_property_checker)
+
+        # Validate and convert the whole batch before anything is written.
+        db_operations = []
+        written_documents = []
+        for operation, operation_data in operations:
+            match operation:
+                case DBOperation.ADD:
+                    compiled_checker.check_document(
+                        operation_data,
+                        strict_compare=False)
+
+                    db_document = \
+                        compiled_checker.app_to_db_doc_conv(operation_data)
+
+                    compiled_checker.add_default_values(db_document)
+
+                    if '_id' not in db_document:
+                        db_document['_id'] = ObjectId()
+
+                    db_operations.append((operation, db_document))
+                    written_documents.append(operation_data)
+
+                case DBOperation.SET:
+                    updated_document_data, attribute_filter_dict = \
+                        operation_data
+
+                    check_valid_filter_attributes(
+                        attribute_filter_dict,
+                        attribute_property_checker)
+
+                    compiled_checker.check_document(updated_document_data)
+
+                    db_operations.append((operation, (
+                        compiled_checker.app_to_db_doc_conv(
+                            updated_document_data),
+                        app_to_db_filter_conv(
+                            attribute_filter_dict,
+                            attribute_property_checker))))
+                    written_documents.append(attribute_filter_dict)
+                    if 'pathToProject' in updated_document_data:
+                        written_documents.append(updated_document_data)
+
+                case DBOperation.REMOVE:
+                    check_valid_filter_attributes(
+                        operation_data,
+                        attribute_property_checker)
+
+                    db_operations.append((
+                        operation,
+                        app_to_db_filter_conv(
+                            operation_data,
+                            attribute_property_checker)))
+                    written_documents.append(operation_data)
+
+                case _:
+                    raise ValueError(f"""
+                    The operation {operation} isn't a valid database
+                    operation.""")
+
+        self.__flush_write_buffer_before(collection)
+
+        try:
+            return self.__bulk_write_db_operations(
+                collection,
+                db_operations,
+                query_function=query_function,
+                ordered=ordered)
+        finally:
+            self.__notify_write_listeners(collection, written_documents)
+
+    def __bulk_write_db_operations(
+            self,
+            /, collection: str,
+            db_operations: list,
+            *, query_function: any = None,
+            ordered: bool = True
+    ) -> dict:
+
+        if query_function:
+            return query_function(db_operations)
+
+        bulk_result = {
+            'inserted_ids': [
+                str(db_operation_data['_id'])
+                for operation, db_operation_data in db_operations
+                if operation == DBOperation.ADD],
+            'matched_count': 0,
+            'modified_count': 0,
+            'deleted_count': 0
+        }
+
+        if len(db_operations) == 0:
+            return bulk_result
+
+        db_requests = []
+        for operation, db_operation_data in db_operations:
+            match operation:
+                case DBOperation.ADD:
+                    db_requests.append(InsertOne(db_operation_data))
+                case DBOperation.SET:
+                    db_updated_document, db_attribute_filter_dict = \
+                        db_operation_data
+                    db_requests.append(UpdateOne(
+                        db_attribute_filter_dict,
+                        {'$set': db_updated_document}))
+                case DBOperation.REMOVE:
+                    db_requests.append(DeleteMany(db_operation_data))
+
+        db_result = self.database[collection].bulk_write(
+            db_requests,
+            ordered=ordered)
+
+        bulk_result['matched_count'] = db_result.matched_count
+        bulk_result['modified_count'] = db_result.modified_count
+        bulk_result['deleted_count'] = db_result.deleted_count
+
+        return bulk_result
 
     def __remove_query(
             self,
@@ -553,52 +1772,201 @@ class DatabaseHandler:
 
         self.__check_connection()
 
-        check_valid_document_attributes(
+        check_valid_filter_attributes(
             attribute_filter_dict,
             attribute_property_checker)
 
-        db_attribute_filter = app_to_db_doc_conv(
+        db_attribute_filter = app_to_db_filter_conv(
             attribute_filter_dict,
             attribute_property_checker)
 
-        # TODO: make it so delete_one is called when attribute is the only
-        #   ket in attribute_filter_dict
-        if not query_function:
-            if act_on_first_match:
-                self.database[collection].delete_one(db_attribute_filter)
+        if not query_function and self.is_write_buffered():
+            self.__buffer_write(
+                collection,
+                BufferedWrite.DELETE,
+                (db_attribute_filter, not act_on_first_match),
+                [attribute_filter_dict])
+            return
+
+        self.__flush_write_buffer_before(collection)
+
+        try:
+            # TODO: make it so delete_one is called when attribute is the only
+            #   ket in attribute_filter_dict
+            if not query_function:
+                if act_on_first_match:
+                    self.database[collection].delete_one(db_attribute_filter)
+                else:
+                    self.database[collection].delete_many(db_attribute_filter)
             else:
-                self.database[collection].delete_many(db_attribute_filter)
-        else:
-            query_function(db_attribute_filter)
+                query_function(db_attribute_filter)
+        finally:
+            self.__notify_write_listeners(collection, [attribute_filter_dict])
 
     def get_function_info(
             self,
             /, attribute_filter_dict: any,
+            *, projection: list = None
     ) -> any:
         return self.__get_query(
             collection=FUNCTION_INFO_COLLECTION,
             attribute_filter_dict=attribute_filter_dict,
-            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER)
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            projection=projection)
 
     def get_test_info(
             self,
-            /, attribute_filter_dict
+            /, attribute_filter_dict: any,
+            *, projection: list = None
     ) -> any:
         return self.__get_query(
             collection=TEST_INFO_COLLECTION,
             attribute_filter_dict=attribute_filter_dict,
-            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER
-        )
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            projection=projection)
 
     def get_function_dependency(
             self,
-            /, attribute_filter_dict
+            /, attribute_filter_dict: any,
+            *, projection: list = None
     ) -> any:
         return self.__get_query(
             collection=FUNCTION_DEPENDENCY_COLLECTION,
             attribute_filter_dict=attribute_filter_dict,
-            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER
-        )
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            projection=projection)
+
+    def iter_function_info(
+            self,
+            /, attribute_filter_dict: dict,
+            *, projection: list = None,
+            limit: int = 0,
+            after_id: str = None
+    ) -> any:
+        """Lazily iterate over the function info documents matching the filter,
+        in ascending order of their IDs. Documents are fetched from the
+        database in batches as the iteration goes on.
+
+        :param attribute_filter_dict: The filter to find documents with.
+        :param projection: The attributes to get, all if None.
+        :param limit: The maximum number of documents, no limit if 0.
+        :param after_id: Only iterate over documents with an ID after this.
+
+        :return: An iterator over the matching documents.
+        """
+        return self.__iter_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            projection=projection,
+            limit=limit,
+            after_id=after_id)
+
+    def count_function_info(
+            self,
+            /, attribute_filter_dict: dict,
+            *, limit: int = 0
+    ) -> int:
+        """Count the function info documents matching the filter.
+
+        :param attribute_filter_dict: The filter to count documents with.
+        :param limit: The maximum number of documents to count, no limit if 0.
+
+        :return: The number of matching documents.
+        """
+        return self.__count_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            limit=limit)
+
+    def iter_test_info(
+            self,
+            /, attribute_filter_dict: dict,
+            *, projection: list = None,
+            limit: int = 0,
+            after_id: str = None
+    ) -> any:
+        """Lazily iterate over the test info documents matching the filter,
+        in ascending order of their IDs. Documents are fetched from the
+        database in batches as the iteration goes on.
+
+        :param attribute_filter_dict: The filter to find documents with.
+        :param projection: The attributes to get, all if None.
+        :param limit: The maximum number of documents, no limit if 0.
+        :param after_id: Only iterate over documents with an ID after this.
+
+        :return: An iterator over the matching documents.
+        """
+        return self.__iter_query(
+            collection=TEST_INFO_COLLECTION,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            projection=projection,
+            limit=limit,
+            after_id=after_id)
+
+    def count_test_info(
+            self,
+            /, attribute_filter_dict: dict,
+            *, limit: int = 0
+    ) -> int:
+        """Count the test info documents matching the filter.
+
+        :param attribute_filter_dict: The filter to count documents with.
+        :param limit: The maximum number of documents to count, no limit if 0.
+
+        :return: The number of matching documents.
+        """
+        return self.__count_query(
+            collection=TEST_INFO_COLLECTION,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            limit=limit)
+
+    def iter_function_dependency(
+            self,
+            /, attribute_filter_dict: dict,
+            *, projection: list = None,
+            limit: int = 0,
+            after_id: str = None
+    ) -> any:
+        """Lazily iterate over the function dependency documents matching the
+        filter, in ascending order of their IDs. Documents are fetched from
+        the database in batches as the iteration goes on.
+
+        :param attribute_filter_dict: The filter to find documents with.
+        :param projection: The attributes to get, all if None.
+        :param limit: The maximum number of documents, no limit if 0.
+        :param after_id: Only iterate over documents with an ID after this.
+
+        :return: An iterator over the matching documents.
+        """
+        return self.__iter_query(
+            collection=FUNCTION_DEPENDENCY_COLLECTION,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            projection=projection,
+            limit=limit,
+            after_id=after_id)
+
+    def count_function_dependency(
+            self,
+            /, attribute_filter_dict: dict,
+            *, limit: int = 0
+    ) -> int:
+        """Count the function dependency documents matching the filter.
+
+        :param attribute_filter_dict: The filter to count documents with.
+        :param limit: The maximum number of documents to count, no limit if 0.
+
+        :return: The number of matching documents.
+        """
+        return self.__count_query(
+            collection=FUNCTION_DEPENDENCY_COLLECTION,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            limit=limit)
 
     def add_function_info(self, function_info: any) -> str:
         return self.__add_query(
@@ -620,38 +1988,70 @@ class DatabaseHandler:
 
     def set_function_info(
             self,
-            /, update_function_info: dict, attribute_filter_dict
+            /, update_function_info: dict, attribute_filter_dict,
+            *, act_on_first_match: bool = True
     ) -> None:
 
         self.__set_query(
             collection=FUNCTION_INFO_COLLECTION,
             updated_document_data=update_function_info,
             attribute_filter_dict=attribute_filter_dict,
-            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            act_on_first_match=act_on_first_match
+        )
+
+    def increment_function_info(
+            self,
+            /, increment_function_info: dict, attribute_filter_dict: dict,
+            *, act_on_first_match: bool = True
+    ) -> int:
+        """Atomically increment numeric attributes of function info
+        documents.
+
+        :param increment_function_info: The attributes to increment mapped to
+            their (possibly negative) increments.
+        :param attribute_filter_dict: The filter for the documents to
+            increment.
+        :param act_on_first_match: If True, only the first matching document
+            is incremented.
+
+        :return: The number of matching documents.
+        """
+
+        return self.__increment_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            attribute_increment_dict=increment_function_info,
+            attribute_filter_dict=attribute_filter_dict,
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            act_on_first_match=act_on_first_match
         )
 
     def set_test_info(
             self,
-            /, update_test_info: dict, attribute_filter_dict: dict
+            /, update_test_info: dict, attribute_filter_dict: dict,
+            *, act_on_first_match: bool = True
     ) -> None:
 
         self.__set_query(
             collection=TEST_INFO_COLLECTION,
             updated_document_data=update_test_info,
             attribute_filter_dict=attribute_filter_dict,
-            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            act_on_first_match=act_on_first_match
         )
 
     def set_function_dependency(
             self,
-            /, update_function_dependency: dict, attribute_filter_dict: dict
+            /, update_function_dependency: dict, attribute_filter_dict: dict,
+            *, act_on_first_match: bool = True
     ) -> None:
 
         self.__set_query(
             collection=FUNCTION_DEPENDENCY_COLLECTION,
             updated_document_data=update_function_dependency,
             attribute_filter_dict=attribute_filter_dict,
-            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            act_on_first_match=act_on_first_match
         )
 
     def remove_function_info(
@@ -683,3 +2083,293 @@ class DatabaseHandler:
             collection=FUNCTION_DEPENDENCY_COLLECTION,
             attribute_filter_dict=attribute_filter_dict,
             attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER)
+
+    # Bulk operations
+
+    def add_function_info_many(
+            self,
+            /, documents: list,
+            *, ordered: bool = True
+    ) -> list:
+        """Add many function info documents in one bulk operation.
+
+        :param documents: The documents to add.
+        :param ordered: If True, the documents are added in order and the
+            operation stops at the first error.
+
+        :return: The ids of the added documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            operations=[(DBOperation.ADD, document) for document in documents],
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            ordered=ordered
+        )['inserted_ids']
+
+    def set_function_info_many(
+            self,
+            /, updates: list,
+            *, ordered: bool = False
+    ) -> int:
+        """Update many function info documents in one bulk operation.
+
+        :param updates: The updates as (updated_document_data,
+            attribute_filter_dict) tuples, every update is applied to the
+            first document matching its filter.
+        :param ordered: If True, the updates are applied in order and the
+            operation stops at the first error.
+
+        :return: The number of modified documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            operations=[(DBOperation.SET, update) for update in updates],
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            ordered=ordered
+        )['modified_count']
+
+    def remove_function_info_many(
+            self,
+            /, attribute_filter_dicts: list,
+            *, ordered: bool = False
+    ) -> int:
+        """Remove all function info documents matching any of the filters
+        in one bulk operation.
+
+        :param attribute_filter_dicts: The filters, for example
+            [{'_id': {'$in': [...]}}].
+        :param ordered: If True, the filters are applied in order and the
+            operation stops at the first error.
+
+        :return: The number of removed documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            operations=[
+                (DBOperation.REMOVE, attribute_filter_dict)
+                for attribute_filter_dict in attribute_filter_dicts],
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            ordered=ordered
+        )['deleted_count']
+
+    def bulk_write_function_info(
+            self,
+            /, operations: list,
+            *, ordered: bool = True
+    ) -> dict:
+        """Run a mix of add, set and remove operations on function info
+        documents in one bulk operation. All operations are validated before
+        anything is written.
+
+        :param operations: The operations as (DBOperation, data) tuples, where
+            data is a document for ADD, an (updated_document_data,
+            attribute_filter_dict) tuple for SET and an attribute filter dict
+            for REMOVE.
+        :param ordered: If True, the operations are run in order and the
+            operation stops at the first error.
+
+        :return: The results of the batch, with the keys 'inserted_ids',
+            'matched_count', 'modified_count' and 'deleted_count'.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_INFO_COLLECTION,
+            operations=operations,
+            attribute_property_checker=FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            ordered=ordered
+        )
+
+    def add_test_info_many(
+            self,
+            /, documents: list,
+            *, ordered: bool = True
+    ) -> list:
+        """Add many test info documents in one bulk operation.
+
+        :param documents: The documents to add.
+        :param ordered: If True, the documents are added in order and the
+            operation stops at the first error.
+
+        :return: The ids of the added documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=TEST_INFO_COLLECTION,
+            operations=[(DBOperation.ADD, document) for document in documents],
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )['inserted_ids']
+
+    def set_test_info_many(
+            self,
+            /, updates: list,
+            *, ordered: bool = False
+    ) -> int:
+        """Update many test info documents in one bulk operation.
+
+        :param updates: The updates as (updated_document_data,
+            attribute_filter_dict) tuples, every update is applied to the
+            first document matching its filter.
+        :param ordered: If True, the updates are applied in order and the
+            operation stops at the first error.
+
+        :return: The number of modified documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=TEST_INFO_COLLECTION,
+            operations=[(DBOperation.SET, update) for update in updates],
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )['modified_count']
+
+    def remove_test_info_many(
+            self,
+            /, attribute_filter_dicts: list,
+            *, ordered: bool = False
+    ) -> int:
+        """Remove all test info documents matching any of the filters
+        in one bulk operation.
+
+        :param attribute_filter_dicts: The filters, for example
+            [{'_id': {'$in': [...]}}].
+        :param ordered: If True, the filters are applied in order and the
+            operation stops at the first error.
+
+        :return: The number of removed documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=TEST_INFO_COLLECTION,
+            operations=[
+                (DBOperation.REMOVE, attribute_filter_dict)
+                for attribute_filter_dict in attribute_filter_dicts],
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )['deleted_count']
+
+    def bulk_write_test_info(
+            self,
+            /, operations: list,
+            *, ordered: bool = True
+    ) -> dict:
+        """Run a mix of add, set and remove operations on test info
+        documents in one bulk operation. All operations are validated before
+        anything is written.
+
+        :param operations: The operations as (DBOperation, data) tuples, where
+            data is a document for ADD, an (updated_document_data,
+            attribute_filter_dict) tuple for SET and an attribute filter dict
+            for REMOVE.
+        :param ordered: If True, the operations are run in order and the
+            operation stops at the first error.
+
+        :return: The results of the batch, with the keys 'inserted_ids',
+            'matched_count', 'modified_count' and 'deleted_count'.
+        """
+
+        return self.__bulk_write_query(
+            collection=TEST_INFO_COLLECTION,
+            operations=operations,
+            attribute_property_checker=TEST_INFO_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )
+
+    def add_function_dependency_many(
+            self,
+            /, documents: list,
+            *, ordered: bool = True
+    ) -> list:
+        """Add many function dependency documents in one bulk operation.
+
+        :param documents: The documents to add.
+        :param ordered: If True, the documents are added in order and the
+            operation stops at the first error.
+
+        :return: The ids of the added documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_DEPENDENCY_COLLECTION,
+            operations=[(DBOperation.ADD, document) for document in documents],
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )['inserted_ids']
+
+    def set_function_dependency_many(
+            self,
+            /, updates: list,
+            *, ordered: bool = False
+    ) -> int:
+        """Update many function dependency documents in one bulk operation.
+
+        :param updates: The updates as (updated_document_data,
+            attribute_filter_dict) tuples, every update is applied to the
+            first document matching its filter.
+        :param ordered: If True, the updates are applied in order and the
+            operation stops at the first error.
+
+        :return: The number of modified documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_DEPENDENCY_COLLECTION,
+            operations=[(DBOperation.SET, update) for update in updates],
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )['modified_count']
+
+    def remove_function_dependency_many(
+            self,
+            /, attribute_filter_dicts: list,
+            *, ordered: bool = False
+    ) -> int:
+        """Remove all function dependency documents matching any of the filters
+        in one bulk operation.
+
+        :param attribute_filter_dicts: The filters, for example
+            [{'_id': {'$in': [...]}}].
+        :param ordered: If True, the filters are applied in order and the
+            operation stops at the first error.
+
+        :return: The number of removed documents.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_DEPENDENCY_COLLECTION,
+            operations=[
+                (DBOperation.REMOVE, attribute_filter_dict)
+                for attribute_filter_dict in attribute_filter_dicts],
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )['deleted_count']
+
+    def bulk_write_function_dependency(
+            self,
+            /, operations: list,
+            *, ordered: bool = True
+    ) -> dict:
+        """Run a mix of add, set and remove operations on function dependency
+        documents in one bulk operation. All operations are validated before
+        anything is written.
+
+        :param operations: The operations as (DBOperation, data) tuples, where
+            data is a document for ADD, an (updated_document_data,
+            attribute_filter_dict) tuple for SET and an attribute filter dict
+            for REMOVE.
+        :param ordered: If True, the operations are run in order and the
+            operation stops at the first error.
+
+        :return: The results of the batch, with the keys 'inserted_ids',
+            'matched_count', 'modified_count' and 'deleted_count'.
+        """
+
+        return self.__bulk_write_query(
+            collection=FUNCTION_DEPENDENCY_COLLECTION,
+            operations=operations,
+            attribute_property_checker=FUNCTION_DEPENDENCY_ATTRIBUTES_CHECKER,
+            ordered=ordered
+        )
@@ -0,0 +1,21 @@
+from api.cache_maintenance import CacheMaintenance
+from api.instances.config_urang import config_urang
+from api.instances.database_main import database_handler
+
+MEGABYTE = 1024 * 1024
+
+__MAINTENANCE_CONFIG = \
+    (config_urang.get('cache') or {}).get('maintenance') or {}
+
+
+def __get_size(config_key):
+    size = __MAINTENANCE_CONFIG.get(config_key)
+    return int(size * MEGABYTE) if size is not None else None
+
+
+cache_maintenance_enabled = __MAINTENANCE_CONFIG.get('enabled', True)
+cache_maintenance = CacheMaintenance(
+    database_handler,
+    interval=__MAINTENANCE_CONFIG.get('interval', 3600),
+    max_project_size=__get_size('max_project_size_mb'),
+    max_total_size=__get_size('max_total_size_mb'))
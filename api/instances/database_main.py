@@ -1,13 +1,44 @@
 from api.database import *
+from api.storage.mongodb import make_mongo_client_options
+from api.instances.config_urang import config_urang, \
+    STANDARD_CONFIG_LOCATION
 import sys
 import os
 
 MONGO_SERVER = os.environ.get('MONGO_SERVER', '127.0.0.1').upper()
 MONGO_PORT = os.environ.get('MONGO_PORT', '27017').upper()
 
+
+def __get_database_url():
+    database_config = config_urang.get('database') or {}
+    if database_config.get('backend', 'mongodb') == 'sqlite':
+        sqlite_path = \
+            (database_config.get('sqlite') or {}).get('path', 'urang.sqlite3')
+        sqlite_path = os.path.join(
+            os.path.dirname(STANDARD_CONFIG_LOCATION), sqlite_path)
+        return SQLITE_URL_PREFIX + os.path.abspath(sqlite_path)
+
+    return f'mongodb://{MONGO_SERVER}:{MONGO_PORT}'
+
+
+def __get_client_options():
+    database_config = config_urang.get('database') or {}
+    return make_mongo_client_options(
+        (database_config.get('mongodb') or {}).get('pool'))
+
+
+def __get_metrics_config():
+    database_config = config_urang.get('database') or {}
+    return database_config.get('metrics') or {}
+
+
 if __name__ != '__main__':
-    try:
-        database_handler = DatabaseHandler(f'mongodb://{MONGO_SERVER}:{MONGO_PORT}')
-        database_handler.connect_to_db()
-    except RuntimeError:
-        pass
+    # The connection is made lazily by the first query of each process, so
+    # that worker processes forked after the import get their own clients.
+    database_handler = DatabaseHandler(
+        __get_database_url(),
+        client_options=__get_client_options(),
+        slow_query_ms=__get_metrics_config().get('slow_query_ms'),
+        explain_slow_queries=
+        __get_metrics_config().get('explain_slow_queries', False))
+    database_handler.connect_to_db(lazy=True)
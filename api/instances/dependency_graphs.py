@@ -0,0 +1,3 @@
+from api.analyzer.dependency_graph import DependencyGraphRegistry
+
+dependency_graph_registry = DependencyGraphRegistry()
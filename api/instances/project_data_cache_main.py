@@ -0,0 +1,6 @@
+from api.instances.database_main import database_handler
+from api.project_data_cache import ProjectDataCache
+
+project_data_cache = ProjectDataCache(database_handler.get_project_version)
+database_handler.add_write_listener(
+    project_data_cache.database_write_listener)
@@ -0,0 +1,148 @@
+from api.database import FUNCTION_INFO_COLLECTION, TEST_INFO_COLLECTION
+from api.util.memory_cache import MemoryCache
+
+
+class ProjectDataCache:
+    """Read through cache of the function info and test info documents of
+    whole projects, keyed by collection and project path.
+
+    The cache is bounded by the total number of cached documents, and the
+    least recently used projects are evicted first. The documents of a
+    project with more documents than that are read from the database every
+    time instead. Cached documents are shared between all readers and must
+    not be modified.
+
+    Cached documents are kept with the version of the project they were read
+    at, and are read again once the version has moved. The versions are kept
+    in the database, so writes made by other processes are seen as well.
+
+    :param get_version: Function getting the version of the documents of a
+    project in a collection, like DatabaseHandler.get_project_version.
+    :type get_version: callable
+    :param max_documents: The maximum number of documents to cache.
+    :type max_documents: int
+
+    :rtype: None
+    """
+    CACHED_COLLECTIONS = (FUNCTION_INFO_COLLECTION, TEST_INFO_COLLECTION)
+
+    def __init__(self, get_version, max_documents: int = 100000) -> None:
+        self.memory_cache = MemoryCache(
+            max_weight=max_documents,
+            weigher=lambda entry: max(1, len(entry[1])))
+        self.__get_version = get_version
+
+    def __get_documents(
+            self,
+            collection: str,
+            path_to_project: str,
+            loader) -> list:
+        # The version is read before the documents, so that documents are
+        # never cached with a version newer than them.
+        version = self.get_version(path_to_project, collection)
+        key = (collection, path_to_project)
+
+        entry = self.memory_cache.get_or_load(
+            key, lambda: (version, loader()))
+        if entry[0] != version:
+            self.memory_cache.remove(key)
+            entry = self.memory_cache.get_or_load(
+                key, lambda: (version, loader()))
+
+        return entry[1]
+
+    def get_function_info(self, path_to_project: str, loader) -> list:
+        """Get all function info documents for a project.
+
+        :param path_to_project: The absolute path to the project.
+        :type path_to_project: str
+        :param loader: Function without arguments loading the documents from
+        the database, if they are not cached.
+        :type loader: callable
+
+        :return: The function info documents.
+        :rtype: list
+        """
+        return self.__get_documents(
+            FUNCTION_INFO_COLLECTION, path_to_project, loader)
+
+    def get_test_info(self, path_to_project: str, loader) -> list:
+        """Get all test info documents for a project.
+
+        :param path_to_project: The absolute path to the project.
+        :type path_to_project: str
+        :param loader: Function without arguments loading the documents from
+        the database, if they are not cached.
+        :type loader: callable
+
+        :return: The test info documents.
+        :rtype: list
+        """
+        return self.__get_documents(
+            TEST_INFO_COLLECTION, path_to_project, loader)
+
+    def invalidate(
+            self,
+            path_to_project: str = None,
+            collection: str = None) -> None:
+        """Invalidate cached documents.
+
+        :param path_to_project: The absolute path to the project to
+        invalidate, all projects if None.
+        :type path_to_project: str|None
+        :param collection: The collection to invalidate, all collections if
+        None.
+        :type collection: str|None
+
+        :return: None
+        """
+        if path_to_project is None and collection is None:
+            self.memory_cache.clear()
+
+        elif path_to_project is not None and collection is not None:
+            self.memory_cache.remove((collection, path_to_project))
+
+        else:
+            self.memory_cache.remove_if(
+                lambda key:
+                (collection is None or key[0] == collection) and
+                (path_to_project is None or key[1] == path_to_project))
+
+    def get_version(self, path_to_project: str, collection: str) -> str:
+        """Get the version of the documents of a project in a collection. The
+        version changes whenever the documents are written to, by any
+        process, and is to be read before the documents, so that a version is
+        never newer than the documents read after it.
+
+        :param path_to_project: The absolute path to the project.
+        :type path_to_project: str
+        :param collection: The collection.
+        :type collection: str
+
+        :return: The version.
+        :rtype: str
+        """
+        return self.__get_version(path_to_project, collection)
+
+    def database_write_listener(
+            self,
+            collection: str,
+            paths_to_project: set | None) -> None:
+        """Invalidate the cached documents affected by a database write.
+
+        :param collection: The collection written to.
+        :type collection: str
+        :param paths_to_project: The paths of all projects written to, None
+        if they are not known.
+        :type paths_to_project: set|None
+
+        :return: None
+        """
+        if collection not in self.CACHED_COLLECTIONS:
+            return
+
+        if paths_to_project is None:
+            self.invalidate(collection=collection)
+        else:
+            for path_to_project in paths_to_project:
+                self.invalidate(path_to_project, collection)
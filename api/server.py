@@ -1,8 +1,12 @@
+import hashlib
+import json
 import time
 from api.api import *
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_sock import Sock
 
+from api.instances.cache_maintenance_main import cache_maintenance, \
+    cache_maintenance_enabled
 from api.instances.shared_websockets_main import shared_websockets_handler
 from api.websocket import WsIdentity
 import simple_websocket
@@ -11,6 +15,70 @@ import simple_websocket
 server = Flask(__name__, static_folder='../build', static_url_path='/')
 socket = Sock(server)
 
+if cache_maintenance_enabled:
+    cache_maintenance.start()
+
+
+def __project_documents_response(api_return: dict, documents_key: str):
+    """Make a response for an API return with project documents. If the
+    documents are a lazy iterator, they are streamed as newline delimited
+    JSON, one document per line. Otherwise the API return is sent as JSON.
+
+    :param api_return: The API return.
+    :type api_return: dict
+    :param documents_key: The key of the documents in the API return.
+    :type documents_key: str
+
+    :return: The response.
+    """
+    if api_return["status"] != APIStatus.OK.value or \
+            isinstance(api_return[documents_key], list):
+        return jsonify(api_return)
+
+    return Response(
+        (json.dumps(document) + "\n"
+         for document in api_return[documents_key]),
+        mimetype='application/x-ndjson')
+
+
+def __conditional_response(
+        version: str,
+        api_call,
+        make_response=jsonify):
+    """Make a response tagged with an ETag, for data that changes with the
+    given version. The ETag is made from the version and the request, so it
+    differs between requests for different data. If the client already has
+    the data, as told by If-None-Match, an empty 304 response is made without
+    calling the API at all.
+
+    The version must be read before the data, so that data newer than its
+    version is at worst fetched again, while data older than its version is
+    never tagged with it.
+
+    :param version: The version of the data.
+    :type version: str
+    :param api_call: Function without arguments calling the API.
+    :type api_call: callable
+    :param make_response: Function making the response for an API return.
+    :type make_response: callable
+
+    :return: The response.
+    """
+    etag = hashlib.sha256(str.encode(json.dumps(
+        [request.path, request.json, version], sort_keys=True))).hexdigest()
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    api_return = api_call()
+    response = make_response(api_return)
+    if api_return["status"] == APIStatus.OK.value:
+        response.set_etag(etag)
+
+    return response
+
 
 @server.route('/')
 def index():
@@ -32,14 +100,17 @@ def any_test_socket(socket_identifier):
 @server.route('/api/list_files', methods=['POST'])
 def post_list_files():
     """List files in the standard directory or from the specified sub
-    directory.
+    directory. The files can be paginated with 'limit' and 'afterFileName'.
 
     :return: JSON with status code and a list of files if successful.
     """
     content = request.json
 
     if 'subDirectory' in content:
-        api_return = list_files(content['subDirectory'])
+        api_return = list_files(
+            content['subDirectory'],
+            content.get("limit", 0),
+            content.get("afterFileName"))
 
     else:
         api_return = {
@@ -91,38 +162,64 @@ def get_get_existing_projects():
     return jsonify(api_return)
 
 
+@server.route('/api/get_database_statistics', methods=['GET'])
+def get_get_database_statistics():
+    """Get the database connection pool and query statistics of the serving
+    process.
+
+    :return: JSON with status code.
+    """
+    api_return = get_database_statistics()
+
+    return jsonify(api_return)
+
+
 @server.route('/api/get_functions_for_project', methods=['POST'])
 def post_get_functions_for_project():
-    """Get all functions created for a project.
+    """Get all functions created for a project. The functions can be
+    paginated with 'limit' and 'afterId', and streamed as newline delimited
+    JSON with 'stream'. Responses are tagged with an ETag, and a 304 is sent
+    if the functions are unchanged since the If-None-Match tag.
 
-    :return: JSON with status code.
+    :return: JSON with status code, or the streamed functions.
     """
     content = request.json
     path_to_project = content["pathToProject"]
 
-    api_return = get_functions_for_project(path_to_project)
-
-    return jsonify(api_return)
+    return __conditional_response(
+        get_project_functions_version(path_to_project),
+        lambda: get_functions_for_project(
+            path_to_project,
+            content.get("limit", 0),
+            content.get("afterId"),
+            content.get("stream", False)),
+        lambda api_return: __project_documents_response(
+            api_return, "projectFunctions"))
 
 
 @server.route('/api/read_file', methods=['POST'])
 def post_read_file():
-    """Read a project file.
+    """Read a project file, or with "version" an older version of it from
+    the cache history. Responses are tagged with an ETag, and a 304 is sent
+    if the file is unchanged since the If-None-Match tag.
 
     :return: JSON with status code.
     """
     content = request.json
     path_to_project = content["pathToProject"]
     file_id = content["fileId"]
+    version = content.get("version", 0)
 
-    api_return = read_file(path_to_project, file_id)
-
-    return jsonify(api_return)
+    return __conditional_response(
+        get_file_version(path_to_project, file_id, version=version),
+        lambda: read_file(path_to_project, file_id, version=version))
 
 
 @server.route('/api/read_old_file', methods=['POST'])
 def post_read_old_file():
-    """Read a project file.
+    """Read the old version of a project file. Responses are tagged with an
+    ETag, and a 304 is sent if the file is unchanged since the If-None-Match
+    tag.
 
     :return: JSON with status code.
     """
@@ -130,25 +227,89 @@ def post_read_old_file():
     path_to_project = content["pathToProject"]
     file_id = content["fileId"]
 
-    api_return = read_file(path_to_project, file_id, True)
+    return __conditional_response(
+        get_file_version(path_to_project, file_id, True),
+        lambda: read_file(path_to_project, file_id, True))
+
+
+@server.route('/api/read_file_range', methods=['POST'])
+def post_read_file_range():
+    """Read a range of a project file, given by "start", "end" and "unit",
+    or the range of the function given by "functionId".
+
+    :return: JSON with status code and the contents of the range if
+    successful.
+    """
+    content = request.json
+    path_to_project = content["pathToProject"]
+    file_id = content["fileId"]
+
+    api_return = read_file_range(
+        path_to_project,
+        file_id,
+        content.get("start", 0),
+        content.get("end"),
+        content.get("unit", "characters"),
+        content.get("functionId"))
 
     return jsonify(api_return)
 
 
-@server.route('/api/get_tests_for_project', methods=['POST'])
-def post_get_tests_for_project():
-    """Get all tests for the given project.
+@server.route('/api/get_function_diff', methods=['POST'])
+def post_get_function_diff():
+    """Diff the source of a function in the old and the current version of
+    its file.
+
+    :return: JSON with status code and the function diff if successful.
+    """
+    content = request.json
+    path_to_project = content["pathToProject"]
+    file_id = content["fileId"]
+    function_id = content["functionId"]
+
+    api_return = get_function_diff(path_to_project, file_id, function_id)
+
+    return jsonify(api_return)
+
+
+@server.route('/api/get_affected_test_surfaces', methods=['POST'])
+def post_get_affected_test_surfaces():
+    """Get all test surfaces affected by changes to a project file.
 
     :return: JSON with status code.
     """
     content = request.json
     path_to_project = content["pathToProject"]
+    file_id = content["fileId"]
 
-    api_return = get_tests_for_project(path_to_project)
+    api_return = get_affected_test_surfaces(path_to_project, file_id)
 
     return jsonify(api_return)
 
 
+@server.route('/api/get_tests_for_project', methods=['POST'])
+def post_get_tests_for_project():
+    """Get all tests for the given project. The tests can be paginated with
+    'limit' and 'afterId', and streamed as newline delimited JSON with
+    'stream'. Responses are tagged with an ETag, and a 304 is sent if the
+    tests are unchanged since the If-None-Match tag.
+
+    :return: JSON with status code, or the streamed tests.
+    """
+    content = request.json
+    path_to_project = content["pathToProject"]
+
+    return __conditional_response(
+        get_project_tests_version(path_to_project),
+        lambda: get_tests_for_project(
+            path_to_project,
+            content.get("limit", 0),
+            content.get("afterId"),
+            content.get("stream", False)),
+        lambda api_return: __project_documents_response(
+            api_return, "projectTests"))
+
+
 @server.route('/api/save_test', methods=['POST'])
 def post_save_test():
     """Save a test for the given function.
@@ -0,0 +1,126 @@
+class StorageCollection:
+    """Interface for a collection of documents in a storage backend.
+
+    The interface is the subset of the pymongo Collection API used by the
+    DatabaseHandler, so that a pymongo Collection is itself a valid storage
+    collection. Filters, projections and updates use the MongoDB query
+    language, and the same pymongo result objects are returned.
+
+    :rtype: None
+    """
+    def find(self, filter: dict = None, projection: dict = None):
+        """Find all documents matching the filter.
+
+        :param filter: The filter to match documents with.
+        :param projection: The projection to apply to the documents.
+
+        :return: A cursor over the matching documents, supporting sort(),
+            limit(), close(), explain() and iteration.
+        """
+        raise NotImplementedError
+
+    def find_one(self, filter: dict = None, projection: dict = None):
+        """Find the first document matching the filter.
+
+        :param filter: The filter to match the document with.
+        :param projection: The projection to apply to the document.
+
+        :return: The document, or None if no document matches.
+        """
+        raise NotImplementedError
+
+    def count_documents(self, filter: dict, limit: int = 0) -> int:
+        """Count the documents matching the filter.
+
+        :param filter: The filter to match documents with.
+        :param limit: The maximum number of documents to count, no limit if
+            0.
+
+        :return: The number of matching documents.
+        """
+        raise NotImplementedError
+
+    def insert_one(self, document: dict):
+        """Insert a document.
+
+        :param document: The document to insert.
+
+        :return: A pymongo InsertOneResult.
+        """
+        raise NotImplementedError
+
+    def update_one(self, filter: dict, update: dict):
+        """Update the first document matching the filter.
+
+        :param filter: The filter to match the document with.
+        :param update: The update operators to apply, $set or $inc.
+
+        :return: A pymongo UpdateResult.
+        """
+        raise NotImplementedError
+
+    def update_many(self, filter: dict, update: dict):
+        """Update all documents matching the filter.
+
+        :param filter: The filter to match documents with.
+        :param update: The update operators to apply, $set or $inc.
+
+        :return: A pymongo UpdateResult.
+        """
+        raise NotImplementedError
+
+    def delete_one(self, filter: dict):
+        """Delete the first document matching the filter.
+
+        :param filter: The filter to match the document with.
+
+        :return: A pymongo DeleteResult.
+        """
+        raise NotImplementedError
+
+    def delete_many(self, filter: dict):
+        """Delete all documents matching the filter.
+
+        :param filter: The filter to match documents with.
+
+        :return: A pymongo DeleteResult.
+        """
+        raise NotImplementedError
+
+    def bulk_write(self, requests: list, ordered: bool = True):
+        """Make several writes at once.
+
+        :param requests: The pymongo InsertOne, UpdateOne and DeleteMany
+            requests to make.
+        :param ordered: If True, the requests are made in order and the
+            writes stop at the first error.
+
+        :return: A pymongo BulkWriteResult.
+        """
+        raise NotImplementedError
+
+
+class StorageBackend:
+    """Interface for a storage backend holding collections of documents.
+
+    Like StorageCollection, the interface is the subset of the pymongo API
+    used by the DatabaseHandler, so that a pymongo Database is itself a
+    valid storage backend.
+
+    :rtype: None
+    """
+    def __getitem__(self, collection: str) -> StorageCollection:
+        """Get a collection, it is created when first written to.
+
+        :param collection: The name of the collection.
+
+        :return: The collection.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Close the storage backend and release all its resources.
+
+        :return: No return value.
+        """
+        raise NotImplementedError
@@ -0,0 +1,152 @@
+FILTER_COMPARISON_OPERATORS = ['$gt', '$gte', '$lt', '$lte']
+
+
+def project_document(document: dict, projection: dict | None) -> dict:
+    """Apply a MongoDB projection to a document.
+
+    :param document: The document, with '_id' as its first field.
+    :param projection: The projection, None to keep all fields.
+
+    :return: The projected document.
+    """
+    if not projection:
+        return document
+
+    include_id = bool(projection.get('_id', 1))
+    included_fields = \
+        {field for field, value in projection.items()
+         if value and field != '_id'}
+
+    if len(included_fields) > 0:
+        return {
+            field: value for field, value in document.items()
+            if field in included_fields or (field == '_id' and include_id)}
+
+    return {
+        field: value for field, value in document.items()
+        if (include_id if field == '_id' else projection.get(field, 1))}
+
+
+def apply_update(document: dict, update: dict) -> dict:
+    """Apply MongoDB update operators to a copy of a document.
+
+    :param document: The document to update.
+    :param update: The update operators, $set or $inc.
+
+    :return: The updated document.
+
+    :raises NotImplementedError: If the update uses an unsupported operator.
+    """
+    updated_document = document.copy()
+
+    for operator, fields in update.items():
+        match operator:
+            case '$set':
+                for field, value in fields.items():
+                    if field != '_id':
+                        updated_document[field] = value
+            case '$inc':
+                for field, increment in fields.items():
+                    updated_document[field] = \
+                        updated_document.get(field, 0) + increment
+            case _:
+                raise NotImplementedError(
+                    f"Unsupported update operator: {operator}")
+
+    return updated_document
+
+
+def get_updated_fields(update: dict) -> set:
+    """Get the fields changed by MongoDB update operators.
+
+    :param update: The update operators.
+
+    :return: The names of the changed fields.
+    """
+    return {field for fields in update.values() for field in fields}
+
+
+def __normalize_value(value: any) -> any:
+    if isinstance(value, tuple):
+        return [__normalize_value(item) for item in value]
+    if isinstance(value, list):
+        return [__normalize_value(item) for item in value]
+
+    return value
+
+
+def __value_equals(field_value: any, value: any) -> bool:
+    field_value = __normalize_value(field_value)
+    value = __normalize_value(value)
+
+    if field_value == value:
+        return True
+
+    # Like in MongoDB, an array field matches a value it contains
+    return isinstance(field_value, list) and not isinstance(value, list) \
+        and value in field_value
+
+
+def __value_compares(field_value: any, operator: str, value: any) -> bool:
+    if field_value is None or value is None:
+        return False
+
+    try:
+        match operator:
+            case '$gt':
+                return field_value > value
+            case '$gte':
+                return field_value >= value
+            case '$lt':
+                return field_value < value
+            case '$lte':
+                return field_value <= value
+    except TypeError:
+        return False
+
+
+def document_matches_filter(document: dict, db_filter: dict) -> bool:
+    """Check if a document matches a MongoDB filter, with the same
+    operators as supported by the SQLite storage backend.
+
+    :param document: The document to check.
+    :param db_filter: The filter to match the document with.
+
+    :return: True if the document matches the filter, False otherwise.
+
+    :raises NotImplementedError: If the filter uses an unsupported operator.
+    """
+    for field, value in (db_filter or {}).items():
+        field_value = document.get(field)
+
+        if isinstance(value, dict) and len(value) > 0 and \
+                all(str(operator).startswith('$') for operator in value):
+            operators = value.items()
+        else:
+            operators = [('$eq', value)]
+
+        for operator, operator_value in operators:
+            match operator:
+                case '$eq':
+                    matches = __value_equals(field_value, operator_value)
+                case '$ne':
+                    matches = not __value_equals(field_value, operator_value)
+                case '$in':
+                    matches = any(
+                        __value_equals(field_value, item)
+                        for item in operator_value)
+                case '$nin':
+                    matches = not any(
+                        __value_equals(field_value, item)
+                        for item in operator_value)
+                case _ if operator in FILTER_COMPARISON_OPERATORS:
+                    matches = __value_compares(
+                        field_value, operator, operator_value)
+                case _:
+                    raise NotImplementedError(
+                        f"Unsupported filter operator: {operator}")
+
+            if not matches:
+                return False
+
+    return True
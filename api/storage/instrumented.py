@@ -0,0 +1,209 @@
+import time
+
+from api.storage.backend import StorageBackend, StorageCollection
+
+
+class InstrumentedCursor:
+    """Cursor timing the iteration of another cursor. Only the time spent
+    fetching documents is counted, not the time the documents are used for
+    between fetches. The query is recorded once the cursor is exhausted or
+    closed.
+
+    :param cursor: The cursor to time.
+    :param record_query: Called with the duration in seconds and the number
+        of fetched documents once the query is done.
+
+    :rtype: None
+    """
+    def __init__(self, cursor: any, record_query: any) -> None:
+        self.cursor = cursor
+        self.record_query = record_query
+        self.duration = 0.0
+        self.documents = 0
+        self.recorded = False
+
+    def __getattr__(self, attribute: str) -> any:
+        return getattr(self.cursor, attribute)
+
+    def sort(self, *args, **kwargs) -> 'InstrumentedCursor':
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs) -> 'InstrumentedCursor':
+        self.cursor = self.cursor.limit(*args, **kwargs)
+        return self
+
+    def __iter__(self):
+        try:
+            start_time = time.perf_counter()
+            iterator = iter(self.cursor)
+            self.duration += time.perf_counter() - start_time
+
+            while True:
+                start_time = time.perf_counter()
+                try:
+                    document = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    self.duration += time.perf_counter() - start_time
+
+                self.documents += 1
+                yield document
+        finally:
+            self.__record()
+
+    def close(self) -> None:
+        self.cursor.close()
+        self.__record()
+
+    def __record(self) -> None:
+        if not self.recorded:
+            self.recorded = True
+            self.record_query(self.duration, self.documents)
+
+
+class InstrumentedStorageCollection(StorageCollection):
+    """Storage collection timing every query made to another collection.
+
+    :param storage_collection: The collection to time the queries of.
+    :param collection: The name of the collection.
+    :param query_listener: Called for every query with the name of the
+        collection, the operation, the filter (None for inserts and bulk
+        writes), the duration in seconds, the number of documents returned
+        or written and a function returning the query plan of the filter,
+        or None if there is no filter.
+
+    :rtype: None
+    """
+    def __init__(
+            self,
+            storage_collection: any,
+            collection: str,
+            query_listener: any) -> None:
+        self.storage_collection = storage_collection
+        self.collection = collection
+        self.query_listener = query_listener
+
+    def __getattr__(self, attribute: str) -> any:
+        return getattr(self.storage_collection, attribute)
+
+    def __explain(self, db_filter: dict) -> any:
+        return lambda: self.storage_collection.find(db_filter).explain()
+
+    def __record(
+            self,
+            operation: str,
+            db_filter: dict | None,
+            start_time: float,
+            documents: int) -> None:
+        self.query_listener(
+            self.collection,
+            operation,
+            db_filter,
+            time.perf_counter() - start_time,
+            documents,
+            self.__explain(db_filter) if db_filter is not None else None)
+
+    def __timed(
+            self,
+            operation: str,
+            db_filter: dict | None,
+            count_documents: any,
+            query: any) -> any:
+        start_time = time.perf_counter()
+        result = None
+        try:
+            result = query()
+            return result
+        finally:
+            self.__record(
+                operation,
+                db_filter,
+                start_time,
+                count_documents(result) if result is not None else 0)
+
+    def find(self, filter: dict = None, projection: dict = None):
+        def record_query(duration: float, documents: int) -> None:
+            self.query_listener(
+                self.collection, 'find', filter or {}, duration, documents,
+                self.__explain(filter or {}))
+
+        start_time = time.perf_counter()
+        cursor = self.storage_collection.find(filter, projection)
+        instrumented_cursor = InstrumentedCursor(cursor, record_query)
+        instrumented_cursor.duration = time.perf_counter() - start_time
+
+        return instrumented_cursor
+
+    def find_one(self, filter: dict = None, projection: dict = None):
+        return self.__timed(
+            'find_one', filter or {}, lambda document: 1,
+            lambda: self.storage_collection.find_one(filter, projection))
+
+    def count_documents(self, filter: dict, **kwargs) -> int:
+        return self.__timed(
+            'count_documents', filter, lambda count: 0,
+            lambda: self.storage_collection.count_documents(
+                filter, **kwargs))
+
+    def insert_one(self, document: dict):
+        return self.__timed(
+            'insert_one', None, lambda result: 1,
+            lambda: self.storage_collection.insert_one(document))
+
+    def update_one(self, filter: dict, update: dict):
+        return self.__timed(
+            'update_one', filter, lambda result: result.matched_count,
+            lambda: self.storage_collection.update_one(filter, update))
+
+    def update_many(self, filter: dict, update: dict):
+        return self.__timed(
+            'update_many', filter, lambda result: result.matched_count,
+            lambda: self.storage_collection.update_many(filter, update))
+
+    def delete_one(self, filter: dict):
+        return self.__timed(
+            'delete_one', filter, lambda result: result.deleted_count,
+            lambda: self.storage_collection.delete_one(filter))
+
+    def delete_many(self, filter: dict):
+        return self.__timed(
+            'delete_many', filter, lambda result: result.deleted_count,
+            lambda: self.storage_collection.delete_many(filter))
+
+    def bulk_write(self, requests: list, ordered: bool = True):
+        return self.__timed(
+            'bulk_write', None,
+            lambda result:
+            result.inserted_count + result.matched_count +
+            result.deleted_count,
+            lambda: self.storage_collection.bulk_write(
+                requests, ordered=ordered))
+
+
+class InstrumentedStorageBackend(StorageBackend):
+    """Storage backend timing every query made to the collections of
+    another storage backend, like a pymongo Database.
+
+    :param storage_backend: The storage backend to time the queries of.
+    :param query_listener: Called for every query, see
+        InstrumentedStorageCollection.
+
+    :rtype: None
+    """
+    def __init__(self, storage_backend: any, query_listener: any) -> None:
+        self.storage_backend = storage_backend
+        self.query_listener = query_listener
+
+    def __getattr__(self, attribute: str) -> any:
+        return getattr(self.storage_backend, attribute)
+
+    def __getitem__(self, collection: str) -> InstrumentedStorageCollection:
+        return InstrumentedStorageCollection(
+            self.storage_backend[collection],
+            collection,
+            self.query_listener)
+
+    def close(self) -> None:
+        self.storage_backend.close()
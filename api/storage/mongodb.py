@@ -0,0 +1,142 @@
+import threading
+
+from pymongo.monitoring import ConnectionPoolListener
+
+# Connection pool options in urang.config.yml mapped to the MongoClient
+# options they set.
+MONGO_CLIENT_OPTIONS = {
+    'max_pool_size': 'maxPoolSize',
+    'min_pool_size': 'minPoolSize',
+    'max_connecting': 'maxConnecting',
+    'max_idle_time_ms': 'maxIdleTimeMS',
+    'wait_queue_timeout_ms': 'waitQueueTimeoutMS',
+    'connect_timeout_ms': 'connectTimeoutMS',
+    'socket_timeout_ms': 'socketTimeoutMS',
+    'server_selection_timeout_ms': 'serverSelectionTimeoutMS'
+}
+
+
+def make_mongo_client_options(pool_config: dict | None) -> dict:
+    """Make the MongoClient options for the connection pool options in the
+    configuration.
+
+    :param pool_config: The connection pool options, None for the MongoClient
+        defaults.
+
+    :return: The MongoClient options.
+
+    :raises TypeError: If the options aren't a dictionary, or if an option
+        isn't an integer or None.
+    :raises ValueError: If an option is unknown or negative.
+    """
+    if pool_config is None:
+        return {}
+
+    if not isinstance(pool_config, dict):
+        raise TypeError("The connection pool options should be a dict.")
+
+    client_options = {}
+    for option, value in pool_config.items():
+        if option not in MONGO_CLIENT_OPTIONS:
+            raise ValueError(
+                f"Unknown connection pool option: {option}, the known "
+                f"options are: {', '.join(MONGO_CLIENT_OPTIONS)}")
+
+        # None keeps the MongoClient default
+        if value is None:
+            continue
+
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError(
+                f"The connection pool option {option} should be an "
+                f"integer, but was given a value of type {type(value)}.")
+
+        if value < 0:
+            raise ValueError(
+                f"The connection pool option {option} can't be negative.")
+
+        client_options[MONGO_CLIENT_OPTIONS[option]] = value
+
+    return client_options
+
+
+class ConnectionPoolStatistics(ConnectionPoolListener):
+    """Connection pool listener counting the connections and checkouts of
+    the connection pools of a MongoClient.
+
+    :rtype: None
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pools = 0
+        self.pools_cleared = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+
+    def get_statistics(self) -> dict:
+        """Get the statistics of the connection pools.
+
+        :return: The number of pools, times pools were cleared, connections
+            created, closed and open, checkouts and failed checkouts, and
+            the current and highest number of checked out connections.
+        """
+        with self.lock:
+            return {
+                'pools': self.pools,
+                'poolsCleared': self.pools_cleared,
+                'connectionsCreated': self.connections_created,
+                'connectionsClosed': self.connections_closed,
+                'connectionsOpen':
+                    self.connections_created - self.connections_closed,
+                'checkouts': self.checkouts,
+                'checkoutFailures': self.checkout_failures,
+                'checkedOut': self.checked_out,
+                'maxCheckedOut': self.max_checked_out
+            }
+
+    def pool_created(self, event) -> None:
+        with self.lock:
+            self.pools += 1
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        with self.lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event) -> None:
+        with self.lock:
+            self.pools -= 1
+
+    def connection_created(self, event) -> None:
+        with self.lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self.lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        with self.lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def connection_checked_in(self, event) -> None:
+        with self.lock:
+            self.checked_out -= 1
@@ -0,0 +1,147 @@
+import threading
+
+# Upper bounds, in milliseconds, of the buckets of the latency histograms.
+# The last bucket counts the queries slower than the last bound.
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+
+def get_filter_shape(db_filter: dict | None) -> str:
+    """Get the shape of a filter, which is the filter with the compared
+    values left out, so that queries differing only by their values get the
+    same shape.
+
+    :param db_filter: The filter, None for operations without a filter.
+
+    :return: The shape of the filter, like '{fileId: ?, _id: {$in: ?}}', or
+        '-' for operations without a filter.
+    """
+    if db_filter is None:
+        return "-"
+
+    def value_shape(value: any) -> str:
+        if isinstance(value, dict) and len(value) > 0 and \
+                all(str(operator).startswith('$') for operator in value):
+            return "{" + ", ".join(
+                f"{operator}: ?" for operator in sorted(value)) + "}"
+
+        return "?"
+
+    return "{" + ", ".join(
+        f"{field}: {value_shape(db_filter[field])}"
+        for field in sorted(db_filter)) + "}"
+
+
+class QueryMetrics:
+    """Thread-safe counters and latency histograms of database queries,
+    grouped by collection, operation and filter shape.
+
+    :rtype: None
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.queries = {}
+
+    def record(
+            self,
+            collection: str,
+            operation: str,
+            filter_shape: str,
+            duration: float,
+            documents: int) -> None:
+        """Record a query.
+
+        :param collection: The collection queried.
+        :param operation: The operation, like 'find' or 'update_one'.
+        :param filter_shape: The shape of the filter of the query.
+        :param duration: The duration of the query in seconds.
+        :param documents: The number of documents returned or written.
+
+        :return: No return value.
+        """
+        duration_ms = duration * 1000
+        bucket = next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS_MS)
+             if duration_ms <= bound),
+            len(LATENCY_BUCKETS_MS))
+
+        with self.lock:
+            query = self.queries.get((collection, operation, filter_shape))
+            if query is None:
+                query = {
+                    'count': 0,
+                    'totalMs': 0.0,
+                    'maxMs': 0.0,
+                    'documents': 0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+                self.queries[(collection, operation, filter_shape)] = query
+
+            query['count'] += 1
+            query['totalMs'] += duration_ms
+            query['maxMs'] = max(query['maxMs'], duration_ms)
+            query['documents'] += documents
+            query['histogram'][bucket] += 1
+
+    def reset(self) -> None:
+        """Remove all recorded queries.
+
+        :return: No return value.
+        """
+        with self.lock:
+            self.queries = {}
+
+    def get_statistics(self) -> list:
+        """Get the statistics of the recorded queries, with the queries
+        taking the most time in total first.
+
+        :return: For every collection, operation and filter shape, the
+            number of queries, their total, mean and max duration in
+            milliseconds, the number of documents returned or written, and
+            the latency histogram mapping the upper bound of each bucket to
+            its number of queries.
+        """
+        bucket_names = \
+            [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + \
+            [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+
+        with self.lock:
+            statistics = [
+                {
+                    'collection': collection,
+                    'operation': operation,
+                    'filterShape': filter_shape,
+                    'count': query['count'],
+                    'totalMs': round(query['totalMs'], 3),
+                    'meanMs': round(query['totalMs'] / query['count'], 3),
+                    'maxMs': round(query['maxMs'], 3),
+                    'documents': query['documents'],
+                    'histogram': dict(zip(bucket_names, query['histogram']))
+                }
+                for (collection, operation, filter_shape), query
+                in self.queries.items()]
+
+        statistics.sort(key=lambda query: query['totalMs'], reverse=True)
+        return statistics
+
+    def format_summary(self) -> str:
+        """Format a summary of the recorded queries, one line per
+        collection, operation and filter shape.
+
+        :return: The summary.
+        """
+        statistics = self.get_statistics()
+        lines = [
+            f"{len(statistics)} kinds of queries, "
+            f"{sum(query['count'] for query in statistics)} queries in "
+            f"{sum(query['totalMs'] for query in statistics):.1f} ms"]
+
+        for query in statistics:
+            lines.append(
+                f"{query['collection']}.{query['operation']} "
+                f"{query['filterShape']}: {query['count']} queries, "
+                f"{query['totalMs']:.1f} ms total, "
+                f"{query['meanMs']:.2f} ms mean, "
+                f"{query['maxMs']:.2f} ms max, "
+                f"{query['documents']} documents")
+
+        return "\n".join(lines)
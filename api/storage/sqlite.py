@@ -0,0 +1,647 @@
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.results import BulkWriteResult, DeleteResult, \
+    InsertOneResult, UpdateResult
+
+from api.storage.backend import StorageBackend, StorageCollection
+from api.storage.documents import apply_update, project_document
+
+FIELD_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+COMPARISON_OPERATORS = {
+    '$eq': "=",
+    '$ne': "!=",
+    '$gt': ">",
+    '$gte': ">=",
+    '$lt': "<",
+    '$lte': "<="
+}
+
+
+def _field_expression(field: str) -> str:
+    """Get the SQL expression for a document field.
+
+    :param field: The name of the field.
+
+    :return: The SQL expression.
+
+    :raises ValueError: If the field name isn't a plain field name.
+    """
+    if field == '_id':
+        return "id"
+
+    if not FIELD_NAME_PATTERN.match(field):
+        raise ValueError(f"Unsupported field name: {field}")
+
+    return f"json_extract(document, '$.{field}')"
+
+
+def _value_parameter(field: str, value: any) -> tuple:
+    """Get the SQL placeholder and parameter for a value to compare a
+    document field with.
+
+    :param field: The name of the field.
+    :param value: The value to compare with.
+
+    :return: The placeholder and the parameter.
+    """
+    if field == '_id':
+        return "?", str(value)
+
+    if isinstance(value, (list, tuple, dict)):
+        return "json(?)", json.dumps(value, separators=(',', ':'))
+
+    return "?", value
+
+
+def _element_condition(field: str, condition: str) -> str:
+    """Get the SQL condition for a document field holding an array with an
+    element matching a condition on the 'value' and 'type' of the element.
+
+    :param field: The name of the field.
+    :param condition: The condition on the element.
+
+    :return: The SQL condition.
+    """
+    return f"(json_type(document, '$.{field}') = 'array' AND EXISTS (" \
+        f"SELECT 1 FROM json_each(document, '$.{field}') WHERE {condition}))"
+
+
+def _equality_condition(field: str, value: any, parameters: list) -> str:
+    """Get the SQL condition for a document field being equal to a value.
+    Like in MongoDB, an array field is also equal to a value it contains.
+
+    :param field: The name of the field.
+    :param value: The value to compare with.
+    :param parameters: The parameters of the condition are appended here.
+
+    :return: The SQL condition, which is never NULL.
+    """
+    expression = _field_expression(field)
+
+    if value is None:
+        condition = f"{expression} IS NULL"
+        element_condition = "type = 'null'"
+    else:
+        placeholder, parameter = _value_parameter(field, value)
+        parameters.append(parameter)
+        condition = f"COALESCE({expression} = {placeholder}, 0)"
+        element_condition = f"value = {placeholder}"
+
+    if isinstance(value, (list, tuple)):
+        return condition
+
+    if value is not None:
+        parameters.append(parameter)
+
+    return f"({condition} OR {_element_condition(field, element_condition)})"
+
+
+def _compile_filter(db_filter: dict, scalar_fields: set = None) -> tuple:
+    """Compile a MongoDB filter into an SQL condition.
+
+    Equality filters ('$eq', '$ne', '$in' and '$nin') match the elements of
+    array fields like in MongoDB, and like document_matches_filter, except
+    for the fields known to hold scalars. Those are compared as a whole so
+    that the filters on them can search the expression indexes.
+
+    :param db_filter: The filter to compile.
+    :param scalar_fields: The fields known to never hold an array, like
+        the indexed fields of the collection.
+
+    :return: The SQL condition and its parameters.
+
+    :raises NotImplementedError: If the filter uses an unsupported operator.
+    """
+    scalar_fields = scalar_fields if scalar_fields is not None else set()
+    conditions = []
+    parameters = []
+
+    for field, value in (db_filter or {}).items():
+        expression = _field_expression(field)
+        scalar = field == '_id' or field in scalar_fields
+
+        if isinstance(value, dict) and len(value) > 0 and \
+                all(str(operator).startswith('$') for operator in value):
+            operators = value.items()
+        else:
+            operators = [('$eq', value)]
+
+        for operator, operator_value in operators:
+            if operator in ('$in', '$nin') and scalar:
+                values = [item for item in operator_value if item is not None]
+                has_none = len(values) < len(operator_value)
+                placeholders = []
+                for item in values:
+                    placeholder, parameter = _value_parameter(field, item)
+                    placeholders.append(placeholder)
+                    parameters.append(parameter)
+
+                in_condition = \
+                    f"{expression} IN ({', '.join(placeholders)})" \
+                    if len(placeholders) > 0 else "0"
+
+                if operator == '$in':
+                    conditions.append(
+                        f"({expression} IS NULL OR {in_condition})"
+                        if has_none else in_condition)
+                else:
+                    conditions.append(
+                        f"({expression} IS NOT NULL AND NOT ({in_condition}))"
+                        if has_none else
+                        f"({expression} IS NULL OR NOT ({in_condition}))")
+
+            elif operator in ('$in', '$nin'):
+                in_condition = " OR ".join(
+                    _equality_condition(field, item, parameters)
+                    for item in operator_value) or "0"
+
+                conditions.append(
+                    f"({in_condition})" if operator == '$in' else
+                    f"NOT ({in_condition})")
+
+            elif operator in ('$eq', '$ne') and not scalar:
+                equality_condition = \
+                    _equality_condition(field, operator_value, parameters)
+
+                conditions.append(
+                    equality_condition if operator == '$eq' else
+                    f"NOT {equality_condition}")
+
+            elif operator in COMPARISON_OPERATORS:
+                if operator_value is None and operator in ('$eq', '$ne'):
+                    conditions.append(
+                        f"{expression} IS NULL" if operator == '$eq' else
+                        f"{expression} IS NOT NULL")
+                    continue
+
+                placeholder, parameter = \
+                    _value_parameter(field, operator_value)
+                parameters.append(parameter)
+
+                if operator == '$ne':
+                    conditions.append(
+                        f"({expression} IS NULL OR "
+                        f"{expression} != {placeholder})")
+                else:
+                    conditions.append(
+                        f"{expression} "
+                        f"{COMPARISON_OPERATORS[operator]} {placeholder}")
+
+            else:
+                raise NotImplementedError(
+                    f"Unsupported filter operator: {operator}")
+
+    if len(conditions) == 0:
+        return "1", parameters
+
+    return " AND ".join(conditions), parameters
+
+
+def _encode_document(document: dict, scalar_fields: set = None) -> str:
+    """Encode a document, without its ID, as JSON.
+
+    :param document: The document to encode.
+    :param scalar_fields: The fields which must not hold an array, see
+        _compile_filter.
+
+    :return: The encoded document.
+
+    :raises ValueError: If one of the scalar fields holds an array.
+    """
+    for field in scalar_fields if scalar_fields is not None else ():
+        if isinstance(document.get(field), (list, tuple)):
+            raise ValueError(
+                f"The indexed field {field} can't hold an array.")
+
+    return json.dumps(
+        {field: value for field, value in document.items() if field != '_id'},
+        separators=(',', ':'))
+
+
+def _decode_document(document_id: str, encoded_document: str) -> dict:
+    return {'_id': ObjectId(document_id), **json.loads(encoded_document)}
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """Storage backend keeping all collections in an embedded SQLite
+    database. Every collection is a table of JSON documents keyed by their
+    ObjectId, with expression indexes on the JSON fields given for the
+    collection. File databases use write-ahead logging so that reads are
+    not blocked by writes.
+
+    :param path: The path to the database file, or ':memory:' for an in
+        memory database.
+    :param indexes: The names of collections mapped to lists of tuples of
+        fields to create (compound) indexes on.
+
+    :rtype: None
+    """
+    def __init__(self, path: str, indexes: dict = None) -> None:
+        if not isinstance(path, str):
+            raise TypeError("path should be a string.")
+        if len(path) <= 0:
+            raise ValueError("Can't use an empty path.")
+
+        self.path = path
+        self.indexes = indexes if indexes is not None else {}
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(
+            path,
+            isolation_level=None,
+            check_same_thread=False)
+
+        if path != ':memory:':
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        self.__collections = {}
+
+    def __getitem__(self, collection: str) -> 'SQLiteStorageCollection':
+        with self.lock:
+            if collection not in self.__collections:
+                self.__create_collection(collection)
+                self.__collections[collection] = \
+                    SQLiteStorageCollection(self, collection)
+
+            return self.__collections[collection]
+
+    def __create_collection(self, collection: str) -> None:
+        if not FIELD_NAME_PATTERN.match(collection):
+            raise ValueError(f"Unsupported collection name: {collection}")
+
+        self.connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{collection}" ('
+            f'id TEXT PRIMARY KEY, '
+            f'document TEXT NOT NULL CHECK (json_valid(document)))')
+
+        for fields in self.indexes.get(collection, []):
+            self.connection.execute(
+                f'CREATE INDEX IF NOT EXISTS '
+                f'"{collection}_{"_".join(fields)}" ON "{collection}" ('
+                f'{", ".join(_field_expression(field) for field in fields)})')
+
+    @contextmanager
+    def transaction(self):
+        """Run statements in a transaction, which is rolled back if an
+        exception is raised.
+
+        :return: The connection to run statements with.
+        """
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            else:
+                self.connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+class SQLiteCursor:
+    """Lazy cursor over the documents in an SQLite collection matching a
+    filter. The query is run when the iteration starts.
+
+    :param storage_collection: The collection to find documents in.
+    :param db_filter: The filter to match documents with.
+    :param projection: The projection to apply to the documents.
+
+    :rtype: None
+    """
+    def __init__(
+            self,
+            storage_collection: 'SQLiteStorageCollection',
+            db_filter: dict,
+            projection: dict) -> None:
+        self.storage_collection = storage_collection
+        self.db_filter = db_filter
+        self.projection = projection
+        self.sort_field = None
+        self.sort_direction = 1
+        self.limit_count = 0
+        self.__rows = None
+
+    def sort(self, field: str, direction: int = 1) -> 'SQLiteCursor':
+        self.sort_field = field
+        self.sort_direction = direction
+        return self
+
+    def limit(self, limit_count: int) -> 'SQLiteCursor':
+        self.limit_count = limit_count
+        return self
+
+    def __iter__(self):
+        if self.__rows is None:
+            self.__rows = self.storage_collection.select(
+                self.db_filter,
+                sort_field=self.sort_field,
+                sort_direction=self.sort_direction,
+                limit=self.limit_count)
+
+        for document_id, encoded_document in self.__rows:
+            yield project_document(
+                _decode_document(document_id, encoded_document),
+                self.projection)
+
+    def close(self) -> None:
+        self.__rows = []
+
+    def explain(self) -> dict:
+        """Get the SQLite query plan of the query.
+
+        :return: The details of the steps of the query plan.
+        """
+        return {
+            'queryPlan': [
+                row[-1] for row in self.storage_collection.select(
+                    self.db_filter,
+                    sort_field=self.sort_field,
+                    sort_direction=self.sort_direction,
+                    limit=self.limit_count,
+                    explain=True)]
+        }
+
+
+class SQLiteBulkWrite:
+    """Collects the writes of pymongo bulk write requests, which add
+    themselves with the same protocol as for a pymongo bulk write.
+
+    :rtype: None
+    """
+    def __init__(self) -> None:
+        self.writes = []
+
+    def add_insert(self, document: dict) -> None:
+        self.writes.append(('insert', document))
+
+    def add_update(
+            self,
+            selector: dict,
+            update: dict,
+            multi: bool = False,
+            upsert: bool = False,
+            **kwargs) -> None:
+        if upsert:
+            raise NotImplementedError("Upserts are not supported.")
+
+        self.writes.append(('update', (selector, update, multi)))
+
+    def add_delete(self, selector: dict, limit: int, **kwargs) -> None:
+        self.writes.append(('delete', (selector, limit == 0)))
+
+
+class SQLiteStorageCollection(StorageCollection):
+    """Collection of documents stored in a table in an SQLite database.
+
+    :param storage_backend: The SQLite storage backend holding the table.
+    :param collection: The name of the collection.
+
+    :rtype: None
+    """
+    def __init__(
+            self,
+            storage_backend: SQLiteStorageBackend,
+            collection: str) -> None:
+        self.storage_backend = storage_backend
+        self.collection = collection
+        self.scalar_fields = {
+            field
+            for fields in storage_backend.indexes.get(collection, [])
+            for field in fields}
+
+    def select(
+            self,
+            db_filter: dict,
+            *, sort_field: str = None,
+            sort_direction: int = 1,
+            limit: int = 0,
+            connection: sqlite3.Connection = None,
+            explain: bool = False) -> list:
+        """Select the IDs and encoded documents matching a filter.
+
+        :param db_filter: The filter to match documents with.
+        :param sort_field: The field to sort by, insertion order if None.
+        :param sort_direction: 1 for ascending and -1 for descending order.
+        :param limit: The maximum number of documents, no limit if 0.
+        :param connection: The connection to use, for example within a
+            transaction.
+        :param explain: If True, the query plan of the selection is returned
+            instead.
+
+        :return: The IDs and encoded documents, or the rows of the query
+            plan.
+        """
+        condition, parameters = _compile_filter(
+            db_filter, self.scalar_fields)
+        order = \
+            "rowid" if sort_field is None else _field_expression(sort_field)
+        direction = "DESC" if sort_direction == -1 else "ASC"
+        statement = \
+            f'SELECT id, document FROM "{self.collection}" ' \
+            f'WHERE {condition} ORDER BY {order} {direction}'
+
+        if limit > 0:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+
+        if explain:
+            statement = "EXPLAIN QUERY PLAN " + statement
+
+        if connection is not None:
+            return connection.execute(statement, parameters).fetchall()
+
+        with self.storage_backend.lock:
+            return self.storage_backend.connection.execute(
+                statement, parameters).fetchall()
+
+    def find(self, filter: dict = None, projection: dict = None):
+        return SQLiteCursor(self, filter, projection)
+
+    def find_one(self, filter: dict = None, projection: dict = None):
+        rows = self.select(filter, limit=1)
+        if len(rows) == 0:
+            return None
+
+        return project_document(_decode_document(*rows[0]), projection)
+
+    def count_documents(self, filter: dict, limit: int = 0) -> int:
+        condition, parameters = _compile_filter(
+            filter, self.scalar_fields)
+        statement = f'SELECT 1 FROM "{self.collection}" WHERE {condition}'
+
+        if limit:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+
+        with self.storage_backend.lock:
+            return self.storage_backend.connection.execute(
+                f"SELECT COUNT(*) FROM ({statement})",
+                parameters).fetchone()[0]
+
+    def __insert(
+            self,
+            connection: sqlite3.Connection,
+            document: dict) -> ObjectId:
+        document_id = document.get('_id')
+        if document_id is None:
+            document_id = ObjectId()
+            document['_id'] = document_id
+        elif not isinstance(document_id, ObjectId):
+            raise TypeError(
+                "Only ObjectId document IDs are supported, got a document "
+                f"ID of type {type(document_id)}.")
+
+        try:
+            connection.execute(
+                f'INSERT INTO "{self.collection}" (id, document) '
+                f'VALUES (?, ?)',
+                (str(document_id),
+                 _encode_document(document, self.scalar_fields)))
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(
+                f"Duplicate document ID: {document_id}") from e
+
+        return document_id
+
+    def __update(
+            self,
+            connection: sqlite3.Connection,
+            db_filter: dict,
+            update: dict,
+            many: bool) -> tuple:
+        rows = self.select(
+            db_filter, limit=0 if many else 1, connection=connection)
+
+        modified_count = 0
+        for document_id, encoded_document in rows:
+            document = json.loads(encoded_document)
+            updated_document = apply_update(document, update)
+
+            if updated_document != document:
+                connection.execute(
+                    f'UPDATE "{self.collection}" SET document = ? '
+                    f'WHERE id = ?',
+                    (_encode_document(
+                        updated_document, self.scalar_fields),
+                     document_id))
+                modified_count += 1
+
+        return len(rows), modified_count
+
+    def __delete(
+            self,
+            connection: sqlite3.Connection,
+            db_filter: dict,
+            many: bool) -> int:
+        rows = self.select(
+            db_filter, limit=0 if many else 1, connection=connection)
+
+        connection.executemany(
+            f'DELETE FROM "{self.collection}" WHERE id = ?',
+            [(document_id,) for document_id, encoded_document in rows])
+
+        return len(rows)
+
+    def insert_one(self, document: dict):
+        with self.storage_backend.transaction() as connection:
+            return InsertOneResult(self.__insert(connection, document), True)
+
+    def update_one(self, filter: dict, update: dict):
+        with self.storage_backend.transaction() as connection:
+            matched_count, modified_count = \
+                self.__update(connection, filter, update, False)
+
+        return UpdateResult(
+            {'n': matched_count, 'nModified': modified_count}, True)
+
+    def update_many(self, filter: dict, update: dict):
+        with self.storage_backend.transaction() as connection:
+            matched_count, modified_count = \
+                self.__update(connection, filter, update, True)
+
+        return UpdateResult(
+            {'n': matched_count, 'nModified': modified_count}, True)
+
+    def delete_one(self, filter: dict):
+        with self.storage_backend.transaction() as connection:
+            return DeleteResult(
+                {'n': self.__delete(connection, filter, False)}, True)
+
+    def delete_many(self, filter: dict):
+        with self.storage_backend.transaction() as connection:
+            return DeleteResult(
+                {'n': self.__delete(connection, filter, True)}, True)
+
+    def bulk_write(self, requests: list, ordered: bool = True):
+        """Make several writes at once, all of them in one transaction. If
+        any write fails, no writes are made, regardless of order.
+
+        :param requests: The pymongo InsertOne, UpdateOne and DeleteMany
+            requests to make.
+        :param ordered: Kept for compatibility, the writes are always made
+            in order.
+
+        :return: A pymongo BulkWriteResult.
+
+        :raises BulkWriteError: If a write fails.
+        """
+        bulk = SQLiteBulkWrite()
+        for request in requests:
+            request._add_to_bulk(bulk)
+
+        bulk_api_result = {
+            'writeErrors': [],
+            'writeConcernErrors': [],
+            'nInserted': 0,
+            'nUpserted': 0,
+            'nMatched': 0,
+            'nModified': 0,
+            'nRemoved': 0,
+            'upserted': []
+        }
+
+        try:
+            with self.storage_backend.transaction() as connection:
+                for index, (write, write_data) in enumerate(bulk.writes):
+                    try:
+                        match write:
+                            case 'insert':
+                                self.__insert(connection, write_data)
+                                bulk_api_result['nInserted'] += 1
+                            case 'update':
+                                matched_count, modified_count = \
+                                    self.__update(connection, *write_data)
+                                bulk_api_result['nMatched'] += matched_count
+                                bulk_api_result['nModified'] += \
+                                    modified_count
+                            case 'delete':
+                                bulk_api_result['nRemoved'] += \
+                                    self.__delete(connection, *write_data)
+                    except (DuplicateKeyError, sqlite3.Error) as e:
+                        bulk_api_result['writeErrors'].append({
+                            'index': index,
+                            'code': 11000
+                            if isinstance(e, DuplicateKeyError) else 1,
+                            'errmsg': str(e),
+                            'op': write_data
+                        })
+                        raise
+
+        except (DuplicateKeyError, sqlite3.Error) as e:
+            for key in ['nInserted', 'nMatched', 'nModified', 'nRemoved']:
+                bulk_api_result[key] = 0
+
+            raise BulkWriteError(bulk_api_result) from e
+
+        return BulkWriteResult(bulk_api_result, True)
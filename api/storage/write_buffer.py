@@ -0,0 +1,211 @@
+import copy
+import time
+from enum import Enum
+
+from api.storage.documents import apply_update, document_matches_filter, \
+    get_updated_fields
+
+
+class BufferedWrite(Enum):
+    INSERT = "INSERT"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+
+def _is_id_filter(db_filter: dict) -> bool:
+    """Check if a filter matches at most one document by its ID.
+
+    :param db_filter: The filter to check.
+
+    :return: True if the filter only compares the ID with a value.
+    """
+    return list(db_filter.keys()) == ['_id'] and \
+        not isinstance(db_filter['_id'], dict)
+
+
+class WriteBuffer:
+    """Buffer of database writes, kept per collection in the order they were
+    made, until they are flushed to the database in one bulk write per
+    collection. Writes are made with the same data as the insert, update and
+    delete requests of a pymongo bulk write.
+
+    Reads can see the buffered writes by overlaying them on the documents
+    read from the database. This is only possible if the buffered writes
+    can't make a document in the database start matching the read filter,
+    which is checked with can_overlay.
+
+    :param max_operations: The number of buffered writes at which the buffer
+        is full.
+    :param max_delay: The number of seconds after the first buffered write at
+        which the buffer is full.
+
+    :rtype: None
+    """
+    def __init__(
+            self,
+            max_operations: int = 1000,
+            max_delay: float = 1.0) -> None:
+        if not isinstance(max_operations, int) or \
+                isinstance(max_operations, bool):
+            raise TypeError("max_operations should be an integer.")
+        if max_operations < 1:
+            raise ValueError("max_operations should be at least 1.")
+        if not isinstance(max_delay, (int, float)) or \
+                isinstance(max_delay, bool):
+            raise TypeError("max_delay should be a number.")
+        if max_delay < 0:
+            raise ValueError("max_delay can't be negative.")
+
+        self.max_operations = max_operations
+        self.max_delay = max_delay
+        self.writes = {}
+        self.written_documents = {}
+        self.operation_count = 0
+        self.first_write_time = None
+
+    def add(
+            self,
+            collection: str,
+            write: BufferedWrite,
+            write_data: any,
+            written_documents: list) -> None:
+        """Buffer a write.
+
+        :param collection: The collection to write to.
+        :param write: The kind of write.
+        :param write_data: The document to insert for inserts, the filter,
+            update and whether to update many documents for updates and the
+            filter and whether to delete many documents for deletes.
+        :param written_documents: The documents and filters written to, as
+            given to the write listeners once the write is flushed.
+
+        :return: No return value.
+        """
+        if not isinstance(write, BufferedWrite):
+            raise ValueError(f"The write {write} isn't a valid write.")
+
+        if self.first_write_time is None:
+            self.first_write_time = time.monotonic()
+
+        self.writes.setdefault(collection, []).append((write, write_data))
+        self.written_documents.setdefault(collection, []) \
+            .extend(written_documents)
+        self.operation_count += 1
+
+    def has_writes(self, collection: str) -> bool:
+        """Check if there are buffered writes to a collection.
+
+        :param collection: The collection to check.
+
+        :return: True if there are buffered writes to the collection.
+        """
+        return collection in self.writes
+
+    def is_full(self) -> bool:
+        """Check if the buffer should be flushed, because either the number
+        of buffered writes or the time since the first buffered write has
+        reached its maximum.
+
+        :return: True if the buffer should be flushed.
+        """
+        if self.operation_count == 0:
+            return False
+
+        return self.operation_count >= self.max_operations or \
+            time.monotonic() - self.first_write_time >= self.max_delay
+
+    def pop(self, collection: str) -> tuple:
+        """Remove the buffered writes to a collection, to flush them.
+
+        :param collection: The collection to remove the writes to.
+
+        :return: The writes, in the order they were made, and the documents
+            and filters written to.
+        """
+        writes = self.writes.pop(collection, [])
+        written_documents = self.written_documents.pop(collection, [])
+        self.operation_count -= len(writes)
+
+        if self.operation_count == 0:
+            self.first_write_time = None
+
+        return writes, written_documents
+
+    def clear(self) -> None:
+        """Remove all buffered writes without flushing them.
+
+        :return: No return value.
+        """
+        self.writes = {}
+        self.written_documents = {}
+        self.operation_count = 0
+        self.first_write_time = None
+
+    def can_overlay(self, collection: str, db_filter: dict) -> bool:
+        """Check if the buffered writes to a collection can be overlaid on
+        the documents read from the database with a filter. This is not
+        possible if a buffered update changes a field in the filter, or if a
+        buffered update or delete of a single document doesn't match it by
+        its ID, as it is not known which document it applies to.
+
+        :param collection: The collection read from.
+        :param db_filter: The filter of the read.
+
+        :return: True if the buffered writes can be overlaid.
+        """
+        for write, write_data in self.writes.get(collection, []):
+            match write:
+                case BufferedWrite.UPDATE:
+                    write_filter, update, many = write_data
+                    if not many and not _is_id_filter(write_filter):
+                        return False
+                    if not get_updated_fields(update).isdisjoint(db_filter):
+                        return False
+                case BufferedWrite.DELETE:
+                    write_filter, many = write_data
+                    if not many and not _is_id_filter(write_filter):
+                        return False
+
+        return True
+
+    def overlay(
+            self,
+            collection: str,
+            db_filter: dict,
+            db_documents: any) -> list:
+        """Apply the buffered writes to a collection to the documents read
+        from the database, as if the writes had been flushed before the
+        read. Inserted documents are placed last, in the order they were
+        inserted.
+
+        :param collection: The collection read from.
+        :param db_filter: The filter the documents were read with.
+        :param db_documents: The full documents read from the database, in
+            the order they were read.
+
+        :return: The documents matching the filter after the writes.
+        """
+        documents = {
+            db_document['_id']: db_document for db_document in db_documents}
+
+        for write, write_data in self.writes.get(collection, []):
+            match write:
+                case BufferedWrite.INSERT:
+                    documents[write_data['_id']] = copy.deepcopy(write_data)
+                case BufferedWrite.UPDATE:
+                    write_filter, update, many = write_data
+                    for document_id, document in documents.items():
+                        if document_matches_filter(document, write_filter):
+                            documents[document_id] = \
+                                apply_update(document, copy.deepcopy(update))
+                case BufferedWrite.DELETE:
+                    write_filter, many = write_data
+                    documents = {
+                        document_id: document
+                        for document_id, document in documents.items()
+                        if not document_matches_filter(
+                            document, write_filter)}
+
+        return [
+            document for document in documents.values()
+            if document_matches_filter(document, db_filter)]
@@ -0,0 +1,5 @@
+import * as namespaced from 'shared/importedNamed';
+
+function dependentFunction(argA, argB) {
+    return argA + argB;
+}
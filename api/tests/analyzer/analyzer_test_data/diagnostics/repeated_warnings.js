@@ -0,0 +1,5 @@
+const objectToSpread = {propA: "foo", propB: "bar"}
+const combinedObject = {...objectToSpread, propC: "baz"}
+
+const otherObject = {...objectToSpread, propD: "qux"}
+const lastObject = {...objectToSpread, propE: "quux"}
@@ -70,7 +70,13 @@ MOCK_FILES_AND_CONTENTS = [
     (MOCK_PROJECT_ROOT + "/import_named.js",
      "dependency/import_named.js"),
     (MOCK_PROJECT_ROOT + "/import_named_renamed.js",
-     "dependency/import_named_renamed.js")
+     "dependency/import_named_renamed.js"),
+
+    # Diagnostics
+    (MOCK_PROJECT_ROOT + "/repeated_warnings.js",
+     "diagnostics/repeated_warnings.js"),
+    (MOCK_PROJECT_ROOT + "/import_namespace.js",
+     "diagnostics/import_namespace.js")
 
 ]
 
@@ -692,6 +698,32 @@ def test_analyzejs_begin_analyze_dependency_import_named(mock_project_files):
            result_dependencies[0] == expected_found_dependency
 
 
+# Validating AnalyzeJS diagnostics
+
+def test_analyzejs_begin_analyze_repeated_warnings_summarized(
+        mock_project_files, caplog):
+    file_location = "/project/src/repeated_warnings.js"
+    project_root = MOCK_PROJECT_ROOT
+    analyzer = AnalyzeJS(file_location, project_root)
+    analyzer.begin_analyze()
+
+    warning_messages = [
+        record.getMessage() for record in caplog.records
+        if record.levelname == "WARNING"]
+    first_warnings = [
+        message for message in warning_messages
+        if "not yet supported. [W-AWHOOEPOTOTNYS]" in message]
+    summaries = [
+        message for message in warning_messages
+        if message.startswith("Repeated warnings during analysis")]
+
+    assert len(analyzer.analyze_warnings["W-AWHOOEPOTOTNYS"]["ranges"]) == 3
+    assert len(first_warnings) == 1 and " >>> Line 2: " in first_warnings[0]
+    assert len(summaries) == 1 and \
+           " >>> [W-AWHOOEPOTOTNYS] repeated 2 time(s), on line(s): 4, 5" \
+           in summaries[0]
+
+
 # Validating analyze_files
 
 def test_analyze_files_arg_not_string():
@@ -715,3 +747,14 @@ def test_analyze_files_arg_empty_string():
         assert str(e) == "'project_root' must be a path"
     except Exception:
         assert False
+
+
+def test_analyzejs_begin_analyze_import_namespace_warned(mock_project_files):
+    file_location = "/project/src/import_namespace.js"
+    project_root = MOCK_PROJECT_ROOT
+    analyzer = AnalyzeJS(file_location, project_root)
+    analyzer.begin_analyze()
+
+    assert analyzer.analyze_warnings["W-ISOTNYS"]["ranges"] == [[7, 22]]
+    assert analyzer.analyze_imported == []
+    assert analyzer.get_dependency_usages() == []
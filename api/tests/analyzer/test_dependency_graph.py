@@ -0,0 +1,112 @@
+import pytest
+from api.analyzer.dependency_graph import DependencyGraph, \
+    DependencyGraphRegistry
+
+MOCK_FUNCTION_INFO = [
+    {"fileId": "shared/api", "functionId": "get"},
+    {"fileId": "shared/api", "functionId": "post"},
+    {"fileId": "shared/request", "functionId": "request"},
+    {"fileId": "components/Issue", "functionId": "loadIssue"},
+    {"fileId": "components/Board", "functionId": "loadBoard"},
+    {"fileId": "components/Other", "functionId": "unrelated"}
+]
+
+MOCK_FUNCTION_DEPENDENCIES = [
+    {"fileId": "shared/api", "functionId": "get",
+     "calledFileId": "shared/request", "calledFunctionId": "request"},
+    {"fileId": "shared/api", "functionId": "post",
+     "calledFileId": "shared/request", "calledFunctionId": "request"},
+    {"fileId": "components/Issue", "functionId": "loadIssue",
+     "calledFileId": "shared/api", "calledFunctionId": "get"},
+    {"fileId": "components/Issue", "functionId": "loadIssue",
+     "calledFileId": "shared/api", "calledFunctionId": "get"},
+    {"fileId": "components/Board", "functionId": "loadBoard",
+     "calledFileId": "components/Issue", "calledFunctionId": "loadIssue"},
+    {"fileId": "App", "functionId": "!OUTSIDE_TEST_SURFACE",
+     "calledFileId": "components/Board", "calledFunctionId": "loadBoard"}
+]
+
+
+@pytest.fixture
+def dependency_graph():
+    yield DependencyGraph(MOCK_FUNCTION_INFO, MOCK_FUNCTION_DEPENDENCIES)
+
+
+def test_dependency_graph_counts(dependency_graph):
+    assert dependency_graph.get_dependencies_count(
+        "shared/api", "get") == 1
+    assert dependency_graph.get_dependents_count(
+        "shared/api", "get") == 2
+    assert dependency_graph.get_dependents_count(
+        "shared/request", "request") == 2
+    assert dependency_graph.get_dependencies_count(
+        "components/Other", "unrelated") == 0
+    assert dependency_graph.get_dependents_count(
+        "components/Other", "unrelated") == 0
+
+
+def test_dependency_graph_counts_unknown_function(dependency_graph):
+    assert dependency_graph.get_dependencies_count("missing", "fn") == 0
+    assert dependency_graph.get_dependents_count("missing", "fn") == 0
+
+
+def test_dependency_graph_transitive_dependents(dependency_graph):
+    expected_dependents = {
+        ("shared/api", "get"): (0, ("shared/api", "get")),
+        ("components/Issue", "loadIssue"): (1, ("shared/api", "get")),
+        ("components/Board", "loadBoard"): (2, ("shared/api", "get")),
+        ("App", "!OUTSIDE_TEST_SURFACE"): (3, ("shared/api", "get"))
+    }
+
+    result_dependents = \
+        dependency_graph.get_transitive_dependents([("shared/api", "get")])
+
+    assert result_dependents == expected_dependents
+
+
+def test_dependency_graph_affected_test_surfaces(dependency_graph):
+    expected_affected = [
+        {"fileId": "shared/request", "functionId": "request", "distance": 0},
+        {"fileId": "shared/api", "functionId": "get", "distance": 1},
+        {"fileId": "shared/api", "functionId": "post", "distance": 1},
+        {"fileId": "components/Issue", "functionId": "loadIssue",
+         "distance": 2},
+        {"fileId": "components/Board", "functionId": "loadBoard",
+         "distance": 3}
+    ]
+
+    result_affected = \
+        dependency_graph.get_affected_test_surfaces("shared/request")
+
+    assert sorted(
+        result_affected,
+        key=lambda surface: (surface["distance"], surface["functionId"])) == \
+           expected_affected
+
+
+def test_dependency_graph_affected_test_surfaces_unknown_file(
+        dependency_graph):
+    assert dependency_graph.get_affected_test_surfaces("missing") == []
+
+
+def test_dependency_graph_registry(dependency_graph):
+    registry = DependencyGraphRegistry()
+
+    assert registry.get("/project") is None
+
+    registry.set("/project", dependency_graph)
+    assert registry.get("/project") is dependency_graph
+
+    registry.remove("/project")
+    assert registry.get("/project") is None
+
+
+def test_dependency_graph_registry_set_not_graph():
+    registry = DependencyGraphRegistry()
+    try:
+        registry.set("/project", {})
+        assert False
+    except TypeError as e:
+        assert str(e) == "'graph' must be a DependencyGraph"
+    except Exception:
+        assert False
@@ -0,0 +1,85 @@
+import pytest
+from api.analyzer.resolver import ImportPathResolver
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    (tmp_path / "shared" / "utils").mkdir(parents=True)
+    (tmp_path / "components" / "Button").mkdir(parents=True)
+    (tmp_path / "shared" / "api.js").write_text("")
+    (tmp_path / "shared" / "utils" / "index.js").write_text("")
+    (tmp_path / "components" / "Button" / "Button.jsx").write_text("")
+    (tmp_path / "components" / "Button" / "index.jsx").write_text("")
+    (tmp_path / "App.js").write_text("")
+
+    yield str(tmp_path)
+
+
+def test_resolver_init_project_root_not_string():
+    try:
+        ImportPathResolver(1)
+        assert False
+    except TypeError as e:
+        assert str(e) == "'path_project_root' must be a STRING"
+    except Exception:
+        assert False
+
+
+def test_resolver_init_project_root_empty():
+    try:
+        ImportPathResolver("")
+        assert False
+    except ValueError as e:
+        assert str(e) == "'path_project_root' cannot be empty"
+    except Exception:
+        assert False
+
+
+def test_resolver_resolve_bare_specifier(project_root):
+    resolver = ImportPathResolver(project_root)
+
+    assert resolver.resolve(project_root, "react") == "react"
+    assert resolver.resolve(project_root, "shared/api") == "shared/api"
+
+
+def test_resolver_resolve_extension_probing(project_root):
+    resolver = ImportPathResolver(project_root)
+
+    assert resolver.resolve(project_root, "./shared/api") == "shared/api"
+    assert resolver.resolve(project_root, "./shared/api.js") == "shared/api"
+    assert resolver.resolve(
+        project_root + "/components/Button", "./Button") == \
+           "components/Button/Button"
+
+
+def test_resolver_resolve_index_file(project_root):
+    resolver = ImportPathResolver(project_root)
+
+    assert resolver.resolve(
+        project_root + "/shared", "./utils") == "shared/utils/index"
+    assert resolver.resolve(
+        project_root + "/shared/utils", "../../components/Button") == \
+           "components/Button/index"
+
+
+def test_resolver_resolve_not_found_lexical(project_root):
+    resolver = ImportPathResolver(project_root)
+
+    assert resolver.resolve(
+        project_root + "/shared", "../missing/module") == "missing/module"
+    assert resolver.resolve(
+        project_root + "/shared", "./missing.js") == "shared/missing"
+
+
+def test_resolver_resolve_memoized(project_root, tmp_path):
+    resolver = ImportPathResolver(project_root)
+
+    assert resolver.resolve(project_root, "./added") == "added"
+
+    # Resolved paths and directory listings are kept until cleared
+    (tmp_path / "added").mkdir()
+    (tmp_path / "added" / "index.js").write_text("")
+    assert resolver.resolve(project_root, "./added") == "added"
+
+    resolver.clear()
+    assert resolver.resolve(project_root, "./added") == "added/index"
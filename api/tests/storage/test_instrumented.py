@@ -0,0 +1,56 @@
+import pytest
+from pymongo import DeleteMany, InsertOne
+from api.storage.instrumented import InstrumentedStorageBackend
+from api.storage.sqlite import SQLiteStorageBackend
+
+
+@pytest.fixture
+def instrumented_backend(tmp_path):
+    queries = []
+
+    def query_listener(
+            collection, operation, db_filter, duration, documents, explain):
+        queries.append((collection, operation, db_filter, documents, explain))
+
+    storage_backend = SQLiteStorageBackend(str(tmp_path / "test.sqlite3"))
+    yield InstrumentedStorageBackend(storage_backend, query_listener), \
+        queries
+    storage_backend.close()
+
+
+def test_instrumented_collection_writes(instrumented_backend):
+    storage_backend, queries = instrumented_backend
+    collection = storage_backend["functionInfo"]
+
+    collection.insert_one({"fileId": "a"})
+    collection.update_many({"fileId": "a"}, {"$set": {"fileId": "b"}})
+    collection.bulk_write([InsertOne({"fileId": "c"}), DeleteMany({})])
+
+    assert [(collection, operation, db_filter, documents)
+            for collection, operation, db_filter, documents, explain
+            in queries] == [
+        ("functionInfo", "insert_one", None, 1),
+        ("functionInfo", "update_many", {"fileId": "a"}, 1),
+        ("functionInfo", "bulk_write", None, 3)]
+
+
+def test_instrumented_collection_reads(instrumented_backend):
+    storage_backend, queries = instrumented_backend
+    collection = storage_backend["functionInfo"]
+    collection.insert_one({"fileId": "a"})
+    collection.insert_one({"fileId": "a"})
+    queries.clear()
+
+    cursor = collection.find({"fileId": "a"}).sort("_id", 1).limit(1)
+    assert queries == []
+    assert len(list(cursor)) == 1
+    assert collection.find_one({"fileId": "b"}) is None
+    assert collection.count_documents({}) == 2
+
+    assert [(operation, documents)
+            for collection, operation, db_filter, documents, explain
+            in queries] == [("find", 1), ("find_one", 0),
+                            ("count_documents", 0)]
+
+    query_plan = queries[0][4]()
+    assert len(query_plan['queryPlan']) > 0
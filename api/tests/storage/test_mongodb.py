@@ -0,0 +1,51 @@
+import pytest
+from api.storage.mongodb import ConnectionPoolStatistics, \
+    make_mongo_client_options
+
+
+def test_make_mongo_client_options():
+    assert make_mongo_client_options(None) == {}
+    assert make_mongo_client_options({
+        'max_pool_size': 20,
+        'min_pool_size': 0,
+        'wait_queue_timeout_ms': None
+    }) == {'maxPoolSize': 20, 'minPoolSize': 0}
+
+
+def test_make_mongo_client_options_bad_options():
+    with pytest.raises(TypeError):
+        make_mongo_client_options([('max_pool_size', 20)])
+    with pytest.raises(ValueError):
+        make_mongo_client_options({'pool_size': 20})
+    with pytest.raises(TypeError):
+        make_mongo_client_options({'max_pool_size': "20"})
+    with pytest.raises(TypeError):
+        make_mongo_client_options({'max_pool_size': True})
+    with pytest.raises(ValueError):
+        make_mongo_client_options({'max_pool_size': -1})
+
+
+def test_connection_pool_statistics():
+    pool_statistics = ConnectionPoolStatistics()
+
+    pool_statistics.pool_created(None)
+    pool_statistics.connection_created(None)
+    pool_statistics.connection_created(None)
+    pool_statistics.connection_checked_out(None)
+    pool_statistics.connection_checked_out(None)
+    pool_statistics.connection_checked_in(None)
+    pool_statistics.connection_check_out_failed(None)
+    pool_statistics.connection_closed(None)
+    pool_statistics.pool_cleared(None)
+
+    assert pool_statistics.get_statistics() == {
+        'pools': 1,
+        'poolsCleared': 1,
+        'connectionsCreated': 2,
+        'connectionsClosed': 1,
+        'connectionsOpen': 1,
+        'checkouts': 2,
+        'checkoutFailures': 1,
+        'checkedOut': 1,
+        'maxCheckedOut': 2
+    }
@@ -0,0 +1,49 @@
+from api.storage.query_metrics import QueryMetrics, get_filter_shape
+
+
+def test_get_filter_shape():
+    assert get_filter_shape(None) == "-"
+    assert get_filter_shape({}) == "{}"
+    assert get_filter_shape({
+        'pathToProject': "/a",
+        '_id': {'$in': ["1", "2"]},
+        'functionRange': {'not': "an operator"}
+    }) == "{_id: {$in: ?}, functionRange: ?, pathToProject: ?}"
+
+
+def test_query_metrics_record():
+    query_metrics = QueryMetrics()
+    query_metrics.record("functionInfo", "find", "{fileId: ?}", 0.0005, 2)
+    query_metrics.record("functionInfo", "find", "{fileId: ?}", 0.2, 3)
+    query_metrics.record("functionInfo", "find", "{_id: ?}", 2, 1)
+
+    statistics = query_metrics.get_statistics()
+    assert [query['filterShape'] for query in statistics] == \
+           ["{_id: ?}", "{fileId: ?}"]
+    assert statistics[1] == {
+        'collection': "functionInfo",
+        'operation': "find",
+        'filterShape': "{fileId: ?}",
+        'count': 2,
+        'totalMs': 200.5,
+        'meanMs': 100.25,
+        'maxMs': 200.0,
+        'documents': 5,
+        'histogram': {
+            '<=1ms': 1, '<=5ms': 0, '<=10ms': 0, '<=50ms': 0,
+            '<=100ms': 0, '<=500ms': 1, '<=1000ms': 0, '>1000ms': 0}
+    }
+    assert statistics[0]['histogram']['>1000ms'] == 1
+
+
+def test_query_metrics_format_summary_and_reset():
+    query_metrics = QueryMetrics()
+    query_metrics.record("testInfo", "insert_one", "-", 0.001, 1)
+
+    assert query_metrics.format_summary() == \
+           "1 kinds of queries, 1 queries in 1.0 ms\n" \
+           "testInfo.insert_one -: 1 queries, 1.0 ms total, " \
+           "1.00 ms mean, 1.00 ms max, 1 documents"
+
+    query_metrics.reset()
+    assert query_metrics.get_statistics() == []
@@ -0,0 +1,195 @@
+import pytest
+from bson.objectid import ObjectId
+from pymongo import DeleteMany, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from api.storage.documents import document_matches_filter
+from api.storage.sqlite import SQLiteStorageBackend
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    storage_backend = SQLiteStorageBackend(
+        str(tmp_path / "test.sqlite3"),
+        {"functionInfo": [("pathToProject", "fileId")]})
+    yield storage_backend
+    storage_backend.close()
+
+
+def __insert_functions(collection):
+    for function_id, number_of_tests in [("a", 1), ("b", 2), ("c", 3)]:
+        collection.insert_one({
+            "pathToProject": "/proj",
+            "fileId": "file",
+            "functionId": function_id,
+            "numberOfTests": number_of_tests,
+            "exportName": None if function_id == "c" else function_id
+        })
+
+
+def test_sqlite_backend_init_bad_arguments():
+    with pytest.raises(TypeError):
+        SQLiteStorageBackend(3)
+
+    with pytest.raises(ValueError):
+        SQLiteStorageBackend("")
+
+
+def test_sqlite_backend_bad_collection_name(sqlite_backend):
+    with pytest.raises(ValueError):
+        sqlite_backend['function"Info']
+
+
+def test_sqlite_backend_write_ahead_logging(sqlite_backend):
+    assert sqlite_backend.connection.execute(
+        "PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_backend_indexes(sqlite_backend):
+    sqlite_backend["functionInfo"]
+    index_names = [row[0] for row in sqlite_backend.connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")]
+    assert "functionInfo_pathToProject_fileId" in index_names
+
+
+def test_sqlite_collection_insert_find(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    inserted_id = collection.insert_one(
+        {"functionId": "a", "functionRange": [1, 2]}).inserted_id
+
+    assert isinstance(inserted_id, ObjectId)
+    assert collection.find_one({"_id": inserted_id}) == \
+           {"_id": inserted_id, "functionId": "a", "functionRange": [1, 2]}
+    assert collection.find_one({"functionId": "missing"}) is None
+
+    with pytest.raises(DuplicateKeyError):
+        collection.insert_one({"_id": inserted_id})
+
+
+def test_sqlite_collection_find_filters(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    __insert_functions(collection)
+
+    def function_ids(db_filter):
+        return [document["functionId"]
+                for document in collection.find(db_filter)]
+
+    assert function_ids({"numberOfTests": {"$gt": 1}}) == ["b", "c"]
+    assert function_ids({"numberOfTests": {"$lte": 1}}) == ["a"]
+    assert function_ids({"functionId": {"$in": ["a", "c"]}}) == ["a", "c"]
+    assert function_ids({"functionId": {"$nin": ["a"]}}) == ["b", "c"]
+    assert function_ids({"exportName": None}) == ["c"]
+    assert function_ids({"exportName": {"$ne": None}}) == ["a", "b"]
+    assert function_ids({"functionId": {"$ne": "a"}}) == ["b", "c"]
+    assert collection.count_documents({"fileId": "file"}) == 3
+    assert collection.count_documents({"fileId": "file"}, limit=2) == 2
+
+
+def test_sqlite_collection_find_filters_arrays(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    documents = [
+        {"functionId": "a", "functionRange": [1, 10]},
+        {"functionId": "b", "functionRange": [2, None]},
+        {"functionId": "c", "functionRange": 10},
+        {"functionId": "d"}
+    ]
+    for document in documents:
+        collection.insert_one(dict(document))
+
+    db_filters = [
+        {"functionRange": 10},
+        {"functionRange": [1, 10]},
+        {"functionRange": None},
+        {"functionRange": {"$ne": 10}},
+        {"functionRange": {"$ne": None}},
+        {"functionRange": {"$in": [2, 10]}},
+        {"functionRange": {"$in": [[1, 10], None]}},
+        {"functionRange": {"$nin": [1, 2]}},
+        {"functionRange": {"$nin": []}}
+    ]
+    for db_filter in db_filters:
+        assert [document["functionId"]
+                for document in collection.find(db_filter)] == \
+            [document["functionId"] for document in documents
+             if document_matches_filter(document, db_filter)], db_filter
+
+
+def test_sqlite_collection_indexed_fields_scalar(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    __insert_functions(collection)
+
+    with pytest.raises(ValueError):
+        collection.insert_one({"fileId": ["file"]})
+    with pytest.raises(ValueError):
+        collection.update_one(
+            {"functionId": "a"}, {"$set": {"pathToProject": ["/proj"]}})
+
+    assert collection.count_documents({}) == 3
+    query_plan = collection.find({
+        "pathToProject": "/proj",
+        "fileId": {"$in": ["file", "other"]}
+    }).explain()["queryPlan"]
+    assert "USING INDEX" in " ".join(query_plan)
+
+
+def test_sqlite_collection_find_sort_limit_projection(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    __insert_functions(collection)
+
+    all_documents = list(collection.find({}))
+    after_id = all_documents[0]["_id"]
+
+    documents = list(
+        collection.find(
+            {"_id": {"$gt": after_id}},
+            {"functionId": 1, "_id": 0}).sort("_id", 1).limit(1))
+    assert documents == [{"functionId": "b"}]
+
+
+def test_sqlite_collection_update_delete(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    __insert_functions(collection)
+
+    update_result = collection.update_many(
+        {"fileId": "file"}, {"$inc": {"numberOfTests": 10}})
+    assert update_result.matched_count == 3
+    assert collection.find_one({"functionId": "a"})["numberOfTests"] == 11
+
+    collection.update_one(
+        {"functionId": "a"}, {"$set": {"exportName": "other"}})
+    assert collection.find_one({"functionId": "a"})["exportName"] == "other"
+
+    assert collection.delete_one({"fileId": "file"}).deleted_count == 1
+    assert collection.delete_many({"fileId": "file"}).deleted_count == 2
+    assert collection.count_documents({}) == 0
+
+
+def test_sqlite_collection_bulk_write(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    __insert_functions(collection)
+
+    bulk_write_result = collection.bulk_write([
+        InsertOne({"functionId": "d"}),
+        UpdateOne({"functionId": "a"}, {"$set": {"numberOfTests": 5}}),
+        DeleteMany({"functionId": {"$in": ["b", "c"]}})
+    ])
+    assert bulk_write_result.inserted_count == 1
+    assert bulk_write_result.modified_count == 1
+    assert bulk_write_result.deleted_count == 2
+    assert sorted(document["functionId"]
+                  for document in collection.find({})) == ["a", "d"]
+
+
+def test_sqlite_collection_bulk_write_rolled_back(sqlite_backend):
+    collection = sqlite_backend["functionInfo"]
+    existing_id = collection.insert_one({"functionId": "a"}).inserted_id
+
+    with pytest.raises(BulkWriteError):
+        collection.bulk_write([
+            DeleteMany({"functionId": "a"}),
+            InsertOne({"functionId": "b"}),
+            InsertOne({"_id": existing_id, "functionId": "c"}),
+            InsertOne({"_id": existing_id, "functionId": "c"})
+        ])
+
+    assert [document["functionId"]
+            for document in collection.find({})] == ["a"]
@@ -0,0 +1,120 @@
+import pytest
+from bson.objectid import ObjectId
+from api.storage.documents import document_matches_filter
+from api.storage.write_buffer import BufferedWrite, WriteBuffer
+
+
+def test_document_matches_filter():
+    document = {"_id": ObjectId(), "functionId": "a", "numberOfTests": 2,
+                "functionRange": [1, 10], "exportName": None}
+
+    assert document_matches_filter(document, {})
+    assert document_matches_filter(document, {"functionId": "a"})
+    assert document_matches_filter(document, {"functionRange": (1, 10)})
+    assert document_matches_filter(document, {"functionRange": 10})
+    assert document_matches_filter(document, {"exportName": None})
+    assert document_matches_filter(document, {"missing": None})
+    assert document_matches_filter(
+        document, {"functionId": {"$in": ["a", "b"]}})
+    assert document_matches_filter(
+        document, {"numberOfTests": {"$gt": 1, "$lte": 2}})
+    assert not document_matches_filter(
+        document, {"functionId": {"$nin": ["a"]}})
+    assert not document_matches_filter(
+        document, {"functionId": {"$ne": "a"}})
+    assert not document_matches_filter(
+        document, {"functionId": "a", "numberOfTests": {"$lt": 2}})
+
+    with pytest.raises(NotImplementedError):
+        document_matches_filter(document, {"functionId": {"$regex": "a"}})
+
+
+def test_write_buffer_init_bad_arguments():
+    with pytest.raises(TypeError):
+        WriteBuffer(max_operations="10")
+    with pytest.raises(ValueError):
+        WriteBuffer(max_operations=0)
+    with pytest.raises(TypeError):
+        WriteBuffer(max_delay="1")
+    with pytest.raises(ValueError):
+        WriteBuffer(max_delay=-1)
+
+
+def test_write_buffer_is_full():
+    write_buffer = WriteBuffer(max_operations=2, max_delay=60)
+    assert not write_buffer.is_full()
+
+    write_buffer.add("functionInfo", BufferedWrite.INSERT,
+                     {"_id": ObjectId()}, [])
+    assert not write_buffer.is_full()
+
+    write_buffer.add("testInfo", BufferedWrite.DELETE, ({}, True), [])
+    assert write_buffer.is_full()
+
+    write_buffer.pop("functionInfo")
+    write_buffer.pop("testInfo")
+    assert not write_buffer.is_full()
+
+    write_buffer = WriteBuffer(max_delay=0)
+    write_buffer.add("functionInfo", BufferedWrite.DELETE, ({}, True), [])
+    assert write_buffer.is_full()
+
+
+def test_write_buffer_pop_and_clear():
+    write_buffer = WriteBuffer()
+    write_buffer.add("functionInfo", BufferedWrite.DELETE, ({}, True),
+                     [{"pathToProject": "/a"}])
+    write_buffer.add("testInfo", BufferedWrite.DELETE, ({}, True), [])
+
+    assert write_buffer.pop("functionInfo") == \
+           ([(BufferedWrite.DELETE, ({}, True))], [{"pathToProject": "/a"}])
+    assert not write_buffer.has_writes("functionInfo")
+    assert write_buffer.has_writes("testInfo")
+
+    write_buffer.clear()
+    assert not write_buffer.has_writes("testInfo")
+    assert write_buffer.operation_count == 0
+
+
+def test_write_buffer_can_overlay():
+    write_buffer = WriteBuffer()
+    assert write_buffer.can_overlay("functionInfo", {"fileId": "a"})
+
+    write_buffer.add(
+        "functionInfo", BufferedWrite.UPDATE,
+        ({"_id": ObjectId()}, {"$set": {"functionHash": "b"}}, False), [])
+    assert write_buffer.can_overlay("functionInfo", {"fileId": "a"})
+    assert not write_buffer.can_overlay("functionInfo", {"functionHash": "a"})
+
+    write_buffer.add(
+        "testInfo", BufferedWrite.DELETE, ({"fileId": "a"}, False), [])
+    assert not write_buffer.can_overlay("testInfo", {"fileId": "a"})
+
+
+def test_write_buffer_overlay():
+    write_buffer = WriteBuffer()
+    kept_id, deleted_id, inserted_id = ObjectId(), ObjectId(), ObjectId()
+    db_documents = [
+        {"_id": kept_id, "fileId": "a", "numberOfTests": 1},
+        {"_id": deleted_id, "fileId": "a", "numberOfTests": 1}]
+
+    write_buffer.add(
+        "functionInfo", BufferedWrite.INSERT,
+        {"_id": inserted_id, "fileId": "a", "numberOfTests": 0}, [])
+    write_buffer.add(
+        "functionInfo", BufferedWrite.INSERT,
+        {"_id": ObjectId(), "fileId": "b", "numberOfTests": 0}, [])
+    write_buffer.add(
+        "functionInfo", BufferedWrite.UPDATE,
+        ({"fileId": "a"}, {"$set": {"numberOfTests": 5}}, True), [])
+    write_buffer.add(
+        "functionInfo", BufferedWrite.DELETE, ({"_id": deleted_id}, False),
+        [])
+
+    assert write_buffer.overlay(
+        "functionInfo", {"fileId": "a"}, db_documents) == [
+        {"_id": kept_id, "fileId": "a", "numberOfTests": 5},
+        {"_id": inserted_id, "fileId": "a", "numberOfTests": 5}]
+
+    # The buffered writes are left unchanged by the overlay
+    assert write_buffer.writes["functionInfo"][0][1]["numberOfTests"] == 0
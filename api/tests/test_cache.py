@@ -2,7 +2,17 @@ import pytest
 from api.tests.fixtures.mocking.open import mocker_open
 from api.tests.fixtures.mocking.os.path.isfile import mocker_os_path_isfile
 import hashlib
-from api.cache import read_file, save_file, compare_file_cache
+import json
+import os
+import time
+import zlib
+from api.cache import read_file, read_file_old, save_file, \
+    compare_file_cache, count_file_versions, migrate_cache_compression, \
+    read_file_range, FileRangeUnit, save_global_session, read_global_session, \
+    read_or_load_global_session, invalidate_global_session, \
+    get_global_session_statistics, collect_cache_garbage, \
+    enforce_cache_quota, lock_project_cache
+from api.util.paths_helper import full_path_to_correct_sub_directory
 
 MOCK_CACHE_ROOT = \
     "/some/place/.analyze_cache"
@@ -135,25 +145,170 @@ def test_cache_save_file_file_data_empty():
         assert False
 
 
-def test_cache_save_file(mock_cache_files):
+@pytest.fixture
+def cache_directory(mocker, tmp_path):
+    mocker.patch("api.cache.CONFIG_LOCATION_CACHE", str(tmp_path))
+    mocker.patch("api.cache.CONFIG_CACHE_COMPRESSION", "zlib")
+    yield tmp_path
+
+
+def __project_cache_directory(cache_directory, project_root):
+    return cache_directory / __copied_cache_hash_function(
+        full_path_to_correct_sub_directory(project_root))
+
+
+def __cache_blob_files(cache_directory, project_root):
+    project_cache = __project_cache_directory(cache_directory, project_root)
+    return sorted(
+        blob_file.name
+        for blob_file in (project_cache / "blobs").glob("*/*"))
+
+
+def test_cache_save_file(cache_directory):
     project_root = "/my/mocked/project"
-    project_root_hash = __copied_cache_hash_function(project_root)
+    project_cache = __project_cache_directory(cache_directory, project_root)
     file_id = "dir/to/some_file"
     file_id_hash = __copied_cache_hash_function(file_id)
     file_contents_to_write = "These are the file contents!"
+    file_contents_hash = __copied_cache_hash_function(file_contents_to_write)
 
-    mock_cache_files_objects = mock_cache_files
     save_file(project_root, file_id, file_contents_to_write)
 
-    written_file_contents = \
-        mock_cache_files_objects[
-            "open_write_content_drain"
-        ][
-            f"{MOCK_CACHE_ROOT}/"
-            f"{project_root_hash}/"
-            f"{file_id_hash}.js"]
+    blob_file = project_cache / "blobs" / file_contents_hash[:2] / \
+        f"{file_contents_hash}.zlib"
+    ref_file = project_cache / "refs" / f"{file_id_hash}.json"
+    assert zlib.decompress(blob_file.read_bytes()).decode() == \
+           file_contents_to_write
+    assert json.loads(ref_file.read_text()) == {
+        "fileId": file_id,
+        "current": file_contents_hash,
+        "history": []
+    }
+    assert read_file(project_root, file_id) == file_contents_to_write
+
+
+def test_cache_save_file_new_version(cache_directory):
+    project_root = "/my/mocked/project"
+    file_id = "dir/to/some_file"
+
+    save_file(project_root, file_id, "First version")
+    save_file(project_root, file_id, "Second version")
+
+    assert read_file(project_root, file_id) == "Second version"
+    assert read_file_old(project_root, file_id) == "First version"
+
+    save_file(project_root, file_id, "Second version")
+
+    assert read_file_old(project_root, file_id) == "First version"
+
+
+def test_cache_save_file_deduplicated(cache_directory):
+    project_root = "/my/mocked/project"
+
+    save_file(project_root, "dir/to/some_file", "Same contents")
+    save_file(project_root, "dir/to/another_file", "Same contents")
+
+    assert __cache_blob_files(cache_directory, project_root) == \
+           [__copied_cache_hash_function("Same contents") + ".zlib"]
+    assert read_file(project_root, "dir/to/another_file") == "Same contents"
+
+
+def test_cache_save_file_migrates_old_cache(cache_directory):
+    project_root = "/my/mocked/project"
+    project_cache = __project_cache_directory(cache_directory, project_root)
+    file_id = "dir/to/some_file"
+    file_id_hash = __copied_cache_hash_function(file_id)
+    project_cache.mkdir()
+    (project_cache / f"{file_id_hash}.js").write_text("Cached version")
+    (project_cache / f"{file_id_hash}[OLD].js").write_text("Old version")
+
+    assert read_file(project_root, file_id) == "Cached version"
+    assert read_file_old(project_root, file_id) == "Old version"
+
+    save_file(project_root, file_id, "New version")
+
+    assert read_file(project_root, file_id) == "New version"
+    assert read_file_old(project_root, file_id) == "Cached version"
+    assert not (project_cache / f"{file_id_hash}.js").exists()
+    assert not (project_cache / f"{file_id_hash}[OLD].js").exists()
+
+
+def test_cache_save_file_history(mocker, cache_directory):
+    mocker.patch("api.cache.CONFIG_CACHE_HISTORY_VERSIONS", 3)
+    project_root = "/my/mocked/project"
+    file_id = "dir/to/some_file"
+    versions = [
+        "function a() {}\n",
+        "function a() {}\nfunction b() {}\n",
+        "function a() { return 1; }\nfunction b() {}\n",
+        "function b() {}\n"
+    ]
+
+    for version_number, file_contents in enumerate(versions):
+        save_file(project_root, file_id, file_contents)
+        assert count_file_versions(project_root, file_id) == \
+               min(version_number + 1, 3)
+
+    assert read_file(project_root, file_id) == versions[3]
+    assert read_file(project_root, file_id, version=1) == versions[2]
+    assert read_file(project_root, file_id, version=2) == versions[1]
+    assert read_file_old(project_root, file_id) == versions[2]
+
+    with pytest.raises(FileNotFoundError) as e:
+        read_file(project_root, file_id, version=3)
+    assert str(e.value) == \
+           f"For project in '{project_root}', there is no version 3 in the " \
+           f"cache for file with ID '{file_id}'"
+
+
+def test_cache_read_file_bad_version(cache_directory):
+    with pytest.raises(TypeError):
+        read_file("/my/mocked/project", "dir/to/some_file", version="1")
+    with pytest.raises(ValueError):
+        read_file("/my/mocked/project", "dir/to/some_file", version=-1)
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+def test_cache_compression(mocker, cache_directory, compression):
+    mocker.patch("api.cache.CONFIG_CACHE_COMPRESSION", compression)
+    mocker.patch("api.cache.CACHE_READ_CHUNK_SIZE", 16)
+    project_root = "/my/mocked/project"
+    file_id = "dir/to/some_file"
+    file_contents = "const text = 'åäö';\n" * 100
+
+    save_file(project_root, file_id, file_contents)
+
+    assert read_file(project_root, file_id) == file_contents
+
+
+def test_cache_migrate_compression(mocker, cache_directory):
+    project_root = "/my/mocked/project"
+    file_contents = "function a() {}\n" * 100
+    mocker.patch("api.cache.CONFIG_CACHE_COMPRESSION", "none")
+    save_file(project_root, "dir/to/some_file", file_contents)
+    save_file(project_root, "dir/to/another_file", "Other contents")
+    mocker.patch("api.cache.CONFIG_CACHE_COMPRESSION", "lzma")
+
+    assert read_file(project_root, "dir/to/some_file") == file_contents
+
+    migration = migrate_cache_compression()
+
+    assert migration["blobs"] == 2
+    assert migration["migrated"] == 2
+    assert migration["after"] < migration["before"]
+    assert all(blob_file.endswith(".xz") for blob_file in
+               __cache_blob_files(cache_directory, project_root))
+    assert read_file(project_root, "dir/to/some_file") == file_contents
+    assert migrate_cache_compression(project_root)["migrated"] == 0
 
-    assert written_file_contents == file_contents_to_write
+
+def test_cache_read_file_old_nonexistant(cache_directory):
+    project_root = "/my/mocked/project"
+    file_id = "dir/to/some_file"
+    save_file(project_root, file_id, "First version")
+
+    with pytest.raises(FileNotFoundError):
+        read_file_old(project_root, file_id)
 
 
 def test_cache_read_file_project_root_not_string():
@@ -330,3 +485,192 @@ def test_compare_file_cache_test(mock_cache_files):
     result = compare_file_cache(project_root, file_id, new_file_data)
 
     assert result == expected_result
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_cache_read_file_range(mocker, cache_directory, compression):
+    mocker.patch("api.cache.CONFIG_CACHE_COMPRESSION", compression)
+    mocker.patch("api.cache.CACHE_READ_CHUNK_SIZE", 8)
+    project_root = "/my/mocked/project"
+    file_id = "dir/to/some_file"
+    file_contents = "const a = 'å';\nfunction b() {\n  return 'ö';\n}\nend"
+    save_file(project_root, file_id, file_contents)
+
+    for start, end in [(0, None), (6, 11), (10, 30), (15, 27), (47, 60),
+                       (0, 0), (60, None)]:
+        assert read_file_range(project_root, file_id, start, end) == \
+               file_contents[start:end]
+
+    assert read_file_range(
+        project_root, file_id, 1, 3, FileRangeUnit.LINES) == \
+           "function b() {\n  return 'ö';\n"
+    assert read_file_range(
+        project_root, file_id, 3, None, FileRangeUnit.LINES) == "}\nend"
+    assert read_file_range(
+        project_root, file_id, 0, 9, FileRangeUnit.BYTES) == "const a ="
+    assert read_file_range(
+        project_root, file_id, 11, 13, FileRangeUnit.BYTES) == "å"
+
+
+def test_cache_read_file_range_old_cache(cache_directory):
+    project_root = "/my/mocked/project"
+    project_cache = __project_cache_directory(cache_directory, project_root)
+    file_id = "dir/to/another_file"
+    project_cache.mkdir()
+    (project_cache / f"{__copied_cache_hash_function(file_id)}.js"). \
+        write_text(MOCK_FILES_AND_CONTENTS[file_id])
+
+    assert read_file_range(
+        project_root, file_id, 1, 2, FileRangeUnit.LINES) == "many\n"
+
+
+def test_cache_read_file_range_bad_range():
+    with pytest.raises(TypeError):
+        read_file_range("/my/mocked/project", "dir/to/some_file", "0")
+    with pytest.raises(ValueError):
+        read_file_range("/my/mocked/project", "dir/to/some_file", 5, 4)
+    with pytest.raises(TypeError):
+        read_file_range(
+            "/my/mocked/project", "dir/to/some_file", 0, 4, "lines")
+
+
+def test_cache_global_session():
+    invalidate_global_session()
+    save_global_session("existing_projects", ["/a"])
+    save_global_session("other", 1)
+
+    assert read_global_session("existing_projects") == ["/a"]
+    assert read_or_load_global_session("other", lambda: 2) == 1
+
+    invalidate_global_session("other")
+    assert read_global_session("other") is None
+    assert read_or_load_global_session("other", lambda: 2) == 2
+
+    invalidate_global_session()
+    assert read_global_session("existing_projects") is None
+    assert get_global_session_statistics()['entries'] == 0
+
+
+def __get_ref_file(cache_directory, project_root, file_id):
+    return __project_cache_directory(cache_directory, project_root) / \
+        "refs" / f"{__copied_cache_hash_function(file_id)}.json"
+
+
+def __set_file_used(cache_directory, project_root, file_id, used):
+    os.utime(
+        __get_ref_file(cache_directory, project_root, file_id), (used, used))
+
+
+def test_cache_collect_garbage(cache_directory):
+    project_root = "/my/mocked/project"
+    project_cache = __project_cache_directory(cache_directory, project_root)
+    removed_project_cache = \
+        __project_cache_directory(cache_directory, "/my/removed/project")
+    save_file(project_root, "dir/to/some_file", "First version")
+    save_file(project_root, "dir/to/some_file", "Second version")
+    save_file(project_root, "dir/to/another_file", "Another file")
+    save_file("/my/removed/project", "dir/to/some_file", "Removed")
+    legacy_file = project_cache / \
+        f"{__copied_cache_hash_function('dir/to/removed_file')}.js"
+    legacy_file.write_text("Legacy version")
+    temporary_file = project_cache / "blobs" / "tmpabc.tmp"
+    temporary_file.write_text("Interrupted write")
+    os.utime(temporary_file, (0, 0))
+
+    collection = collect_cache_garbage(
+        {project_root: {"dir/to/some_file"}})
+
+    assert collection["projects"] == 1
+    assert collection["files"] == 2
+    assert collection["blobs"] == 2
+    assert collection["skipped"] == 0
+    assert collection["freed"] > 0
+    assert not removed_project_cache.exists()
+    assert not legacy_file.exists()
+    assert not temporary_file.exists()
+    assert __cache_blob_files(cache_directory, project_root) == \
+           [__copied_cache_hash_function("Second version") + ".zlib"]
+    assert read_file(project_root, "dir/to/some_file") == "Second version"
+    assert read_file_old(project_root, "dir/to/some_file") == \
+           "First version"
+    with pytest.raises(FileNotFoundError):
+        read_file(project_root, "dir/to/another_file")
+
+
+def test_cache_collect_garbage_keeps_locked_and_recent(cache_directory):
+    save_file("/my/mocked/project", "dir/to/some_file", "Analyzing")
+    save_file("/my/new/project", "dir/to/some_file", "Just analyzed")
+
+    with lock_project_cache("/my/mocked/project"):
+        collection = collect_cache_garbage({}, live_since=time.time() - 60)
+
+    assert collection["projects"] == 0
+    assert collection["skipped"] == 1
+    assert read_file("/my/mocked/project", "dir/to/some_file") == \
+           "Analyzing"
+    assert read_file("/my/new/project", "dir/to/some_file") == \
+           "Just analyzed"
+
+
+def test_cache_enforce_quota(cache_directory):
+    project_root = "/my/mocked/project"
+    other_project_root = "/my/other/project"
+    for used, file_id in enumerate(["oldest", "older", "newest"]):
+        save_file(project_root, file_id, f"Contents of {file_id}")
+        __set_file_used(cache_directory, project_root, file_id, used + 1)
+    save_file(other_project_root, "other", "Contents of other")
+    __set_file_used(cache_directory, other_project_root, "other", 2.5)
+
+    quota = enforce_cache_quota()
+    size = quota["size"]
+    assert quota["files"] == 0
+
+    project_size = size - sum(
+        file_path.stat().st_size
+        for file_path in __project_cache_directory(
+            cache_directory, other_project_root).rglob("*")
+        if file_path.is_file())
+    quota = enforce_cache_quota(max_project_size=project_size - 1)
+
+    assert quota["files"] == 1
+    assert quota["size"] == size - quota["freed"]
+    assert not __get_ref_file(cache_directory, project_root, "oldest").exists()
+    assert __get_ref_file(cache_directory, project_root, "older").exists()
+
+    quota = enforce_cache_quota(max_total_size=quota["size"] - 1)
+
+    assert quota["files"] == 1
+    assert not __get_ref_file(cache_directory, project_root, "older").exists()
+    assert read_file(other_project_root, "other") == "Contents of other"
+    assert read_file(project_root, "newest") == "Contents of newest"
+    with pytest.raises(FileNotFoundError):
+        read_file(project_root, "oldest")
+
+
+def test_cache_enforce_quota_locked(cache_directory):
+    locked_project_root = "/my/locked/project"
+    project_root = "/my/mocked/project"
+    save_file(locked_project_root, "large", "Large contents " * 1000)
+    for used, file_id in enumerate(["oldest", "older", "newest"]):
+        save_file(project_root, file_id, f"Contents of {file_id}")
+        __set_file_used(cache_directory, project_root, file_id, used + 1)
+    size = enforce_cache_quota()["size"]
+
+    locked_size = sum(
+        file_path.stat().st_size
+        for file_path in __project_cache_directory(
+            cache_directory, locked_project_root).rglob("*")
+        if file_path.is_file())
+
+    with lock_project_cache(locked_project_root):
+        quota = enforce_cache_quota(max_total_size=locked_size - 1)
+        assert quota["files"] == 0 and quota["skipped"] == 1
+        assert quota["size"] == size
+
+        quota = enforce_cache_quota(max_total_size=size - 1)
+
+    assert quota["files"] == 1
+    assert quota["size"] == size - quota["freed"]
+    assert not __get_ref_file(cache_directory, project_root, "oldest").exists()
+    assert __get_ref_file(cache_directory, project_root, "older").exists()
+    assert read_file(locked_project_root, "large") == "Large contents " * 1000
@@ -0,0 +1,66 @@
+import pytest
+from api.cache import read_file, save_file, lock_cache_maintenance
+from api.cache_maintenance import CacheMaintenance
+
+
+@pytest.fixture
+def cache_directory(mocker, tmp_path):
+    mocker.patch("api.cache.CONFIG_LOCATION_CACHE", str(tmp_path / "cache"))
+    yield tmp_path / "cache"
+
+
+def __make_database_handler(mocker, function_files: list):
+    database_handler = mocker.Mock()
+    database_handler.get_function_info.return_value = [
+        {"pathToProject": project, "fileId": file_id}
+        for project, file_id in function_files] or None
+    return database_handler
+
+
+def test_cache_maintenance_init_bad_interval(mocker):
+    with pytest.raises(TypeError):
+        CacheMaintenance(mocker.Mock(), interval="1")
+    with pytest.raises(ValueError):
+        CacheMaintenance(mocker.Mock(), interval=0)
+
+
+def test_cache_maintenance_live_projects(mocker):
+    database_handler = __make_database_handler(mocker, [
+        ("/my/project", "src/App"),
+        ("/my/project", "src/App"),
+        ("/my/project/../project", "src/List"),
+        ("/my/other/project", "index")])
+    cache_maintenance = CacheMaintenance(database_handler)
+
+    assert cache_maintenance.get_live_projects() == {
+        "/my/project": {"src/App", "src/List"},
+        "/my/other/project": {"index"}
+    }
+    database_handler.get_function_info.assert_called_once_with(
+        {}, projection=['pathToProject', 'fileId'])
+    assert CacheMaintenance(
+        __make_database_handler(mocker, [])).get_live_projects() == {}
+
+
+def test_cache_maintenance_run(mocker, tmp_path, cache_directory):
+    project_root = tmp_path / "project"
+    save_file(str(project_root), "App", "const a = 1;")
+    save_file(str(project_root), "Removed", "const b = 2;")
+    save_file("/my/removed/project", "App", "const c = 3;")
+    cache_maintenance = CacheMaintenance(
+        __make_database_handler(mocker, [(str(project_root), "App")]))
+
+    last_run = cache_maintenance.run()
+
+    assert last_run["collection"]["projects"] == 1
+    assert last_run["collection"]["files"] == 1
+    assert last_run["quota"]["files"] == 0
+    assert read_file(str(project_root), "App") == "const a = 1;"
+    with pytest.raises(FileNotFoundError):
+        read_file(str(project_root), "Removed")
+    assert cache_maintenance.get_statistics() == {
+        "runs": 1, "running": False, "lastRun": last_run}
+
+    with lock_cache_maintenance():
+        assert cache_maintenance.run() is None
+    assert cache_maintenance.runs == 1
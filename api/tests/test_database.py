@@ -1,17 +1,42 @@
+import json
+import os
 import pytest
 # from api.database import DatabaseHandler
 from api.database import *
+from api.database import _reset_database_handlers_after_fork
+from bson import json_util
 from bson.objectid import ObjectId
 from pprint import pprint
 
-
-@pytest.fixture
-def mock_db(mocker, mongodb):
-    db_mock = mocker.patch('api.database.MongoClient')
-    db_mock().admin.command.return_value = 1
-    db_mock().urangutest = mongodb
-    t_db = DatabaseHandler("mongodb://address:00000")
-    t_db.connect_to_db()
+MONGODB_TEST_DATA_DIRECTORY = \
+    os.path.join(os.path.dirname(__file__), "mongoDB_test_data")
+
+
+def __load_test_data(t_db):
+    for collection in [
+            FUNCTION_INFO_COLLECTION,
+            TEST_INFO_COLLECTION,
+            FUNCTION_DEPENDENCY_COLLECTION]:
+        with open(os.path.join(
+                MONGODB_TEST_DATA_DIRECTORY, f"{collection}.json")) as file:
+            for document in json.load(
+                    file, object_hook=json_util.object_hook):
+                t_db.database[collection].insert_one(document)
+
+
+@pytest.fixture(params=["mongodb", "sqlite"])
+def mock_db(request, mocker, tmp_path):
+    if request.param == "mongodb":
+        db_mock = mocker.patch('api.database.MongoClient')
+        db_mock().admin.command.return_value = 1
+        db_mock().urangutest = request.getfixturevalue("mongodb")
+        t_db = DatabaseHandler("mongodb://address:00000")
+        t_db.connect_to_db()
+    else:
+        t_db = DatabaseHandler(
+            SQLITE_URL_PREFIX + str(tmp_path / "urangutest.sqlite3"))
+        t_db.connect_to_db()
+        __load_test_data(t_db)
     yield t_db
     try:
         t_db.disconnect_from_db()
@@ -135,6 +160,38 @@ def __compare_objects(
 
 # TODO: write tests for check_valid_document_attributes
 
+def test_compile_attribute_checker_compiled_once():
+    compiled_checker = \
+        compile_attribute_checker(FUNCTION_INFO_ATTRIBUTE_CHECKER)
+    assert compile_attribute_checker(FUNCTION_INFO_ATTRIBUTE_CHECKER) is \
+           compiled_checker
+    assert compile_attribute_checker(TEST_INFO_ATTRIBUTES_CHECKER) is not \
+           compiled_checker
+
+
+def test_check_valid_document_attributes_errors():
+    with pytest.raises(TypeError):
+        check_valid_document_attributes(
+            {1: "a"}, FUNCTION_INFO_ATTRIBUTE_CHECKER)
+    with pytest.raises(ValueError):
+        check_valid_document_attributes(
+            {"": "a"}, FUNCTION_INFO_ATTRIBUTE_CHECKER)
+    with pytest.raises(ValueError):
+        check_valid_document_attributes(
+            {"notAnAttribute": "a"}, FUNCTION_INFO_ATTRIBUTE_CHECKER)
+    with pytest.raises(TypeError):
+        check_valid_document_attributes(
+            {"numberOfTests": "1"}, FUNCTION_INFO_ATTRIBUTE_CHECKER)
+    with pytest.raises(ValueError):
+        check_valid_document_attributes(
+            {"numberOfTests": -1}, FUNCTION_INFO_ATTRIBUTE_CHECKER)
+    with pytest.raises(ValueError):
+        check_valid_document_attributes(
+            __function_coupling_data(),
+            FUNCTION_INFO_ATTRIBUTE_CHECKER,
+            strict_compare=True)
+
+
 def test_connect_to_db_bad_arguments():
     with pytest.raises(TypeError):
         DatabaseHandler(3)
@@ -154,6 +211,93 @@ def test_connect_to_db_multiple_times(mocker):
         t_db.connect_to_db()
 
 
+def test_connect_to_db_lazy(mocker):
+    db_mock = mocker.patch('api.database.MongoClient')
+    t_db = DatabaseHandler(
+        "mongodb://localhost:27017", client_options={'maxPoolSize': 5})
+    t_db.connect_to_db(lazy=True)
+    assert t_db.client is None
+    db_mock.assert_not_called()
+
+    with pytest.raises(RuntimeError):
+        t_db.connect_to_db()
+
+    t_db.count_function_info({})
+    assert db_mock.call_count == 1
+    assert db_mock.call_args.kwargs['maxPoolSize'] == 5
+
+    t_db.count_function_info({})
+    assert db_mock.call_count == 1
+    t_db.disconnect_from_db()
+
+
+def test_disconnect_from_db_lazy_without_connection():
+    t_db = DatabaseHandler("mongodb://localhost:27017")
+    t_db.connect_to_db(lazy=True)
+    t_db.disconnect_from_db()
+
+    with pytest.raises(RuntimeError):
+        t_db.count_function_info({})
+
+
+def test_connect_to_db_bad_client_options():
+    with pytest.raises(TypeError):
+        DatabaseHandler("mongodb://localhost:27017", client_options=5)
+
+
+def test_reset_database_handlers_after_fork(tmp_path):
+    t_db = DatabaseHandler(
+        SQLITE_URL_PREFIX + str(tmp_path / "urangutest.sqlite3"))
+    t_db.connect_to_db()
+    parent_client = t_db.client
+    t_db.add_function_info(__function_info_data())
+
+    _reset_database_handlers_after_fork()
+    assert t_db.client is None
+    assert not t_db.get_pool_statistics()['connected']
+
+    assert t_db.count_function_info({}) == 1
+    assert t_db.client is not None and t_db.client is not parent_client
+    parent_client.close()
+    t_db.disconnect_from_db()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="Requires os.fork")
+def test_database_handler_forked_child_connects_again(tmp_path):
+    t_db = DatabaseHandler(
+        SQLITE_URL_PREFIX + str(tmp_path / "urangutest.sqlite3"))
+    t_db.connect_to_db()
+    t_db.add_function_info(__function_info_data())
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            if t_db.client is None and t_db.count_function_info({}) == 1:
+                exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    os.close(read_fd)
+    os.close(write_fd)
+    assert os.waitpid(pid, 0)[1] == 0
+    assert t_db.count_function_info({}) == 1
+    t_db.disconnect_from_db()
+
+
+def test_get_pool_statistics(mocker):
+    mocker.patch('api.database.MongoClient')
+    t_db = DatabaseHandler("mongodb://localhost:27017")
+    assert t_db.get_pool_statistics()['pool'] is None
+
+    t_db.connect_to_db()
+    pool_statistics = t_db.get_pool_statistics()
+    assert pool_statistics['pid'] == os.getpid()
+    assert pool_statistics['connected']
+    assert pool_statistics['pool']['connectionsOpen'] == 0
+
+
 def test_disconnect_from_db_without_connection():
     with pytest.raises(RuntimeError):
         t_db = DatabaseHandler("mongodb://localhost:27017")
@@ -617,6 +761,542 @@ def test_set_function_info(mock_db):
     __compare_objects(received_func_inf, expected_func_inf)
 
 
+def test_set_function_info_many(mock_db):
+    t_db = mock_db
+    func_inf_id_a = t_db.add_function_info(
+        __function_info_data(function_id="default.get"))
+    func_inf_id_b = t_db.add_function_info(
+        __function_info_data(function_id="default.post"))
+    modified_count = t_db.set_function_info_many([
+        ({'dependents': 1, 'haveFunctionChanged': True},
+         {'_id': func_inf_id_a}),
+        ({'dependents': 2, 'changeList': ['dependents']},
+         {'_id': func_inf_id_b})
+    ])
+    received_func_inf_a = t_db.get_function_info({'_id': func_inf_id_a})[0]
+    received_func_inf_b = t_db.get_function_info({'_id': func_inf_id_b})[0]
+    assert modified_count == 2
+    assert received_func_inf_a['dependents'] == 1
+    assert received_func_inf_a['haveFunctionChanged']
+    assert received_func_inf_b['dependents'] == 2
+    assert received_func_inf_b['changeList'] == ['dependents']
+
+
+def test_set_function_info_many_invalid_update(mock_db):
+    t_db = mock_db
+    func_inf_id = t_db.add_function_info(__function_info_data())
+    with pytest.raises(ValueError):
+        t_db.set_function_info_many([
+            ({'dependents': 1}, {'_id': func_inf_id}),
+            ({'notAnAttribute': 1}, {'_id': func_inf_id})
+        ])
+    received_func_inf = t_db.get_function_info({'_id': func_inf_id})[0]
+    assert received_func_inf['dependents'] == 24
+
+
+def test_add_function_info_many(mock_db):
+    t_db = mock_db
+    func_infs = [
+        __function_info_data(function_id="default.get"),
+        __function_info_data(function_id="default.post")
+    ]
+    func_inf_ids = t_db.add_function_info_many(func_infs)
+    assert len(func_inf_ids) == 2
+    for func_inf_id, func_inf in zip(func_inf_ids, func_infs):
+        received_func_inf = t_db.get_function_info({'_id': func_inf_id})[0]
+        assert received_func_inf['functionId'] == func_inf['functionId']
+        assert received_func_inf['changeList'] == []
+
+
+def test_add_test_info_many_invalid_document(mock_db):
+    t_db = mock_db
+    test_infs = [
+        __test_info_data(custom_name="first"),
+        {**__test_info_data(custom_name="second"), 'fileId': ""}
+    ]
+    with pytest.raises(ValueError):
+        t_db.add_test_info_many(test_infs)
+    assert t_db.get_test_info({'customName': "first"}) is None
+
+
+def test_remove_function_dependency_many(mock_db):
+    t_db = mock_db
+    func_coup_ids = t_db.add_function_dependency_many([
+        __function_coupling_data(function_id='removeA'),
+        __function_coupling_data(function_id='removeB'),
+        __function_coupling_data(function_id='keep')
+    ])
+    deleted_count = t_db.remove_function_dependency_many([
+        {'_id': {'$in': func_coup_ids[:2]}}
+    ])
+    assert deleted_count == 2
+    assert t_db.get_function_dependency({'_id': func_coup_ids[0]}) is None
+    assert t_db.get_function_dependency({'_id': func_coup_ids[1]}) is None
+    assert t_db.get_function_dependency({'_id': func_coup_ids[2]}) is not None
+
+
+def test_remove_function_dependency_filter_in(mock_db):
+    t_db = mock_db
+    func_coup_ids = t_db.add_function_dependency_many([
+        __function_coupling_data(function_id='removeA'),
+        __function_coupling_data(function_id='removeB')
+    ])
+    t_db.remove_function_dependency(
+        {'functionId': {'$in': ['removeA', 'removeB']}})
+    assert t_db.get_function_dependency(
+        {'_id': {'$in': func_coup_ids}}) is None
+
+
+def test_get_function_dependency_filter_in_invalid_item(mock_db):
+    t_db = mock_db
+    with pytest.raises(ValueError):
+        t_db.get_function_dependency({'_id': {'$in': ["not_an_id"]}})
+
+
+def test_get_function_dependency_filter_unsupported_operator(mock_db):
+    t_db = mock_db
+    with pytest.raises(ValueError):
+        t_db.get_function_dependency({'functionId': {'$regex': "api"}})
+
+
+def test_bulk_write_test_info(mock_db):
+    t_db = mock_db
+    test_inf_id = t_db.add_test_info(__test_info_data(custom_name="old"))
+    removed_test_inf_id = \
+        t_db.add_test_info(__test_info_data(custom_name="removed"))
+    bulk_result = t_db.bulk_write_test_info([
+        (DBOperation.ADD, __test_info_data(custom_name="added")),
+        (DBOperation.SET, ({'customName': "new"}, {'_id': test_inf_id})),
+        (DBOperation.REMOVE, {'_id': removed_test_inf_id})
+    ])
+    assert len(bulk_result['inserted_ids']) == 1
+    assert bulk_result['modified_count'] == 1
+    assert bulk_result['deleted_count'] == 1
+    assert t_db.get_test_info(
+        {'_id': bulk_result['inserted_ids'][0]})[0]['customName'] == "added"
+    assert t_db.get_test_info({'_id': test_inf_id})[0]['customName'] == "new"
+    assert t_db.get_test_info({'_id': removed_test_inf_id}) is None
+
+
+def test_set_function_info_all_matches_filter_nin(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/proj_nin"
+    func_inf_ids = t_db.add_function_info_many([
+        __function_info_data(
+            path_to_project=path_to_project,
+            function_id=function_id,
+            have_function_changed=True)
+        for function_id in ["tested", "untestedA", "untestedB"]])
+    t_db.set_function_info(
+        {'haveFunctionChanged': False},
+        {'pathToProject': path_to_project,
+         'functionId': {'$nin': ["tested"]}},
+        act_on_first_match=False)
+    received_func_infs = [
+        t_db.get_function_info({'_id': func_inf_id})[0]
+        for func_inf_id in func_inf_ids]
+    assert [func_inf['haveFunctionChanged']
+            for func_inf in received_func_infs] == [True, False, False]
+
+
+def test_count_test_info(mock_db):
+    t_db = mock_db
+    t_db.add_test_info_many([
+        __test_info_data(path_to_project="/path/to/project/count")
+        for _ in range(3)])
+    assert t_db.count_test_info(
+        {'pathToProject': "/path/to/project/count"}) == 3
+    assert t_db.count_test_info(
+        {'pathToProject': "/path/to/project/count"}, limit=1) == 1
+    assert t_db.count_test_info(
+        {'pathToProject': "/path/to/project/missing"}) == 0
+
+
+def test_increment_function_info(mock_db):
+    t_db = mock_db
+    func_inf_id = t_db.add_function_info(
+        __function_info_data(number_fo_tests=2))
+    matched_count = t_db.increment_function_info(
+        {'numberOfTests': 1}, {'_id': func_inf_id})
+    t_db.increment_function_info({'numberOfTests': -2}, {'_id': func_inf_id})
+    received_func_inf = t_db.get_function_info({'_id': func_inf_id})[0]
+    assert matched_count == 1
+    assert received_func_inf['numberOfTests'] == 1
+
+
+def test_increment_function_info_not_numeric(mock_db):
+    t_db = mock_db
+    with pytest.raises(TypeError):
+        t_db.increment_function_info(
+            {'functionHash': 1}, {'functionId': "default.get"})
+    with pytest.raises(TypeError):
+        t_db.increment_function_info(
+            {'numberOfTests': "1"}, {'functionId': "default.get"})
+
+
+def test_get_function_info_projection(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/projection"
+    t_db.add_function_info_many([
+        __function_info_data(
+            path_to_project=path_to_project, function_id=function_id)
+        for function_id in ["first", "second"]])
+    documents = t_db.get_function_info(
+        {'pathToProject': path_to_project},
+        projection=['fileId', 'functionId'])
+    assert len(documents) == 2
+    for doc in documents:
+        assert set(doc.keys()) == {'fileId', 'functionId'}
+
+
+def test_get_function_info_projection_with_id(mock_db):
+    t_db = mock_db
+    func_inf_id = t_db.add_function_info(
+        __function_info_data(function_id="projected"))
+    received_func_inf = t_db.get_function_info(
+        {'_id': func_inf_id},
+        projection=['_id', 'functionId'])[0]
+    assert received_func_inf == {
+        '_id': func_inf_id,
+        'functionId': "projected"}
+
+
+def test_iter_test_info_pagination(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/pagination"
+    test_inf_ids = t_db.add_test_info_many([
+        __test_info_data(path_to_project=path_to_project)
+        for _ in range(5)])
+
+    first_page = list(t_db.iter_test_info(
+        {'pathToProject': path_to_project}, limit=2))
+    second_page = list(t_db.iter_test_info(
+        {'pathToProject': path_to_project},
+        limit=2, after_id=first_page[-1]['_id']))
+    last_page = list(t_db.iter_test_info(
+        {'pathToProject': path_to_project},
+        limit=2, after_id=second_page[-1]['_id']))
+
+    assert [test_inf['_id'] for test_inf in
+            first_page + second_page + last_page] == sorted(test_inf_ids)
+    assert len(last_page) == 1
+
+
+def test_iter_function_info_lazy(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/lazy"
+    t_db.add_function_info_many([
+        __function_info_data(
+            path_to_project=path_to_project, function_id=function_id)
+        for function_id in ["first", "second"]])
+
+    documents = t_db.iter_function_info(
+        {'pathToProject': path_to_project}, projection=['functionId'])
+
+    assert not isinstance(documents, list)
+    assert next(documents) == {'functionId': "first"}
+    assert list(documents) == [{'functionId': "second"}]
+
+
+def test_iter_function_dependency_invalid(mock_db):
+    t_db = mock_db
+    with pytest.raises(TypeError):
+        t_db.iter_function_dependency({}, limit="1")
+    with pytest.raises(ValueError):
+        t_db.iter_function_dependency({}, limit=-1)
+    with pytest.raises(ValueError):
+        t_db.iter_function_dependency({}, after_id="0123")
+    with pytest.raises(ValueError):
+        t_db.iter_function_dependency(
+            {'_id': "0123456789ab0123456789ab"},
+            after_id="0123456789ab0123456789ab")
+
+
+def test_get_test_info_filter_gt(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/gt"
+    test_inf_ids = t_db.add_test_info_many([
+        __test_info_data(path_to_project=path_to_project)
+        for _ in range(3)])
+    documents = t_db.get_test_info({
+        'pathToProject': path_to_project,
+        '_id': {'$gt': test_inf_ids[0]}})
+    assert sorted(test_inf['_id'] for test_inf in documents) == \
+           sorted(test_inf_ids[1:])
+
+
+def test_write_listeners(mock_db):
+    t_db = mock_db
+    writes = []
+
+    def listener(collection, paths_to_project):
+        writes.append((collection, paths_to_project))
+
+    t_db.add_write_listener(listener)
+    test_inf_id = t_db.add_test_info(
+        __test_info_data(path_to_project="/path/to/project/listen"))
+    t_db.set_test_info({'customName': "renamed"}, {'_id': test_inf_id})
+    t_db.set_test_info({'customName': "renamed again"}, {
+        '_id': test_inf_id,
+        'pathToProject': "/path/to/project/listen"})
+    t_db.remove_function_dependency_many([
+        {'pathToProject': "/path/to/project/a"},
+        {'pathToProject': {'$in': ["/path/to/project/b"]}}])
+    t_db.remove_write_listener(listener)
+    t_db.remove_test_info({'_id': test_inf_id})
+
+    assert writes == [
+        (TEST_INFO_COLLECTION, {"/path/to/project/listen"}),
+        (TEST_INFO_COLLECTION, None),
+        (TEST_INFO_COLLECTION, {"/path/to/project/listen"}),
+        (FUNCTION_DEPENDENCY_COLLECTION,
+         {"/path/to/project/a", "/path/to/project/b"})]
+
+
+def test_get_project_version(mock_db):
+    t_db = mock_db
+    path_a = "/path/to/project/version/a"
+    path_b = "/path/to/project/version/b"
+
+    def versions():
+        return (t_db.get_project_version(path_a, TEST_INFO_COLLECTION),
+                t_db.get_project_version(path_b, TEST_INFO_COLLECTION),
+                t_db.get_project_version(path_a, FUNCTION_INFO_COLLECTION))
+
+    with pytest.raises(ValueError):
+        t_db.get_project_version(path_a, FUNCTION_DEPENDENCY_COLLECTION)
+
+    test_version_a, test_version_b, function_version_a = versions()
+    assert versions() == (test_version_a, test_version_b, function_version_a)
+
+    # Writes to a known project only move the version of that project
+    test_inf_id = \
+        t_db.add_test_info(__test_info_data(path_to_project=path_a))
+    assert versions()[1:] == (test_version_b, function_version_a)
+    assert versions()[0] != test_version_a
+    test_version_a = versions()[0]
+
+    # Writes to unknown projects move the versions of all projects
+    t_db.set_test_info({'customName': "renamed"}, {'_id': test_inf_id})
+    assert versions()[0] != test_version_a
+    assert versions()[1] != test_version_b
+    assert versions()[2] == function_version_a
+
+
+def test_get_project_version_shared(tmp_path):
+    database_url = SQLITE_URL_PREFIX + str(tmp_path / "urangutest.sqlite3")
+    t_db = DatabaseHandler(database_url)
+    t_db.connect_to_db()
+    other_t_db = DatabaseHandler(database_url)
+    other_t_db.connect_to_db()
+    path_to_project = "/path/to/project/version"
+
+    version = t_db.get_project_version(
+        path_to_project, FUNCTION_INFO_COLLECTION)
+    assert other_t_db.get_project_version(
+        path_to_project, FUNCTION_INFO_COLLECTION) == version
+
+    # Writes by other processes move the version as well
+    other_t_db.add_function_info(
+        __function_info_data(path_to_project=path_to_project))
+    assert t_db.get_project_version(
+        path_to_project, FUNCTION_INFO_COLLECTION) != version
+
+    other_t_db.disconnect_from_db()
+    t_db.disconnect_from_db()
+
+
+def test_write_buffer_read_your_writes(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/buffered"
+    t_db.begin_write_buffer()
+
+    func_inf_id = t_db.add_function_info(
+        __function_info_data(path_to_project=path_to_project))
+    t_db.add_function_info(__function_info_data(
+        path_to_project=path_to_project, function_id="default.post"))
+    t_db.set_function_info({'functionHash': "changed"}, {'_id': func_inf_id})
+    t_db.remove_function_info(
+        {'pathToProject': path_to_project, 'functionId': "default.post"})
+
+    # Nothing is written before the buffer is flushed
+    assert t_db.database[FUNCTION_INFO_COLLECTION].count_documents(
+        {'pathToProject': path_to_project}) == 0
+
+    received_func_inf = \
+        t_db.get_function_info({'pathToProject': path_to_project})
+    assert [func_inf['_id'] for func_inf in received_func_inf] == \
+           [func_inf_id]
+    assert received_func_inf[0]['functionHash'] == "changed"
+    assert t_db.count_function_info({'pathToProject': path_to_project}) == 1
+    assert [func_inf['functionId'] for func_inf in t_db.iter_function_info(
+        {'pathToProject': path_to_project},
+        projection=['functionId'])] == ["default.get"]
+
+    t_db.end_write_buffer()
+    assert not t_db.is_write_buffered()
+    assert t_db.get_function_info({'pathToProject': path_to_project}) == \
+           received_func_inf
+
+
+def test_write_buffer_flushes_when_read_cannot_be_overlaid(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/buffered"
+    func_inf_id = t_db.add_function_info(
+        __function_info_data(path_to_project=path_to_project))
+    t_db.begin_write_buffer()
+
+    t_db.set_function_info(
+        {'haveFunctionChanged': True}, {'_id': func_inf_id})
+    received_func_inf = t_db.get_function_info(
+        {'pathToProject': path_to_project, 'haveFunctionChanged': True})
+
+    assert [func_inf['_id'] for func_inf in received_func_inf] == \
+           [func_inf_id]
+    assert t_db.database[FUNCTION_INFO_COLLECTION].count_documents(
+        {'pathToProject': path_to_project, 'haveFunctionChanged': True}) == 1
+    t_db.discard_write_buffer()
+
+
+def test_write_buffer_flushes_when_full(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/buffered"
+    t_db.begin_write_buffer(max_operations=2)
+
+    t_db.add_test_info(__test_info_data(path_to_project=path_to_project))
+    assert t_db.database[TEST_INFO_COLLECTION].count_documents(
+        {'pathToProject': path_to_project}) == 0
+
+    t_db.add_test_info(__test_info_data(path_to_project=path_to_project))
+    assert t_db.database[TEST_INFO_COLLECTION].count_documents(
+        {'pathToProject': path_to_project}) == 2
+    t_db.end_write_buffer()
+
+
+def test_write_buffer_flushes_before_increment(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/buffered"
+    t_db.begin_write_buffer()
+
+    func_inf_id = t_db.add_function_info(__function_info_data(
+        path_to_project=path_to_project, number_fo_tests=1))
+
+    assert t_db.increment_function_info(
+        {'numberOfTests': 1}, {'_id': func_inf_id}) == 1
+    assert t_db.database[FUNCTION_INFO_COLLECTION].find_one(
+        {'_id': ObjectId(func_inf_id)})['numberOfTests'] == 2
+    t_db.end_write_buffer()
+
+
+def test_write_buffer_discard(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/buffered"
+    writes = []
+    t_db.add_write_listener(
+        lambda collection, paths_to_project: writes.append(collection))
+    t_db.begin_write_buffer()
+
+    t_db.add_function_dependency(
+        __function_coupling_data(path_to_project=path_to_project))
+    t_db.discard_write_buffer()
+    t_db.end_write_buffer()
+
+    assert t_db.get_function_dependency(
+        {'pathToProject': path_to_project}) is None
+    assert writes == []
+
+
+def test_write_buffer_listeners_notified_on_flush(mock_db):
+    t_db = mock_db
+    path_to_project = "/path/to/project/buffered"
+    writes = []
+    t_db.add_write_listener(
+        lambda collection, paths_to_project:
+        writes.append((collection, paths_to_project)))
+    t_db.begin_write_buffer()
+
+    t_db.add_function_dependency(
+        __function_coupling_data(path_to_project=path_to_project))
+    assert writes == []
+
+    t_db.flush_write_buffer()
+    assert writes == [(FUNCTION_DEPENDENCY_COLLECTION, {path_to_project})]
+    t_db.end_write_buffer()
+
+
+def test_write_buffer_begin_twice(mock_db):
+    t_db = mock_db
+    t_db.begin_write_buffer()
+    with pytest.raises(RuntimeError):
+        t_db.begin_write_buffer()
+    t_db.discard_write_buffer()
+
+
+def test_query_statistics(mock_db):
+    t_db = mock_db
+    t_db.query_metrics.reset()
+    func_inf_id = t_db.add_function_info(__function_info_data())
+    t_db.get_function_info({'_id': func_inf_id})
+    t_db.get_function_info({'_id': func_inf_id})
+
+    assert {(query['collection'], query['operation'], query['filterShape'],
+             query['count'], query['documents'])
+            for query in t_db.get_query_statistics()} == {
+        (FUNCTION_INFO_COLLECTION, 'insert_one', "-", 1, 1),
+        (FUNCTION_INFO_COLLECTION, 'find_one', "{_id: ?}", 2, 2),
+        # The first write to the project creates its version
+        (PROJECT_VERSION_COLLECTION, 'update_one', "{_id: ?}", 1, 0),
+        (PROJECT_VERSION_COLLECTION, 'insert_one', "-", 1, 1)}
+
+
+def test_query_summary(mock_db):
+    t_db = mock_db
+    assert t_db.end_query_summary() is None
+
+    t_db.begin_query_summary()
+    with pytest.raises(RuntimeError):
+        t_db.begin_query_summary()
+    t_db.count_test_info({})
+    query_summary = t_db.end_query_summary()
+
+    assert [(query['operation'], query['count'])
+            for query in query_summary.get_statistics()] == \
+           [('count_documents', 1)]
+
+
+def test_slow_query_log(caplog, tmp_path):
+    t_db = DatabaseHandler(
+        SQLITE_URL_PREFIX + str(tmp_path / "urangutest.sqlite3"),
+        slow_query_ms=0,
+        explain_slow_queries=True)
+    t_db.connect_to_db()
+    t_db.get_function_info({'pathToProject': "/path/to/project"})
+    t_db.disconnect_from_db()
+
+    assert "Slow query on functionInfo: find {pathToProject: ?}" in \
+           caplog.text
+    assert "queryPlan" in caplog.text
+
+
+def test_slow_query_bad_arguments():
+    with pytest.raises(TypeError):
+        DatabaseHandler("mongodb://localhost:27017", slow_query_ms="100")
+    with pytest.raises(ValueError):
+        DatabaseHandler("mongodb://localhost:27017", slow_query_ms=-1)
+
+
+def test_get_test_info_projection_invalid(mock_db):
+    t_db = mock_db
+    with pytest.raises(TypeError):
+        t_db.get_test_info({}, projection="functionId")
+    with pytest.raises(TypeError):
+        t_db.get_test_info({}, projection=[1])
+    with pytest.raises(ValueError):
+        t_db.get_test_info({}, projection=[])
+    with pytest.raises(ValueError):
+        t_db.get_test_info({}, projection=['notAnAttribute'])
+
+
 def test_set_test_info(mock_db):
     t_db = mock_db
     test_inf = __test_info_data()
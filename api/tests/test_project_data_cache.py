@@ -0,0 +1,125 @@
+from api.database import FUNCTION_INFO_COLLECTION, TEST_INFO_COLLECTION, \
+    FUNCTION_DEPENDENCY_COLLECTION
+from api.project_data_cache import ProjectDataCache
+
+
+def __make_loader(documents: list, loads: list):
+    def loader():
+        loads.append(1)
+        return documents
+
+    return loader
+
+
+def __get_unchanged_version(path_to_project: str, collection: str) -> str:
+    return "0"
+
+
+def test_project_data_cache_read_through():
+    project_data_cache = ProjectDataCache(__get_unchanged_version)
+    loads = []
+    loader = __make_loader([{"functionId": "get"}], loads)
+
+    assert project_data_cache.get_function_info("/a", loader) == \
+           [{"functionId": "get"}]
+    assert project_data_cache.get_function_info("/a", loader) == \
+           [{"functionId": "get"}]
+    assert len(loads) == 1
+
+
+def test_project_data_cache_bounded():
+    project_data_cache = ProjectDataCache(
+        __get_unchanged_version, max_documents=3)
+    loads = []
+
+    project_data_cache.get_test_info(
+        "/a", __make_loader([{}, {}], loads))
+    project_data_cache.get_test_info(
+        "/b", __make_loader([{}, {}], loads))
+    project_data_cache.get_test_info(
+        "/a", __make_loader([{}, {}], loads))
+
+    assert len(loads) == 3
+
+    # A project too large to cache is loaded every time, and evicts nothing
+    project_data_cache.get_test_info(
+        "/c", __make_loader([{}, {}, {}, {}], loads))
+    project_data_cache.get_test_info(
+        "/c", __make_loader([{}, {}, {}, {}], loads))
+    project_data_cache.get_test_info(
+        "/a", __make_loader([{}, {}], loads))
+
+    assert len(loads) == 5
+
+
+def test_project_data_cache_database_write_listener():
+    project_data_cache = ProjectDataCache(__get_unchanged_version)
+    loads = []
+
+    def read_all():
+        project_data_cache.get_function_info("/a", __make_loader([], loads))
+        project_data_cache.get_function_info("/b", __make_loader([], loads))
+        project_data_cache.get_test_info("/a", __make_loader([], loads))
+
+    read_all()
+    assert len(loads) == 3
+
+    # Writes to a known project only invalidate that project's collection
+    project_data_cache.database_write_listener(
+        FUNCTION_INFO_COLLECTION, {"/a"})
+    read_all()
+    assert len(loads) == 4
+
+    # Writes to unknown projects invalidate the whole collection
+    project_data_cache.database_write_listener(TEST_INFO_COLLECTION, None)
+    read_all()
+    assert len(loads) == 5
+
+    # Writes to collections that aren't cached are ignored
+    project_data_cache.database_write_listener(
+        FUNCTION_DEPENDENCY_COLLECTION, None)
+    read_all()
+    assert len(loads) == 5
+
+
+def test_project_data_cache_invalidate():
+    project_data_cache = ProjectDataCache(__get_unchanged_version)
+    loads = []
+
+    def read_all():
+        project_data_cache.get_function_info("/a", __make_loader([], loads))
+        project_data_cache.get_test_info("/a", __make_loader([], loads))
+        project_data_cache.get_test_info("/b", __make_loader([], loads))
+
+    read_all()
+    project_data_cache.invalidate("/a")
+    read_all()
+    assert len(loads) == 5
+
+    project_data_cache.invalidate()
+    read_all()
+    assert len(loads) == 8
+
+
+def test_project_data_cache_version_moved():
+    versions = {}
+    project_data_cache = ProjectDataCache(
+        lambda path_to_project, collection:
+        versions.get((collection, path_to_project), "0"))
+    loads = []
+
+    def read_all():
+        project_data_cache.get_function_info("/a", __make_loader([], loads))
+        project_data_cache.get_function_info("/b", __make_loader([], loads))
+
+    read_all()
+    read_all()
+    assert len(loads) == 2
+
+    # The version moves when another process writes to the project
+    versions[(FUNCTION_INFO_COLLECTION, "/a")] = "1"
+    assert project_data_cache.get_version(
+        "/a", FUNCTION_INFO_COLLECTION) == "1"
+    read_all()
+    read_all()
+    assert len(loads) == 3
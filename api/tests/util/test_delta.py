@@ -0,0 +1,23 @@
+import pytest
+from api.util.delta import apply_delta, make_delta
+
+
+def test_delta_round_trip():
+    source = "line 1\nline 2\nline 3\nline 4\n"
+    target = "line 1\nline two\nline 3\nline 4\nline 5"
+
+    delta = make_delta(source, target)
+
+    assert delta == [[0, 1], "line two\n", [2, 4], "line 5"]
+    assert apply_delta(source, delta) == target
+
+
+def test_delta_round_trip_empty_and_line_endings():
+    assert apply_delta("", make_delta("", "new\r\nfile")) == "new\r\nfile"
+    assert apply_delta("old\nfile\n", make_delta("old\nfile\n", "")) == ""
+    assert make_delta("same\n", "same\n") == [[0, 1]]
+
+
+def test_apply_delta_bad_operation():
+    with pytest.raises(ValueError):
+        apply_delta("source", [[0, 1], {"insert": "text"}])
@@ -0,0 +1,41 @@
+import random
+from api.util.diff import DiffOperation, diff_lines, format_diff
+
+
+def test_diff_lines():
+    old_lines = ["a", "b", "c", "a", "b", "b", "a"]
+    new_lines = ["c", "b", "a", "b", "a", "c"]
+
+    diff = diff_lines(old_lines, new_lines)
+
+    assert [line for operation, line in diff
+            if operation != DiffOperation.INSERT] == old_lines
+    assert [line for operation, line in diff
+            if operation != DiffOperation.DELETE] == new_lines
+    assert sum(operation != DiffOperation.EQUAL
+               for operation, line in diff) == 5
+
+
+def test_diff_lines_random():
+    random_generator = random.Random(7)
+    for _ in range(50):
+        old_lines = [random_generator.choice("abcd")
+                     for _ in range(random_generator.randint(0, 30))]
+        new_lines = [random_generator.choice("abcd")
+                     for _ in range(random_generator.randint(0, 30))]
+
+        diff = diff_lines(old_lines, new_lines)
+
+        assert [line for operation, line in diff
+                if operation != DiffOperation.INSERT] == old_lines
+        assert [line for operation, line in diff
+                if operation != DiffOperation.DELETE] == new_lines
+
+
+def test_format_diff():
+    diff = diff_lines(
+        "This file has\nmany\nlines!".splitlines(),
+        "This file has\nsome\nlines!".splitlines())
+
+    assert format_diff(diff) == "  This file has\n- many\n+ some\n  lines!"
+    assert format_diff(diff_lines([], [])) == ""
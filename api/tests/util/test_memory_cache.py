@@ -0,0 +1,135 @@
+import pytest
+from api.util.memory_cache import MemoryCache
+
+
+def test_memory_cache_init_max_weight_not_integer():
+    with pytest.raises(TypeError):
+        MemoryCache("10")
+
+
+def test_memory_cache_init_max_weight_too_small():
+    with pytest.raises(ValueError):
+        MemoryCache(0)
+
+
+def test_memory_cache_get_set():
+    memory_cache = MemoryCache(4)
+
+    assert memory_cache.get("missing") is None
+    assert memory_cache.get("missing", []) == []
+
+    memory_cache.set("key", "value")
+    assert memory_cache.get("key") == "value"
+    assert "key" in memory_cache
+    assert memory_cache.hits == 1
+    assert memory_cache.misses == 2
+
+
+def test_memory_cache_least_recently_used_eviction():
+    memory_cache = MemoryCache(2)
+
+    memory_cache.set("a", 1)
+    memory_cache.set("b", 2)
+    memory_cache.get("a")
+    memory_cache.set("c", 3)
+
+    assert "a" in memory_cache
+    assert "b" not in memory_cache
+    assert "c" in memory_cache
+    assert memory_cache.evictions == 1
+
+
+def test_memory_cache_weigher():
+    memory_cache = MemoryCache(5, weigher=len)
+
+    memory_cache.set("a", [1, 2])
+    memory_cache.set("b", [1, 2, 3])
+    assert memory_cache.get_weight() == 5
+
+    memory_cache.set("c", [1])
+    assert "a" not in memory_cache
+    assert memory_cache.get_weight() == 4
+
+    # A value too heavy to cache is not cached, and evicts nothing
+    memory_cache.set("d", [1, 2, 3, 4, 5, 6])
+    assert "d" not in memory_cache
+    assert memory_cache.get_weight() == 4
+
+    memory_cache.set("c", [1, 2, 3, 4, 5, 6])
+    assert "c" not in memory_cache
+    assert memory_cache.get_weight() == 3
+
+
+def test_memory_cache_get_or_load():
+    memory_cache = MemoryCache(4)
+    loaded_keys = []
+
+    def loader():
+        loaded_keys.append("key")
+        return "value"
+
+    assert memory_cache.get_or_load("key", loader) == "value"
+    assert memory_cache.get_or_load("key", loader) == "value"
+    assert loaded_keys == ["key"]
+
+
+def test_memory_cache_get_or_load_invalidated_while_loading():
+    memory_cache = MemoryCache(4)
+
+    def loader():
+        memory_cache.remove("key")
+        return "stale value"
+
+    assert memory_cache.get_or_load("key", loader) == "stale value"
+    assert "key" not in memory_cache
+
+
+def test_memory_cache_remove():
+    memory_cache = MemoryCache(4)
+    memory_cache.set(("functionInfo", "/a"), 1)
+    memory_cache.set(("functionInfo", "/b"), 2)
+    memory_cache.set(("testInfo", "/a"), 3)
+
+    memory_cache.remove(("functionInfo", "/b"))
+    assert len(memory_cache) == 2
+
+    memory_cache.remove_if(lambda key: key[1] == "/a")
+    assert len(memory_cache) == 0
+    assert memory_cache.get_weight() == 0
+
+
+def test_memory_cache_init_bad_ttl():
+    with pytest.raises(TypeError):
+        MemoryCache(4, ttl="10")
+    with pytest.raises(ValueError):
+        MemoryCache(4, ttl=0)
+
+
+def test_memory_cache_ttl(mocker):
+    mock_monotonic = mocker.patch("api.util.memory_cache.time.monotonic")
+    mock_monotonic.return_value = 100.0
+    memory_cache = MemoryCache(4, ttl=10)
+
+    memory_cache.set("a", 1)
+    mock_monotonic.return_value = 105.0
+    memory_cache.set("b", 2)
+    assert memory_cache.get("a") == 1
+
+    mock_monotonic.return_value = 110.0
+    assert memory_cache.get("a") is None
+    assert memory_cache.get_or_load("b", lambda: 3) == 2
+
+    mock_monotonic.return_value = 115.0
+    memory_cache.set("c", 3)
+    assert len(memory_cache) == 1
+    assert "c" in memory_cache
+
+    assert memory_cache.get_statistics() == {
+        'entries': 1,
+        'weight': 1,
+        'maxWeight': 4,
+        'hits': 2,
+        'misses': 1,
+        'evictions': 0,
+        'expirations': 2
+    }
@@ -0,0 +1,63 @@
+import difflib
+
+
+def make_delta(source: str, target: str) -> list:
+    """Make a line based delta turning the source text into the target text.
+
+    The delta is a list of operations, each one either a list [start, end]
+    copying the source lines from start up to end, or a string inserted as
+    is. Lines the texts have in common are only referenced, which makes the
+    delta between two versions of a file a fraction of the size of the file.
+    The delta only holds lists, integers and strings, so it can be saved as
+    JSON.
+
+    :param source: The text the delta is applied to.
+    :type source: str
+    :param target: The text the delta produces.
+    :type target: str
+
+    :return: The delta.
+    :rtype: list
+    """
+    source_lines = source.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+
+    delta = []
+    sequence_matcher = difflib.SequenceMatcher(
+        None, source_lines, target_lines, autojunk=False)
+    for tag, source_start, source_end, target_start, target_end in \
+            sequence_matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([source_start, source_end])
+        elif tag in ('replace', 'insert'):
+            delta.append("".join(target_lines[target_start:target_end]))
+
+    return delta
+
+
+def apply_delta(source: str, delta: list) -> str:
+    """Apply a delta made by make_delta to its source text.
+
+    :param source: The text the delta was made from.
+    :type source: str
+    :param delta: The delta.
+    :type delta: list
+
+    :return: The target text the delta was made for.
+    :rtype: str
+
+    :raises ValueError: If the delta holds an operation that is neither a
+    copy nor an insertion.
+    """
+    source_lines = source.splitlines(keepends=True)
+
+    target_parts = []
+    for operation in delta:
+        if isinstance(operation, str):
+            target_parts.append(operation)
+        elif isinstance(operation, list) and len(operation) == 2:
+            target_parts.extend(source_lines[operation[0]:operation[1]])
+        else:
+            raise ValueError(f"Bad delta operation: {operation!r}")
+
+    return "".join(target_parts)
@@ -0,0 +1,153 @@
+from enum import Enum
+
+
+class DiffOperation(Enum):
+    """Operation of a line in a diff. The value is the prefix of the line
+    in a formatted diff, the same prefixes as difflib.Differ uses."""
+    EQUAL = "  "
+    DELETE = "- "
+    INSERT = "+ "
+
+
+def __myers_diff(old_lines: list, new_lines: list) -> list:
+    """Find a shortest edit script turning the old lines into the new lines
+    with the Myers O(ND) algorithm, where D is the number of deleted and
+    inserted lines. Diffs between similar texts are therefore close to
+    linear, unlike difflib which is near quadratic on long inputs.
+
+    :param old_lines: The old lines.
+    :type old_lines: list
+    :param new_lines: The new lines.
+    :type new_lines: list
+
+    :return: The diff as (DiffOperation, line) tuples.
+    :rtype: list
+    """
+    old_length = len(old_lines)
+    new_length = len(new_lines)
+
+    # furthest[k] is the furthest old line index reached on diagonal k, where
+    # k is the old line index minus the new line index. Trace holds a copy
+    # of it before every number of edits, for backtracking.
+    furthest = {1: 0}
+    trace = []
+    for edits in range(old_length + new_length + 1):
+        trace.append(furthest.copy())
+        for diagonal in range(-edits, edits + 1, 2):
+            if diagonal == -edits or (
+                    diagonal != edits and
+                    furthest[diagonal - 1] < furthest[diagonal + 1]):
+                old_index = furthest[diagonal + 1]
+            else:
+                old_index = furthest[diagonal - 1] + 1
+
+            new_index = old_index - diagonal
+            while old_index < old_length and new_index < new_length and \
+                    old_lines[old_index] == new_lines[new_index]:
+                old_index += 1
+                new_index += 1
+
+            furthest[diagonal] = old_index
+            if old_index >= old_length and new_index >= new_length:
+                return __myers_backtrack(old_lines, new_lines, trace)
+
+    return []
+
+
+def __myers_backtrack(old_lines: list, new_lines: list, trace: list) -> list:
+    """Follow the trace of the Myers algorithm back from the end of both
+    texts to build the diff.
+
+    :param old_lines: The old lines.
+    :type old_lines: list
+    :param new_lines: The new lines.
+    :type new_lines: list
+    :param trace: The furthest reaching old line indexes before every number
+    of edits.
+    :type trace: list
+
+    :return: The diff as (DiffOperation, line) tuples.
+    :rtype: list
+    """
+    diff = []
+    old_index = len(old_lines)
+    new_index = len(new_lines)
+    for edits in range(len(trace) - 1, -1, -1):
+        furthest = trace[edits]
+        diagonal = old_index - new_index
+        if diagonal == -edits or (
+                diagonal != edits and
+                furthest[diagonal - 1] < furthest[diagonal + 1]):
+            previous_diagonal = diagonal + 1
+        else:
+            previous_diagonal = diagonal - 1
+
+        previous_old_index = furthest[previous_diagonal]
+        previous_new_index = previous_old_index - previous_diagonal
+
+        while old_index > previous_old_index and \
+                new_index > previous_new_index:
+            old_index -= 1
+            new_index -= 1
+            diff.append((DiffOperation.EQUAL, old_lines[old_index]))
+
+        if edits > 0:
+            if old_index == previous_old_index:
+                new_index -= 1
+                diff.append((DiffOperation.INSERT, new_lines[new_index]))
+            else:
+                old_index -= 1
+                diff.append((DiffOperation.DELETE, old_lines[old_index]))
+
+        old_index = previous_old_index
+        new_index = previous_new_index
+
+    diff.reverse()
+    return diff
+
+
+def diff_lines(old_lines: list, new_lines: list) -> list:
+    """Diff two lists of lines. Lines common to the start and end of both
+    lists are matched before the Myers algorithm runs on what is left.
+
+    :param old_lines: The old lines.
+    :type old_lines: list
+    :param new_lines: The new lines.
+    :type new_lines: list
+
+    :return: The diff as (DiffOperation, line) tuples, in order.
+    :rtype: list
+    """
+    prefix_length = 0
+    while prefix_length < min(len(old_lines), len(new_lines)) and \
+            old_lines[prefix_length] == new_lines[prefix_length]:
+        prefix_length += 1
+
+    suffix_length = 0
+    while suffix_length < \
+            min(len(old_lines), len(new_lines)) - prefix_length and \
+            old_lines[-1 - suffix_length] == new_lines[-1 - suffix_length]:
+        suffix_length += 1
+
+    old_end = len(old_lines) - suffix_length
+    new_end = len(new_lines) - suffix_length
+
+    return \
+        [(DiffOperation.EQUAL, line) for line in old_lines[:prefix_length]] + \
+        __myers_diff(
+            old_lines[prefix_length:old_end],
+            new_lines[prefix_length:new_end]) + \
+        [(DiffOperation.EQUAL, line) for line in old_lines[old_end:]]
+
+
+def format_diff(diff: list) -> str:
+    """Format a diff the way difflib.Differ does, every line prefixed with
+    '  ', '- ' or '+ ', but without the '? ' hint lines.
+
+    :param diff: The diff as (DiffOperation, line) tuples.
+    :type diff: list
+
+    :return: The formatted diff.
+    :rtype: str
+    """
+    return "\n".join(operation.value + line for operation, line in diff)
@@ -0,0 +1,246 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryCache:
+    """Thread safe in memory cache with least recently used eviction.
+
+    The cache is bounded by the total weight of its entries. Every entry
+    weighs 1 unless a weigher function is given, in which case the weight of
+    an entry is the weigher applied to its value. When the total weight
+    exceeds the maximum weight, the least recently used entries are evicted
+    until it no longer does. A value weighing more than the maximum weight
+    on its own is never cached.
+
+    If a time to live is given, entries also expire that many seconds after
+    they were set. Expired entries are never returned, and are removed when
+    read or when a later set finds them expired.
+
+    :param max_weight: The maximum total weight of all entries.
+    :type max_weight: int
+    :param weigher: Function giving the weight of a value, every value weighs
+    1 if None.
+    :type weigher: callable|None
+    :param ttl: The time to live of the entries in seconds, entries never
+    expire if None.
+    :type ttl: float|None
+
+    :rtype: None
+    """
+    def __init__(
+            self,
+            max_weight: int = 128,
+            weigher=None,
+            ttl: float | None = None) -> None:
+        if not isinstance(max_weight, int) or isinstance(max_weight, bool):
+            raise TypeError("'max_weight' must be an INTEGER")
+        elif max_weight < 1:
+            raise ValueError("'max_weight' must be at least 1")
+
+        if ttl is not None and (
+                not isinstance(ttl, (int, float)) or isinstance(ttl, bool)):
+            raise TypeError("'ttl' must be a NUMBER")
+        elif ttl is not None and ttl <= 0:
+            raise ValueError("'ttl' must be positive")
+
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.ttl = ttl
+
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        # With a time to live every entry expires the same time after it was
+        # set, so the entries in the order they were set are also in the
+        # order they expire.
+        self.__expiry_order = OrderedDict()
+        self.__weight = 0
+        self.__generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def __contains__(self, key) -> bool:
+        with self.__lock:
+            return self.__get_entry_unlocked(key) is not None
+
+    def __weigh(self, value) -> int:
+        return 1 if self.weigher is None else self.weigher(value)
+
+    def __pop_unlocked(self, key) -> tuple | None:
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__weight -= entry[1]
+            self.__expiry_order.pop(key, None)
+
+        return entry
+
+    def __get_entry_unlocked(self, key) -> tuple | None:
+        entry = self.__entries.get(key)
+        if entry is not None and self.ttl is not None and \
+                self.__expiry_order[key] <= time.monotonic():
+            self.__pop_unlocked(key)
+            self.expirations += 1
+            return None
+
+        return entry
+
+    def __remove_expired_unlocked(self) -> None:
+        now = time.monotonic()
+        while len(self.__expiry_order) > 0:
+            key, expires_at = next(iter(self.__expiry_order.items()))
+            if expires_at > now:
+                break
+
+            self.__pop_unlocked(key)
+            self.expirations += 1
+
+    def __set_unlocked(self, key, value) -> None:
+        weight = self.__weigh(value)
+
+        self.__pop_unlocked(key)
+        if weight > self.max_weight:
+            return
+
+        if self.ttl is not None:
+            self.__remove_expired_unlocked()
+            self.__expiry_order[key] = time.monotonic() + self.ttl
+
+        self.__entries[key] = (value, weight)
+        self.__weight += weight
+
+        while self.__weight > self.max_weight:
+            self.__pop_unlocked(next(iter(self.__entries)))
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        """Get a cached value and mark it as the most recently used.
+
+        :param key: The key of the value.
+        :param default: The value to return if the key is not cached.
+
+        :return: The cached value, or the default value if not cached.
+        """
+        with self.__lock:
+            entry = self.__get_entry_unlocked(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def get_or_load(self, key, loader):
+        """Get a cached value, or load and cache it if not cached. The loader
+        is called without holding the lock. If the cache is invalidated while
+        the value is loading, the loaded value is returned but not cached, as
+        it might already be stale. So is a value too heavy to cache.
+
+        :param key: The key of the value.
+        :param loader: Function without arguments loading the value.
+        :type loader: callable
+
+        :return: The cached or loaded value.
+        """
+        with self.__lock:
+            entry = self.__get_entry_unlocked(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            generation = self.__generation
+
+        value = loader()
+
+        with self.__lock:
+            if generation == self.__generation:
+                self.__set_unlocked(key, value)
+
+        return value
+
+    def set(self, key, value) -> None:
+        """Cache a value as the most recently used, unless it weighs more
+        than the maximum weight, in which case any cached value of the key is
+        removed instead.
+
+        :param key: The key of the value.
+        :param value: The value to cache.
+
+        :return: None
+        """
+        with self.__lock:
+            self.__set_unlocked(key, value)
+
+    def remove(self, key) -> None:
+        """Remove a cached value, if cached.
+
+        :param key: The key of the value.
+
+        :return: None
+        """
+        with self.__lock:
+            self.__generation += 1
+            self.__pop_unlocked(key)
+
+    def remove_if(self, predicate) -> None:
+        """Remove all cached values whose key matches the predicate.
+
+        :param predicate: Function taking a key and returning True if the
+        value should be removed.
+        :type predicate: callable
+
+        :return: None
+        """
+        with self.__lock:
+            self.__generation += 1
+            for key in [key for key in self.__entries if predicate(key)]:
+                self.__pop_unlocked(key)
+
+    def clear(self) -> None:
+        """Remove all cached values.
+
+        :return: None
+        """
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+            self.__expiry_order.clear()
+            self.__weight = 0
+
+    def get_weight(self) -> int:
+        """Get the total weight of all cached values.
+
+        :return: The total weight.
+        :rtype: int
+        """
+        with self.__lock:
+            return self.__weight
+
+    def get_statistics(self) -> dict:
+        """Get the size and the usage counters of the cache.
+
+        :return: The number of 'entries', their total 'weight', the
+        'maxWeight', and the number of 'hits', 'misses', 'evictions' and
+        'expirations' so far.
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'entries': len(self.__entries),
+                'weight': self.__weight,
+                'maxWeight': self.max_weight,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -29,3 +29,9 @@ def full_path_to_correct_sub_directory(full_path):
         r"^" + re.escape(os.path.abspath(get_base_directory())),
         '',
         os.path.abspath(full_path))
+
+
+def file_path_to_file_id(project_root, file_path):
+    return re.sub(r"^" + re.escape(project_root) + r"/|\.jsx?$",
+                  "",
+                  file_path)